@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Compiled Agent Cache
+
+Content-addressed cache of CodeValidator results and compiled agent code
+objects, so byte-identical agent code (elites carried over between
+generations, agents rebuilt for every match, agents reloaded by the play
+tools) is validated and parsed only once.
+
+Entries are keyed by the SHA-256 of the code. Validation results are also
+keyed by the validator's limits and VALIDATOR_VERSION, so stored results
+from an older validator are not reused. With a cache directory, entries are
+marshalled to disk (code objects tagged with the interpreter's cache tag,
+since marshal is version specific) and survive across runs.
+"""
+import os
+import sys
+import marshal
+import hashlib
+import types
+from dataclasses import asdict
+from typing import Dict, Optional, Tuple
+
+from code_validator import VALIDATOR_VERSION, CodeValidator, ValidationResult
+
+# Name of the cache directory inside an experiment directory
+CACHE_DIR_NAME = "agent_cache"
+
+
+def code_hash(code: str) -> str:
+    """SHA-256 of agent code (AgentSerializer shows the first 16 characters)"""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+class CompiledAgentCache:
+    """
+    In-memory (and optionally on-disk) cache of validation results and code objects
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for marshalled entries (None = memory only)
+        """
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self._code_objects: Dict[str, types.CodeType] = {}
+        self._validations: Dict[Tuple[str, int, int], ValidationResult] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_experiment(cls, experiment_dir: str) -> 'CompiledAgentCache':
+        """Cache stored under an experiment directory"""
+        return cls(os.path.join(experiment_dir, CACHE_DIR_NAME))
+
+    @classmethod
+    def for_agent_file(cls, agent_path: str) -> 'CompiledAgentCache':
+        """
+        Cache for an agent file saved by an experiment (experiment_dir/top_agents/*.py)
+
+        Falls back to a memory-only cache if the experiment has no cache directory.
+        """
+        experiment_dir = os.path.dirname(os.path.dirname(os.path.abspath(agent_path)))
+        cache_dir = os.path.join(experiment_dir, CACHE_DIR_NAME)
+        return cls(cache_dir if os.path.isdir(cache_dir) else None)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name)
+
+    def _load(self, name: str):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(name), 'rb') as f:
+                return marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+    def _store(self, name: str, value):
+        if not self.cache_dir:
+            return
+        try:
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = self._path(f"{name}.{os.getpid()}.tmp")
+            with open(tmp_path, 'wb') as f:
+                marshal.dump(value, f)
+            os.replace(tmp_path, self._path(name))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Could not write agent cache entry {name}: {e}")
+
+    def validate(self, validator: CodeValidator, code: str, agent_id: str = "unknown") -> ValidationResult:
+        """
+        CodeValidator.validate_code, computed once per distinct code and validator limits
+        """
+        digest = code_hash(code)
+        key = (digest, validator.max_lines, validator.max_chars)
+        result = self._validations.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+
+        name = f"{digest}.{validator.max_lines}.{validator.max_chars}.v{VALIDATOR_VERSION}.validation"
+        stored = self._load(name)
+        try:
+            # Entries whose fields no longer match ValidationResult are misses
+            result = ValidationResult(**stored) if isinstance(stored, dict) else None
+        except TypeError:
+            result = None
+        if result is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+            result = validator.validate_code(code, agent_id)
+            self._store(name, asdict(result))
+
+        self._validations[key] = result
+        return result
+
+    def get_code_object(self, code: str) -> types.CodeType:
+        """
+        Compiled module code for agent source, parsed once per distinct code
+
+        Raises:
+            SyntaxError: If the code does not compile (failures are not cached)
+        """
+        digest = code_hash(code)
+        code_object = self._code_objects.get(digest)
+        if code_object is not None:
+            self.hits += 1
+            return code_object
+
+        name = f"{digest}.{sys.implementation.cache_tag}.code"
+        code_object = self._load(name)
+        if isinstance(code_object, types.CodeType):
+            self.hits += 1
+        else:
+            self.misses += 1
+            code_object = compile(code, f"<agent {digest[:16]}>", 'exec')
+            self._store(name, code_object)
+
+        self._code_objects[digest] = code_object
+        return code_object
+
+    def get_stats(self) -> Dict[str, int]:
+        """Cache hit/miss counts and sizes"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'code_objects': len(self._code_objects),
+            'validations': len(self._validations),
+        }
+
+
+_default_cache = None
+
+
+def get_agent_cache() -> CompiledAgentCache:
+    """Process-wide memory-only cache used by SafeAgents created without an explicit cache"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CompiledAgentCache()
+    return _default_cache
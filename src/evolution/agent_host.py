@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Agent Host Processes
+
+Runs evolved agent code in separate, resource-limited worker processes
+instead of inside the tournament process.
+
+Each host worker compiles and holds a set of SafeAgents. Observations go to
+the worker and actions come back through per-worker shared memory arrays
+(one slot per hosted agent); the pipe only carries short commands. Workers
+apply setrlimit caps on address space (and optionally CPU seconds) after
+start-up, and a worker that does not answer within its deadline, or dies,
+is killed and respawned with its agents recompiled.
+
+HostedAgent keeps the get_action(state) / seed() / reset_budget() interface
+of SafeAgent, so MatchRunner can use hosted agents unchanged.
+"""
+import io
+import os
+import sys
+import contextlib
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+
+STATE_SIZE = 26
+
+# Agent methods the parent may invoke remotely besides get_action
+REMOTE_METHODS = ('seed', 'reset_budget', 'get_stats')
+
+
+@dataclass
+class HostedAgentSpec:
+    """Everything a worker needs to (re)compile an agent"""
+    agent_id: str
+    code: str
+    timeout_seconds: float = 1.0
+    cpu_budget_seconds: Optional[float] = None
+    seed: Optional[int] = None
+
+
+def _address_space_bytes() -> Optional[int]:
+    """Current virtual memory size of this process (Linux only)"""
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmSize:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _apply_limits(memory_limit_mb: Optional[int], cpu_limit_seconds: Optional[int]):
+    """Cap what agent code in this process may use; the interpreter's own footprint is not counted"""
+    if resource is None:
+        return
+    if memory_limit_mb is not None:
+        current = _address_space_bytes()
+        if current is not None:
+            limit = current + memory_limit_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    if cpu_limit_seconds is not None:
+        # SIGXCPU at the soft limit kills the worker; the parent respawns it
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit_seconds, cpu_limit_seconds + 1))
+
+
+def _attach(name: str, shape: tuple, dtype):
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+
+def _host_serve(remote, states, actions):
+    """Answer commands until told to close"""
+    from safe_execution import SafeAgent
+
+    agents = {}
+    while True:
+        command, *args = remote.recv()
+        if command == 'act':
+            for slot in args[0]:
+                agent = agents.get(slot)
+                actions[slot] = agent.get_action(states[slot]) if agent is not None else 0
+            remote.send(None)
+        elif command == 'probe':
+            slots, batch, budget_seconds = args
+            remote.send(np.stack([agents[slot].get_actions(batch, budget_seconds) if slot in agents
+                                  else np.zeros(len(batch), dtype=np.int8) for slot in slots]))
+        elif command == 'add':
+            slot, spec = args
+            # Compile messages would interleave across workers; validity is reported back instead
+            with contextlib.redirect_stdout(io.StringIO()):
+                agent = SafeAgent(spec.agent_id, spec.code, spec.timeout_seconds, seed=spec.seed,
+                                  cpu_budget_seconds=spec.cpu_budget_seconds)
+            agents[slot] = agent
+            remote.send(agent.is_valid)
+        elif command == 'remove':
+            agents.pop(args[0], None)
+            remote.send(None)
+        elif command == 'call':
+            slot, method, method_args = args
+            agent = agents.get(slot)
+            if agent is None or method not in REMOTE_METHODS:
+                remote.send(None)
+            else:
+                remote.send(getattr(agent, method)(*method_args))
+        elif command == 'close':
+            return
+
+
+def _host_worker(remote, parent_remote, states_name, actions_name, capacity, limits):
+    """Worker process hosting up to capacity agents"""
+    parent_remote.close()
+    states_shm, states = _attach(states_name, (capacity, STATE_SIZE), np.float32)
+    actions_shm, actions = _attach(actions_name, (capacity,), np.int64)
+    _apply_limits(**limits)
+
+    try:
+        _host_serve(remote, states, actions)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Drop the views before closing the blocks
+        del states, actions
+        states_shm.close()
+        actions_shm.close()
+        remote.close()
+
+
+class _HostWorker:
+    """Parent-side handle on one agent host process and its shared memory"""
+
+    def __init__(self, pool: 'AgentHostPool'):
+        self.pool = pool
+        capacity = pool.slots_per_worker
+        self._states_shm = shared_memory.SharedMemory(create=True, size=capacity * STATE_SIZE * 4)
+        self._actions_shm = shared_memory.SharedMemory(create=True, size=capacity * 8)
+        self.states = np.ndarray((capacity, STATE_SIZE), dtype=np.float32, buffer=self._states_shm.buf)
+        self.actions = np.ndarray((capacity,), dtype=np.int64, buffer=self._actions_shm.buf)
+
+        self.specs: Dict[int, HostedAgentSpec] = {}
+        self.valid: Dict[int, bool] = {}
+        self.remote = None
+        self.process = None
+        self._start()
+
+    def _start(self):
+        ctx = self.pool._ctx
+        self.remote, work_remote = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_host_worker,
+            args=(work_remote, self.remote, self._states_shm.name, self._actions_shm.name,
+                  self.pool.slots_per_worker, self.pool.limits),
+            daemon=True,
+        )
+        self.process.start()
+        work_remote.close()
+
+    def _kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=5)
+        self.remote.close()
+
+    def free_slot(self) -> Optional[int]:
+        for slot in range(self.pool.slots_per_worker):
+            if slot not in self.specs:
+                return slot
+        return None
+
+    def send(self, message):
+        try:
+            self.remote.send(message)
+            return True
+        except (BrokenPipeError, EOFError, OSError):
+            return False
+
+    def receive(self, timeout: float):
+        """
+        Wait for a reply
+
+        Returns:
+            (True, reply), or (False, None) if the worker hung or died; it is respawned
+        """
+        try:
+            if self.remote.poll(timeout):
+                return True, self.remote.recv()
+            reason = f"no reply within {timeout:.1f}s"
+        except (EOFError, OSError):
+            reason = f"worker exited (code {self.process.exitcode})"
+        print(f"⚠️  Agent host worker {self.process.pid} failed: {reason}; respawning")
+        self.respawn()
+        return False, None
+
+    def request(self, message, timeout: float):
+        if not self.send(message):
+            print(f"⚠️  Agent host worker {self.process.pid} is gone; respawning")
+            self.respawn()
+            return False, None
+        return self.receive(timeout)
+
+    def respawn(self):
+        """Replace the worker process and recompile its agents; agents that hang again are dropped"""
+        self.pool.respawns += 1
+        self._kill()
+        self._start()
+        for slot, spec in list(self.specs.items()):
+            if not self.valid.get(slot):
+                continue
+            self.send(('add', slot, spec))
+            if self.remote.poll(self.pool.hang_timeout):
+                try:
+                    self.valid[slot] = self.remote.recv()
+                    continue
+                except EOFError:
+                    pass
+            print(f"❌ Agent {spec.agent_id} could not be restored in a fresh host; disabling it")
+            self.valid[slot] = False
+            self._kill()
+            self._start()
+            # Earlier slots were lost with the killed process; restore them again
+            return self.respawn()
+
+    def close(self):
+        self.send(('close',))
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.remote.close()
+
+        self.states = None
+        self.actions = None
+        for shm in (self._states_shm, self._actions_shm):
+            try:
+                shm.close()
+            except BufferError:
+                pass  # A caller still holds a view; the block is freed once it is dropped
+            shm.unlink()
+
+
+class HostedAgent:
+    """
+    Proxy for an agent compiled inside a host worker; drop-in for SafeAgent in matches
+    """
+
+    def __init__(self, pool: 'AgentHostPool', worker: _HostWorker, slot: int, spec: HostedAgentSpec):
+        self.pool = pool
+        self.worker = worker
+        self.slot = slot
+        self.spec = spec
+
+        # SafeAgent-compatible attributes
+        self.agent_id = spec.agent_id
+        self.code = spec.code
+        self.timeout_seconds = spec.timeout_seconds
+        self.cpu_budget_seconds = spec.cpu_budget_seconds
+
+    @property
+    def is_valid(self) -> bool:
+        return self.worker.valid.get(self.slot, False)
+
+    def _deadline(self) -> float:
+        return self.pool.hang_timeout + self.timeout_seconds
+
+    def get_action(self, state: np.ndarray) -> int:
+        """
+        Run the agent's get_action in its host process
+
+        Returns:
+            Action integer (0-9), 0 if the agent is invalid or its host had to be respawned
+        """
+        if not self.is_valid:
+            return 0
+        worker = self.worker
+        worker.states[self.slot] = state
+        ok, _ = worker.request(('act', (self.slot,)), self._deadline())
+        return int(worker.actions[self.slot]) if ok else 0
+
+    def _call(self, method: str, *args):
+        ok, reply = self.worker.request(('call', self.slot, method, args), self._deadline())
+        return reply if ok else None
+
+    def seed(self, seed: Optional[int] = None):
+        """Reseed the agent's random streams (also reapplied if the host is respawned)"""
+        self.spec.seed = seed
+        self._call('seed', seed)
+
+    def reset_budget(self, cpu_budget_seconds: Optional[float] = None):
+        """Start a new cumulative CPU budget period in the host"""
+        self._call('reset_budget', cpu_budget_seconds)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Execution statistics from the host-side SafeAgent"""
+        return self._call('get_stats') or {'agent_id': self.agent_id, 'is_disabled': True}
+
+
+class AgentHostPool:
+    """
+    Pool of resource-limited worker processes that compile and run evolved agents
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, slots_per_worker: int = 64,
+                 memory_limit_mb: Optional[int] = 256, cpu_limit_seconds: Optional[int] = None,
+                 hang_timeout: float = 2.0, start_method: Optional[str] = None):
+        """
+        Initialize the pool
+
+        Args:
+            num_workers: Host processes (None = all cores)
+            slots_per_worker: Maximum agents hosted by one process
+            memory_limit_mb: Address space agent code may add on top of the interpreter (None = no cap)
+            cpu_limit_seconds: RLIMIT_CPU for each worker's lifetime (None = no cap)
+            hang_timeout: Seconds a worker may take beyond an agent's own timeout
+                          before it is considered hung, killed and respawned
+            start_method: multiprocessing start method (None = platform default)
+        """
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.slots_per_worker = slots_per_worker
+        self.hang_timeout = hang_timeout
+        self.limits = {'memory_limit_mb': memory_limit_mb, 'cpu_limit_seconds': cpu_limit_seconds}
+        self.respawns = 0
+
+        self._ctx = mp.get_context(start_method)
+        self._workers = [_HostWorker(self) for _ in range(self.num_workers)]
+        self.closed = False
+
+    def add_agent(self, agent_id: str, code: str, timeout_seconds: float = 1.0,
+                  cpu_budget_seconds: Optional[float] = None, seed: Optional[int] = None) -> Optional[HostedAgent]:
+        """
+        Compile an agent in the least loaded host
+
+        Returns:
+            HostedAgent (check is_valid), or None if every host is full or the host failed
+        """
+        worker = min(self._workers, key=lambda w: len(w.specs))
+        slot = worker.free_slot()
+        if slot is None:
+            print(f"❌ Cannot host agent {agent_id}: all {self.num_workers * self.slots_per_worker} slots in use")
+            return None
+
+        spec = HostedAgentSpec(agent_id, code, timeout_seconds, cpu_budget_seconds, seed)
+        worker.specs[slot] = spec
+        worker.valid[slot] = False
+        ok, is_valid = worker.request(('add', slot, spec), self.hang_timeout)
+        if not ok:
+            del worker.specs[slot], worker.valid[slot]
+            print(f"❌ Agent {agent_id} hung its host while compiling")
+            return None
+
+        worker.valid[slot] = bool(is_valid)
+        return HostedAgent(self, worker, slot, spec)
+
+    def remove_agent(self, agent: HostedAgent):
+        """Free an agent's slot"""
+        worker = agent.worker
+        if worker.specs.pop(agent.slot, None) is not None:
+            worker.valid.pop(agent.slot, None)
+            worker.request(('remove', agent.slot), self.hang_timeout)
+
+    def get_actions(self, agents: List[HostedAgent], states: np.ndarray) -> np.ndarray:
+        """
+        Query many agents at once: one round trip per host, all hosts working in parallel
+
+        Args:
+            agents: Hosted agents from this pool
+            states: (len(agents), state_size) observations, one per agent
+
+        Returns:
+            (len(agents),) int64 actions; 0 for invalid agents or hosts that had to be respawned
+        """
+        result = np.zeros(len(agents), dtype=np.int64)
+        batches: Dict[int, tuple] = {}
+        for i, agent in enumerate(agents):
+            if agent.is_valid:
+                agent.worker.states[agent.slot] = states[i]
+                worker, indices = batches.setdefault(id(agent.worker), (agent.worker, []))
+                indices.append(i)
+
+        sent = []
+        for worker, indices in batches.values():
+            if worker.send(('act', tuple(agents[i].slot for i in indices))):
+                sent.append((worker, indices))
+            else:
+                worker.respawn()
+
+        for worker, indices in sent:
+            timeout = self.hang_timeout + sum(agents[i].timeout_seconds for i in indices)
+            ok, _ = worker.receive(timeout)
+            if ok:
+                result[indices] = worker.actions[[agents[i].slot for i in indices]]
+        return result
+
+    def get_batch_actions(self, agents: List[HostedAgent], states: np.ndarray,
+                          budget_seconds: Optional[float] = None) -> np.ndarray:
+        """
+        Every agent's actions on every state of a batch (e.g. a probe bank), hosts working in parallel
+
+        Args:
+            agents: Hosted agents from this pool
+            states: (n, state_size) observations, the same for all agents
+            budget_seconds: CPU time each agent may spend on the batch (None = unlimited)
+
+        Returns:
+            (len(agents), n) int8 actions; rows of 0 for invalid agents or hosts that had to be respawned
+        """
+        result = np.zeros((len(agents), len(states)), dtype=np.int8)
+        batches: Dict[int, tuple] = {}
+        for i, agent in enumerate(agents):
+            if agent.is_valid:
+                worker, indices = batches.setdefault(id(agent.worker), (agent.worker, []))
+                indices.append(i)
+
+        sent = []
+        for worker, indices in batches.values():
+            if worker.send(('probe', tuple(agents[i].slot for i in indices), states, budget_seconds)):
+                sent.append((worker, indices))
+            else:
+                worker.respawn()
+
+        for worker, indices in sent:
+            # Each call is bounded by its timeout, and the batch by its budget when one is set
+            timeout = max(agents[i].timeout_seconds for i in indices)
+            per_agent = budget_seconds + timeout if budget_seconds is not None else len(states) * timeout
+            ok, actions = worker.receive(self.hang_timeout + per_agent * len(indices))
+            if ok:
+                result[indices] = actions
+        return result
+
+    def close(self):
+        """Stop the hosts and free their shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for worker in self._workers:
+            worker.close()
+        self._workers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Offline AST Variation Operators
+
+Mutation and crossover of agent code without an LLM round trip. Operators
+work on the parsed get_action function:
+- mutate: perturbs numeric thresholds (float constants assigned to names,
+  e.g. `close_range = 0.12`, or compared against) and swaps returned action
+  constants (0-9) for other actions
+- crossover: splices an if statement of the second parent into the first
+  parent's decision tree in place of one of its own. Only branches whose
+  free names are already defined at the splice point, and that bind every
+  name the replaced branch bound, are used, so children don't fail with
+  NameError at runtime.
+
+Each parent is parsed and analysed once. Children are made by rewriting the
+parent's source at the positions of the chosen nodes, so comments and
+formatting survive, and are returned only if they pass CodeValidator. A
+child costs a few string splices plus one validation, which makes thousands
+of candidates per second possible for typical agents.
+"""
+import ast
+import math
+import time
+import random
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+from code_validator import CodeValidator, create_safe_execution_environment
+
+# Valid agent actions (see prompt_templates.py ACTION SPACE)
+ACTIONS = range(10)
+
+# Names agent code can use without defining them (safe builtins and modules)
+_SAFE_GLOBALS = create_safe_execution_environment()
+AVAILABLE_NAMES = set(_SAFE_GLOBALS) | set(_SAFE_GLOBALS['__builtins__'])
+
+
+def _get_action(tree: ast.Module) -> Optional[ast.FunctionDef]:
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == 'get_action':
+            return node
+    return None
+
+
+def _stored_names(nodes: List[ast.AST]) -> Set[str]:
+    """Names bound anywhere in nodes (assignments, loop targets, defs, imports, arguments)"""
+    names = set()
+    for root in nodes:
+        for node in ast.walk(root):
+            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+                names.add(node.id)
+            elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+                names.add(node.name)
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                names.update((alias.asname or alias.name).split('.')[0] for alias in node.names)
+            elif isinstance(node, ast.arg):
+                names.add(node.arg)
+    return names
+
+
+def _free_names(node: ast.AST) -> Set[str]:
+    """Names a subtree reads without binding them itself"""
+    loaded = {n.id for n in ast.walk(node) if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Load)}
+    # `x += 1` reads x before binding it
+    augmented = {n.target.id for n in ast.walk(node)
+                 if isinstance(n, ast.AugAssign) and isinstance(n.target, ast.Name)}
+    return (loaded | augmented) - (_stored_names([node]) - augmented)
+
+
+@dataclass
+class _Branch:
+    """An if statement (not an elif) of a parent's get_action"""
+    first_line: int      # 0-based index of the `if` line
+    end_line: int        # 0-based index one past the last line
+    indent: str          # Leading whitespace of the `if` line
+    top: int             # Index of the top-level get_action statement containing it
+    free_names: Set[str]  # Names it reads without binding
+    bound_names: Set[str]  # Names it binds
+
+
+@dataclass
+class _Parent:
+    """A parent's source and the edit sites found in its get_action"""
+    source: str
+    lines: List[str]                          # source.splitlines(keepends=True)
+    thresholds: List[Tuple[int, int, float]]  # (start, end, value) of numeric threshold constants
+    actions: List[Tuple[int, int, int]]       # (start, end, action) of returned action constants
+    branches: List[_Branch]
+    defined: List[Set[str]]                   # Names defined before each top-level statement
+
+
+def _analyse(code: str) -> Optional[_Parent]:
+    """Edit sites of a parent (None if it doesn't parse or has no get_action)"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    function = _get_action(tree)
+    if function is None:
+        return None
+
+    lines = code.splitlines(keepends=True)
+    line_starts = [0]
+    for line in lines:
+        line_starts.append(line_starts[-1] + len(line))
+
+    def offset(lineno: int, col: int) -> int:
+        # AST columns are UTF-8 byte offsets
+        line = lines[lineno - 1]
+        return line_starts[lineno - 1] + len(line.encode('utf-8')[:col].decode('utf-8', 'ignore'))
+
+    def span(node: ast.AST) -> Tuple[int, int]:
+        return offset(node.lineno, node.col_offset), offset(node.end_lineno, node.end_col_offset)
+
+    thresholds, actions = [], []
+    for node in ast.walk(function):
+        if isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            operands = [node.value]
+        elif isinstance(node, ast.Compare):
+            operands = [node.left] + node.comparators
+        else:
+            if (isinstance(node, ast.Return) and isinstance(node.value, ast.Constant)
+                    and type(node.value.value) is int and node.value.value in ACTIONS):
+                actions.append(span(node.value) + (node.value.value,))
+            continue
+        for operand in operands:
+            if isinstance(operand, ast.UnaryOp) and isinstance(operand.op, ast.USub):
+                operand = operand.operand
+            if (isinstance(operand, ast.Constant) and type(operand.value) is float
+                    and operand.value != 0.0):
+                thresholds.append(span(operand) + (operand.value,))
+
+    branches = []
+    for top, statement in enumerate(function.body):
+        for node in ast.walk(statement):
+            if not isinstance(node, ast.If):
+                continue
+            line = lines[node.lineno - 1]
+            indent = line[:len(line) - len(line.lstrip())]
+            if line.lstrip().startswith('if') and len(indent.encode('utf-8')) == node.col_offset:
+                branches.append(_Branch(node.lineno - 1, node.end_lineno, indent, top,
+                                        _free_names(node), _stored_names([node])))
+
+    # Module-level names and arguments are defined everywhere in the function
+    defined = [AVAILABLE_NAMES | _stored_names([function.args]) |
+               _stored_names([node for node in tree.body if node is not function])]
+    for statement in function.body:
+        defined.append(defined[-1] | _stored_names([statement]))
+
+    return _Parent(code, lines, thresholds, actions, branches, defined)
+
+
+def _reindent(lines: List[str], old: str, new: str) -> List[str]:
+    """Lines with the `old` indentation prefix replaced by `new`"""
+    reindented = []
+    for line in lines:
+        if not line.strip():
+            reindented.append(line)
+        elif line.startswith(old):
+            reindented.append(new + line[len(old):])
+        else:
+            reindented.append(new + line.lstrip(' \t'))
+    return reindented
+
+
+class ASTVariation:
+    """
+    Local mutation and crossover of agent code
+    """
+
+    def __init__(self, validator: Optional[CodeValidator] = None, seed: Optional[int] = None,
+                 threshold_rate: float = 0.3, threshold_scale: float = 0.2, action_rate: float = 0.1,
+                 max_parsed: int = 256):
+        """
+        Initialize the variation engine
+
+        Args:
+            validator: Validator every child must pass (default: CodeValidator())
+            seed: Seed for the operators' random choices
+            threshold_rate: Probability of perturbing each numeric threshold
+            threshold_scale: Standard deviation of the log-scale threshold perturbation
+            action_rate: Probability of swapping each returned action constant
+            max_parsed: Parents to keep analysed
+        """
+        self.validator = validator or CodeValidator()
+        self.rng = random.Random(seed)
+        self.threshold_rate = threshold_rate
+        self.threshold_scale = threshold_scale
+        self.action_rate = action_rate
+        self.max_parsed = max_parsed
+        self._parsed: Dict[str, Optional[_Parent]] = {}
+
+        self.attempts = 0
+        self.produced = 0
+        self.invalid = 0
+        self.unchanged = 0
+        self.time = 0.0
+
+    def _parent(self, code: str) -> Optional[_Parent]:
+        if code not in self._parsed:
+            if len(self._parsed) >= self.max_parsed:
+                self._parsed.clear()
+            self._parsed[code] = _analyse(code)
+        return self._parsed[code]
+
+    def _perturb(self, value: float) -> float:
+        perturbed = value * math.exp(self.rng.gauss(0.0, self.threshold_scale))
+        if -1.0 <= value <= 1.0:
+            # State features are normalized, so thresholds in range stay in range
+            perturbed = max(-1.0, min(1.0, perturbed))
+        return round(perturbed, 3)
+
+    def _swap_action(self, action: int) -> int:
+        return self.rng.choice([a for a in ACTIONS if a != action])
+
+    def _finish(self, code: str, parent: _Parent) -> Optional[str]:
+        """Validated child code, or None"""
+        if code == parent.source:
+            self.unchanged += 1
+            return None
+        result = self.validator.validate_code(code)
+        if not result.is_valid:
+            self.invalid += 1
+            return None
+        self.produced += 1
+        return result.cleaned_code
+
+    def mutate(self, code: str) -> Optional[str]:
+        """
+        Mutate an agent's thresholds and actions
+
+        Args:
+            code: Parent agent code
+
+        Returns:
+            Validated child code, or None if no valid child was produced
+        """
+        start = time.perf_counter()
+        self.attempts += 1
+        try:
+            parent = self._parent(code)
+            if parent is None:
+                self.invalid += 1
+                return None
+            if not parent.thresholds and not parent.actions:
+                self.unchanged += 1
+                return None
+
+            edits = []  # (start, end, replacement)
+            for begin, end, value in parent.thresholds:
+                if self.rng.random() < self.threshold_rate:
+                    edits.append((begin, end, repr(self._perturb(value))))
+            for begin, end, action in parent.actions:
+                if self.rng.random() < self.action_rate:
+                    edits.append((begin, end, str(self._swap_action(action))))
+            if not edits:
+                # Always change something
+                begin, end, value = self.rng.choice(parent.thresholds + parent.actions)
+                edits.append((begin, end, str(self._swap_action(value)) if type(value) is int
+                              else repr(self._perturb(value))))
+
+            pieces, position = [], 0
+            for begin, end, replacement in sorted(edits):
+                pieces.append(parent.source[position:begin])
+                pieces.append(replacement)
+                position = end
+            pieces.append(parent.source[position:])
+            return self._finish(''.join(pieces), parent)
+        finally:
+            self.time += time.perf_counter() - start
+
+    def crossover(self, code1: str, code2: str) -> Optional[str]:
+        """
+        Replace one if statement of the first parent with one from the second
+
+        Args:
+            code1: Parent whose code the child is based on
+            code2: Parent that donates a branch
+
+        Returns:
+            Validated child code, or None if no valid child was produced
+        """
+        start = time.perf_counter()
+        self.attempts += 1
+        try:
+            parent, donor = self._parent(code1), self._parent(code2)
+            if parent is None or donor is None:
+                self.invalid += 1
+                return None
+            if not parent.branches or not donor.branches:
+                self.unchanged += 1
+                return None
+
+            target = self.rng.choice(parent.branches)
+            # Only branches that read names already defined at the splice point, and bind
+            # everything the replaced branch did (later code may read it)
+            branches = [b for b in donor.branches
+                        if b.free_names <= parent.defined[target.top] and target.bound_names <= b.bound_names]
+            if not branches:
+                self.unchanged += 1
+                return None
+            branch = self.rng.choice(branches)
+
+            spliced = _reindent(donor.lines[branch.first_line:branch.end_line], branch.indent, target.indent)
+            if not spliced[-1].endswith('\n'):
+                spliced[-1] += '\n'
+            child = ''.join(parent.lines[:target.first_line] + spliced + parent.lines[target.end_line:])
+            return self._finish(child, parent)
+        finally:
+            self.time += time.perf_counter() - start
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'attempts': self.attempts,
+            'produced': self.produced,
+            'invalid': self.invalid,
+            'unchanged': self.unchanged,
+            'time': self.time,
+        }
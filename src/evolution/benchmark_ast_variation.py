@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for offline AST mutation and crossover
+
+Generates children from two parent pools, the short StubLLMClient templates
+and the LLM-generated agents archived in experiments/medium_evolution
+(~190 lines each), and reports validated candidates per second for each
+operator. Every counted child has passed CodeValidator.
+"""
+import sys
+import os
+import io
+import glob
+import time
+import random
+import contextlib
+sys.path.append(os.path.dirname(__file__))
+
+from agent_serialization import AgentSerializer
+from ast_variation import ASTVariation
+from generation_pipeline import STUB_TEMPLATES
+
+ARCHIVE = os.path.join(os.path.dirname(__file__), 'experiments', 'medium_evolution', 'agent_archive')
+
+
+def load_archive_agents(limit: int = 20):
+    """Code of up to `limit` archived agents (empty if the archive is missing)"""
+    codes = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        serializer = AgentSerializer(ARCHIVE) if os.path.isdir(ARCHIVE) else None
+        for path in sorted(glob.glob(os.path.join(ARCHIVE, '*.py')))[:limit]:
+            agent = serializer.load_agent_python(path)
+            if agent:
+                codes.append(agent.code)
+    return codes
+
+
+def measure(parents, operator: str, candidates: int, seed: int = 0):
+    """(validated children per second, engine stats) for one operator"""
+    engine = ASTVariation(seed=seed)
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(candidates):
+        if operator == 'crossover':
+            engine.crossover(*rng.sample(parents, 2))
+        else:
+            engine.mutate(rng.choice(parents))
+    elapsed = time.perf_counter() - start
+    return engine.produced / elapsed, engine.get_stats()
+
+
+def benchmark_ast_variation(candidates: int = 2000):
+    print('🔍 AST Variation Benchmark:')
+    print('=' * 50)
+
+    pools = {'stub templates': [t.strip() for t in STUB_TEMPLATES]}
+    archive = load_archive_agents()
+    if archive:
+        pools[f'{len(archive)} archived agents'] = archive
+
+    results = {}
+    for name, parents in pools.items():
+        for operator in ('mutate', 'crossover'):
+            rate, stats = measure(parents, operator, candidates)
+            results[(name, operator)] = rate
+            print(f'  {name:20s} {operator:9s}: {rate:8.0f} children/s '
+                  f'({stats["produced"]}/{stats["attempts"]} valid, {stats["unchanged"]} unchanged)')
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_ast_variation()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark for concurrent agent generation
+
+Generates a population through GenerationPipeline against StubLLMClient with
+a simulated per-request latency, validating and compiling every response
+as the trainer does, and compares wall time across concurrency levels.
+Concurrency 1 is the previous behaviour: one request at a time, with
+validation and compilation between requests.
+"""
+import sys
+import os
+import io
+import time
+import contextlib
+sys.path.append(os.path.dirname(__file__))
+
+from code_validator import CodeValidator
+from safe_execution import SafeAgent
+from agent_cache import CompiledAgentCache
+from generation_pipeline import GenerationPipeline, GenerationRequest, StubLLMClient
+
+STYLES = ['aggressive', 'defensive', 'zoner', 'balanced', 'adaptive']
+
+
+def generate_population(population_size: int, concurrency: int, latency: float, failures_per_request: int = 0):
+    """Generate and compile a population; returns (agents, pipeline stats)"""
+    validator = CodeValidator()
+    cache = CompiledAgentCache()
+    client = StubLLMClient(seed=0, latency=latency, failures_per_request=failures_per_request)
+    pipeline = GenerationPipeline(client, max_concurrency=concurrency, backoff_seconds=latency)
+    agents = []
+
+    def make_request(i):
+        style = STYLES[i % len(STYLES)]
+        return GenerationRequest(prompt=f"Write a {style} fighting agent", fighting_style=style, generation=0)
+
+    def accept(request, code):
+        result = cache.validate(validator, code)
+        if not result.is_valid:
+            return False
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent = SafeAgent(f"gen0_agent_{len(agents):03d}", result.cleaned_code, cache=cache)
+        if not agent.is_valid:
+            return False
+        agents.append(agent)
+        return True
+
+    pipeline.run(make_request, accept, population_size, population_size * 3)
+    return agents, pipeline.get_stats()
+
+
+def benchmark_generation(population_size=32, latency=0.25, concurrency_levels=(1, 4, 8, 16)):
+    print('🔍 Agent Generation Benchmark:')
+    print('=' * 50)
+    print(f'  {population_size} agents, {latency * 1000:.0f} ms simulated latency per request')
+
+    results = {}
+    for concurrency in concurrency_levels:
+        start = time.perf_counter()
+        agents, stats = generate_population(population_size, concurrency, latency)
+        elapsed = time.perf_counter() - start
+        results[concurrency] = elapsed
+        print(f'  concurrency {concurrency:3d}: {elapsed:6.2f}s '
+              f'({len(agents)} agents, {stats["requests"]} requests, '
+              f'{results[concurrency_levels[0]] / elapsed:.1f}x)')
+
+    start = time.perf_counter()
+    agents, stats = generate_population(population_size, concurrency_levels[-1], latency, failures_per_request=1)
+    print(f'  with one transient failure per request: {time.perf_counter() - start:.2f}s '
+          f'({len(agents)} agents, {stats["retries"]} retries)')
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_generation()
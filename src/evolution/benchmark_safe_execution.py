@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for SafeAgent timeout protection
+
+Measures the per-call cost of guarding an agent's get_action, comparing the
+CPU-budget watchdog against legacy_timeout, a frozen copy of the previous
+per-call SIGALRM guard (swap handler, arm setitimer, cancel, restore handler).
+"""
+import sys
+import os
+import time
+import signal
+import threading
+from contextlib import contextmanager
+sys.path.append(os.path.dirname(__file__))
+
+import numpy as np
+from cpu_watchdog import CPUBudget
+from safe_execution import SafeAgent
+
+AGENT_CODE = """
+def get_action(state):
+    if state[22] < 0.3:
+        return 4
+    return 2 if state[23] > 0 else 1
+"""
+
+
+@contextmanager
+def legacy_timeout(seconds):
+    """Previous SafeAgent._timeout_context, kept only as a benchmark reference"""
+    def timeout_handler(signum, frame):
+        raise TimeoutError(f"execution timed out after {seconds}s")
+
+    old_handler = signal.signal(signal.SIGALRM, timeout_handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, old_handler)
+
+
+def _time_calls(call, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - start) / calls
+
+
+def _run_in_thread(func):
+    """Run func on a worker thread, returning its result or the exception it raised"""
+    result = []
+
+    def target():
+        try:
+            result.append(func())
+        except Exception as e:
+            result.append(e)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def benchmark_safe_execution(calls=100000):
+    print('🔍 SafeAgent Timeout Protection Microbenchmark:')
+    print('=' * 50)
+    print(f'  {calls} get_action calls per measurement')
+
+    state = np.zeros(26, dtype=np.float32)
+    state[22] = 0.5
+    agent = SafeAgent('bench', AGENT_CODE)
+    func = agent.get_action_func
+    budget = CPUBudget(call_seconds=1.0, total_seconds=None)
+
+    def unguarded():
+        return func(state)
+
+    def legacy():
+        with legacy_timeout(1.0):
+            return func(state)
+
+    def watched():
+        budget.begin()
+        try:
+            return func(state)
+        finally:
+            budget.end()
+
+    results = {}
+    for name, call in [('none', unguarded), ('sigalrm', legacy), ('watchdog', watched)]:
+        call()
+        results[name] = _time_calls(call, calls)
+
+    base = results['none']
+    print('\n1. Guard overhead per get_action call:')
+    for name in ('sigalrm', 'watchdog'):
+        overhead = results[name] - base
+        print(f'  {name:9s} {results[name] * 1e6:.3f} us/call '
+              f'(+{overhead * 1e6:.3f} us over unguarded {base * 1e6:.3f} us)')
+    print(f'  Per 3600-frame game x 2 agents: sigalrm {(results["sigalrm"] - base) * 7200 * 1e3:.1f} ms, '
+          f'watchdog {(results["watchdog"] - base) * 7200 * 1e3:.1f} ms')
+
+    print('\n2. Full SafeAgent.get_action (guard + validation + stats):')
+    agent_time = _time_calls(lambda: agent.get_action(state), calls)
+    print(f'  {agent_time * 1e6:.3f} us/call ({1 / agent_time:,.0f} calls/second)')
+
+    print('\n3. Guarding from a worker thread:')
+    legacy_result = _run_in_thread(legacy)
+    print(f'  sigalrm   {"works" if not isinstance(legacy_result, Exception) else f"fails ({legacy_result})"}')
+    spin_agent = SafeAgent('spin', 'def get_action(state):\n    while True:\n        pass\n', timeout_seconds=0.05)
+    start = time.perf_counter()
+    action = _run_in_thread(lambda: spin_agent.get_action(state))
+    print(f'  watchdog  infinite loop stopped after {time.perf_counter() - start:.3f}s '
+          f'(action {action}, timeouts {spin_agent.total_timeouts})')
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_safe_execution()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Swiss tournament pairing
+
+Measures the time to pair one Swiss round against population size, for the
+score-group pairing engine and legacy_swiss_pairings, a frozen copy of the
+previous pairing code (full sort, then a scan of the sorted list for every
+agent). Standings come from simulated rounds with random results, so no
+matches are played.
+"""
+import sys
+import os
+import time
+import random
+import contextlib
+import io
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(__file__))
+
+from swiss_tournament import SwissTournament, TournamentResult
+
+
+def legacy_swiss_pairings(tournament: SwissTournament):
+    """Previous SwissTournament._create_swiss_pairings, kept only as a benchmark reference"""
+    standings = tournament.standings
+
+    sorted_agents = sorted(
+        tournament.agents,
+        key=lambda a: (
+            standings[a.agent_id].wins,
+            tournament._rating(a),
+            standings[a.agent_id].strength_of_schedule,
+            standings[a.agent_id].avg_fitness
+        ),
+        reverse=True
+    )
+
+    def find_best_opponent(agent, used_agents):
+        faced = tournament.get_opponents(agent.agent_id)
+        for candidate in sorted_agents:
+            if (candidate.agent_id != agent.agent_id and
+                    candidate.agent_id not in used_agents and
+                    candidate.agent_id not in faced):
+                return candidate
+        for candidate in sorted_agents:
+            if candidate.agent_id != agent.agent_id and candidate.agent_id not in used_agents:
+                return candidate
+        return None
+
+    pairings = []
+    used_agents = set()
+    for agent in sorted_agents:
+        if agent.agent_id in used_agents:
+            continue
+        opponent = find_best_opponent(agent, used_agents)
+        if opponent:
+            pairings.append((agent, opponent))
+            used_agents.add(agent.agent_id)
+            used_agents.add(opponent.agent_id)
+        else:
+            pairings.append((agent, None))
+            used_agents.add(agent.agent_id)
+    return pairings
+
+
+def _random_result(agent1, agent2, rng):
+    """Synthetic match result (or bye) for a pairing"""
+    if agent2 is None:
+        return TournamentResult(agent1.agent_id, "BYE", 1.0, 0.0, 0.0, 0.0, 0, {'bye': True})
+    score = rng.choice([0.0, 0.5, 1.0])
+    return TournamentResult(agent1.agent_id, agent2.agent_id, score, 1.0 - score,
+                            rng.uniform(0, 100), rng.uniform(0, 100), 1, {})
+
+
+def simulated_tournament(n_agents: int, rounds: int, seed: int = 0) -> SwissTournament:
+    """Tournament with `rounds` rounds of random results already applied"""
+    rng = random.Random(seed)
+    random.seed(seed)
+    agents = [SimpleNamespace(agent_id=f"agent_{i:05d}") for i in range(n_agents)]
+    tournament = SwissTournament(agents, rounds=rounds + 1)
+    for round_num in range(1, rounds + 1):
+        tournament.current_round = round_num
+        pairings = tournament._create_pairings()
+        tournament._update_standings([_random_result(a, b, rng) for a, b in pairings])
+    tournament.current_round = rounds + 1
+    return tournament
+
+
+def benchmark_swiss_pairing(sizes=(1000, 5000, 10000, 20000, 50000), rounds=4, legacy_max=5000):
+    print('🔍 Swiss Pairing Benchmark:')
+    print('=' * 50)
+    print(f'  Time to pair round {rounds + 1} after {rounds} simulated rounds')
+
+    results = {}
+    for n in sizes:
+        with contextlib.redirect_stdout(io.StringIO()):
+            tournament = simulated_tournament(n, rounds)
+
+        start = time.perf_counter()
+        pairings = tournament._create_swiss_pairings()
+        engine_time = time.perf_counter() - start
+        rematches = sum(1 for a, b in pairings
+                        if b is not None and b.agent_id in tournament.get_opponents(a.agent_id))
+
+        line = f'  {n:6d} agents: score groups {engine_time * 1e3:8.1f} ms ({rematches} rematches)'
+        results[n] = {'engine': engine_time}
+        if n <= legacy_max:
+            start = time.perf_counter()
+            legacy = legacy_swiss_pairings(tournament)
+            legacy_time = time.perf_counter() - start
+            same = [(a.agent_id, b and b.agent_id) for a, b in legacy] == \
+                   [(a.agent_id, b and b.agent_id) for a, b in pairings]
+            results[n]['legacy'] = legacy_time
+            line += f' | legacy {legacy_time * 1e3:9.1f} ms ({legacy_time / engine_time:.0f}x, ' \
+                    f'{"same pairings" if same else "DIFFERENT pairings"})'
+        print(line)
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_swiss_pairing()
@@ -11,6 +11,9 @@ import sys
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
 
+# Bump whenever validate_code's results change for the same code; cached validations are keyed by it
+VALIDATOR_VERSION = 2
+
 @dataclass
 class ValidationResult:
     """Result of code validation"""
@@ -20,6 +23,18 @@ class ValidationResult:
     metrics: Dict[str, int]
     cleaned_code: Optional[str] = None
 
+def _walk_statements(tree: ast.AST):
+    """Yield every statement in a tree (imports are statements, so expressions are skipped)"""
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        for field in ('body', 'orelse', 'finalbody', 'handlers', 'cases'):
+            children = getattr(node, field, None)
+            if isinstance(children, list):
+                pending.extend(reversed(children))
+        if isinstance(node, ast.stmt):
+            yield node
+
 class CodeValidator:
     """
     Validates and cleans LLM-generated agent code
@@ -53,6 +68,7 @@ class CodeValidator:
             r'from\s+os\s+import',
             r'from\s+sys\s+import',
             r'from\s+subprocess\s+import',
+            r'__import__\s*\(',
             r'eval\s*\(',
             r'exec\s*\(',
             r'compile\s*\(',
@@ -77,9 +93,12 @@ class CodeValidator:
 
         # Allowed imports
         self.allowed_imports = {
-            'numpy', 'np', 'random', 'math', 'time'
+            'numpy', 'np', 'random', 'math'
         }
 
+        # Compiled dangerous patterns, rebuilt if the pattern list changes
+        self._compiled_patterns = None
+
     def validate_code(self, code: str, agent_id: str = "unknown") -> ValidationResult:
         """
         Validate agent code comprehensively
@@ -111,9 +130,9 @@ class CodeValidator:
         if metrics['chars'] > self.max_chars:
             errors.append(f"Code too long: {metrics['chars']} chars (max {self.max_chars})")
 
-        # 3. Syntax validation
-        syntax_valid, syntax_error = self._validate_syntax(cleaned_code)
-        if not syntax_valid:
+        # 3. Syntax validation (the tree is reused for import validation)
+        tree, syntax_error = self._parse(cleaned_code)
+        if tree is None:
             errors.append(f"Syntax error: {syntax_error}")
 
         # 4. Security validation
@@ -125,14 +144,19 @@ class CodeValidator:
         errors.extend(missing_requirements)
 
         # 6. Import validation
-        import_issues = self._validate_imports(cleaned_code)
+        import_issues = self._validate_imports(cleaned_code, tree)
         errors.extend(import_issues)
 
         # 7. Complexity warnings
         complexity_warnings = self._check_complexity(cleaned_code)
         warnings.extend(complexity_warnings)
 
-        # 8. Code quality suggestions
+        # 8. Per-call cost estimate (compared to the frame budget by the trainer's CostGate)
+        if tree is not None:
+            cost_warnings = self._estimate_cost(tree, metrics)
+            warnings.extend(cost_warnings)
+
+        # 9. Code quality suggestions
         quality_warnings = self._check_code_quality(cleaned_code)
         warnings.extend(quality_warnings)
 
@@ -176,23 +200,44 @@ class CodeValidator:
 
         return '\n'.join(cleaned_lines)
 
-    def _validate_syntax(self, code: str) -> Tuple[bool, Optional[str]]:
-        """Validate Python syntax"""
+    def _parse(self, code: str) -> Tuple[Optional[ast.Module], Optional[str]]:
+        """Parse code; returns (tree, None) or (None, syntax error)"""
         try:
-            ast.parse(code)
-            return True, None
+            return ast.parse(code), None
         except SyntaxError as e:
-            return False, f"Line {e.lineno}: {e.msg}"
+            return None, f"Line {e.lineno}: {e.msg}"
         except Exception as e:
-            return False, str(e)
+            return None, str(e)
+
+    def _validate_syntax(self, code: str) -> Tuple[bool, Optional[str]]:
+        """Validate Python syntax"""
+        tree, error = self._parse(code)
+        return tree is not None, error
+
+    def _security_regexes(self, ascii_code: bool):
+        """(match lower-cased code?, [(pattern, regex)]) for the current dangerous patterns"""
+        patterns = tuple(self.dangerous_patterns)
+        if self._compiled_patterns is None or self._compiled_patterns[0] != patterns:
+            self._compiled_patterns = (
+                patterns,
+                [(p, re.compile(p, re.IGNORECASE)) for p in patterns],
+                # Case-sensitive variants, only usable if no pattern has upper-case characters
+                [(p, re.compile(p)) for p in patterns] if all(p == p.lower() for p in patterns) else None,
+            )
+        if ascii_code and self._compiled_patterns[2] is not None:
+            return True, self._compiled_patterns[2]
+        return False, self._compiled_patterns[1]
 
     def _validate_security(self, code: str) -> List[str]:
         """Check for dangerous patterns"""
         issues = []
 
-        for pattern in self.dangerous_patterns:
-            matches = re.findall(pattern, code, re.IGNORECASE)
-            if matches:
+        # Lower-cased ASCII code matches exactly like IGNORECASE, and searches far faster
+        lowercase, regexes = self._security_regexes(code.isascii())
+        text = code.lower() if lowercase else code
+
+        for pattern, regex in regexes:
+            if regex.search(text):
                 issues.append(f"Dangerous pattern detected: {pattern}")
 
         return issues
@@ -207,14 +252,15 @@ class CodeValidator:
 
         return issues
 
-    def _validate_imports(self, code: str) -> List[str]:
+    def _validate_imports(self, code: str, tree: Optional[ast.Module] = None) -> List[str]:
         """Validate import statements"""
         issues = []
 
         try:
-            tree = ast.parse(code)
+            if tree is None:
+                tree = ast.parse(code)
 
-            for node in ast.walk(tree):
+            for node in _walk_statements(tree):
                 if isinstance(node, ast.Import):
                     for alias in node.names:
                         if alias.name not in self.allowed_imports:
@@ -266,6 +312,15 @@ class CodeValidator:
 
         return warnings
 
+    def _estimate_cost(self, tree: ast.Module, metrics: Dict) -> List[str]:
+        """Record the static per-call cost estimate and warn about costly constructs"""
+        # Imported here: cost_analysis depends on agent_cache, which imports this module
+        from cost_analysis import analyze_cost
+
+        cost = analyze_cost(tree)
+        metrics['estimated_call_ms'] = cost.estimated_ms
+        return [f"Per-call cost: {issue}" for issue in cost.issues]
+
     def _check_code_quality(self, code: str) -> List[str]:
         """Check code quality and readability"""
         warnings = []
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Per-Call Cost Analysis
+
+Estimates how long one get_action call of agent code takes, before the agent
+plays a game. A game runs at 60 FPS (16.7 ms per frame for physics and both
+agents), while SafeAgent's per-call timeout is a full second, so slow agents
+otherwise only show up as slow tournaments.
+
+- analyze_cost: static estimate from the AST of get_action and the module
+  functions it calls. Loops multiply their body's cost by their iteration
+  count (constant range bounds and literal sequences are exact; other
+  iterables are assumed to be state-sized), if statements take their most
+  expensive branch, and NumPy allocations add their element counts. Unbounded
+  while loops, large or data-dependent range bounds, heavy NumPy
+  allocations and recursion are reported as issues; unbounded loops and
+  recursion make the estimate infinite.
+- benchmark_call_cost: empirical micro-benchmark of the agent on sample states.
+- CostGate: rejects (or down-weights) agents whose estimated or measured cost
+  exceeds a frame budget, caching results by code hash.
+"""
+import io
+import ast
+import math
+import time
+import contextlib
+import numpy as np
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Set, Union
+
+from agent_cache import code_hash
+
+STATE_SIZE = 26                 # Iterations assumed for loops over the state or other runtime sequences
+WHILE_ITERATIONS = 100          # Iterations assumed for a while loop with a condition
+DATA_DEPENDENT_ITERATIONS = 100  # Iterations assumed for range() with a runtime bound
+LARGE_RANGE = 10000             # range() sizes reported as large
+LARGE_ARRAY = 100000            # NumPy allocation sizes (elements) reported as heavy
+NUMPY_CALL_OPERATIONS = 20      # Fixed overhead of a NumPy call, in operations
+
+# Calibrated on the archived LLM agents (benchmark_call_cost): SafeAgent adds a fixed overhead per call,
+# then roughly 12 ns per AST node evaluated on the worst path and 1 ns per array element
+CALL_OVERHEAD_NS = 3500.0
+NS_PER_OPERATION = 12.0
+NS_PER_ELEMENT = 1.0
+
+# NumPy functions whose cost is dominated by the array they allocate (first argument = shape)
+_NUMPY_ALLOCATORS = {'zeros', 'ones', 'empty', 'full', 'eye', 'identity', 'rand', 'randn', 'random',
+                     'uniform', 'normal', 'randint', 'arange', 'linspace', 'tile', 'repeat', 'outer'}
+_NUMPY_MODULES = {'np', 'numpy', 'random'}
+# Builtins whose cost is linear in their argument's length
+_LINEAR_BUILTINS = {'sum', 'min', 'max', 'sorted', 'any', 'all', 'list', 'tuple', 'set', 'dict'}
+
+
+@dataclass
+class CostEstimate:
+    """Static per-call cost of agent code"""
+    operations: float = 0.0      # AST node evaluations on the most expensive path
+    numpy_elements: float = 0.0  # Array elements allocated
+    issues: List[str] = field(default_factory=list)
+    unbounded: bool = False      # An unbounded loop or recursion can run indefinitely
+
+    @property
+    def estimated_ms(self) -> float:
+        if self.unbounded:
+            return math.inf
+        return (CALL_OVERHEAD_NS + self.operations * NS_PER_OPERATION + self.numpy_elements * NS_PER_ELEMENT) / 1e6
+
+
+def _constant_int(node: ast.AST) -> Optional[int]:
+    if isinstance(node, ast.Constant) and type(node.value) is int:
+        return node.value
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        value = _constant_int(node.operand)
+        return None if value is None else -value
+    return None
+
+
+def _call_name(node: ast.Call) -> str:
+    """Dotted name of the called function ('' if not a plain name/attribute chain)"""
+    parts = []
+    func = node.func
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if not isinstance(func, ast.Name):
+        return ''
+    parts.append(func.id)
+    return '.'.join(reversed(parts))
+
+
+def _exits(statements: List[ast.stmt]) -> bool:
+    """Whether a loop body can leave that loop (break, return or raise; nested loops' breaks don't count)"""
+    stack = list(statements)
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.Break, ast.Return, ast.Raise)):
+            return True
+        if not isinstance(node, (ast.For, ast.AsyncFor, ast.While, ast.FunctionDef, ast.AsyncFunctionDef,
+                                 ast.ClassDef, ast.Lambda)):
+            stack.extend(ast.iter_child_nodes(node))
+    return False
+
+
+class _CostAnalyzer:
+    """Walks get_action, descending into module-level functions it calls"""
+
+    def __init__(self, tree: ast.Module):
+        self.functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+        self.estimate = CostEstimate()
+        self._function_costs: Dict[str, float] = {}
+        self._stack: List[str] = []
+        self._reported: Set[str] = set()
+
+    def _issue(self, message: str):
+        if message not in self._reported:
+            self._reported.add(message)
+            self.estimate.issues.append(message)
+
+    def function_cost(self, name: str) -> float:
+        if name in self._stack:
+            self._issue(f"recursion: {name}() calls itself"
+                        + (f" via {' -> '.join(self._stack[self._stack.index(name) + 1:])}"
+                           if self._stack[-1] != name else ""))
+            self.estimate.unbounded = True
+            return 0.0
+        if name not in self._function_costs:
+            self._stack.append(name)
+            cost = self.block_cost(self.functions[name].body)
+            self._stack.pop()
+            self._function_costs[name] = cost
+        return self._function_costs[name]
+
+    def block_cost(self, statements: List[ast.stmt]) -> float:
+        return sum(self.statement_cost(statement) for statement in statements)
+
+    def statement_cost(self, node: ast.stmt) -> float:
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            iterations = self.iterations(node.iter)
+            return (self.expr_cost(node.iter) + iterations * (1 + self.block_cost(node.body))
+                    + self.block_cost(node.orelse))
+        if isinstance(node, ast.While):
+            test = node.test
+            always_true = isinstance(test, ast.Constant) and bool(test.value)
+            if always_true and not _exits(node.body):
+                self._issue(f"unbounded loop: `while {ast.unparse(test)}` (line {node.lineno}) never exits")
+                self.estimate.unbounded = True
+                return 0.0
+            self._issue(f"while loop without a static bound (line {node.lineno}), "
+                        f"assumed {WHILE_ITERATIONS} iterations")
+            return WHILE_ITERATIONS * (self.expr_cost(test) + self.block_cost(node.body)) + self.block_cost(node.orelse)
+        if isinstance(node, ast.If):
+            return self.expr_cost(node.test) + max(self.block_cost(node.body), self.block_cost(node.orelse))
+        if isinstance(node, ast.Try):
+            handlers = max((self.block_cost(handler.body) for handler in node.handlers), default=0.0)
+            return (self.block_cost(node.body) + handlers + self.block_cost(node.orelse)
+                    + self.block_cost(node.finalbody))
+        if isinstance(node, ast.With):
+            return sum(self.expr_cost(item.context_expr) for item in node.items) + self.block_cost(node.body)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            return 1.0  # Defining is cheap; calls are costed where they happen
+        if isinstance(node, (ast.Return, ast.Expr, ast.Assign, ast.AugAssign, ast.AnnAssign)):
+            return 1.0 + (self.expr_cost(node.value) if node.value is not None else 0.0)
+        return 1.0 + sum(self.expr_cost(child) for child in ast.iter_child_nodes(node)
+                         if isinstance(child, ast.expr))
+
+    def expr_cost(self, node: ast.AST) -> float:
+        # Fast paths for the node types agent code is mostly made of
+        kind = type(node)
+        if kind is ast.Name or kind is ast.Constant:
+            return 1.0
+        if kind is ast.Subscript:
+            return 1.0 + self.expr_cost(node.value) + self.expr_cost(node.slice)
+        if kind is ast.Compare:
+            return 1.0 + self.expr_cost(node.left) + sum(map(self.expr_cost, node.comparators))
+        if kind is ast.BinOp:
+            return 1.0 + self.expr_cost(node.left) + self.expr_cost(node.right)
+        if kind is ast.BoolOp:
+            return 1.0 + sum(map(self.expr_cost, node.values))
+        if kind is ast.UnaryOp or kind is ast.Attribute:
+            return 1.0 + self.expr_cost(node.operand if kind is ast.UnaryOp else node.value)
+        if kind is ast.Call:
+            return self.call_cost(node)
+
+        if isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            iterations = 1.0
+            cost = 0.0
+            for generator in node.generators:
+                cost += iterations * self.expr_cost(generator.iter)
+                iterations *= self.iterations(generator.iter)
+                cost += iterations * sum(self.expr_cost(condition) for condition in generator.ifs)
+            elements = ([node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt])
+            return 1.0 + cost + iterations * sum(self.expr_cost(element) for element in elements)
+        if isinstance(node, ast.Lambda):
+            return 1.0
+        return 1.0 + sum(self.expr_cost(child) for child in ast.iter_child_nodes(node)
+                         if isinstance(child, (ast.expr, ast.keyword)))
+
+    def call_cost(self, node: ast.Call) -> float:
+        cost = 1.0 + sum(self.expr_cost(arg) for arg in node.args) + sum(self.expr_cost(k.value) for k in node.keywords)
+        name = _call_name(node)
+        parts = name.split('.')
+
+        if name in self.functions:
+            return cost + self.function_cost(name)
+        if len(parts) > 1 and parts[0] in _NUMPY_MODULES:
+            cost += NUMPY_CALL_OPERATIONS
+            if parts[-1] in _NUMPY_ALLOCATORS:
+                self.estimate.numpy_elements += self._allocation_size(node, name)
+            return cost
+        if name in _LINEAR_BUILTINS and node.args:
+            return cost + self.iterations(node.args[0])
+        return cost
+
+    def _allocation_size(self, node: ast.Call, name: str) -> float:
+        """Elements allocated by a NumPy allocator call (reports heavy or runtime-sized ones)"""
+        function = name.split('.')[-1]
+        if function in ('arange', 'linspace'):
+            size = self._range_size(node.args, name) if function == 'arange' else (
+                _constant_int(node.args[2]) if len(node.args) > 2 else 50)
+        elif function == 'outer':
+            return STATE_SIZE * STATE_SIZE
+        else:
+            shape = node.args[0] if node.args else next(
+                (k.value for k in node.keywords if k.arg in ('size', 'shape')), None)
+            size = 1 if shape is None else self._shape_size(shape)
+        if size is None:
+            self._issue(f"NumPy allocation with a runtime size: {name}() (line {node.lineno})")
+            return float(STATE_SIZE)
+        if size > LARGE_ARRAY:
+            self._issue(f"heavy NumPy allocation: {name}() of {size:,} elements (line {node.lineno})")
+        return float(size)
+
+    def _shape_size(self, shape: ast.AST) -> Optional[int]:
+        if isinstance(shape, (ast.Tuple, ast.List)):
+            sizes = [self._shape_size(element) for element in shape.elts]
+            return None if None in sizes else math.prod(sizes)
+        value = _constant_int(shape)
+        if value is not None:
+            return max(0, value)
+        if isinstance(shape, ast.Call) and _call_name(shape) == 'len':
+            return STATE_SIZE
+        return None
+
+    def _range_size(self, args: List[ast.expr], name: str) -> Optional[int]:
+        values = [_constant_int(arg) for arg in args]
+        if None in values or not values:
+            return None
+        try:
+            return len(range(*values))
+        except (TypeError, ValueError):
+            return 0
+
+    def iterations(self, node: ast.AST) -> float:
+        """Times a loop over node runs"""
+        if isinstance(node, ast.Call):
+            name = _call_name(node)
+            if name == 'range' or name.endswith('.arange'):
+                size = self._range_size(node.args, name)
+                if size is None:
+                    if all(_constant_int(arg) is not None or
+                           (isinstance(arg, ast.Call) and _call_name(arg) == 'len') for arg in node.args):
+                        return float(STATE_SIZE)  # range(len(x)): as long as a runtime sequence
+                    self._issue(f"range() bound depends on runtime data (line {node.lineno}), "
+                                f"assumed {DATA_DEPENDENT_ITERATIONS} iterations")
+                    return float(DATA_DEPENDENT_ITERATIONS)
+                if size > LARGE_RANGE:
+                    self._issue(f"large range(): {size:,} iterations (line {node.lineno})")
+                return float(size)
+            if name in ('enumerate', 'reversed', 'sorted', 'zip', 'list', 'tuple') and node.args:
+                return min(self.iterations(arg) for arg in node.args)
+            return float(STATE_SIZE)
+        if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+            return float(len(node.elts))
+        if isinstance(node, ast.Dict):
+            return float(len(node.keys))
+        if isinstance(node, ast.Constant) and isinstance(node.value, (str, bytes, tuple)):
+            return float(len(node.value))
+        return float(STATE_SIZE)
+
+
+def analyze_cost(code: Union[str, ast.Module]) -> CostEstimate:
+    """
+    Static per-call cost of agent code
+
+    Args:
+        code: Agent code, or its parsed module
+
+    Returns:
+        CostEstimate of one get_action call (empty if the code doesn't parse or has no get_action)
+    """
+    if isinstance(code, str):
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return CostEstimate()
+    else:
+        tree = code
+    analyzer = _CostAnalyzer(tree)
+    if 'get_action' in analyzer.functions:
+        analyzer.estimate.operations = analyzer.function_cost('get_action')
+    return analyzer.estimate
+
+
+def benchmark_call_cost(code: str, states: np.ndarray, timeout_seconds: float = 1.0,
+                        budget_ms: Optional[float] = None, cache=None) -> Dict[str, float]:
+    """
+    Time get_action calls on sample states
+
+    Args:
+        code: Validated agent code
+        states: (n, 26) sample observations, one call each (after one warm-up call)
+        timeout_seconds: Per-call timeout
+        budget_ms: Stop early once calls have clearly exceeded this per-call budget
+        cache: Compiled code cache (None = the process-wide cache)
+
+    Returns:
+        calls, mean_ms, p95_ms and max_ms of the measured calls
+    """
+    from safe_execution import SafeAgent
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = SafeAgent("cost_benchmark", code, timeout_seconds, seed=0, cache=cache)
+        agent.get_action(states[0])
+        times = []
+        for state in states:
+            start = time.perf_counter()
+            agent.get_action(state)
+            times.append(time.perf_counter() - start)
+            # A few calls at several times the budget settle it
+            if budget_ms is not None and len(times) >= 5 and 1000 * np.mean(times) > 4 * budget_ms:
+                break
+
+    times_ms = 1000 * np.array(times)
+    return {
+        'calls': len(times),
+        'mean_ms': float(times_ms.mean()),
+        'p95_ms': float(np.percentile(times_ms, 95)),
+        'max_ms': float(times_ms.max()),
+    }
+
+
+@dataclass
+class CostCheck:
+    """An agent's estimated and measured per-call cost against the frame budget"""
+    agent_id: str
+    estimated_ms: float
+    measured_ms: Optional[float]  # 95th percentile on the sample states (None if not benchmarked)
+    issues: List[str] = field(default_factory=list)
+    over_budget: bool = False
+    weight: float = 1.0           # Fitness multiplier for down-weighting, budget / cost (capped at 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class CostGate:
+    """
+    Checks agents' per-call cost against a frame budget, statically and on sample states
+    """
+
+    def __init__(self, frame_budget_ms: float = 1.0, states: Optional[np.ndarray] = None,
+                 sample_states: int = 64, timeout_seconds: float = 1.0, seed: int = 0, cache=None):
+        """
+        Initialize the gate
+
+        Args:
+            frame_budget_ms: Per-call cost an agent may have
+            states: Sample states to time agents on (default: a small probe bank from real games)
+            sample_states: Size of the default sample
+            timeout_seconds: Per-call timeout while benchmarking
+            seed: Seed for the default sample
+            cache: Compiled code cache for the agents (None = the process-wide cache)
+        """
+        self.frame_budget_ms = frame_budget_ms
+        self.states = states
+        self.sample_states = sample_states
+        self.timeout_seconds = timeout_seconds
+        self.seed = seed
+        self.cache = cache
+        self.results: Dict[str, CostCheck] = {}  # Code hash -> check
+
+        self.checked = 0
+        self.reused = 0
+        self.over_budget = 0
+        self.time = 0.0
+        self._over: List[CostCheck] = []
+
+    def _get_states(self) -> np.ndarray:
+        if self.states is None:
+            from fingerprints import build_probe_bank
+            self.states = build_probe_bank(self.sample_states, self.seed)
+        return self.states
+
+    def check(self, agent_id: str, code: str) -> CostCheck:
+        """
+        Estimate (and, if the estimate is within budget, measure) an agent's per-call cost
+
+        Args:
+            agent_id: Agent to report the check for
+            code: Validated agent code
+
+        Returns:
+            CostCheck; over_budget is True if either cost exceeds the frame budget
+        """
+        key = code_hash(code)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.reused += 1
+            result = CostCheck(**{**cached.to_dict(), 'agent_id': agent_id, 'issues': list(cached.issues)})
+        else:
+            start = time.perf_counter()
+            result = self._check(agent_id, code)
+            self.results[key] = result
+            self.checked += 1
+            self.time += time.perf_counter() - start
+
+        if result.over_budget:
+            self.over_budget += 1
+            self._over.append(result)
+        return result
+
+    def _check(self, agent_id: str, code: str) -> CostCheck:
+        estimate = analyze_cost(code)
+        result = CostCheck(agent_id, estimate.estimated_ms, None, list(estimate.issues))
+
+        # Agents already over budget on paper aren't run (an unbounded loop would use the full timeout)
+        if estimate.estimated_ms <= self.frame_budget_ms:
+            measured = benchmark_call_cost(code, self._get_states(), self.timeout_seconds,
+                                           self.frame_budget_ms, self.cache)
+            result.measured_ms = measured['p95_ms']
+
+        cost = max(result.estimated_ms, result.measured_ms or 0.0)
+        result.over_budget = cost > self.frame_budget_ms
+        result.weight = 1.0 if not result.over_budget else self.frame_budget_ms / cost
+        if result.over_budget:
+            if math.isinf(result.estimated_ms):
+                result.issues.append("per-call cost has no static bound")
+            elif result.estimated_ms > self.frame_budget_ms:
+                result.issues.append(f"estimated {result.estimated_ms:.3g}ms per call > "
+                                     f"{self.frame_budget_ms:g}ms budget")
+            else:
+                result.issues.append(f"measured {result.measured_ms:.3g}ms per call (p95) > "
+                                     f"{self.frame_budget_ms:g}ms budget")
+        return result
+
+    def take_report(self) -> Dict[str, Any]:
+        """Counts, time and over-budget agents since the last report (then starts a new one)"""
+        report = {
+            'checked': self.checked,
+            'reused': self.reused,
+            'over_budget': self.over_budget,
+            'seconds': round(self.time, 3),
+            'over_budget_agents': {check.agent_id: check.issues for check in self._over},
+        }
+        self.checked = self.reused = self.over_budget = 0
+        self.time = 0.0
+        self._over = []
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'checked': self.checked, 'reused': self.reused, 'over_budget': self.over_budget,
+                'time': self.time}
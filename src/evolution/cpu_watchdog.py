@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+CPU-Time Watchdog for Agent Execution
+
+Enforces cumulative CPU-time budgets on agent code without touching signals,
+so it works on any thread of any process.
+
+Each agent owns a CPUBudget. Entering and leaving agent code only stores a
+few attributes and reads the calling thread's CPU clock; nothing is armed or
+cancelled per call. A single daemon thread per process polls the budgets
+that are currently inside agent code, reads the owning thread's CPU clock,
+and raises the budget's exception in that thread once the call has used up
+its share. Budgets are reset once per game (or per batch of decisions).
+
+Like a signal handler, the exception is delivered between bytecodes, so a
+single long-running C call (e.g. time.sleep or a huge numpy operation) is
+only interrupted once it returns. Agent code that swallows the exception
+(a bare `except:`) is interrupted again every REFIRE_SECONDS of CPU time
+until the call ends, and end() discards an exception still pending when
+the call returns, so it cannot land in the caller's code.
+"""
+import os
+import time
+import ctypes
+import threading
+import weakref
+from typing import Optional
+
+if hasattr(time, 'pthread_getcpuclockid'):
+    # CPU time of the calling thread, and of any other thread by id
+    _call_clock = time.thread_time
+
+    def _thread_cpu_time(thread_id: int) -> float:
+        return time.clock_gettime(time.pthread_getcpuclockid(thread_id))
+else:
+    # No per-thread CPU clocks readable from another thread (Windows): fall back to wall time
+    _call_clock = time.perf_counter
+
+    def _thread_cpu_time(thread_id: int) -> float:
+        return time.perf_counter()
+
+
+_get_ident = threading.get_ident
+
+# CPU seconds a call may keep running after an interrupt before it is interrupted again
+REFIRE_SECONDS = 0.05
+
+
+def _raise_in_thread(thread_id: int, exception: type) -> bool:
+    """Asynchronously raise exception in the given thread"""
+    return ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_ulong(thread_id), ctypes.py_object(exception)) == 1
+
+
+def _clear_pending(thread_id: int):
+    """Discard an asynchronous exception not yet delivered to the given thread"""
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+
+
+class CPUBudget:
+    """
+    Cumulative CPU-time budget for one agent
+
+    call_seconds caps any single call; total_seconds caps the sum of all
+    calls since the last reset() (None = no cumulative cap).
+    """
+
+    def __init__(self, call_seconds: float = 1.0, total_seconds: Optional[float] = None,
+                 exception: type = TimeoutError, watchdog: Optional['CPUWatchdog'] = None):
+        self.call_seconds = call_seconds
+        self.total_seconds = total_seconds
+        self.exception = exception
+        self.used = 0.0
+
+        self._watchdog = watchdog
+        self._registered = False
+        self._lock = threading.Lock()
+
+        # State of the call in progress, read by the watchdog thread
+        self._start = None
+        self._limit = 0.0
+        self._thread = None
+        self._fired_at = None  # CPU seconds into the call of the last interrupt (None = not interrupted)
+
+    @property
+    def interrupted(self) -> bool:
+        """Whether the last call was interrupted (even if the agent swallowed the exception)"""
+        return self._fired_at is not None
+
+    @property
+    def remaining(self) -> float:
+        """CPU seconds left before the cumulative budget is spent"""
+        if self.total_seconds is None:
+            return float('inf')
+        return max(0.0, self.total_seconds - self.used)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.remaining <= 0.0
+
+    def reset(self, total_seconds: Optional[float] = None):
+        """Start a new budget period (e.g. a new game), optionally with a new cumulative cap"""
+        if total_seconds is not None:
+            self.total_seconds = total_seconds
+        self.used = 0.0
+
+    def begin(self) -> bool:
+        """
+        Mark the calling thread as running agent code
+
+        Returns:
+            False if the cumulative budget is already spent (the call should not run)
+        """
+        # Hot path: runs once per agent decision, so no properties or syscalls beyond the clock read
+        limit = self.call_seconds
+        if self.total_seconds is not None:
+            remaining = self.total_seconds - self.used
+            if remaining <= 0.0:
+                return False
+            if remaining < limit:
+                limit = remaining
+        if not self._registered:
+            (self._watchdog or get_watchdog()).add(self)
+            self._registered = True
+
+        self._limit = limit
+        self._thread = _get_ident()
+        self._fired_at = None
+        self._start = _call_clock()
+        return True
+
+    def end(self) -> float:
+        """
+        Mark the end of agent code and charge its CPU time to the budget
+
+        Safe to call twice; returns the CPU seconds charged by this call.
+        """
+        now = _call_clock()
+        with self._lock:
+            start = self._start
+            self._start = None
+            if self._fired_at is not None:
+                _clear_pending(self._thread)
+        if start is None:
+            return 0.0
+        elapsed = now - start
+        self.used += elapsed
+        return elapsed
+
+
+class CPUWatchdog:
+    """
+    One background thread per process that interrupts calls over their budget
+    """
+
+    def __init__(self, poll_interval: float = 0.005):
+        """
+        Args:
+            poll_interval: Seconds between checks; timeouts fire at most this late
+                           (plus the interpreter's thread switch interval)
+        """
+        self.poll_interval = poll_interval
+        self._budgets = weakref.WeakSet()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+
+    def add(self, budget: CPUBudget):
+        """Start watching a budget (kept until the budget is garbage collected)"""
+        self._budgets.add(budget)
+        self._ensure_running()
+
+    def _ensure_running(self):
+        # Threads do not survive fork, so a forked child starts its own
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='agent-watchdog', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.poll_interval)
+            self.check()
+
+    def check(self) -> int:
+        """
+        Interrupt every call that has used up its CPU allowance
+
+        Returns:
+            Number of calls interrupted
+        """
+        fired = 0
+        for budget in list(self._budgets):
+            start = budget._start
+            if start is None:
+                continue
+            try:
+                used = _thread_cpu_time(budget._thread) - start
+            except OSError:
+                continue  # Thread exited between the check and the clock read
+            fired_at = budget._fired_at
+            if used <= budget._limit or (fired_at is not None and used - fired_at <= REFIRE_SECONDS):
+                continue
+
+            # Only interrupt if the same call is still running; end() clears _start under this lock.
+            # A call still running REFIRE_SECONDS after an interrupt swallowed it, so it is interrupted again
+            with budget._lock:
+                if budget._start is start and budget._fired_at is fired_at:
+                    budget._fired_at = used
+                    fired += _raise_in_thread(budget._thread, budget.exception)
+        return fired
+
+
+_watchdog = None
+
+
+def get_watchdog() -> CPUWatchdog:
+    """Process-wide watchdog shared by all budgets"""
+    global _watchdog
+    if _watchdog is None:
+        _watchdog = CPUWatchdog()
+    return _watchdog
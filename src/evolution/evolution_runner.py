@@ -8,6 +8,7 @@ to create a complete evolutionary training pipeline for fighting game AI.
 import os
 import sys
 import time
+import random
 import argparse
 import math
 from typing import List, Dict, Any, Optional
@@ -20,13 +21,25 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'training'))
 
 # Import all evolutionary components
 from swiss_tournament import SwissTournament
-from match_runner import MatchRunner, RuleBasedMatchRunner, create_rule_based_opponents
+from match_runner import create_rule_based_opponents
+from parallel_matches import ParallelMatchExecutor
+from payoff_matrix import PayoffMatrix
+from ratings import RatingStore
 from code_validator import CodeValidator
 from safe_execution import SafeAgent, AgentPool
 from prompt_templates import PromptTemplateManager, PromptContext
 from hall_of_fame import HallOfFame
 from experiment_manager import ExperimentManager, ExperimentConfig
 from agent_serialization import AgentSerializer
+from agent_cache import CompiledAgentCache
+from generation_pipeline import (GenerationPipeline, GenerationRequest, AnthropicClient,
+                                 SyncClientAdapter, StubLLMClient)
+from llm_cache import LLMResponseCache, CachedLLMClient
+from ast_variation import ASTVariation
+from fingerprints import FingerprintStore, find_duplicates
+from surrogate import FitnessSurrogate, screening_report
+from qualifier import Qualifier
+from cost_analysis import CostGate
 
 class EvolutionaryTrainer:
     """
@@ -48,9 +61,16 @@ class EvolutionaryTrainer:
 
         # Initialize core components
         self.experiment_manager = ExperimentManager(experiment_name, config)
+
+        # Glicko ratings shared by all experiments (experiments/ratings.json)
+        self.ratings = None
+        if config.track_ratings:
+            self.ratings = RatingStore.for_experiment(self.experiment_manager.experiment_dir)
+
         self.hall_of_fame = HallOfFame(
             self.experiment_manager.experiment_dir,
-            max_agents=config.max_agents_hall_of_fame
+            max_agents=config.max_agents_hall_of_fame,
+            ratings=self.ratings
         )
         self.agent_serializer = AgentSerializer(
             os.path.join(self.experiment_manager.experiment_dir, "agent_archive")
@@ -58,16 +78,72 @@ class EvolutionaryTrainer:
 
         # Initialize validation and execution
         self.code_validator = CodeValidator(config.max_lines, config.max_chars)
-        self.agent_pool = AgentPool()
+        # Validation and compilation are cached by code hash, so elites are not re-parsed every generation
+        if config.persist_agent_cache:
+            self.agent_cache = CompiledAgentCache.for_experiment(self.experiment_manager.experiment_dir)
+        else:
+            self.agent_cache = CompiledAgentCache()
+        self.agent_pool = AgentPool(self.agent_cache)
         self.prompt_manager = PromptTemplateManager(config.max_lines, config.max_chars)
-
-        # Initialize match running
-        self.match_runner = MatchRunner(config.games_per_match, config.timeout_seconds)
-        self.rule_based_opponents = create_rule_based_opponents()
-        self.rule_based_runner = RuleBasedMatchRunner(
-            self.rule_based_opponents,
-            config.games_per_match
+        # Local mutation/crossover of agent code, as an alternative to LLM variation
+        self.ast_variation = ASTVariation(self.code_validator, seed=config.seed)
+
+        # Initialize match running (matches within a phase are independent and run in parallel)
+        # Results are cached per code pair, so unchanged pairings are not replayed each generation
+        self.payoff_matrix = None
+        if config.reuse_match_results:
+            self.payoff_matrix = PayoffMatrix(
+                os.path.join(self.experiment_manager.experiment_dir, "payoff_matrix.json"))
+        self.match_executor = ParallelMatchExecutor(
+            config.match_workers,
+            config.games_per_match,
+            config.timeout_seconds,
+            action_repeat=config.action_repeat,
+            seed=config.seed,
+            isolate_agents=config.isolate_agents,
+            payoff_matrix=self.payoff_matrix,
+            early_stopping=config.early_stopping,
+            stopping_error=config.stopping_error,
+            stopping_margin=config.stopping_margin,
+            ratings=self.ratings
         )
+        self.rule_based_opponents = create_rule_based_opponents()
+
+        # Per-call cost of agent code against the frame budget, estimated from the AST and timed on sample states
+        self.cost_gate = None
+        if config.cost_policy != 'off':
+            self.cost_gate = CostGate(
+                config.frame_budget_ms,
+                sample_states=config.cost_sample_states,
+                timeout_seconds=config.timeout_seconds,
+                seed=config.seed or 0,
+                cache=self.agent_cache
+            )
+
+        # Short games that reject erroring, slow or single-action agents before they join the population
+        self.qualifier = None
+        if config.qualify_agents:
+            self.qualifier = Qualifier(
+                config.qualifier_frames,
+                max_error_rate=config.qualifier_max_error_rate,
+                max_latency_ms=config.qualifier_max_latency_ms,
+                min_entropy=config.qualifier_min_entropy,
+                action_repeat=config.action_repeat,
+                timeout_seconds=config.timeout_seconds,
+                seed=config.seed or 0,
+                cache=self.agent_cache
+            )
+
+        # Behavior fingerprints by code hash (fingerprints.npz); the probe bank is loaded on first use
+        self.fingerprints = None
+        # Fitness predictions for screening candidates (created on first use)
+        self.surrogate = None
+        self.surrogate_stats = None
+
+        # Agent generation (LLM client created on first use; set claude_client to use your own)
+        self.claude_client = None
+        self.generation_pipeline = None
+        self.llm_cache = None
 
         # Evolution state
         self.current_generation = 0
@@ -78,6 +154,7 @@ class EvolutionaryTrainer:
         print(f"   Population: {config.population_size}")
         print(f"   Generations: {config.generations}")
         print(f"   Swiss Rounds: {config.swiss_rounds}")
+        print(f"   Match Workers: {self.match_executor.num_workers}")
 
     def run_evolution(self) -> List[Dict[str, Any]]:
         """
@@ -89,6 +166,11 @@ class EvolutionaryTrainer:
         print(f"\n🚀 Starting evolutionary training")
         start_time = time.time()
 
+        # Selection and first-round pairings use the global RNG; seeding it makes a rerun
+        # issue the same prompts in the same order, so it replays from the LLM cache
+        if self.config.seed is not None:
+            random.seed(self.config.seed)
+
         try:
             # Create initial population
             self._create_initial_population()
@@ -134,16 +216,16 @@ class EvolutionaryTrainer:
             self.experiment_manager._log(f"Evolution failed: {e}")
             return []
 
+        finally:
+            self.match_executor.close()
+            if self.fingerprints is not None:
+                self.fingerprints.close()
+
     def _create_initial_population(self):
         """Create the initial population of agents"""
         print(f"\n🧬 Creating initial population ({self.config.population_size} agents)")
 
-        # Import Claude API
-        try:
-            from anthropic import Anthropic
-            self.claude_client = Anthropic(api_key=self.anthropic_api_key)
-        except ImportError:
-            raise RuntimeError("Anthropic library not installed. Run: pip install anthropic")
+        pipeline = self._get_generation_pipeline()
 
         # Create diverse fighting styles
         fighting_styles = [
@@ -151,77 +233,123 @@ class EvolutionaryTrainer:
             'rushdown', 'counter_puncher', 'hit_and_run', 'pressure_fighter', 'patient_defender'
         ]
 
-        created_count = 0
-        attempts = 0
-        max_attempts = self.config.population_size * 3  # Allow multiple attempts
+        def make_request(i: int) -> GenerationRequest:
+            return self._build_request(fighting_styles[i % len(fighting_styles)], generation=0)
 
-        while created_count < self.config.population_size and attempts < max_attempts:
-            attempts += 1
-
-            # Select fighting style
-            style = fighting_styles[created_count % len(fighting_styles)]
-
-            # Generate agent code
-            agent_code = self._generate_agent_code(style, generation=0)
-
-            if agent_code:
-                agent_id = f"gen0_agent_{created_count:03d}"
+        def accept(request: GenerationRequest, agent_code: str) -> bool:
+            # Validate and create agent as soon as its code arrives
+            agent_id = f"gen0_agent_{len(self.population):03d}"
+            if not self._create_and_validate_agent(agent_id, agent_code, request.fighting_style, generation=0):
+                return False
+            if len(self.population) % 5 == 0:
+                print(f"   Created {len(self.population)}/{self.config.population_size} agents")
+            return True
 
-                # Validate and create agent
-                if self._create_and_validate_agent(agent_id, agent_code, style, generation=0):
-                    created_count += 1
-                    if created_count % 5 == 0:
-                        print(f"   Created {created_count}/{self.config.population_size} agents")
+        max_attempts = self.config.population_size * 3  # Allow multiple attempts
+        pipeline.run(make_request, accept, self.config.population_size, max_attempts)
 
         print(f"✅ Initial population created: {len(self.population)} agents")
+        self._print_generation_stats()
+        self._print_qualifier_stats()
 
         if len(self.population) < self.config.population_size // 2:
             raise RuntimeError(f"Failed to create sufficient initial population: {len(self.population)}")
 
-    def _generate_agent_code(self, fighting_style: str, generation: int,
-                           parent_codes: List[str] = None) -> Optional[str]:
-        """Generate agent code using Claude API"""
-        try:
-            context = PromptContext(
-                fighting_style=fighting_style,
-                generation=generation,
-                parent_codes=parent_codes or []
-            )
-
-            prompt = self.prompt_manager.generate_agent_prompt(context)
-
-            response = self.claude_client.messages.create(
-                model=self.config.anthropic_model,
-                max_tokens=2000,
-                messages=[{"role": "user", "content": prompt}]
+    def _get_generation_pipeline(self) -> GenerationPipeline:
+        """Concurrent LLM generation pipeline, created with its client on first use"""
+        if self.generation_pipeline is None:
+            if self.claude_client is not None:
+                client = SyncClientAdapter(self.claude_client, self.config.anthropic_model)
+            elif self.config.llm_backend == 'stub':
+                client = StubLLMClient(seed=self.config.seed or 0)
+            elif self.config.llm_replay_only:
+                client = None  # Every response must come from the cache
+            else:
+                client = AnthropicClient(self.anthropic_api_key, self.config.anthropic_model)
+
+            # Responses of seeded runs are cached by prompt, model, sampling parameters and seed
+            # (experiments/llm_cache); unseeded runs always sample fresh responses
+            if self.config.llm_replay_only and self.config.seed is None:
+                raise ValueError("llm_replay_only needs the seed of the run to replay")
+            if ((self.config.cache_llm_responses or self.config.llm_replay_only)
+                    and self.config.seed is not None and self.config.llm_backend != 'stub'):
+                self.llm_cache = LLMResponseCache.for_experiment(self.experiment_manager.experiment_dir)
+                client = CachedLLMClient(client, self.llm_cache, self.config.anthropic_model,
+                                         {'max_tokens': 2000, 'seed': self.config.seed},
+                                         replay_only=self.config.llm_replay_only)
+
+            self.generation_pipeline = GenerationPipeline(
+                client,
+                max_concurrency=self.config.llm_concurrency,
+                max_retries=self.config.llm_max_retries,
+                seed=self.config.seed or 0
             )
+        return self.generation_pipeline
+
+    def _build_request(self, fighting_style: str, generation: int,
+                       parent_codes: List[str] = None) -> GenerationRequest:
+        """Prompt the LLM for one agent"""
+        context = PromptContext(
+            fighting_style=fighting_style,
+            generation=generation,
+            parent_codes=parent_codes or []
+        )
+        return GenerationRequest(
+            prompt=self.prompt_manager.generate_agent_prompt(context),
+            fighting_style=fighting_style,
+            generation=generation,
+            parent_codes=parent_codes or []
+        )
 
-            code = response.content[0].text.strip()
-
-            # Clean up code (remove markdown if present)
-            if "```python" in code:
-                code = code.split("```python")[1].split("```")[0].strip()
-            elif "```" in code:
-                code = code.split("```")[1].strip()
-
-            return code
-
-        except Exception as e:
-            print(f"⚠️  Failed to generate agent code: {e}")
-            return None
+    def _print_generation_stats(self):
+        stats = self.generation_pipeline.get_stats()
+        print(f"   LLM requests: {stats['requests']} total, {stats['retries']} retries, "
+              f"{stats['failed']} failed, {stats['rejected']} rejected "
+              f"({stats['wall_time']:.1f}s generating)")
+        if self.llm_cache is not None:
+            cache_stats = self.llm_cache.get_stats()
+            print(f"   LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+    def _print_qualifier_stats(self):
+        if self.cost_gate is not None:
+            stats = self.cost_gate.get_stats()
+            print(f"   Cost gate: {stats['over_budget']} over the {self.config.frame_budget_ms:g}ms frame budget, "
+                  f"{stats['checked']} checked, {stats['reused']} reused ({stats['time']:.2f}s)")
+        if self.qualifier is not None:
+            stats = self.qualifier.get_stats()
+            print(f"   Qualifier: {stats['rejected']} rejected, {stats['tested']} tested, "
+                  f"{stats['reused']} reused ({stats['time']:.2f}s)")
 
     def _create_and_validate_agent(self, agent_id: str, code: str, fighting_style: str,
                                   generation: int) -> bool:
         """Create and validate an agent"""
         # Validate code
-        validation_result = self.code_validator.validate_code(code, agent_id)
+        validation_result = self.agent_cache.validate(self.code_validator, code, agent_id)
 
         if not validation_result.is_valid:
             return False
 
+        # Agents over the frame budget are rejected, or kept with a fitness weight (cost_policy)
+        cost_weight = 1.0
+        if self.cost_gate is not None:
+            check = self.cost_gate.check(agent_id, validation_result.cleaned_code)
+            if check.over_budget:
+                if self.config.cost_policy == 'reject':
+                    print(f"   🐢 {agent_id} over frame budget: {'; '.join(check.issues)}")
+                    return False
+                cost_weight = check.weight
+
+        # Fast-fail battery against idle, random and easy opponents
+        if self.qualifier is not None:
+            result = self.qualifier.qualify(agent_id, validation_result.cleaned_code)
+            if not result.passed:
+                print(f"   🚫 {agent_id} failed qualifier: {'; '.join(result.reasons)}")
+                return False
+
         # Create safe agent
         success = self.agent_pool.add_agent(agent_id, validation_result.cleaned_code,
-                                          self.config.timeout_seconds)
+                                          self.config.timeout_seconds,
+                                          cpu_budget_seconds=self.config.cpu_budget_seconds)
 
         if success:
             agent = self.agent_pool.get_agent(agent_id)
@@ -229,6 +357,7 @@ class EvolutionaryTrainer:
             agent.fighting_style = fighting_style
             agent.generation = generation
             agent.code = validation_result.cleaned_code
+            agent.cost_weight = cost_weight
 
             self.population.append(agent)
             return True
@@ -240,19 +369,26 @@ class EvolutionaryTrainer:
         print(f"\n⚔️  Evaluating Generation {self.current_generation}")
 
         valid_agents = [agent for agent in self.population if agent.is_valid]
+        if self.config.dedupe_agents and len(valid_agents) > 2:
+            valid_agents = self._collapse_duplicates(valid_agents)
+
+        self.surrogate_stats = None
+        screening = None
+        if self.config.surrogate_screening and len(valid_agents) > 2:
+            valid_agents, screening = self._screen_candidates(valid_agents)
 
         if len(valid_agents) < 2:
             print(f"❌ Insufficient valid agents for evaluation: {len(valid_agents)}")
             return
+        evaluation_start = time.time()
 
         # Phase 1: Swiss tournament among peers
         print(f"   Phase 1: Swiss tournament ({len(valid_agents)} agents)")
-        tournament = SwissTournament(valid_agents, rounds=self.config.swiss_rounds)
-
-        def tournament_match_runner(agent1, agent2):
-            return self.match_runner.run_match(agent1, agent2)
+        tournament = SwissTournament(valid_agents, rounds=self.config.swiss_rounds, ratings=self.ratings)
 
-        tournament_rankings = tournament.run_tournament(tournament_match_runner)
+        tournament_rankings = tournament.run_tournament(self.match_executor.run_match,
+                                                        self.match_executor.run_matches)
+        self.experiment_manager.save_tournament_store(self.current_generation, tournament.results)
 
         # Phase 2: Evaluate top performers against rule-based opponents
         print(f"   Phase 2: Rule-based evaluation")
@@ -260,9 +396,9 @@ class EvolutionaryTrainer:
         top_agents = [agent for agent_id, standing in tournament_rankings[:top_count]
                      for agent in valid_agents if agent.agent_id == agent_id]
 
-        for agent in top_agents:
-            rule_based_results = self.rule_based_runner.evaluate_agent_vs_rule_based(agent)
+        all_rule_based_results = self.match_executor.evaluate_vs_rule_based(top_agents, self.rule_based_opponents)
 
+        for agent, rule_based_results in zip(top_agents, all_rule_based_results):
             # Combine tournament and rule-based fitness
             tournament_fitness = next(standing.avg_fitness for agent_id, standing in tournament_rankings
                                     if agent_id == agent.agent_id)
@@ -275,10 +411,15 @@ class EvolutionaryTrainer:
 
         # Phase 3: Quick evaluation for remaining agents
         remaining_agents = [agent for agent in valid_agents if agent not in top_agents]
-        for agent in remaining_agents:
-            # Lighter evaluation against one rule-based opponent
-            if self.rule_based_opponents:
-                match_result = self.match_runner.run_match(agent, self.rule_based_opponents[0])
+        # Lighter evaluation against one rule-based opponent
+        if self.rule_based_opponents:
+            quick_results = self.match_executor.run_matches(
+                [(agent, self.rule_based_opponents[0]) for agent in remaining_agents])
+        else:
+            quick_results = [None] * len(remaining_agents)
+
+        for agent, match_result in zip(remaining_agents, quick_results):
+            if match_result is not None:
                 agent.fitness = match_result.agent1_fitness
                 agent.win_rate = match_result.agent1_score
                 agent.avg_reward = match_result.agent1_fitness
@@ -287,6 +428,19 @@ class EvolutionaryTrainer:
                 agent.win_rate = 0.0
                 agent.avg_reward = 0.0
 
+        # Down-weight agents over the frame budget (cost_policy 'penalize')
+        for agent in valid_agents:
+            weight = getattr(agent, 'cost_weight', 1.0)
+            if weight < 1.0:
+                agent.fitness -= abs(agent.fitness) * (1.0 - weight)
+
+        if self.payoff_matrix is not None:
+            print(f"   Matches: {self.match_executor.matches_played} played, "
+                  f"{self.match_executor.matches_reused} reused from payoff matrix (total)")
+
+        if self.config.surrogate_screening:
+            self._record_surrogate_results(valid_agents, screening, time.time() - evaluation_start)
+
         # Sort population by fitness
         self.population.sort(key=lambda x: getattr(x, 'fitness', 0), reverse=True)
 
@@ -300,12 +454,144 @@ class EvolutionaryTrainer:
             print(f"      Avg fitness:  {avg_fitness:.2f}")
             print(f"      Valid agents: {len(valid_agents)}/{len(self.population)}")
 
+    def _get_fingerprints(self) -> FingerprintStore:
+        """Fingerprint store, probing agents in sandbox host processes"""
+        if self.fingerprints is None:
+            self.fingerprints = FingerprintStore.for_experiment(
+                self.experiment_manager.experiment_dir,
+                self.config.probe_bank_size,
+                num_workers=max(1, self.config.match_workers),
+                timeout_seconds=self.config.timeout_seconds,
+                seed=self.config.seed or 0
+            )
+        return self.fingerprints
+
+    def _collapse_duplicates(self, agents: List[SafeAgent]) -> List[SafeAgent]:
+        """
+        Remove agents that behave like an earlier agent on the probe bank
+
+        Args:
+            agents: Valid agents, in order of preference (elites come first)
+
+        Returns:
+            The agents that were kept
+        """
+        store = self._get_fingerprints()
+        duplicate_of = find_duplicates(store.get_fingerprints([agent.code for agent in agents]),
+                                       self.config.dedupe_threshold)
+        store.save()
+
+        kept = [agent for agent, original in zip(agents, duplicate_of) if original < 0]
+        if len(kept) < 2:
+            return agents
+
+        duplicates = [(agent, agents[original]) for agent, original in zip(agents, duplicate_of) if original >= 0]
+        for agent, original in duplicates:
+            self.agent_pool.remove_agent(agent.agent_id)
+        dropped = {id(agent) for agent, _ in duplicates}
+        self.population = [agent for agent in self.population if id(agent) not in dropped]
+
+        stats = store.get_stats()
+        print(f"   Behavior fingerprints: {len(duplicates)} near-duplicates collapsed "
+              f"({stats['probed']} probed, {stats['reused']} reused in total)")
+        for agent, original in duplicates:
+            print(f"      {agent.agent_id} behaves like {original.agent_id}")
+        return kept
+
+    def _get_surrogate(self) -> FitnessSurrogate:
+        """Fitness surrogate on the fingerprint store, seeded with past experiments' halls of fame"""
+        if self.surrogate is None:
+            self.surrogate = FitnessSurrogate.for_experiment(
+                self.experiment_manager.experiment_dir,
+                self._get_fingerprints(),
+                min_records=self.config.surrogate_min_records,
+                seed=self.config.seed or 0
+            )
+        return self.surrogate
+
+    def _screen_candidates(self, agents: List[SafeAgent]):
+        """
+        Keep the agents the surrogate predicts are most promising for full evaluation
+
+        Args:
+            agents: Valid agents of the generation
+
+        Returns:
+            (agents to evaluate, screening details for _record_surrogate_results or None)
+        """
+        surrogate = self._get_surrogate()
+        if not surrogate.fit():
+            print(f"   Surrogate: collecting results ({len(surrogate.fitness)}/{surrogate.min_records} agents)")
+            return agents, None
+        self.fingerprints.save()
+
+        codes = [agent.code for agent in agents]
+        predictions = surrogate.predict(codes)
+        protected = [surrogate.knows(code) for code in codes]
+        for agent, prediction in zip(agents, predictions):
+            agent.predicted_fitness = float(prediction)
+
+        keep = max(2, math.ceil(self.config.surrogate_keep_fraction * len(agents)))
+        rng = random.Random(f"{self.config.seed}|{self.current_generation}")
+        chosen, audited = surrogate.select(predictions, protected, keep, self.config.surrogate_audit, rng)
+
+        evaluated = [agents[i] for i in chosen]
+        chosen = set(chosen)
+        screening = {
+            'screened': [agent for i, agent in enumerate(agents) if i not in chosen],
+            'audited': {id(agents[i]) for i in audited},
+            'protected': {id(agent) for agent, is_protected in zip(agents, protected) if is_protected},
+        }
+        print(f"   Surrogate: {len(screening['screened'])}/{len(agents)} agents screened out, "
+              f"{len(audited)} audited (model fitted on {surrogate.get_stats()['fitted_on']} agents)")
+        return evaluated, screening
+
+    def _record_surrogate_results(self, evaluated: List[SafeAgent], screening, evaluation_seconds: float):
+        """
+        Score the generation's predictions, rank screened-out agents and train on the new results
+
+        Args:
+            evaluated: Agents that were fully evaluated
+            screening: Details from _screen_candidates (None if nothing was screened)
+            evaluation_seconds: Time spent evaluating
+        """
+        surrogate = self._get_surrogate()
+        stats = {'fitted_on': surrogate.get_stats()['fitted_on'], 'evaluated': len(evaluated),
+                 'evaluation_seconds': round(evaluation_seconds, 2), 'screened_out': 0}
+
+        if screening is not None:
+            new_agents = [agent for agent in evaluated if id(agent) not in screening['protected']]
+            stats.update(screening_report(
+                [agent.predicted_fitness for agent in new_agents],
+                [agent.fitness for agent in new_agents],
+                [id(agent) in screening['audited'] for agent in new_agents],
+                len(screening['screened'])
+            ))
+
+            # Screened-out agents rank below every evaluated agent, in predicted order
+            floor = min(agent.fitness for agent in evaluated)
+            for agent in screening['screened']:
+                agent.fitness = min(agent.predicted_fitness, floor)
+                agent.win_rate = 0.0
+                agent.avg_reward = 0.0
+                agent.screened_out = True
+
+            correlation, mae = stats['rank_correlation'], stats['mae']
+            print(f"   Surrogate accuracy: rank correlation "
+                  f"{'n/a' if correlation is None else f'{correlation:.2f}'}, "
+                  f"MAE {'n/a' if mae is None else f'{mae:.2f}'}, "
+                  f"{stats['missed']}/{stats['audited']} audited agents missed")
+
+        surrogate.add_results([agent.code for agent in evaluated], [agent.fitness for agent in evaluated])
+        self.surrogate_stats = stats
+
     def _update_hall_of_fame(self):
         """Update Hall of Fame with current generation's best agents"""
         agent_data = []
 
         for agent in self.population:
-            if hasattr(agent, 'fitness') and agent.fitness > 0:
+            # Screened-out agents only have a predicted fitness
+            if hasattr(agent, 'fitness') and agent.fitness > 0 and not getattr(agent, 'screened_out', False):
                 data = {
                     'agent_id': agent.agent_id,
                     'fitness': agent.fitness,
@@ -345,6 +631,26 @@ class EvolutionaryTrainer:
                 'hall_of_fame_size': len(self.hall_of_fame.agents)
             }
 
+        if self.surrogate_stats is not None:
+            stats['surrogate'] = self.surrogate_stats
+        # Both cover the agents created for this generation
+        if self.cost_gate is not None:
+            stats['cost_gate'] = self.cost_gate.take_report()
+        if self.qualifier is not None:
+            stats['qualifier'] = self.qualifier.take_report()
+
+        if self.payoff_matrix is not None:
+            self.payoff_matrix.save()
+
+        if self.ratings is not None:
+            top_rated = self.hall_of_fame.get_top_agents_by_rating(1)
+            if top_rated:
+                record, rating = top_rated[0]
+                stats['best_rating'] = rating.rating
+                print(f"   📈 Top rated: {record.agent_id} ({rating}, {rating.games} games)")
+            self.ratings.advance_period()
+            self.ratings.save()
+
         # Update experiment tracking
         self.experiment_manager.update_evolution_summary(self.current_generation, stats)
         self.experiment_manager.log_generation_complete(self.current_generation, stats)
@@ -370,7 +676,7 @@ class EvolutionaryTrainer:
         # Clear current population
         old_population = self.population.copy()
         self.population = []
-        self.agent_pool = AgentPool()  # Fresh agent pool
+        self.agent_pool = AgentPool(self.agent_cache)  # Fresh agent pool, shared compile cache
 
         # Keep elite agents
         elite_count = min(self.config.elite_size, len(old_population))
@@ -390,45 +696,70 @@ class EvolutionaryTrainer:
                     created_count += 1
 
         # Generate new agents through mutation and crossover
-        attempts = 0
-        max_attempts = self.config.population_size * 3
-
-        while created_count < self.config.population_size and attempts < max_attempts:
-            attempts += 1
-
-            if len(old_population) == 0:
-                break
-
-            new_code = None
+        next_generation = self.current_generation + 1
+        parents = [agent for agent in old_population if hasattr(agent, 'code')]
 
+        def make_request(i: int) -> GenerationRequest:
             # Decide between mutation and crossover
-            if len(old_population) >= 2 and (created_count % 3 != 0):  # 2/3 crossover, 1/3 mutation
+            if len(parents) >= 2 and ((created_count + i) % 3 != 0):  # 2/3 crossover, 1/3 mutation
                 # Crossover
-                parent1, parent2 = self._tournament_selection(old_population, 2)
-                if hasattr(parent1, 'code') and hasattr(parent2, 'code'):
-                    new_code = self._generate_agent_code(
-                        'hybrid',
-                        self.current_generation + 1,
-                        [parent1.code, parent2.code]
-                    )
-            else:
-                # Mutation
-                parent = self._tournament_selection(old_population, 1)[0]
-                if hasattr(parent, 'code'):
-                    new_code = self._generate_agent_code(
-                        getattr(parent, 'fighting_style', 'adaptive'),
-                        self.current_generation + 1,
-                        [parent.code]
-                    )
-
-            if new_code:
-                new_id = f"gen{self.current_generation + 1}_agent_{created_count:03d}"
-                if self._create_and_validate_agent(
-                    new_id, new_code, 'evolved', self.current_generation + 1
-                ):
-                    created_count += 1
+                parent1, parent2 = self._tournament_selection(parents, 2)
+                return self._build_request('hybrid', next_generation, [parent1.code, parent2.code])
+            # Mutation
+            parent = self._tournament_selection(parents, 1)[0]
+            return self._build_request(getattr(parent, 'fighting_style', 'adaptive'),
+                                       next_generation, [parent.code])
+
+        def accept(request: Optional[GenerationRequest], new_code: str) -> bool:
+            new_id = f"gen{next_generation}_agent_{len(self.population):03d}"
+            return self._create_and_validate_agent(new_id, new_code, 'evolved', next_generation)
+
+        # Local AST variation makes its share of the children without any LLM calls
+        local_count = int(self.config.ast_variation_rate * (self.config.population_size - created_count) + 0.5)
+        if parents and local_count > 0:
+            self._create_local_children(parents, local_count, accept)
+
+        remaining = self.config.population_size - len(self.population)
+        if parents and remaining > 0:
+            max_attempts = self.config.population_size * 3
+            self._get_generation_pipeline().run(make_request, accept, remaining, max_attempts)
 
         print(f"   Created {len(self.population)} agents for next generation")
+        if self.generation_pipeline is not None:
+            self._print_generation_stats()
+        self._print_qualifier_stats()
+        if self.ast_variation.attempts:
+            stats = self.ast_variation.get_stats()
+            print(f"   AST variation: {stats['produced']} children from {stats['attempts']} attempts, "
+                  f"{stats['invalid']} invalid, {stats['unchanged']} unchanged ({stats['time']:.2f}s)")
+        cache_stats = self.agent_cache.get_stats()
+        print(f"   Agent cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+    def _create_local_children(self, parents: List[SafeAgent], count: int, accept) -> int:
+        """
+        Create children by AST mutation and crossover of parent code
+
+        Args:
+            parents: Agents to select parents from
+            count: Number of children wanted
+            accept: Validates and adds a child's code; returns True if it was kept
+
+        Returns:
+            Number of children created
+        """
+        created = 0
+        attempts = 0
+        while created < count and attempts < count * 10:
+            if len(parents) >= 2 and attempts % 3 != 0:  # 2/3 crossover, 1/3 mutation
+                parent1, parent2 = self._tournament_selection(parents, 2)
+                code = self.ast_variation.crossover(parent1.code, parent2.code)
+            else:
+                parent = self._tournament_selection(parents, 1)[0]
+                code = self.ast_variation.mutate(parent.code)
+            attempts += 1
+            if code is not None and accept(None, code):
+                created += 1
+        return created
 
     def _tournament_selection(self, population: List[SafeAgent], count: int) -> List[SafeAgent]:
         """Select agents using tournament selection"""
@@ -478,6 +809,38 @@ def main():
                        help='Number of generations (default: 10)')
     parser.add_argument('--games-per-match', type=int, default=3,
                        help='Games per match (default: 3)')
+    parser.add_argument('--action-repeat', type=int, default=1,
+                       help='Frames each agent action is held for (default: 1)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes playing matches in parallel (default: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Base seed for reproducible matches (default: unseeded)')
+    parser.add_argument('--llm-concurrency', type=int, default=8,
+                       help='LLM generation requests in flight at once (default: 8)')
+    parser.add_argument('--llm-backend', choices=['anthropic', 'stub'], default='anthropic',
+                       help='Agent code source; "stub" generates deterministic code offline')
+    parser.add_argument('--replay-only', action='store_true',
+                       help='Generate agents only from the LLM response cache of an earlier run '
+                            'with the same --seed (no API calls)')
+    parser.add_argument('--ast-variation', type=float, default=0.0,
+                       help='Share of each new generation made by local AST mutation/crossover '
+                            'instead of LLM calls, 0-1 (default: 0)')
+    parser.add_argument('--dedupe', action='store_true',
+                       help='Drop agents that behave like another agent on the probe-state bank')
+    parser.add_argument('--frame-budget', type=float, default=1.0, metavar='MS',
+                       help='Per-call cost in ms an agent may have, estimated from its code and '
+                            'timed on sample states (default: 1.0)')
+    parser.add_argument('--cost-policy', choices=['reject', 'penalize', 'off'], default='off',
+                       help='What to do with agents over the frame budget (default: off, no cost gate)')
+    parser.add_argument('--qualifier', action='store_true',
+                       help='Reject broken or single-action agents in short qualifier games first')
+    parser.add_argument('--surrogate', type=float, default=None, metavar='FRACTION',
+                       help='Fully evaluate only this share (0-1) of each generation, chosen by a '
+                            'fitness model trained on past results (default: evaluate all)')
+    parser.add_argument('--isolate-agents', action='store_true',
+                       help='Run agent code in separate resource-limited processes')
+    parser.add_argument('--early-stopping', choices=['clinch', 'sprt'], default=None,
+                       help='End matches once the winner is decided (default: play all games)')
     parser.add_argument('--experiment-name', type=str, default=None,
                        help='Experiment name (auto-generated if not provided)')
     parser.add_argument('--anthropic-key', type=str, default=None,
@@ -488,9 +851,12 @@ def main():
                        help='Skip automatic .env file loading')
 
     args = parser.parse_args()
+    if args.replay_only and args.seed is None:
+        parser.error("--replay-only needs the --seed of the run to replay")
 
-    # Setup environment configuration
-    if not args.skip_env_setup:
+    # Setup environment configuration (the offline stub needs none)
+    offline = args.llm_backend == 'stub' or args.replay_only
+    if not args.skip_env_setup and not offline:
         print("🔧 Setting up environment configuration...")
         env_config = setup_environment()
 
@@ -510,7 +876,7 @@ def main():
               env_config.get('anthropic_api_key') or
               os.getenv('ANTHROPIC_API_KEY'))
 
-    if not api_key:
+    if not api_key and not offline:
         print("❌ No Anthropic API key found!")
         print("💡 Please either:")
         print("   1. Add ANTHROPIC_API_KEY to your .env file")
@@ -528,17 +894,40 @@ def main():
         population_size=args.population,
         generations=args.generations,
         games_per_match=args.games_per_match,
+        action_repeat=args.action_repeat,
+        match_workers=args.workers,
+        seed=args.seed,
+        isolate_agents=args.isolate_agents,
+        early_stopping=args.early_stopping,
         swiss_rounds=max(1, math.ceil(math.log2(args.population))),
-        anthropic_model=model_name
+        anthropic_model=model_name,
+        llm_backend=args.llm_backend,
+        llm_concurrency=args.llm_concurrency,
+        llm_replay_only=args.replay_only,
+        ast_variation_rate=min(1.0, max(0.0, args.ast_variation)),
+        dedupe_agents=args.dedupe,
+        qualify_agents=args.qualifier,
+        frame_budget_ms=args.frame_budget,
+        cost_policy=args.cost_policy,
+        surrogate_screening=args.surrogate is not None,
+        surrogate_keep_fraction=min(1.0, max(0.0, args.surrogate if args.surrogate is not None else 0.5))
     )
 
     print(f"🧬 Starting Evolutionary Training")
     print(f"   Population: {config.population_size}")
     print(f"   Generations: {config.generations}")
     print(f"   Swiss Rounds: {config.swiss_rounds}")
-    print(f"   Games per Match: {config.games_per_match}")
-    print(f"   Model: {model_name}")
-    print(f"   API Key: {api_key[:12]}...{api_key[-4:]} (masked)")
+    print(f"   Games per Match: {config.games_per_match}"
+          + (f" (early stopping: {config.early_stopping})" if config.early_stopping else ""))
+    print(f"   Action Repeat: {config.action_repeat}")
+    print(f"   Match Workers: {config.match_workers}")
+    if args.llm_backend == 'stub':
+        print(f"   Model: offline stub")
+    elif args.replay_only:
+        print(f"   Model: {model_name} (replaying cached responses only)")
+    else:
+        print(f"   Model: {model_name} ({config.llm_concurrency} concurrent requests)")
+        print(f"   API Key: {api_key[:12]}...{api_key[-4:]} (masked)")
 
     # Run evolution
     try:
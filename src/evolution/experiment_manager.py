@@ -24,11 +24,37 @@ class ExperimentConfig:
     # Tournament parameters
     swiss_rounds: Optional[int] = None  # Auto-calculated if None
     games_per_match: int = 5
+    action_repeat: int = 1  # Frames each agent action is held for
+    match_workers: int = 1  # Processes playing matches in parallel
+    seed: Optional[int] = None  # Base seed for match RNG (None = unseeded)
+    isolate_agents: bool = False  # Run agent code in resource-limited host processes
+    persist_agent_cache: bool = True  # Keep validated/compiled agent code under experiment_dir/agent_cache
+    reuse_match_results: bool = True  # Replay only code pairs missing from experiment_dir/payoff_matrix.json
+    early_stopping: Optional[str] = None  # End matches once decided: None, 'clinch' or 'sprt'
+    stopping_error: float = 0.05  # SPRT error rate in each direction
+    stopping_margin: float = 0.3  # SPRT tests decisive-game win rates of 0.5 +/- margin
+    track_ratings: bool = True  # Update Glicko ratings in experiments/ratings.json from every match
+    dedupe_agents: bool = False  # Drop agents that behave like another on the probe bank before the tournament
+    dedupe_threshold: float = 0.01  # Largest fraction of probe states on which duplicates may differ
+    probe_bank_size: int = 20000  # Observations in experiments/probe_states.npy
+    frame_budget_ms: float = 1.0  # Per-call cost an agent may have (60 FPS leaves 16.7 ms per frame for the whole game)
+    cost_policy: str = 'off'  # Agents over the frame budget: 'reject', 'penalize' (fitness scaled by budget/cost) or 'off'
+    cost_sample_states: int = 64  # Sample states each agent is timed on by the cost gate
+    qualify_agents: bool = False  # Reject erroring, slow or single-action agents in short games before they join
+    qualifier_frames: int = 300  # Frames per qualifier game (one each vs idle, random and easy opponents)
+    qualifier_max_error_rate: float = 0.1  # Largest share of qualifier calls that may raise or time out
+    qualifier_max_latency_ms: float = 5.0  # Largest mean wall time per get_action call
+    qualifier_min_entropy: float = 0.2  # Smallest entropy (bits) of the agent's qualifier actions
+    surrogate_screening: bool = False  # Fully evaluate only agents a fitness model predicts are promising
+    surrogate_keep_fraction: float = 0.5  # Share of each generation the surrogate sends to full evaluation
+    surrogate_min_records: int = 30  # Measured agents (incl. past halls of fame) needed before screening
+    surrogate_audit: int = 1  # Screened-out agents evaluated anyway each generation to measure misses
     
     # Code constraints
     max_lines: int = 1400
     max_chars: int = 40000
-    timeout_seconds: float = 1.0
+    timeout_seconds: float = 1.0  # CPU time per action
+    cpu_budget_seconds: Optional[float] = None  # Cumulative CPU time per game (None = unlimited)
     
     # Evolution parameters
     mutation_rate: float = 0.3
@@ -36,6 +62,12 @@ class ExperimentConfig:
     
     # LLM parameters
     anthropic_model: str = "claude-3-5-sonnet-20241022"
+    llm_backend: str = "anthropic"  # "anthropic", or "stub" for offline deterministic agent code
+    llm_concurrency: int = 8  # Generation requests in flight at once
+    llm_max_retries: int = 3  # Retries (with exponential backoff) per failed request
+    cache_llm_responses: bool = True  # Seeded runs reuse generated code by prompt/model/params/seed (experiments/llm_cache)
+    llm_replay_only: bool = False  # Never call the API; every response must come from the cache (needs seed)
+    ast_variation_rate: float = 0.0  # Share of children made by local AST mutation/crossover (1.0 = no LLM after gen 0)
     
     # Evaluation parameters
     rule_based_opponents: List[str] = None
@@ -164,6 +196,25 @@ Load agents from `top_agents/` directory for testing or further evolution.
         self._log(f"  Best fitness: {stats.get('best_fitness', 'N/A')}")
         self._log(f"  Avg fitness: {stats.get('avg_fitness', 'N/A')}")
         self._log(f"  Valid agents: {stats.get('valid_agents', 'N/A')}")
+        cost_gate = stats.get('cost_gate')
+        if cost_gate:
+            self._log(f"  Cost gate: {cost_gate['over_budget']} over frame budget, {cost_gate['checked']} checked, "
+                      f"{cost_gate['reused']} reused in {cost_gate['seconds']}s")
+            for agent_id, issues in cost_gate.get('over_budget_agents', {}).items():
+                self._log(f"    {agent_id}: {'; '.join(issues)}")
+        qualifier = stats.get('qualifier')
+        if qualifier:
+            self._log(f"  Qualifier: {qualifier['rejected']} rejected, {qualifier['tested']} tested, "
+                      f"{qualifier['reused']} reused in {qualifier['seconds']}s")
+            for agent_id, reasons in qualifier.get('rejections', {}).items():
+                self._log(f"    {agent_id}: {'; '.join(reasons)}")
+        surrogate = stats.get('surrogate')
+        if surrogate:
+            self._log(f"  Surrogate: {surrogate.get('screened_out', 0)} screened out, "
+                      f"{surrogate.get('evaluated')} evaluated in {surrogate.get('evaluation_seconds')}s, "
+                      f"rank correlation {surrogate.get('rank_correlation', 'N/A')}, "
+                      f"MAE {surrogate.get('mae', 'N/A')}, "
+                      f"{surrogate.get('missed', 0)}/{surrogate.get('audited', 0)} audited missed")
         
         print(f"✅ {message}")
         print(f"   Best fitness: {stats.get('best_fitness', 'N/A')}")
@@ -184,6 +235,14 @@ Load agents from `top_agents/` directory for testing or further evolution.
         
         self._log(f"Saved tournament results for generation {generation}")
     
+    def save_tournament_store(self, generation: int, result_store):
+        """Save a generation's columnar tournament results (ResultStore) as .npz"""
+        filename = f"generation_{generation:03d}_results.npz"
+        filepath = os.path.join(self.experiment_dir, "tournament_logs", filename)
+        result_store.save(filepath)
+        
+        self._log(f"Saved {len(result_store)} tournament results for generation {generation}")
+    
     def save_generation_snapshot(self, generation: int, population_data: List[Dict[str, Any]]):
         """Save complete population snapshot (optional, for detailed analysis)"""
         filename = f"generation_{generation:03d}_population.json"
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Behavior Fingerprints
+
+Identifies agents that behave the same whatever their code looks like. A
+probe-state bank is a fixed array of observations sampled from real games
+between rule-based and random policies; an agent's fingerprint is the
+action it chooses on every probe state. Two agents whose fingerprints
+disagree on at most a small fraction of the bank are near-duplicates, and
+only the first of them needs a tournament slot.
+
+The bank is built once and shared by all experiments
+(experiments/probe_states.npy). Agents are probed in a batch loop inside
+AgentHostPool sandbox workers (or in-process), seeded so that agents using
+random get the same fingerprint on every run. Fingerprints are stored by
+code hash in fingerprints.npz next to hall_of_fame.json and reused across
+generations and runs of the experiment.
+"""
+import os
+import sys
+import io
+import hashlib
+import contextlib
+import numpy as np
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'training'))
+
+from agent_cache import code_hash
+
+PROBE_BANK_FILE_NAME = "probe_states.npy"
+FINGERPRINTS_FILE_NAME = "fingerprints.npz"
+NUM_ACTIONS = 10
+
+
+def build_probe_bank(size: int = 20000, seed: int = 0, stride: int = 3) -> np.ndarray:
+    """
+    Sample observations from games between rule-based and random policies
+
+    Args:
+        size: Number of probe states
+        seed: Seed for the games and the sampling
+        stride: Record both fighters' observations every `stride` steps
+
+    Returns:
+        (size, 26) float32 observations in random order
+    """
+    from environment import FightingGameEnv
+    from models import SimplePolicy
+
+    rng = np.random.default_rng(seed)
+    policies = [SimplePolicy(difficulty) for difficulty in ('easy', 'medium', 'hard')] + [None]  # None = random
+    matchups = [(p1, p2) for p1 in policies for p2 in policies]
+
+    env = FightingGameEnv(headless=True, action_repeat=1)
+    samples = []
+    collected = 0
+    game = 0
+    # Oversample so the bank is a random subset of many games rather than the first few
+    while collected < 2 * size:
+        policy1, policy2 = matchups[game % len(matchups)]
+        env.seed(seed + game)
+        for player, policy in enumerate((policy1, policy2)):
+            if policy is not None:
+                policy.seed(seed + 2 * game + player)
+        env.reset()
+        observations = env.observations
+
+        for step in range(env.max_steps):
+            if step % stride == 0:
+                samples.append(observations.copy())
+                collected += 2
+            actions = [policy.get_action(observations[player]) if policy is not None else int(rng.integers(NUM_ACTIONS))
+                       for player, policy in enumerate((policy1, policy2))]
+            _, _, done, _ = env.step(*actions)
+            if done:
+                break
+        game += 1
+
+    states = np.concatenate(samples).astype(np.float32)
+    return states[rng.choice(len(states), size, replace=False)]
+
+
+def load_probe_bank(path: str, size: int = 20000, seed: int = 0) -> np.ndarray:
+    """Probe bank stored at path, built (and saved) first if missing or of another size"""
+    if os.path.exists(path):
+        try:
+            bank = np.load(path)
+            if bank.shape[0] == size:
+                return bank
+        except Exception as e:
+            print(f"⚠️  Could not load probe bank {path}: {e}")
+
+    print(f"🔍 Building probe-state bank ({size} states)...")
+    bank = build_probe_bank(size, seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.save(path, bank)
+    return bank
+
+
+def bank_digest(bank: np.ndarray) -> str:
+    """Identifies the bank fingerprints were taken on"""
+    return hashlib.sha256(np.ascontiguousarray(bank).tobytes()).hexdigest()[:16]
+
+
+def disagreement(fingerprint1: np.ndarray, fingerprint2: np.ndarray) -> float:
+    """Fraction of probe states on which two agents choose different actions"""
+    return float(np.mean(fingerprint1 != fingerprint2))
+
+
+def action_distribution(fingerprint: np.ndarray) -> np.ndarray:
+    """Share of probe states on which an agent chooses each action"""
+    return np.bincount(fingerprint, minlength=NUM_ACTIONS) / max(1, len(fingerprint))
+
+
+def find_duplicates(fingerprints: np.ndarray, threshold: float = 0.01) -> np.ndarray:
+    """
+    Group near-duplicate agents, keeping the first of each group
+
+    Args:
+        fingerprints: (n_agents, bank_size) actions, in order of preference
+        threshold: Largest disagreement at which agents count as duplicates
+
+    Returns:
+        (n_agents,) index of the earlier agent each one duplicates, -1 for kept agents
+    """
+    duplicate_of = np.full(len(fingerprints), -1)
+    kept: List[int] = []
+    for i, fingerprint in enumerate(fingerprints):
+        if kept:
+            distances = np.mean(fingerprints[kept] != fingerprint, axis=1)
+            nearest = int(np.argmin(distances))
+            if distances[nearest] <= threshold:
+                duplicate_of[i] = kept[nearest]
+                continue
+        kept.append(i)
+    return duplicate_of
+
+
+class FingerprintStore:
+    """
+    Fingerprints by code hash, probed on demand and optionally persisted
+    """
+
+    def __init__(self, bank: np.ndarray, path: Optional[str] = None, isolate: bool = True,
+                 num_workers: int = 1, timeout_seconds: float = 1.0, budget_seconds: Optional[float] = 10.0,
+                 seed: int = 0):
+        """
+        Initialize the store
+
+        Args:
+            bank: (bank_size, 26) probe states
+            path: .npz file for fingerprints (None = memory only)
+            isolate: Probe agents in AgentHostPool sandbox workers instead of in-process
+            num_workers: Sandbox worker processes
+            timeout_seconds: Per-call timeout while probing
+            budget_seconds: CPU time an agent may spend on the whole bank; later states get action 0
+            seed: Seed for agents' random streams while probing
+        """
+        self.bank = bank
+        self.digest = bank_digest(bank)
+        self.path = path
+        self.isolate = isolate
+        self.num_workers = num_workers
+        self.timeout_seconds = timeout_seconds
+        self.budget_seconds = budget_seconds
+        self.seed = seed
+        self.fingerprints: Dict[str, np.ndarray] = {}
+        self._host_pool = None
+
+        self.probed = 0
+        self.reused = 0
+
+        if path and os.path.exists(path):
+            self._load()
+
+    @classmethod
+    def for_experiment(cls, experiment_dir: str, bank_size: int = 20000, **kwargs) -> 'FingerprintStore':
+        """Store next to the experiment's hall_of_fame.json, on the bank shared by all experiments"""
+        experiments_dir = os.path.dirname(os.path.abspath(experiment_dir))
+        bank = load_probe_bank(os.path.join(experiments_dir, PROBE_BANK_FILE_NAME), bank_size)
+        return cls(bank, os.path.join(experiment_dir, FINGERPRINTS_FILE_NAME), **kwargs)
+
+    def _load(self):
+        try:
+            with np.load(self.path) as data:
+                if str(data['bank_digest']) != self.digest:
+                    print(f"⚠️  Fingerprints in {self.path} were taken on another probe bank; re-probing")
+                    return
+                self.fingerprints = dict(zip(data['keys'].tolist(), data['actions']))
+        except Exception as e:
+            print(f"⚠️  Could not load fingerprints from {self.path}: {e}")
+
+    def save(self):
+        """Write all fingerprints to path"""
+        if not self.path:
+            return
+        keys = list(self.fingerprints)
+        actions = (np.stack([self.fingerprints[key] for key in keys]) if keys
+                   else np.zeros((0, len(self.bank)), dtype=np.int8))
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            np.savez_compressed(self.path, keys=np.array(keys, dtype=str), actions=actions,
+                                bank_digest=np.array(self.digest))
+        except OSError as e:
+            print(f"⚠️  Could not save fingerprints: {e}")
+
+    def _probe(self, codes: List[str]) -> np.ndarray:
+        """Fingerprints of agent code, one row per code"""
+        ids = [f"probe_{code_hash(code)[:16]}" for code in codes]
+        if not self.isolate:
+            from safe_execution import SafeAgent
+            rows = []
+            for agent_id, code in zip(ids, codes):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    agent = SafeAgent(agent_id, code, self.timeout_seconds, seed=self.seed)
+                rows.append(agent.get_actions(self.bank, self.budget_seconds))
+            return np.stack(rows)
+
+        if self._host_pool is None or self._host_pool.closed:
+            from agent_host import AgentHostPool
+            self._host_pool = AgentHostPool(self.num_workers, slots_per_worker=16)
+        capacity = self._host_pool.num_workers * self._host_pool.slots_per_worker
+        rows = []
+        for start in range(0, len(codes), capacity):
+            agents = [self._host_pool.add_agent(agent_id, code, self.timeout_seconds, seed=self.seed)
+                      for agent_id, code in zip(ids[start:start + capacity], codes[start:start + capacity])]
+            hosted = [agent for agent in agents if agent is not None]
+            actions = iter(self._host_pool.get_batch_actions(hosted, self.bank, self.budget_seconds))
+            rows.extend(next(actions) if agent is not None else np.zeros(len(self.bank), dtype=np.int8)
+                        for agent in agents)
+            for agent in hosted:
+                self._host_pool.remove_agent(agent)
+        return np.stack(rows)
+
+    def get_fingerprints(self, codes: List[str]) -> np.ndarray:
+        """
+        Fingerprints for agent code, probing only code not seen before
+
+        Args:
+            codes: Agent code strings
+
+        Returns:
+            (len(codes), bank_size) int8 actions
+        """
+        keys = [code_hash(code) for code in codes]
+        missing = {}
+        for key, code in zip(keys, codes):
+            if key not in self.fingerprints:
+                missing.setdefault(key, code)
+        self.reused += len(codes) - len(missing)
+
+        if missing:
+            for key, fingerprint in zip(missing, self._probe(list(missing.values()))):
+                self.fingerprints[key] = fingerprint
+            self.probed += len(missing)
+
+        if not keys:
+            return np.zeros((0, len(self.bank)), dtype=np.int8)
+        return np.stack([self.fingerprints[key] for key in keys])
+
+    def close(self):
+        """Stop the sandbox workers"""
+        if self._host_pool is not None:
+            self._host_pool.close()
+            self._host_pool = None
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'fingerprints': len(self.fingerprints), 'probed': self.probed, 'reused': self.reused}
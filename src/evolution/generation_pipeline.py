@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Concurrent Agent Generation Pipeline
+
+Generates agent code with many LLM requests in flight at once. An asyncio
+pipeline keeps up to max_concurrency requests outstanding, retries failed
+requests with exponential backoff, and validates and compiles each response
+as soon as it arrives while the remaining requests are still in flight.
+Requests are issued only until enough agents have been accepted, so the
+population size (and agent numbering) is the same as with serial generation.
+
+Clients implement one coroutine, generate(request) -> str:
+- AnthropicClient: the Anthropic API (AsyncAnthropic)
+- SyncClientAdapter: any client with a blocking messages.create, run in a thread
+- StubLLMClient: a local deterministic stand-in that returns canned or
+  mutated agent code, for offline tests and benchmarks
+"""
+import re
+import time
+import random
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ResponseUnavailable(Exception):
+    """Raised by clients when a request cannot succeed, so retrying is pointless"""
+
+
+@dataclass
+class GenerationRequest:
+    """One agent to generate"""
+    prompt: str
+    fighting_style: str
+    generation: int
+    parent_codes: List[str] = field(default_factory=list)
+    index: int = 0  # Issue order within a batch (set by GenerationPipeline)
+    cache_slot: Optional[Tuple[str, int]] = None  # (prompt key, occurrence) held across retries (set by CachedLLMClient)
+
+
+def extract_code(text: str) -> str:
+    """Agent code from an LLM response (markdown fences removed)"""
+    code = text.strip()
+    if "```python" in code:
+        code = code.split("```python")[1].split("```")[0].strip()
+    elif "```" in code:
+        code = code.split("```")[1].strip()
+    return code
+
+
+class AnthropicClient:
+    """Anthropic API client using the library's asyncio interface"""
+
+    def __init__(self, api_key: str, model: str, max_tokens: int = 2000):
+        try:
+            from anthropic import AsyncAnthropic
+        except ImportError:
+            raise RuntimeError("Anthropic library not installed. Run: pip install anthropic")
+        self.client = AsyncAnthropic(api_key=api_key)
+        self.model = model
+        self.max_tokens = max_tokens
+
+    async def generate(self, request: GenerationRequest) -> str:
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": request.prompt}]
+        )
+        return response.content[0].text
+
+
+class SyncClientAdapter:
+    """Runs a blocking client's messages.create (e.g. anthropic.Anthropic) in a worker thread"""
+
+    def __init__(self, client, model: str, max_tokens: int = 2000):
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+
+    async def generate(self, request: GenerationRequest) -> str:
+        response = await asyncio.to_thread(
+            self.client.messages.create,
+            model=self.model,
+            max_tokens=self.max_tokens,
+            messages=[{"role": "user", "content": request.prompt}]
+        )
+        return response.content[0].text
+
+
+STUB_TEMPLATES = [
+    '''
+def get_action(state):
+    """Aggressive fighter"""
+    distance = state[22]
+    relative_pos = state[23]
+
+    if distance < 0.15:
+        return 4  # punch
+    elif distance < 0.3:
+        return 2 if relative_pos > 0 else 1  # close in
+    return 9  # projectile
+''',
+    '''
+def get_action(state):
+    """Defensive fighter"""
+    distance = state[22]
+    relative_pos = state[23]
+    health_advantage = state[25]
+
+    if health_advantage < -0.2 and distance < 0.25:
+        return 6  # block when losing
+    elif distance < 0.12:
+        return 5  # kick
+    return 2 if relative_pos > 0 else 1
+''',
+    '''
+def get_action(state):
+    """Zoner fighter"""
+    distance = state[22]
+    relative_pos = state[23]
+
+    if distance > 0.4:
+        return 9  # projectile
+    elif distance < 0.2:
+        return 1 if relative_pos > 0 else 2  # back off
+    return 6  # block
+''',
+]
+
+_NUMBER = re.compile(r'(?<![\w.\[])(\d+\.\d+)')
+
+
+class StubLLMClient:
+    """
+    Deterministic offline stand-in for an LLM
+
+    Prompts without parents get one of STUB_TEMPLATES; prompts with parents get the
+    first parent with its decimal constants perturbed. The choice and the perturbation
+    depend only on the seed, the prompt and the request's index in its batch, so a run
+    is reproducible whatever order responses arrive in.
+    """
+
+    def __init__(self, seed: int = 0, latency: float = 0.0, failures_per_request: int = 0,
+                 templates: Optional[List[str]] = None):
+        """
+        Initialize the stub
+
+        Args:
+            seed: Seed mixed into every response
+            latency: Simulated seconds per request
+            failures_per_request: Raise this many transient errors for each prompt before answering
+            templates: Canned agent code (default: STUB_TEMPLATES)
+        """
+        self.seed = seed
+        self.latency = latency
+        self.failures_per_request = failures_per_request
+        self.templates = templates or STUB_TEMPLATES
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures: Dict[tuple, int] = {}
+
+    def _rng(self, request: GenerationRequest) -> random.Random:
+        digest = hashlib.sha256(f"{self.seed}|{request.index}|{request.prompt}".encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'big'))
+
+    def respond(self, request: GenerationRequest) -> str:
+        """The response for a request, without latency or failures"""
+        rng = self._rng(request)
+        if not request.parent_codes:
+            return "```python\n" + rng.choice(self.templates).strip() + "\n```"
+
+        def perturb(match):
+            value = float(match.group(1)) * rng.uniform(0.8, 1.25)
+            return f"{value:.3f}"
+        return "```python\n" + _NUMBER.sub(perturb, request.parent_codes[0]).strip() + "\n```"
+
+    async def generate(self, request: GenerationRequest) -> str:
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            key = (request.index, request.prompt)
+            failures = self._failures.get(key, 0)
+            if failures < self.failures_per_request:
+                self._failures[key] = failures + 1
+                raise ConnectionError("stub transient failure")
+            return self.respond(request)
+        finally:
+            self.in_flight -= 1
+
+
+class GenerationPipeline:
+    """
+    Issues generation requests concurrently and hands responses to an accept callback
+    """
+
+    def __init__(self, client, max_concurrency: int = 8, max_retries: int = 3,
+                 backoff_seconds: float = 1.0, max_backoff_seconds: float = 30.0, seed: int = 0):
+        """
+        Initialize the pipeline
+
+        Args:
+            client: Object with an async generate(GenerationRequest) -> str
+            max_concurrency: Requests in flight at once
+            max_retries: Retries per request after the first failure
+            backoff_seconds: Delay before the first retry (doubles each retry, with jitter)
+            max_backoff_seconds: Cap on the retry delay
+            seed: Seed for backoff jitter
+        """
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self._jitter = random.Random(seed)
+
+        self.requests = 0
+        self.retries = 0
+        self.failed = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.wall_time = 0.0
+
+    async def _request(self, request: GenerationRequest) -> Optional[str]:
+        """One request with retries; None if every attempt failed"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self.client.generate(request)
+            except ResponseUnavailable as e:
+                print(f"⚠️  Failed to generate agent code: {e}")
+                return None
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"⚠️  Failed to generate agent code: {e}")
+                    return None
+                self.retries += 1
+                delay = min(self.backoff_seconds * 2 ** attempt, self.max_backoff_seconds)
+                await asyncio.sleep(delay * self._jitter.uniform(0.5, 1.0))
+
+    async def generate(self, make_request: Callable[[int], GenerationRequest],
+                       accept: Callable[[GenerationRequest, str], bool],
+                       target: int, max_attempts: int) -> int:
+        """
+        Generate until `target` responses are accepted or `max_attempts` requests were made
+
+        Args:
+            make_request: Builds the i-th request (called when it is issued)
+            accept: Validates and stores a response's code; returns True if it was kept
+            target: Number of accepted responses wanted
+            max_attempts: Maximum number of requests to issue
+
+        Returns:
+            Number of responses accepted
+        """
+        start = time.time()
+        accepted = 0
+        issued = 0
+        in_flight = {}  # task -> (issue index, request)
+
+        def can_issue():
+            # Never request more than could still be needed
+            return (accepted + len(in_flight) < target and issued < max_attempts
+                    and len(in_flight) < self.max_concurrency)
+
+        while True:
+            while can_issue():
+                request = make_request(issued)
+                request.index = issued
+                in_flight[asyncio.ensure_future(self._request(request))] = (issued, request)
+                issued += 1
+                self.requests += 1
+
+            if not in_flight:
+                break
+
+            # Validate and compile each response while the others are still in flight
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: in_flight[t][0]):
+                _, request = in_flight.pop(task)
+                text = task.result()
+                if text is None:
+                    self.failed += 1
+                elif accept(request, extract_code(text)):
+                    accepted += 1
+                else:
+                    self.rejected += 1
+
+        self.accepted += accepted
+        self.wall_time += time.time() - start
+        return accepted
+
+    def run(self, make_request: Callable[[int], GenerationRequest],
+            accept: Callable[[GenerationRequest, str], bool],
+            target: int, max_attempts: int) -> int:
+        """Blocking wrapper around generate()"""
+        return asyncio.run(self.generate(make_request, accept, target, max_attempts))
+
+    def get_stats(self) -> Dict[str, float]:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failed': self.failed,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'wall_time': self.wall_time,
+        }
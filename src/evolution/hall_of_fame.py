@@ -46,16 +46,18 @@ class HallOfFame:
     - Human-readable Python files
     """
     
-    def __init__(self, experiment_dir: str, max_agents: int = 100):
+    def __init__(self, experiment_dir: str, max_agents: int = 100, ratings=None):
         """
         Initialize Hall of Fame
         
         Args:
             experiment_dir: Directory for this evolutionary experiment
             max_agents: Maximum number of agents to preserve
+            ratings: Optional RatingStore to query agents' persistent ratings from
         """
         self.experiment_dir = experiment_dir
         self.max_agents = max_agents
+        self.ratings = ratings
         self.hall_of_fame_dir = os.path.join(experiment_dir, "top_agents")
         self.metadata_file = os.path.join(experiment_dir, "hall_of_fame.json")
         
@@ -108,6 +110,22 @@ class HallOfFame:
                 return agent
         return None
     
+    def get_rating(self, agent_id: str):
+        """Persistent rating of an agent, or None if it is unknown or never rated"""
+        agent = self.get_agent_by_id(agent_id)
+        if agent is None or self.ratings is None:
+            return None
+        return self.ratings.get_for_code(agent.code)
+    
+    def get_top_agents_by_rating(self, n: int = 10) -> List[Tuple[AgentRecord, Any]]:
+        """Get top N rated agents as (record, rating), by conservative rating"""
+        if self.ratings is None:
+            return []
+        rated = [(agent, self.ratings.get_for_code(agent.code)) for agent in self.agents]
+        rated = [(agent, rating) for agent, rating in rated if rating is not None]
+        rated.sort(key=lambda x: x[1].conservative, reverse=True)
+        return rated[:n]
+    
     def get_agents_by_generation(self, generation: int) -> List[AgentRecord]:
         """Get all agents from a specific generation"""
         return [agent for agent in self.agents if agent.generation == generation]
@@ -254,6 +272,8 @@ class HallOfFame:
     
     def _format_agent_file(self, agent: AgentRecord, rank: Optional[int] = None) -> str:
         """Format agent code with metadata header"""
+        rating = self.ratings.get_for_code(agent.code) if self.ratings is not None else None
+        rating_line = f"\n- Rating: {rating} ({rating.games} games)" if rating is not None else ""
         header = f'''"""
 Hall of Fame Agent
 ==================
@@ -266,7 +286,7 @@ Fighting Style: {agent.fighting_style}
 Performance Metrics:
 - Fitness: {agent.fitness:.2f}
 - Win Rate: {agent.win_rate:.1%}
-- Average Reward: {agent.avg_reward:.2f}
+- Average Reward: {agent.avg_reward:.2f}{rating_line}
 
 Created: {datetime.fromtimestamp(agent.creation_time).strftime("%Y-%m-%d %H:%M:%S")}
 Lineage: {" -> ".join(agent.lineage) if agent.lineage else "Original"}
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+LLM Response Cache
+
+Persistent, content-addressed cache of generated agent code. Entries are
+keyed by the SHA-256 of the rendered prompt, the model name and the
+sampling parameters (the trainer includes the run seed, and only caches
+seeded runs, so a new seed or an unseeded run still gets fresh samples),
+and hold the cleaned code of every response received for that key: the n-th request with a given key in a run gets the n-th
+stored response, so agents that share a prompt (e.g. two initial agents of
+the same style) stay distinct, and a rerun that issues the same prompts in
+the same order (same seed) replays the original run without any API calls.
+
+Entries are JSON files in experiments/llm_cache/, shared by all
+experiments. In replay-only mode a miss is an error instead of a request.
+"""
+import os
+import json
+import hashlib
+from typing import Any, Dict, Optional
+
+from generation_pipeline import GenerationRequest, ResponseUnavailable, extract_code
+
+# Name of the cache directory in the experiments directory
+LLM_CACHE_DIR_NAME = "llm_cache"
+
+
+class ResponseCacheMiss(ResponseUnavailable):
+    """A replay-only cache has no response for a request"""
+
+
+def prompt_key(prompt: str, model: str, params: Dict[str, Any]) -> str:
+    """Cache key for a rendered prompt sent to a model with given sampling parameters"""
+    payload = json.dumps({'prompt': prompt, 'model': model, 'params': params}, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Cleaned agent code by prompt key and occurrence, optionally persisted to disk
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the cache
+
+        Args:
+            cache_dir: Directory for entry files (None = memory only)
+        """
+        self.cache_dir = cache_dir
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def for_experiment(cls, experiment_dir: str) -> 'LLMResponseCache':
+        """Cache shared by all experiments next to experiment_dir"""
+        experiments_dir = os.path.dirname(os.path.abspath(experiment_dir))
+        return cls(os.path.join(experiments_dir, LLM_CACHE_DIR_NAME))
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entry(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None and self.cache_dir and os.path.exists(self._path(key)):
+            try:
+                with open(self._path(key), 'r') as f:
+                    entry = json.load(f)
+                self._entries[key] = entry
+            except Exception as e:
+                print(f"⚠️  Could not read LLM cache entry {key[:16]}: {e}")
+        return entry
+
+    def get(self, key: str, occurrence: int) -> Optional[str]:
+        """Code of the occurrence-th response stored for key, or None"""
+        entry = self._entry(key)
+        code = entry['responses'].get(str(occurrence)) if entry else None
+        if code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return code
+
+    def put(self, key: str, occurrence: int, code: str, model: str, params: Dict[str, Any]):
+        """Store the cleaned code of a response"""
+        entry = self._entry(key) or {'model': model, 'params': params, 'responses': {}}
+        entry['responses'][str(occurrence)] = code
+        self._entries[key] = entry
+        if not self.cache_dir:
+            return
+        try:
+            # Write then rename so an interrupted run never leaves a partial entry
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️  Could not write LLM cache entry {key[:16]}: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+class CachedLLMClient:
+    """
+    Generation client that answers from an LLMResponseCache before asking the wrapped client
+    """
+
+    def __init__(self, client, cache: LLMResponseCache, model: str, params: Dict[str, Any],
+                 replay_only: bool = False):
+        """
+        Initialize the caching client
+
+        Args:
+            client: Wrapped client (may be None when replay_only)
+            cache: Response cache to read and extend
+            model: Model name, part of the cache key
+            params: Sampling parameters, part of the cache key
+            replay_only: Fail on a cache miss instead of calling the client
+        """
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.params = params
+        self.replay_only = replay_only
+
+        # Occurrences handed out per key this run; requests hold theirs (cache_slot) across retries
+        self._occurrences: Dict[str, int] = {}
+
+    def _slot(self, request: GenerationRequest) -> tuple:
+        key = prompt_key(request.prompt, self.model, self.params)
+        if request.cache_slot is None or request.cache_slot[0] != key:
+            occurrence = self._occurrences.get(key, 0)
+            self._occurrences[key] = occurrence + 1
+            request.cache_slot = (key, occurrence)
+        return request.cache_slot
+
+    async def generate(self, request: GenerationRequest) -> str:
+        key, occurrence = self._slot(request)
+        code = self.cache.get(key, occurrence)
+        if code is not None:
+            return code
+        if self.replay_only or self.client is None:
+            raise ResponseCacheMiss(f"no cached response for prompt {key[:16]} #{occurrence}")
+
+        code = extract_code(await self.client.generate(request))
+        self.cache.put(key, occurrence, code, self.model, self.params)
+        return code
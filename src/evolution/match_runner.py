@@ -8,6 +8,7 @@ safety measures and result calculation.
 import sys
 import os
 import time
+import math
 import numpy as np
 from typing import Tuple, Dict, Any, Optional
 
@@ -16,21 +17,75 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'training'))
 
 from swiss_tournament import TournamentResult
 
+# Early stopping modes for MatchRunner(early_stopping=...)
+STOPPING_MODES = ('clinch', 'sprt')
+
+class SequentialStopping:
+    """
+    Decides when a match's winner is settled before all games are played
+
+    'clinch' stops once the trailing agent could not even draw the match with
+    every remaining game. 'sprt' additionally runs Wald's sequential
+    probability ratio test on decisive games, testing "agent1 wins a decisive
+    game with probability 0.5 - margin" against "0.5 + margin" with error rate
+    error_rate on both sides, and stops as soon as either is accepted.
+    """
+
+    def __init__(self, mode: str = 'clinch', error_rate: float = 0.05, margin: float = 0.3):
+        if mode not in STOPPING_MODES:
+            raise ValueError(f"Unknown early stopping mode {mode!r}; expected one of {STOPPING_MODES}")
+        if not 0.0 < margin < 0.5:
+            raise ValueError(f"margin must be in (0, 0.5), got {margin}")
+        self.mode = mode
+        self.error_rate = error_rate
+        self.margin = margin
+
+        p0, p1 = 0.5 - margin, 0.5 + margin
+        self._win_step = math.log(p1 / p0)              # LLR change when agent1 wins
+        self._loss_step = math.log((1 - p1) / (1 - p0))  # LLR change when agent2 wins
+        self._bound = math.log((1 - error_rate) / error_rate)
+
+    def check(self, agent1_wins: int, agent2_wins: int, games_left: int) -> Optional[str]:
+        """
+        Returns:
+            Stop reason ('clinched' or 'sprt'), or None to keep playing
+        """
+        if abs(agent1_wins - agent2_wins) > games_left:
+            return 'clinched'
+        if self.mode == 'sprt' and games_left > 0:
+            llr = agent1_wins * self._win_step + agent2_wins * self._loss_step
+            if abs(llr) >= self._bound:
+                return 'sprt'
+        return None
+
 class MatchRunner:
     """
     Executes matches between agents with safety measures and result tracking
     """
 
-    def __init__(self, games_per_match: int = 5, timeout_seconds: int = 30):
+    def __init__(self, games_per_match: int = 5, timeout_seconds: int = 30, action_repeat: int = 1,
+                 seed: Optional[int] = None, early_stopping: Optional[str] = None,
+                 stopping_error: float = 0.05, stopping_margin: float = 0.3):
         """
         Initialize match runner
 
         Args:
             games_per_match: Number of games to play per match
             timeout_seconds: Maximum time allowed per match
+            action_repeat: Frames each agent action is held for (agents are queried every N frames)
+            seed: If set, game i of every match reseeds the env and both agents from seed + i
+            early_stopping: None (always play games_per_match), 'clinch' or 'sprt'
+                            (see SequentialStopping); games_per_match becomes the maximum
+            stopping_error: SPRT error rate for each direction
+            stopping_margin: SPRT distance of the tested win rates from 0.5
         """
         self.games_per_match = games_per_match
         self.timeout_seconds = timeout_seconds
+        self.action_repeat = action_repeat
+        self.seed = seed
+        self.stopping = None
+        if early_stopping:
+            self.stopping = SequentialStopping(early_stopping, stopping_error, stopping_margin)
 
         # Import training environment
         try:
@@ -63,15 +118,24 @@ class MatchRunner:
             agent1_total_fitness = 0.0
             agent2_total_fitness = 0.0
             games_completed = 0
+            stop_reason = 'completed'
 
-            env = self.env_class(headless=True)
+            env = self.env_class(headless=True, action_repeat=self.action_repeat)
 
             for game_num in range(self.games_per_match):
                 # Check timeout
                 if time.time() - start_time > self.timeout_seconds:
                     print(f"⏰ Match timeout after {games_completed} games")
+                    stop_reason = 'timeout'
                     break
 
+                # Stop early once the winner is settled
+                if self.stopping is not None:
+                    reason = self.stopping.check(agent1_wins, agent2_wins, self.games_per_match - game_num)
+                    if reason is not None:
+                        stop_reason = reason
+                        break
+
                 # Play single game
                 game_result = self._play_single_game(env, agent1, agent2, game_num)
 
@@ -121,6 +185,8 @@ class MatchRunner:
                     'agent1_wins': agent1_wins,
                     'agent2_wins': agent2_wins,
                     'draws': games_completed - agent1_wins - agent2_wins,
+                    'max_games': self.games_per_match,
+                    'stop_reason': stop_reason,
                     'match_duration': time.time() - start_time
                 }
             )
@@ -137,23 +203,31 @@ class MatchRunner:
             winner: 1 for agent1, 2 for agent2, 0 for draw
         """
         try:
-            state = env.reset()
+            if self.seed is not None:
+                self._seed_game(env, agent1, agent2, self.seed + game_num)
+
+            # CPU budgets are per game: arm them once here instead of on every decision
+            for agent in (agent1, agent2):
+                if hasattr(agent, 'reset_budget'):
+                    agent.reset_budget()
+
+            env.reset()
+            # Both agents' views, refreshed in place by every reset/step
+            observations = env.observations
             agent1_total_reward = 0.0
             agent2_total_reward = 0.0
 
             step_count = 0
-            max_steps = 3600  # 60 seconds at 60 FPS
+            # One step is one decision; the env covers action_repeat frames per step
+            max_steps = -(-env.max_steps // env.action_repeat)
 
             while step_count < max_steps:
                 # Get actions from both agents with safety
-                action1 = self._get_safe_action(agent1, state)
-
-                # Get opponent state for agent2
-                opponent_state = env.get_state(player_fighter=env.fighter2)
-                action2 = self._get_safe_action(agent2, opponent_state)
+                action1 = self._get_safe_action(agent1, observations[0])
+                action2 = self._get_safe_action(agent2, observations[1])
 
                 # Execute step
-                next_state, rewards, done, info = env.step(action1, action2)
+                _, rewards, done, info = env.step(action1, action2)
 
                 # Accumulate rewards
                 if isinstance(rewards, tuple):
@@ -165,7 +239,6 @@ class MatchRunner:
                 if done:
                     break
 
-                state = next_state
                 step_count += 1
 
             # Determine winner based on health
@@ -182,6 +255,13 @@ class MatchRunner:
             print(f"⚠️  Game {game_num} failed: {e}")
             return None
 
+    def _seed_game(self, env, agent1, agent2, game_seed: int):
+        """Seed the env and any agent exposing seed() so a game can be replayed exactly"""
+        env.seed(game_seed)
+        for player, agent in enumerate((agent1, agent2)):
+            if hasattr(agent, 'seed'):
+                agent.seed(game_seed * 2 + player)
+
     def _get_safe_action(self, agent, state) -> int:
         """
         Get action from agent with safety measures
@@ -235,15 +315,16 @@ class RuleBasedMatchRunner(MatchRunner):
     Specialized match runner for evaluating agents against rule-based opponents
     """
 
-    def __init__(self, rule_based_opponents: list, games_per_match: int = 10):
+    def __init__(self, rule_based_opponents: list, games_per_match: int = 10, action_repeat: int = 1):
         """
         Initialize rule-based match runner
 
         Args:
             rule_based_opponents: List of rule-based opponent instances
             games_per_match: Number of games per opponent
+            action_repeat: Frames each agent action is held for
         """
-        super().__init__(games_per_match)
+        super().__init__(games_per_match, action_repeat=action_repeat)
         self.rule_based_opponents = rule_based_opponents
 
     def evaluate_agent_vs_rule_based(self, agent) -> Dict[str, float]:
@@ -253,36 +334,48 @@ class RuleBasedMatchRunner(MatchRunner):
         Returns:
             Dictionary with evaluation metrics
         """
-        total_fitness = 0.0
-        total_wins = 0
-        total_games = 0
-
-        results = {}
-
-        for opponent in self.rule_based_opponents:
-            match_result = self.run_match(agent, opponent)
-
-            # Store individual opponent results
-            opponent_name = getattr(opponent, 'difficulty', 'unknown')
-            results[f'vs_{opponent_name}'] = {
-                'score': match_result.agent1_score,
-                'fitness': match_result.agent1_fitness,
-                'games': match_result.games_played
-            }
-
-            # Accumulate totals
-            total_fitness += match_result.agent1_fitness * match_result.games_played
-            total_wins += match_result.agent1_score * match_result.games_played
-            total_games += match_result.games_played
-
-        # Calculate overall metrics
-        results['overall'] = {
-            'avg_fitness': total_fitness / total_games if total_games > 0 else 0.0,
-            'win_rate': total_wins / total_games if total_games > 0 else 0.0,
-            'total_games': total_games
+        match_results = [self.run_match(agent, opponent) for opponent in self.rule_based_opponents]
+        return summarize_rule_based_results(self.rule_based_opponents, match_results)
+
+def summarize_rule_based_results(opponents: list, match_results: list) -> Dict[str, Any]:
+    """
+    Combine one agent's matches against rule-based opponents into evaluation metrics
+
+    Args:
+        opponents: Rule-based opponents, in the same order as match_results
+        match_results: TournamentResults with the evaluated agent as agent1
+
+    Returns:
+        Dictionary with per-opponent results and 'overall' metrics
+    """
+    total_fitness = 0.0
+    total_wins = 0
+    total_games = 0
+
+    results = {}
+
+    for opponent, match_result in zip(opponents, match_results):
+        # Store individual opponent results
+        opponent_name = getattr(opponent, 'difficulty', 'unknown')
+        results[f'vs_{opponent_name}'] = {
+            'score': match_result.agent1_score,
+            'fitness': match_result.agent1_fitness,
+            'games': match_result.games_played
         }
 
-        return results
+        # Accumulate totals
+        total_fitness += match_result.agent1_fitness * match_result.games_played
+        total_wins += match_result.agent1_score * match_result.games_played
+        total_games += match_result.games_played
+
+    # Calculate overall metrics
+    results['overall'] = {
+        'avg_fitness': total_fitness / total_games if total_games > 0 else 0.0,
+        'win_rate': total_wins / total_games if total_games > 0 else 0.0,
+        'total_games': total_games
+    }
+
+    return results
 
 def create_rule_based_opponents():
     """Create standard set of rule-based opponents for evaluation"""
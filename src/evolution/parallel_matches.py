@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Parallel Match Execution
+
+Runs batches of independent matches (one Swiss round, or a set of agents
+against the rule-based opponents) on a multiprocessing pool.
+
+Agents are not shipped to workers as live objects: each one is reduced to a
+small picklable AgentSpec (agent id plus code, or rule-based difficulty) and
+rebuilt fresh inside the worker for every match. Every match also gets its
+own seed, derived from the executor seed and the two agents' code, so
+results do not depend on which worker ran a match, how many workers there
+are, or when the pair was scheduled. With num_workers <= 1 the same code
+runs in-process.
+
+Because a match is fully determined by the code pair and the evaluation
+settings, results can be reused from a PayoffMatrix: only pairs that are
+missing from it are played. Peer matches are always played with the two
+agents in code-hash order (and reported back in the order requested), so a
+pair reuses its result whichever side it was scheduled on.
+
+With isolate_agents, evolved agents are compiled in AgentHostPool worker
+processes (see agent_host.py) instead of the process playing the match.
+"""
+import io
+import os
+import hashlib
+import sys
+import contextlib
+import multiprocessing as mp
+from multiprocessing import util
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Tuple, Dict, Any, Optional
+
+# Add parent directories to path for imports
+sys.path.append(os.path.dirname(__file__))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'training'))
+
+from swiss_tournament import TournamentResult
+from match_runner import MatchRunner, summarize_rule_based_results
+from agent_cache import code_hash
+from payoff_matrix import PayoffMatrix, evaluation_key
+from ratings import RatingStore
+
+# Match seeds stay below this so the per-game seeds (match seed + game index) fit in 31 bits
+MAX_MATCH_SEED = 2 ** 31 - 2 ** 16
+
+
+@dataclass
+class AgentSpec:
+    """Picklable recipe for rebuilding an agent inside a worker process"""
+    agent_id: str
+    code: Optional[str] = None          # Evolved agents (SafeAgent)
+    difficulty: Optional[str] = None    # Rule-based opponents (SimplePolicy)
+    timeout_seconds: float = 1.0
+    cpu_budget_seconds: Optional[float] = None
+
+    @classmethod
+    def from_agent(cls, agent) -> 'AgentSpec':
+        """Describe a SafeAgent or a rule-based SimplePolicy opponent"""
+        if getattr(agent, 'code', None) is not None:
+            return cls(agent.agent_id, code=agent.code,
+                       timeout_seconds=getattr(agent, 'timeout_seconds', 1.0),
+                       cpu_budget_seconds=getattr(agent, 'cpu_budget_seconds', None))
+        if getattr(agent, 'difficulty', None) is not None:
+            return cls(agent.agent_id, difficulty=agent.difficulty)
+        raise ValueError(f"Cannot run agent {getattr(agent, 'agent_id', agent)!r} in a worker: "
+                         f"it has neither code nor a rule-based difficulty")
+
+    @property
+    def key(self) -> str:
+        """What the agent plays like: its code hash, or its rule-based difficulty"""
+        if self.code is not None:
+            return code_hash(self.code)
+        return f"rule_based_{self.difficulty}"
+
+    def build(self, host_pool=None):
+        """Create a fresh agent from this spec, inside host_pool if given"""
+        if self.code is not None and host_pool is not None:
+            agent = host_pool.add_agent(self.agent_id, self.code, self.timeout_seconds,
+                                        cpu_budget_seconds=self.cpu_budget_seconds)
+            if agent is None:
+                raise RuntimeError("agent host unavailable")
+            return agent
+
+        if self.code is not None:
+            from safe_execution import SafeAgent
+            # The code was validated when the agent was created; skip the per-match compile banner
+            with contextlib.redirect_stdout(io.StringIO()):
+                agent = SafeAgent(self.agent_id, self.code, self.timeout_seconds,
+                                  cpu_budget_seconds=self.cpu_budget_seconds)
+            return agent
+
+        from models import SimplePolicy
+        agent = SimplePolicy(self.difficulty)
+        agent.agent_id = self.agent_id
+        return agent
+
+
+# Per-process settings, set by _init_worker (or directly for in-process runs)
+_runner_kwargs: Dict[str, Any] = {}
+_host_kwargs: Optional[Dict[str, Any]] = None
+_host_pool = None
+
+
+def _init_worker(runner_kwargs: Dict[str, Any], host_kwargs: Optional[Dict[str, Any]] = None):
+    """Pool initializer: remember how matches should be run in this process"""
+    global _runner_kwargs, _host_kwargs
+    _runner_kwargs = runner_kwargs
+    _host_kwargs = host_kwargs
+
+
+def _get_host_pool():
+    """This process's agent hosts, started on first use (None when agents run in-process)"""
+    global _host_pool
+    if _host_kwargs is None:
+        return None
+    if _host_pool is None or _host_pool.closed:
+        from agent_host import AgentHostPool
+        _host_pool = AgentHostPool(**_host_kwargs)
+        # Pool workers skip atexit; stop the hosts and free their shared memory on exit either way
+        util.Finalize(_host_pool, _host_pool.close, exitpriority=10)
+    return _host_pool
+
+
+def _run_match_task(task: Tuple[AgentSpec, AgentSpec, Optional[int]]):
+    """Play one match between freshly built agents"""
+    spec1, spec2, match_seed = task
+    runner = MatchRunner(seed=match_seed, **_runner_kwargs)
+    host_pool = _get_host_pool()
+    agents = []
+    try:
+        for spec in (spec1, spec2):
+            agents.append(spec.build(host_pool))
+        return runner.run_match(*agents)
+    except Exception as e:
+        return runner._create_error_result(spec1, spec2, f"Agent setup error: {e}")
+    finally:
+        if host_pool is not None:
+            for agent in agents:
+                if hasattr(agent, 'slot'):
+                    host_pool.remove_agent(agent)
+
+
+def _swapped(result: TournamentResult) -> TournamentResult:
+    """The same match result seen from the other side"""
+    metadata = dict(result.metadata)
+    if 'agent1_wins' in metadata:
+        metadata['agent1_wins'], metadata['agent2_wins'] = metadata['agent2_wins'], metadata['agent1_wins']
+    return TournamentResult(
+        agent1_id=result.agent2_id,
+        agent2_id=result.agent1_id,
+        agent1_score=result.agent2_score,
+        agent2_score=result.agent1_score,
+        agent1_fitness=result.agent2_fitness,
+        agent2_fitness=result.agent1_fitness,
+        games_played=result.games_played,
+        metadata=metadata
+    )
+
+
+class ParallelMatchExecutor:
+    """
+    Runs batches of matches on a process pool with deterministic per-match seeds
+    """
+
+    def __init__(self, num_workers: Optional[int] = None, games_per_match: int = 5,
+                 timeout_seconds: int = 30, action_repeat: int = 1, seed: Optional[int] = None,
+                 isolate_agents: bool = False, payoff_matrix: Optional[PayoffMatrix] = None,
+                 early_stopping: Optional[str] = None, stopping_error: float = 0.05,
+                 stopping_margin: float = 0.3, ratings: Optional[RatingStore] = None):
+        """
+        Initialize the executor
+
+        Args:
+            num_workers: Worker processes (None = all cores, <= 1 = run in-process)
+            games_per_match: Number of games to play per match
+            timeout_seconds: Maximum time allowed per match
+            action_repeat: Frames each agent action is held for
+            seed: Base seed; each match is seeded from it and the two agents' code (None = unseeded)
+            isolate_agents: Run evolved agent code in resource-limited host processes
+            payoff_matrix: Results to reuse and extend; pairs found there are not replayed
+            early_stopping: End matches once decided: None, 'clinch' or 'sprt' (see SequentialStopping)
+            stopping_error: SPRT error rate
+            stopping_margin: SPRT distance of the tested win rates from 0.5
+            ratings: RatingStore updated with every match played (reused results are not re-counted)
+        """
+        self.num_workers = (os.cpu_count() or 1) if num_workers is None else max(1, num_workers)
+        self.seed = seed
+        self.runner_kwargs = {
+            'games_per_match': games_per_match,
+            'timeout_seconds': timeout_seconds,
+            'action_repeat': action_repeat,
+            'early_stopping': early_stopping,
+            'stopping_error': stopping_error,
+            'stopping_margin': stopping_margin,
+        }
+        # Each match process hosts the two agents it is playing
+        self.host_kwargs = {'num_workers': 1, 'slots_per_worker': 2} if isolate_agents else None
+
+        self.payoff_matrix = payoff_matrix
+        self.ratings = ratings
+        stop_key = None
+        if early_stopping == 'sprt':
+            stop_key = f"sprt:{stopping_error}:{stopping_margin}"
+        elif early_stopping:
+            stop_key = early_stopping
+        self.eval_key = evaluation_key(seed, games_per_match, action_repeat, stop_key)
+
+        self.matches_played = 0
+        self.matches_reused = 0
+        self._pool = None
+
+    def _pair_seed(self, key1: str, key2: str) -> Optional[int]:
+        """Seed for a match between two pieces of agent code"""
+        if self.seed is None:
+            return None
+        digest = hashlib.sha256(f"{self.seed}|{key1}|{key2}".encode('utf-8')).digest()
+        return int.from_bytes(digest[:8], 'little') % MAX_MATCH_SEED
+
+    def _get_pool(self):
+        if self._pool is None:
+            # Not multiprocessing.Pool: its daemonic workers cannot start agent host processes
+            self._pool = ProcessPoolExecutor(self.num_workers, mp_context=mp.get_context(),
+                                             initializer=_init_worker,
+                                             initargs=(self.runner_kwargs, self.host_kwargs))
+        return self._pool
+
+    def run_matches(self, pairings: List[Tuple]) -> List:
+        """
+        Play a batch of independent matches
+
+        Args:
+            pairings: List of (agent1, agent2) tuples
+
+        Returns:
+            List of TournamentResults in the same order as pairings
+        """
+        results = [None] * len(pairings)
+        tasks = []
+        scheduled = []  # (index in pairings, played swapped)
+
+        for i, (agent1, agent2) in enumerate(pairings):
+            spec1, spec2 = AgentSpec.from_agent(agent1), AgentSpec.from_agent(agent2)
+            key1, key2 = spec1.key, spec2.key
+            swap = spec1.code is not None and spec2.code is not None and key1 > key2
+            if swap:
+                spec1, spec2, key1, key2 = spec2, spec1, key2, key1
+
+            if self.payoff_matrix is not None:
+                cached = self.payoff_matrix.lookup(key1, key2, self.eval_key, spec1.agent_id, spec2.agent_id)
+                if cached is not None:
+                    results[i] = _swapped(cached) if swap else cached
+                    self.matches_reused += 1
+                    continue
+
+            tasks.append((spec1, spec2, self._pair_seed(key1, key2)))
+            scheduled.append((i, swap))
+
+        if self.num_workers <= 1 or len(tasks) <= 1:
+            _init_worker(self.runner_kwargs, self.host_kwargs)
+            played = [_run_match_task(task) for task in tasks]
+        else:
+            played = list(self._get_pool().map(_run_match_task, tasks))
+        self.matches_played += len(played)
+
+        for (i, swap), (spec1, spec2, _), result in zip(scheduled, tasks, played):
+            if self.payoff_matrix is not None:
+                self.payoff_matrix.record(spec1.key, spec2.key, self.eval_key, result)
+            if self.ratings is not None:
+                self.ratings.record(spec1.key, spec2.key, result)
+            results[i] = _swapped(result) if swap else result
+
+        return results
+
+    def run_match(self, agent1, agent2):
+        """Play a single match (drop-in for MatchRunner.run_match)"""
+        return self.run_matches([(agent1, agent2)])[0]
+
+    def evaluate_vs_rule_based(self, agents: List, opponents: List) -> List[Dict[str, Any]]:
+        """
+        Evaluate several agents against every rule-based opponent in one batch
+
+        Returns:
+            One RuleBasedMatchRunner-style results dictionary per agent, in order
+        """
+        pairings = [(agent, opponent) for agent in agents for opponent in opponents]
+        match_results = self.run_matches(pairings)
+
+        n = len(opponents)
+        return [summarize_rule_based_results(opponents, match_results[i * n:(i + 1) * n])
+                for i in range(len(agents))]
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self.host_kwargs is not None and _host_pool is not None:
+            _host_pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Persistent Payoff Matrix
+
+Stores match results keyed by the code of the two agents and the
+evaluation settings (seed, games per match, action repeat, early stopping), so a pairing
+whose code has not changed (e.g. two elites carried into the next
+generation under new IDs, or an elite against a rule-based opponent) is
+played once per experiment rather than once per generation.
+
+Agent keys are code hashes for evolved agents and "rule_based_<difficulty>"
+for rule-based opponents. Results are stored in the orientation they were
+played (player 1 first) in payoff_matrix.json next to hall_of_fame.json.
+"""
+import os
+import json
+import time
+from dataclasses import asdict
+from typing import Dict, Any, Optional
+
+from swiss_tournament import TournamentResult
+
+
+def evaluation_key(seed: Optional[int], games_per_match: int, action_repeat: int,
+                   early_stopping: Optional[str] = None) -> str:
+    """Settings that decide a match's outcome besides the two agents"""
+    key = f"seed={seed}|games={games_per_match}|repeat={action_repeat}"
+    if early_stopping:
+        key += f"|stop={early_stopping}"
+    return key
+
+
+class PayoffMatrix:
+    """
+    Match results between pieces of agent code, optionally persisted to JSON
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the payoff matrix
+
+        Args:
+            path: JSON file to load from and save to (None = memory only)
+        """
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def _key(key1: str, key2: str, eval_key: str) -> str:
+        return f"{key1}|{key2}|{eval_key}"
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.entries = data.get('entries', {})
+            print(f"📁 Loaded {len(self.entries)} cached match results")
+        except Exception as e:
+            print(f"⚠️  Could not load payoff matrix: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Write the matrix to disk (no-op without a path)"""
+        if not self.path:
+            return
+        try:
+            data = {'last_updated': time.time(), 'entries': self.entries}
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"❌ Failed to save payoff matrix: {e}")
+
+    def lookup(self, key1: str, key2: str, eval_key: str,
+               agent1_id: str, agent2_id: str) -> Optional[TournamentResult]:
+        """
+        Cached result of key1 (as player 1) against key2, relabelled with the current agent IDs
+
+        Returns:
+            TournamentResult with metadata['cached'] = True, or None if the pair was never played
+        """
+        entry = self.entries.get(self._key(key1, key2, eval_key))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return TournamentResult(
+            agent1_id=agent1_id,
+            agent2_id=agent2_id,
+            agent1_score=entry['agent1_score'],
+            agent2_score=entry['agent2_score'],
+            agent1_fitness=entry['agent1_fitness'],
+            agent2_fitness=entry['agent2_fitness'],
+            games_played=entry['games_played'],
+            metadata=dict(entry['metadata'], cached=True)
+        )
+
+    def record(self, key1: str, key2: str, eval_key: str, result: TournamentResult):
+        """Store a completed match; failed matches are not cached so they get retried"""
+        if result.games_played == 0 or 'error' in result.metadata:
+            return
+        entry = asdict(result)
+        del entry['agent1_id'], entry['agent2_id']
+        entry['metadata'] = {k: v for k, v in entry['metadata'].items() if k != 'cached'}
+        self.entries[self._key(key1, key2, eval_key)] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
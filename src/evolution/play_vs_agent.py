@@ -20,6 +20,8 @@ from game_engine import GameEngine
 from fighter import Fighter
 from agent_serialization import AgentSerializer
 from safe_execution import SafeAgent
+from agent_cache import CompiledAgentCache
+from ratings import RatingStore
 
 class HumanVsAgentGame:
     """
@@ -57,7 +59,8 @@ class HumanVsAgentGame:
                 raise ValueError(f"Could not load agent from {self.agent_path}")
             
             # Create safe agent
-            self.agent = SafeAgent(agent_data.agent_id, agent_data.code)
+            self.agent = SafeAgent(agent_data.agent_id, agent_data.code,
+                                   cache=CompiledAgentCache.for_agent_file(self.agent_path))
             
             if not self.agent.is_valid:
                 raise ValueError(f"Agent failed to compile: {agent_data.agent_id}")
@@ -66,6 +69,8 @@ class HumanVsAgentGame:
             print(f"   Fitness: {agent_data.metadata.get('fitness', 'Unknown')}")
             print(f"   Fighting Style: {agent_data.metadata.get('fighting_style', 'Unknown')}")
             print(f"   Generation: {agent_data.metadata.get('generation', 'Unknown')}")
+            rating = RatingStore.for_agent_file(self.agent_path).get_for_code(agent_data.code)
+            print(f"   Rating: {rating if rating is not None else 'Unrated'}")
             
         except Exception as e:
             print(f"❌ Failed to load agent: {e}")
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Qualifier Stage
+
+Cheap fast-fail check between CodeValidator and the tournament. Each new
+agent plays a short battery of games (a few hundred frames each) against an
+idle opponent, a random opponent and SimplePolicy('easy'), and is rejected if
+it fails any threshold:
+- error rate: share of get_action calls that raised or timed out
+- latency: mean wall time per get_action call
+- behavior entropy: entropy of the agent's action distribution, so agents
+  that always idle or spam one action never reach full 3600-frame matches
+
+Games are seeded, so results depend only on the code; they are cached by code
+hash, and elites are not requalified every generation. Agents are qualified
+on a fresh SafeAgent, so errors in the qualifier don't count towards the
+population agent's error limit.
+"""
+import io
+import os
+import sys
+import time
+import contextlib
+import numpy as np
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'training'))
+
+from agent_cache import code_hash
+from safe_execution import SafeAgent
+
+NUM_ACTIONS = 10
+
+
+class IdlePolicy:
+    """Opponent that never acts"""
+
+    def seed(self, seed=None):
+        pass
+
+    def get_action(self, state):
+        return 0
+
+
+def create_qualifier_opponents() -> Dict[str, Any]:
+    """Idle, random and easy rule-based opponents, by name"""
+    from models import RandomPolicy, SimplePolicy
+    return {'idle': IdlePolicy(), 'random': RandomPolicy(), 'easy': SimplePolicy('easy')}
+
+
+def action_entropy(action_counts: np.ndarray) -> float:
+    """Shannon entropy (bits) of an action distribution given as counts"""
+    total = action_counts.sum()
+    if total == 0:
+        return 0.0
+    p = action_counts[action_counts > 0] / total
+    return max(0.0, float(-(p * np.log2(p)).sum()))
+
+
+@dataclass
+class QualifierResult:
+    """Outcome of an agent's qualifier battery"""
+    agent_id: str
+    passed: bool
+    reasons: List[str] = field(default_factory=list)
+    calls: int = 0
+    error_rate: float = 0.0
+    mean_latency_ms: float = 0.0
+    max_latency_ms: float = 0.0
+    entropy: float = 0.0
+    seconds: float = 0.0
+    last_error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class Qualifier:
+    """
+    Short games against weak opponents that reject broken or degenerate agents
+    """
+
+    def __init__(self, frames: int = 300, max_error_rate: float = 0.1, max_latency_ms: float = 5.0,
+                 min_entropy: float = 0.2, action_repeat: int = 1, timeout_seconds: float = 1.0,
+                 seed: int = 0, cache=None):
+        """
+        Initialize the qualifier
+
+        Args:
+            frames: Frames per game (one game against each opponent)
+            max_error_rate: Largest share of calls that may raise or time out
+            max_latency_ms: Largest mean wall time per get_action call
+            min_entropy: Smallest entropy (bits) of the agent's actions over all games
+                         (0.2 bits: about 97% of calls return the same action)
+            action_repeat: Frames each agent action is held for
+            timeout_seconds: CPU time per action
+            seed: Seed for the games, the random opponent and the agent
+            cache: Compiled code cache for the agents (None = the process-wide cache)
+        """
+        self.frames = frames
+        self.max_error_rate = max_error_rate
+        self.max_latency_ms = max_latency_ms
+        self.min_entropy = min_entropy
+        self.action_repeat = action_repeat
+        self.timeout_seconds = timeout_seconds
+        self.seed = seed
+        self.cache = cache
+        self.opponents = create_qualifier_opponents()
+        self._env = None
+        self.results: Dict[str, QualifierResult] = {}  # Code hash -> result
+
+        self.tested = 0
+        self.reused = 0
+        self.rejected = 0
+        self.time = 0.0
+        self._rejections: List[QualifierResult] = []
+
+    def _get_env(self):
+        if self._env is None:
+            from environment import FightingGameEnv
+            self._env = FightingGameEnv(headless=True, max_steps=self.frames, action_repeat=self.action_repeat)
+        return self._env
+
+    def qualify(self, agent_id: str, code: str) -> QualifierResult:
+        """
+        Run (or reuse) an agent's qualifier battery
+
+        Args:
+            agent_id: Agent to report the result for
+            code: Validated agent code
+
+        Returns:
+            QualifierResult; passed is False if any threshold failed
+        """
+        key = code_hash(code)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.reused += 1
+            result = QualifierResult(**{**cached.to_dict(), 'agent_id': agent_id, 'reasons': list(cached.reasons)})
+        else:
+            start = time.perf_counter()
+            result = self._run(agent_id, code)
+            result.seconds = time.perf_counter() - start
+            self.results[key] = result
+            self.tested += 1
+            self.time += result.seconds
+
+        if not result.passed:
+            self.rejected += 1
+            self._rejections.append(result)
+        return result
+
+    def _run(self, agent_id: str, code: str) -> QualifierResult:
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent = SafeAgent(agent_id, code, self.timeout_seconds, cache=self.cache)
+        if not agent.is_valid:
+            return QualifierResult(agent_id, False, ["does not compile"])
+
+        env = self._get_env()
+        counts = np.zeros(NUM_ACTIONS, dtype=np.int64)
+        latencies = []
+        too_slow = False
+        with contextlib.redirect_stdout(io.StringIO()):
+            for game, opponent in enumerate(self.opponents.values()):
+                if too_slow:
+                    break
+                env.seed(self.seed + game)
+                agent.seed(self.seed + game)
+                opponent.seed(self.seed + game)
+                agent.reset_budget()
+                env.reset()
+                observations = env.observations
+                done = False
+                while not done and not agent.is_disabled:
+                    call_start = time.perf_counter()
+                    action = agent.get_action(observations[0])
+                    latencies.append(time.perf_counter() - call_start)
+                    counts[action] += 1
+                    _, _, done, _ = env.step(action, opponent.get_action(observations[1]))
+                    # Slow agents fail on latency; don't spend the whole battery measuring them
+                    if len(latencies) % 20 == 0 and 1000 * np.mean(latencies) > 2 * self.max_latency_ms:
+                        too_slow = True
+                        break
+
+        calls = len(latencies)
+        failures = agent.total_errors + agent.total_timeouts
+        result = QualifierResult(
+            agent_id, True,
+            calls=calls,
+            error_rate=failures / max(1, calls),
+            mean_latency_ms=1000 * float(np.mean(latencies)) if latencies else 0.0,
+            max_latency_ms=1000 * float(np.max(latencies)) if latencies else 0.0,
+            entropy=action_entropy(counts),
+            last_error=agent.last_error
+        )
+
+        if agent.is_disabled:
+            result.reasons.append("disabled for excessive errors or timeouts")
+        if result.error_rate > self.max_error_rate:
+            result.reasons.append(f"error rate {result.error_rate:.0%} > {self.max_error_rate:.0%}"
+                                  + (f" ({result.last_error})" if result.last_error else ""))
+        if result.mean_latency_ms > self.max_latency_ms:
+            result.reasons.append(f"mean latency {result.mean_latency_ms:.2f}ms > {self.max_latency_ms:.2f}ms")
+        if result.entropy < self.min_entropy and not too_slow:
+            top_action = int(np.argmax(counts))
+            result.reasons.append(f"action entropy {result.entropy:.2f} bits < {self.min_entropy:.2f} "
+                                  f"({counts[top_action] / max(1, calls):.0%} action {top_action})")
+        result.passed = not result.reasons
+        return result
+
+    def take_report(self) -> Dict[str, Any]:
+        """Counts, time and rejection reasons since the last report (then starts a new one)"""
+        report = {
+            'tested': self.tested,
+            'reused': self.reused,
+            'rejected': self.rejected,
+            'seconds': round(self.time, 3),
+            'rejections': {result.agent_id: result.reasons for result in self._rejections},
+        }
+        self.tested = self.reused = self.rejected = 0
+        self.time = 0.0
+        self._rejections = []
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'tested': self.tested, 'reused': self.reused, 'rejected': self.rejected, 'time': self.time}
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Persistent Glicko Ratings
+
+Keeps a Glicko rating (rating plus rating deviation) for every piece of
+agent code ever played, across generations and experiments. Ratings are
+updated incrementally from each TournamentResult, counting every game of a
+match as one result against the opponent's pre-match rating, so a rating
+is only as certain as the evidence behind it.
+
+Players are keyed like the payoff matrix: code hashes for evolved agents
+(an elite carried into the next generation under a new ID keeps its
+rating) and "rule_based_<difficulty>" for rule-based opponents, which
+anchor the scale. The store lives in experiments/ratings.json, next to the
+experiment directories, so later experiments start from earlier ratings.
+
+Each generation is one rating period: advance_period() lets the deviation
+of agents that sit out grow again, up to the unrated deviation.
+
+Experiments running at the same time share the file, so save() merges
+under a file lock: it re-reads the file and applies this store's changes
+since it last loaded or saved (rating and count deltas; Glicko precision,
+1/deviation^2, is additive over independent results) instead of
+overwriting the other experiments' updates.
+"""
+import os
+import json
+import math
+import time
+import contextlib
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not locked
+    fcntl = None
+
+from agent_cache import code_hash
+from swiss_tournament import TournamentResult
+
+# Name of the shared rating file in the experiments directory
+RATINGS_FILE_NAME = "ratings.json"
+
+DEFAULT_RATING = 1500.0
+DEFAULT_DEVIATION = 350.0  # Deviation of an unrated agent
+MIN_DEVIATION = 30.0
+
+_Q = math.log(10) / 400
+
+
+@dataclass
+class Rating:
+    """Glicko rating of one agent"""
+    rating: float = DEFAULT_RATING
+    deviation: float = DEFAULT_DEVIATION
+    matches: int = 0
+    games: int = 0
+    last_period: int = 0
+
+    @property
+    def conservative(self) -> float:
+        """Rating the agent is ~97.5% likely to be above (rating - 2 deviations)"""
+        return self.rating - 2 * self.deviation
+
+    def __str__(self) -> str:
+        return f"{self.rating:.0f} +/- {2 * self.deviation:.0f}"
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Exclusive lock on path + '.lock' for the duration of the block (no-op without fcntl)"""
+    if fcntl is None:
+        yield
+        return
+    with open(f"{path}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _merge_rating(base: Rating, ours: Rating, theirs: Rating) -> Rating:
+    """Apply our changes to a rating since base on top of another writer's version of it"""
+    precision = 1 / theirs.deviation ** 2 + 1 / ours.deviation ** 2 - 1 / base.deviation ** 2
+    deviation = 1 / math.sqrt(precision) if precision > 0 else ours.deviation
+    return Rating(theirs.rating + ours.rating - base.rating,
+                  min(max(deviation, MIN_DEVIATION), DEFAULT_DEVIATION),
+                  theirs.matches + ours.matches - base.matches,
+                  theirs.games + ours.games - base.games,
+                  max(theirs.last_period, ours.last_period))
+
+
+def agent_key(agent) -> str:
+    """Rating key for a SafeAgent (code hash) or a rule-based SimplePolicy (difficulty)"""
+    code = getattr(agent, 'code', None)
+    if code is not None:
+        return code_hash(code)
+    return f"rule_based_{agent.difficulty}"
+
+
+def _g(deviation: float) -> float:
+    return 1 / math.sqrt(1 + 3 * (_Q * deviation) ** 2 / math.pi ** 2)
+
+
+def expected_score(rating: float, opponent_rating: float, opponent_deviation: float) -> float:
+    """Expected score of a player against an opponent of uncertain strength"""
+    return 1 / (1 + 10 ** (-_g(opponent_deviation) * (rating - opponent_rating) / 400))
+
+
+def glicko_update(rating: float, deviation: float,
+                  results: List[Tuple[float, float, float]]) -> Tuple[float, float]:
+    """
+    One Glicko rating-period update
+
+    Args:
+        rating: Player's rating before the period
+        deviation: Player's rating deviation before the period
+        results: (opponent rating, opponent deviation, score) for each game played
+
+    Returns:
+        (new rating, new deviation)
+    """
+    if not results:
+        return rating, deviation
+
+    d_inverse = 0.0
+    improvement = 0.0
+    for opponent_rating, opponent_deviation, score in results:
+        g = _g(opponent_deviation)
+        expected = expected_score(rating, opponent_rating, opponent_deviation)
+        d_inverse += _Q ** 2 * g ** 2 * expected * (1 - expected)
+        improvement += g * (score - expected)
+
+    precision = 1 / deviation ** 2 + d_inverse
+    new_rating = rating + _Q / precision * improvement
+    new_deviation = max(math.sqrt(1 / precision), MIN_DEVIATION)
+    return new_rating, new_deviation
+
+
+class RatingStore:
+    """
+    Glicko ratings for agent code, optionally persisted to JSON
+    """
+
+    def __init__(self, path: Optional[str] = None, period_growth: float = 50.0):
+        """
+        Initialize the rating store
+
+        Args:
+            path: JSON file to load from and save to (None = memory only)
+            period_growth: Deviation added (in quadrature) per rating period without play
+        """
+        self.path = path
+        self.period_growth = period_growth
+        self.ratings: Dict[str, Rating] = {}
+        self.period = 0
+        self.updates = 0
+        # Ratings and period as last read from or written to the file; save() merges our changes since
+        self._base: Dict[str, Rating] = {}
+        self._base_period = 0
+        self._load()
+
+    @classmethod
+    def for_experiment(cls, experiment_dir: str) -> 'RatingStore':
+        """Store shared by all experiments next to experiment_dir"""
+        experiments_dir = os.path.dirname(os.path.abspath(experiment_dir))
+        return cls(os.path.join(experiments_dir, RATINGS_FILE_NAME))
+
+    @classmethod
+    def for_agent_file(cls, agent_path: str) -> 'RatingStore':
+        """
+        Store for an agent file saved by an experiment (experiments/<name>/top_agents/*.py)
+
+        Falls back to an empty memory-only store if no ratings were saved.
+        """
+        experiment_dir = os.path.dirname(os.path.dirname(os.path.abspath(agent_path)))
+        path = os.path.join(os.path.dirname(experiment_dir), RATINGS_FILE_NAME)
+        return cls(path if os.path.exists(path) else None)
+
+    def _read(self) -> Tuple[int, Dict[str, Rating]]:
+        """Period and ratings stored in the file (empty if there is none)"""
+        if not os.path.exists(self.path):
+            return 0, {}
+        with open(self.path, 'r') as f:
+            data = json.load(f)
+        return data.get('period', 0), {key: Rating(**value) for key, value in data.get('ratings', {}).items()}
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            self.period, self.ratings = self._read()
+            print(f"📁 Loaded {len(self.ratings)} agent ratings")
+        except Exception as e:
+            print(f"⚠️  Could not load ratings: {e}")
+            self.ratings = {}
+        self._base, self._base_period = dict(self.ratings), self.period
+
+    def save(self):
+        """Merge the ratings into the file on disk (no-op without a path)"""
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with _file_lock(self.path):
+                try:
+                    period, ratings = self._read()
+                except (ValueError, TypeError) as e:
+                    print(f"⚠️  Overwriting unreadable ratings file: {e}")
+                    period, ratings = self._base_period, {}
+                period += self.period - self._base_period
+                for key, rating in self.ratings.items():
+                    base = self._base.get(key)
+                    if rating is base:
+                        continue  # Unchanged by this store
+                    theirs = ratings.get(key)
+                    ratings[key] = rating if theirs is None else _merge_rating(
+                        base or Rating(last_period=rating.last_period), rating, theirs)
+
+                data = {
+                    'last_updated': time.time(),
+                    'period': period,
+                    'ratings': {key: asdict(rating) for key, rating in ratings.items()}
+                }
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+
+            # Continue from the merged state, including other experiments' updates
+            self.ratings, self.period = ratings, period
+            self._base, self._base_period = dict(ratings), period
+        except Exception as e:
+            print(f"❌ Failed to save ratings: {e}")
+
+    def _current(self, key: str) -> Rating:
+        """Rating for key with its deviation grown for the periods it sat out"""
+        rating = self.ratings.get(key)
+        if rating is None:
+            return Rating(last_period=self.period)
+        idle_periods = self.period - rating.last_period
+        if idle_periods > 0:
+            deviation = math.sqrt(rating.deviation ** 2 + idle_periods * self.period_growth ** 2)
+            rating = Rating(rating.rating, min(deviation, DEFAULT_DEVIATION),
+                            rating.matches, rating.games, self.period)
+        return rating
+
+    def get(self, key: str) -> Optional[Rating]:
+        """Current rating for a key, or None if it was never rated"""
+        if key not in self.ratings:
+            return None
+        return self._current(key)
+
+    def get_for_code(self, code: str) -> Optional[Rating]:
+        return self.get(code_hash(code))
+
+    def get_for_agent(self, agent) -> Rating:
+        """Current rating of an agent object (the unrated default if it never played)"""
+        return self._current(agent_key(agent))
+
+    def record(self, key1: str, key2: str, result: TournamentResult):
+        """
+        Update both players from a match result
+
+        Each game counts as one result (wins, losses and draws from the match metadata);
+        without per-game counts the match score counts as a single game. Cached and failed
+        results are ignored, since they carry no new evidence.
+        """
+        metadata = result.metadata or {}
+        if result.games_played == 0 or 'error' in metadata or metadata.get('cached'):
+            return
+
+        if 'agent1_wins' in metadata:
+            wins, losses = metadata['agent1_wins'], metadata['agent2_wins']
+            scores = [1.0] * wins + [0.0] * losses + [0.5] * (result.games_played - wins - losses)
+        else:
+            scores = [result.agent1_score]
+
+        player1, player2 = self._current(key1), self._current(key2)
+        rating1, deviation1 = glicko_update(
+            player1.rating, player1.deviation,
+            [(player2.rating, player2.deviation, score) for score in scores])
+        rating2, deviation2 = glicko_update(
+            player2.rating, player2.deviation,
+            [(player1.rating, player1.deviation, 1.0 - score) for score in scores])
+
+        self.ratings[key1] = Rating(rating1, deviation1, player1.matches + 1,
+                                    player1.games + len(scores), self.period)
+        self.ratings[key2] = Rating(rating2, deviation2, player2.matches + 1,
+                                    player2.games + len(scores), self.period)
+        self.updates += 1
+
+    def advance_period(self):
+        """Start a new rating period (one per generation)"""
+        self.period += 1
+
+    def top(self, n: int = 10, conservative: bool = True) -> List[Tuple[str, Rating]]:
+        """Best-rated keys, by conservative rating unless conservative=False"""
+        current = [(key, self._current(key)) for key in self.ratings]
+        current.sort(key=lambda item: item[1].conservative if conservative else item[1].rating,
+                     reverse=True)
+        return current[:n]
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def get_stats(self):
+        return {'rated_agents': len(self.ratings), 'period': self.period, 'updates': self.updates}
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Columnar Tournament Result Store
+
+Keeps every match of a tournament as one row of a NumPy structured array
+(agent indices, scores, fitness, games, game wins, max games, duration,
+round and error/cached flags) instead of TournamentResult objects stored
+under both agents. The only metadata that doesn't fit a column, the error
+message of failed matches and the stop reason of matches that didn't play
+all their games, is kept in a sparse {row: note} map. Standings, strength of
+schedule and head-to-head records are computed with vectorized queries over
+the columns, and the whole store saves to a compressed .npz file for
+offline analysis:
+
+    data = np.load("generation_003_results.npz")
+    data['results']['agent1_score'], data['agent_ids']
+    failed = data['results']['flags'] & FLAG_ERROR != 0
+"""
+import json
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+# Agent index used in the agent2 column for a bye
+BYE_INDEX = -1
+
+RESULT_DTYPE = np.dtype([
+    ('round', np.int32),
+    ('agent1', np.int32),
+    ('agent2', np.int32),       # BYE_INDEX for a bye
+    ('agent1_score', np.float64),
+    ('agent2_score', np.float64),
+    ('agent1_fitness', np.float64),
+    ('agent2_fitness', np.float64),
+    ('games', np.int32),
+    ('agent1_wins', np.int32),
+    ('agent2_wins', np.int32),
+    ('max_games', np.int32),
+    ('duration', np.float32),
+    ('flags', np.uint8),        # FLAG_* bits
+])
+
+# Bits of the flags column
+FLAG_ERROR = 1        # The match failed (metadata['error']); its 0-0 result is not a real draw
+FLAG_CACHED = 2       # Reused from the payoff matrix instead of played
+FLAG_GAME_COUNTS = 4  # agent1_wins, agent2_wins and max_games are known (a MatchRunner result)
+
+# Stop reason of a match that played all its games (not stored per row)
+COMPLETED = 'completed'
+
+
+def _flags(metadata: Dict) -> int:
+    return ((FLAG_ERROR if 'error' in metadata else 0) | (FLAG_CACHED if metadata.get('cached') else 0)
+            | (FLAG_GAME_COUNTS if 'agent1_wins' in metadata else 0))
+
+
+def _note(metadata: Dict) -> Optional[Dict]:
+    """Metadata kept outside the columns: error message, or a stop reason other than completed"""
+    note = {}
+    if 'error' in metadata:
+        note['error'] = metadata['error']
+    if metadata.get('stop_reason', COMPLETED) != COMPLETED:
+        note['stop_reason'] = metadata['stop_reason']
+    return note or None
+
+
+class ResultStore:
+    """
+    Append-only table of match results between indexed agents
+    """
+
+    def __init__(self, agent_ids: List[str], capacity: int = 1024):
+        """
+        Initialize an empty store
+
+        Args:
+            agent_ids: Agent ID for each agent index
+            capacity: Rows to allocate up front (grows by doubling)
+        """
+        self.agent_ids = list(agent_ids)
+        self.index = {agent_id: i for i, agent_id in enumerate(self.agent_ids)}
+        self._rows = np.zeros(max(1, capacity), dtype=RESULT_DTYPE)
+        self._size = 0
+        self._notes: Dict[int, Dict] = {}  # Row -> error message / early stop reason (failed or stopped rows only)
+
+    @property
+    def n_agents(self) -> int:
+        return len(self.agent_ids)
+
+    @property
+    def rows(self) -> np.ndarray:
+        """View of the stored results"""
+        return self._rows[:self._size]
+
+    def __len__(self):
+        return self._size
+
+    def append(self, round_num: int, agent1: int, agent2: int, agent1_score: float, agent2_score: float,
+               agent1_fitness: float, agent2_fitness: float, games: int, duration: float = 0.0,
+               metadata: Optional[Dict] = None):
+        """Add one match result (agent2 = BYE_INDEX for a bye); game counts and flags come from metadata"""
+        metadata = metadata or {}
+        if self._size == len(self._rows):
+            grown = np.zeros(2 * len(self._rows), dtype=RESULT_DTYPE)
+            grown[:self._size] = self._rows
+            self._rows = grown
+        self._rows[self._size] = (round_num, agent1, agent2, agent1_score, agent2_score,
+                                  agent1_fitness, agent2_fitness, games,
+                                  metadata.get('agent1_wins', 0), metadata.get('agent2_wins', 0),
+                                  metadata.get('max_games', 0), duration, _flags(metadata))
+        note = _note(metadata)
+        if note is not None:
+            self._notes[self._size] = note
+        self._size += 1
+
+    def metadata(self, row: int) -> Dict:
+        """Match metadata of a row, rebuilt from its columns and note"""
+        values = self._rows[row]
+        flags = int(values['flags'])
+        metadata = {}
+        if flags & FLAG_GAME_COUNTS:
+            wins1, wins2 = int(values['agent1_wins']), int(values['agent2_wins'])
+            metadata.update(agent1_wins=wins1, agent2_wins=wins2, draws=int(values['games']) - wins1 - wins2,
+                            max_games=int(values['max_games']), stop_reason=COMPLETED,
+                            match_duration=float(values['duration']))
+        if flags & FLAG_CACHED:
+            metadata['cached'] = True
+        metadata.update(self._notes.get(row, {}))
+        return metadata
+
+    def standings(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Per-agent totals
+
+        Returns:
+            (wins, matches played excluding byes, total fitness) arrays indexed by agent
+        """
+        rows = self.rows
+        n = self.n_agents
+        played = rows['agent2'] != BYE_INDEX
+
+        wins = np.bincount(rows['agent1'], rows['agent1_score'], n)
+        wins += np.bincount(rows['agent2'][played], rows['agent2_score'][played], n)
+        fitness = np.bincount(rows['agent1'], rows['agent1_fitness'], n)
+        fitness += np.bincount(rows['agent2'][played], rows['agent2_fitness'][played], n)
+        matches = np.bincount(rows['agent1'][played], minlength=n)
+        matches += np.bincount(rows['agent2'][played], minlength=n)
+        return wins, matches, fitness
+
+    def opponent_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct (agent, opponent) index pairs, in both directions"""
+        rows = self.rows
+        played = rows['agent2'] != BYE_INDEX
+        a1 = rows['agent1'][played].astype(np.int64)
+        a2 = rows['agent2'][played].astype(np.int64)
+        codes = np.unique(np.concatenate([a1 * self.n_agents + a2, a2 * self.n_agents + a1]))
+        return codes // self.n_agents, codes % self.n_agents
+
+    def strength_of_schedule(self, win_rates: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Average win rate of the distinct opponents each agent faced (0 if none)
+
+        Args:
+            win_rates: Per-agent win rates (default: wins / matches from standings())
+        """
+        if win_rates is None:
+            wins, matches, _ = self.standings()
+            win_rates = np.divide(wins, matches, out=np.zeros_like(wins), where=matches > 0)
+
+        agents, opponents = self.opponent_pairs()
+        total = np.bincount(agents, win_rates[opponents], self.n_agents)
+        count = np.bincount(agents, minlength=self.n_agents)
+        return np.divide(total, count, out=np.zeros_like(total), where=count > 0)
+
+    def head_to_head(self, agent: int, opponent: int) -> Dict[str, int]:
+        """Match wins, losses and draws of agent against opponent"""
+        rows = self.rows
+        forward = (rows['agent1'] == agent) & (rows['agent2'] == opponent)
+        backward = (rows['agent1'] == opponent) & (rows['agent2'] == agent)
+        scores = np.concatenate([rows['agent1_score'][forward], rows['agent2_score'][backward]])
+        return {
+            'matches': int(len(scores)),
+            'wins': int(np.sum(scores == 1.0)),
+            'losses': int(np.sum(scores == 0.0)),
+            'draws': int(np.sum(scores == 0.5)),
+        }
+
+    def score_matrix(self, agents: Optional[List[int]] = None) -> np.ndarray:
+        """
+        Total match score of each agent (row) against each other agent (column)
+
+        Args:
+            agents: Agent indices to include (default: all; the matrix is dense)
+        """
+        agents = np.arange(self.n_agents) if agents is None else np.asarray(agents)
+        position = np.full(self.n_agents, -1)
+        position[agents] = np.arange(len(agents))
+
+        rows = self.rows[self.rows['agent2'] != BYE_INDEX]
+        p1, p2 = position[rows['agent1']], position[rows['agent2']]
+        keep = (p1 >= 0) & (p2 >= 0)
+
+        matrix = np.zeros((len(agents), len(agents)))
+        np.add.at(matrix, (p1[keep], p2[keep]), rows['agent1_score'][keep])
+        np.add.at(matrix, (p2[keep], p1[keep]), rows['agent2_score'][keep])
+        return matrix
+
+    def save(self, path: str):
+        """Write the results, agent IDs and row notes (JSON) to a compressed .npz file"""
+        np.savez_compressed(path, results=self.rows, agent_ids=np.array(self.agent_ids),
+                            note_rows=np.array(list(self._notes), dtype=np.int64),
+                            notes=np.array([json.dumps(note) for note in self._notes.values()], dtype=str))
+
+    @classmethod
+    def load(cls, path: str) -> 'ResultStore':
+        """Read a store written by save() (columns missing from older files load zeroed)"""
+        with np.load(path) as data:
+            results = data['results']
+            store = cls(data['agent_ids'].tolist(), capacity=len(results))
+            for name in results.dtype.names:
+                if name in RESULT_DTYPE.names:
+                    store._rows[name][:len(results)] = results[name]
+            store._size = len(results)
+            if 'notes' in data:
+                store._notes = {int(row): json.loads(note) for row, note in zip(data['note_rows'], data['notes'])}
+        return store
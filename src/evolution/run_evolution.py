@@ -179,11 +179,14 @@ def interactive_menu():
                     gen = input("Generations (default 10): ").strip() or "10"
                     games = input("Games per match (default 3): ").strip() or "3"
                     name = input("Experiment name (optional): ").strip() or None
+                    seed = input("Seed (optional; only seeded runs cache LLM responses, so reusing a seed replays them): ").strip() or None
                     
                     original_argv = sys.argv.copy()
                     sys.argv = ['evolution_runner.py', '--population', pop, '--generations', gen, '--games-per-match', games]
                     if name:
                         sys.argv.extend(['--experiment-name', name])
+                    if seed:
+                        sys.argv.extend(['--seed', seed])
                     
                     result = evolution_main()
                     sys.argv = original_argv
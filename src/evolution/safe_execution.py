@@ -5,45 +5,87 @@ Safe Execution Environment for Evolutionary Agents
 Provides isolated execution of LLM-generated agent code with
 timeout protection, resource limits, and error handling.
 """
-import signal
 import sys
 import time
+import types
+import random
 import traceback
 import numpy as np
 from typing import Any, Dict, Optional, Callable
-from contextlib import contextmanager
 
-class TimeoutError(Exception):
-    """Raised when code execution times out"""
+from cpu_watchdog import CPUBudget
+from agent_cache import CompiledAgentCache, get_agent_cache
+
+class TimeoutError(BaseException):
+    """
+    Raised when code execution times out
+
+    Injected into agent code by the CPU watchdog; a BaseException, so agent
+    code catching Exception cannot swallow it.
+    """
     pass
 
 class SafeExecutionError(Exception):
     """Raised when safe execution fails"""
     pass
 
+def _seeded_module(module, generator, default_generator):
+    """
+    Copy of a module whose module-level random functions draw from `generator`.
+
+    random and numpy.random expose their functions as bound methods of one
+    hidden global generator; those are swapped for the same methods on a
+    private generator, everything else is shared with the real module.
+    """
+    proxy = types.ModuleType(module.__name__)
+    proxy.__dict__.update(module.__dict__)
+    for name, value in module.__dict__.items():
+        if getattr(value, '__self__', None) is default_generator:
+            setattr(proxy, name, getattr(generator, name))
+    return proxy
+
+
 class SafeAgent:
     """
     Safely executes LLM-generated agent code with protection mechanisms
     """
 
-    def __init__(self, agent_id: str, code: str, timeout_seconds: float = 1.0):
+    def __init__(self, agent_id: str, code: str, timeout_seconds: float = 1.0, seed: Optional[int] = None,
+                 cpu_budget_seconds: Optional[float] = None, cache: Optional[CompiledAgentCache] = None):
         """
         Initialize safe agent
 
         Args:
             agent_id: Unique identifier for the agent
             code: Validated Python code string
-            timeout_seconds: Maximum execution time per action
+            timeout_seconds: Maximum CPU time per action
+            seed: Seed for the agent's private random/numpy.random streams (None = unseeded)
+            cpu_budget_seconds: Cumulative CPU time allowed between reset_budget() calls,
+                                i.e. per game when run by MatchRunner (None = unlimited)
+            cache: Compiled code cache (None = the process-wide in-memory cache)
         """
         self.agent_id = agent_id
         self.code = code
         self.timeout_seconds = timeout_seconds
+        self.cpu_budget_seconds = cpu_budget_seconds
+        self.cache = cache or get_agent_cache()
+
+        # Enforced by the process-wide watchdog thread; nothing is armed per call
+        self.budget = CPUBudget(timeout_seconds, cpu_budget_seconds, exception=TimeoutError)
+
+        # Private random streams so agents are reproducible and don't share global state
+        self.py_random = random.Random()
+        self.np_random = np.random.RandomState()
+        self.seed(seed)
 
         # Execution statistics
         self.total_calls = 0
         self.total_errors = 0
         self.total_timeouts = 0
+        self.budget_exhaustions = 0
+        self._budget_spent = False
         self.avg_execution_time = 0.0
+        self.last_error: Optional[str] = None
         self.is_disabled = False
 
         # Compile the agent code
@@ -56,8 +98,8 @@ class SafeAgent:
             # Create safe execution environment
             safe_globals = self._create_safe_globals()
 
-            # Execute the code to define functions
-            exec(self.code, safe_globals)
+            # Execute the code to define functions (parsed once per distinct code)
+            exec(self.cache.get_code_object(self.code), safe_globals)
 
             # Extract the get_action function
             if 'get_action' in safe_globals:
@@ -71,6 +113,16 @@ class SafeAgent:
             self.is_disabled = True
             self.get_action_func = None
 
+    def seed(self, seed: Optional[int] = None):
+        """Reseed the agent's random and numpy.random streams"""
+        self.py_random.seed(seed)
+        self.np_random.seed(None if seed is None else seed % (2 ** 32))
+
+    def reset_budget(self, cpu_budget_seconds: Optional[float] = None):
+        """Start a new cumulative CPU budget period (called once per game)"""
+        self.budget.reset(cpu_budget_seconds)
+        self._budget_spent = False
+
     def get_action(self, state: np.ndarray) -> int:
         """
         Safely execute agent's get_action function
@@ -87,19 +139,28 @@ class SafeAgent:
         self.total_calls += 1
 
         try:
-            start_time = time.time()
-
             # Execute with timeout protection
-            with self._timeout_context(self.timeout_seconds):
+            if not self.budget.begin():
+                # Budget for this period is spent: idle until the next reset
+                if not self._budget_spent:
+                    self._budget_spent = True
+                    self.budget_exhaustions += 1
+                return 0
+            try:
                 action = self.get_action_func(state)
+            finally:
+                execution_time = self.budget.end()
+            if self.budget.interrupted:
+                # The agent caught the watchdog's interrupt and returned anyway
+                raise TimeoutError()
 
-            execution_time = time.time() - start_time
             self._update_timing_stats(execution_time)
 
             # Validate and return action
             return self._validate_action(action)
 
         except TimeoutError:
+            self.budget.end()
             self.total_timeouts += 1
             self._handle_timeout()
             return 0
@@ -109,12 +170,56 @@ class SafeAgent:
             self._handle_error(e)
             return 0
 
+    def get_actions(self, states: np.ndarray, budget_seconds: Optional[float] = None) -> np.ndarray:
+        """
+        Actions for a batch of states (e.g. a probe bank), one get_action call each
+
+        Args:
+            states: (n, state_size) observations
+            budget_seconds: Cumulative CPU time for the whole batch (None = unlimited); the
+                            agent's own budget period is restored afterwards
+
+        Returns:
+            (n,) int8 actions, 0 where the agent failed or ran out of budget
+        """
+        total_seconds = self.budget.total_seconds
+        self.budget.total_seconds = budget_seconds
+        self.reset_budget()
+        try:
+            return np.fromiter((self.get_action(state) for state in states), dtype=np.int8, count=len(states))
+        finally:
+            self.budget.total_seconds = total_seconds
+            self.reset_budget()
+
     def _create_safe_globals(self) -> Dict[str, Any]:
         """Create restricted global environment for code execution"""
-        import numpy as np
-        import random
         import math
 
+        # random and numpy (including `import` inside the agent) resolve to per-agent seeded copies
+        agent_random = _seeded_module(random, self.py_random, random._inst)
+        agent_np_random = _seeded_module(np.random, self.np_random, np.random.mtrand._rand)
+        agent_np = types.ModuleType(np.__name__)
+        agent_np.__dict__.update(np.__dict__)
+        agent_np.random = agent_np_random
+        agent_modules = {
+            'random': agent_random,
+            'math': math,
+            'numpy': agent_np,
+            'numpy.random': agent_np_random,
+        }
+
+        def agent_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only random, math and numpy can be imported; anything else (os, sys, ...) is refused
+            top = name.split('.')[0]
+            if level != 0 or top not in agent_modules:
+                raise ImportError(f"import of '{name}' is not allowed in agent code")
+            # `import numpy.random` binds the top-level package; `from numpy.random import x` needs the submodule
+            if not fromlist:
+                return agent_modules[top]
+            if name in agent_modules:
+                return agent_modules[name]
+            return __import__(name, globals, locals, fromlist, level)  # Other numpy submodules, e.g. numpy.linalg
+
         # Restricted builtins
         safe_builtins = {
             # Basic types
@@ -153,41 +258,17 @@ class SafeAgent:
             'KeyError': KeyError,
 
             # Import functionality (needed for agent code)
-            '__import__': __import__,
+            '__import__': agent_import,
         }
 
         return {
             '__builtins__': safe_builtins,
-            'np': np,
-            'numpy': np,
-            'random': random,
+            'np': agent_np,
+            'numpy': agent_np,
+            'random': agent_random,
             'math': math,
         }
 
-    @contextmanager
-    def _timeout_context(self, seconds: float):
-        """Context manager for timeout protection"""
-        def timeout_handler(signum, frame):
-            raise TimeoutError(f"Agent {self.agent_id} execution timed out after {seconds}s")
-
-        # Set up signal handler (Unix/Linux/Mac only)
-        if hasattr(signal, 'SIGALRM'):
-            old_handler = signal.signal(signal.SIGALRM, timeout_handler)
-            signal.setitimer(signal.ITIMER_REAL, seconds)
-
-            try:
-                yield
-            finally:
-                signal.alarm(0)  # Cancel the alarm
-                signal.signal(signal.SIGALRM, old_handler)
-        else:
-            # Fallback for Windows (no signal support)
-            # Use simple time-based check (less precise)
-            start_time = time.time()
-            yield
-            if time.time() - start_time > seconds:
-                raise TimeoutError(f"Agent {self.agent_id} execution took too long")
-
     def _validate_action(self, action: Any) -> int:
         """Validate and normalize action output"""
         try:
@@ -220,6 +301,8 @@ class SafeAgent:
 
     def _handle_error(self, error: Exception):
         """Handle execution errors"""
+        self.last_error = f"{type(error).__name__}: {error}"
+
         # Only print first few errors to avoid spam
         if self.total_errors <= 3:
             print(f"⚠️  Agent {self.agent_id} error: {error}")
@@ -238,6 +321,8 @@ class SafeAgent:
             'total_timeouts': self.total_timeouts,
             'error_rate': self.total_errors / max(1, self.total_calls),
             'timeout_rate': self.total_timeouts / max(1, self.total_calls),
+            'budget_exhaustions': self.budget_exhaustions,
+            'cpu_used': self.budget.used,
             'avg_execution_time': self.avg_execution_time,
             'is_disabled': self.is_disabled
         }
@@ -252,11 +337,13 @@ class AgentPool:
     Manages a pool of safe agents with monitoring and cleanup
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[CompiledAgentCache] = None):
         self.agents: Dict[str, SafeAgent] = {}
+        self.cache = cache
         self.creation_time = time.time()
 
-    def add_agent(self, agent_id: str, code: str, timeout_seconds: float = 1.0) -> bool:
+    def add_agent(self, agent_id: str, code: str, timeout_seconds: float = 1.0,
+                  cpu_budget_seconds: Optional[float] = None) -> bool:
         """
         Add a new agent to the pool
 
@@ -264,7 +351,8 @@ class AgentPool:
             True if agent was successfully added, False otherwise
         """
         try:
-            agent = SafeAgent(agent_id, code, timeout_seconds)
+            agent = SafeAgent(agent_id, code, timeout_seconds, cpu_budget_seconds=cpu_budget_seconds,
+                              cache=self.cache)
             if agent.is_valid:
                 self.agents[agent_id] = agent
                 return True
@@ -335,12 +423,12 @@ def get_action(state):
     action = agent.get_action(test_state)
     print(f"Valid agent test: {'✅ PASS' if action == 4 else '❌ FAIL'} (action: {action})")
 
-    # Test 2: Timeout protection
+    # Test 2: Timeout protection (CPU time, so the agent has to actually spin)
     timeout_code = """
 def get_action(state):
-    import time
-    time.sleep(2)  # This should timeout
-    return 0
+    total = 0
+    while True:
+        total += 1  # This should timeout
 """
 
     timeout_agent = SafeAgent("test_timeout", timeout_code, timeout_seconds=0.1)
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Surrogate Fitness Model
+
+Predicts an agent's fitness from its behavior, so that only the promising
+part of a generation gets a full Swiss tournament and rule-based evaluation.
+Features come from the agent's fingerprint on the probe-state bank
+(fingerprints.py): how often it picks each action at close, medium and far
+range, how often when losing, even or winning on health, and how often it
+moves toward or away from the opponent.
+
+The model is a small ensemble of one-hidden-layer MLPs in NumPy. It is
+trained on the hall_of_fame.json records of past experiments and on every
+agent fully evaluated so far in this one, and refitted whenever new results
+arrive. Agents whose fitness is already known (elites) are always evaluated,
+and a few screened-out agents can be evaluated anyway (audited) to measure
+what screening misses.
+"""
+import os
+import glob
+import json
+import math
+import random
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from agent_cache import code_hash
+from fingerprints import NUM_ACTIONS
+
+# Context ranges on the probe states (see prompt_templates.py TACTICAL RANGES)
+DISTANCE_RANGES = ((0.0, 0.15), (0.15, 0.3), (0.3, math.inf))   # state[22]
+HEALTH_RANGES = ((-math.inf, -0.2), (-0.2, 0.2), (0.2, math.inf))  # state[25]
+MOVE_RIGHT = (2, 8)
+MOVE_LEFT = (1, 7)
+
+
+def behavior_features(fingerprints: np.ndarray, bank: np.ndarray) -> np.ndarray:
+    """
+    Behavior features of agents from their fingerprints
+
+    Args:
+        fingerprints: (n_agents, bank_size) actions on the probe bank
+        bank: (bank_size, 26) probe states
+
+    Returns:
+        (n_agents, 62) float32: action shares per distance range (30) and per
+        health range (30), then the shares of states moving toward and away
+        from the opponent
+    """
+    fingerprints = np.asarray(fingerprints)
+    contexts = ([(bank[:, 22] >= low) & (bank[:, 22] < high) for low, high in DISTANCE_RANGES] +
+                [(bank[:, 25] >= low) & (bank[:, 25] < high) for low, high in HEALTH_RANGES])
+
+    columns = []
+    for mask in contexts:
+        actions = fingerprints[:, mask]
+        for action in range(NUM_ACTIONS):
+            columns.append(np.mean(actions == action, axis=1) if actions.shape[1] else
+                           np.zeros(len(fingerprints)))
+
+    # state[23] > 0: the opponent is to the right
+    right = bank[:, 23] > 0
+    moves_right = np.isin(fingerprints, MOVE_RIGHT)
+    moves_left = np.isin(fingerprints, MOVE_LEFT)
+    columns.append(np.mean(np.where(right, moves_right, moves_left), axis=1))
+    columns.append(np.mean(np.where(right, moves_left, moves_right), axis=1))
+    return np.stack(columns, axis=1).astype(np.float32)
+
+
+def rank_correlation(x: Sequence[float], y: Sequence[float]) -> Optional[float]:
+    """Spearman rank correlation (ties share their mean rank); None if undefined"""
+    def ranks(values):
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(values, kind='mergesort')
+        ranked = np.empty(len(values))
+        ranked[order] = np.arange(len(values))
+        for value in np.unique(values):
+            tied = values == value
+            ranked[tied] = ranked[tied].mean()
+        return ranked
+
+    if len(x) < 2:
+        return None
+    rx, ry = ranks(x), ranks(y)
+    if rx.std() == 0 or ry.std() == 0:
+        return None
+    return float(np.corrcoef(rx, ry)[0, 1])
+
+
+class MLPRegressor:
+    """
+    Ensemble of one-hidden-layer tanh networks trained full-batch with Adam
+    """
+
+    def __init__(self, hidden: int = 16, members: int = 3, epochs: int = 400,
+                 learning_rate: float = 0.01, weight_decay: float = 1e-3, seed: int = 0):
+        """
+        Initialize the regressor
+
+        Args:
+            hidden: Hidden units per network
+            members: Networks in the ensemble (predictions are averaged)
+            epochs: Full-batch training steps
+            learning_rate: Adam step size
+            weight_decay: L2 penalty on the weights
+            seed: Seed for weight initialization
+        """
+        self.hidden = hidden
+        self.members = members
+        self.epochs = epochs
+        self.learning_rate = learning_rate
+        self.weight_decay = weight_decay
+        self.seed = seed
+        self._networks: List[List[np.ndarray]] = []
+
+    def fit(self, features: np.ndarray, targets: np.ndarray) -> 'MLPRegressor':
+        features = np.asarray(features, dtype=np.float64)
+        targets = np.asarray(targets, dtype=np.float64)
+        self._x_mean = features.mean(axis=0)
+        self._x_std = np.maximum(features.std(axis=0), 1e-6)
+        self._y_mean = targets.mean()
+        self._y_std = max(targets.std(), 1e-6)
+        x = (features - self._x_mean) / self._x_std
+        y = (targets - self._y_mean) / self._y_std
+
+        rng = np.random.default_rng(self.seed)
+        self._networks = [self._train(x, y, rng) for _ in range(self.members)]
+        return self
+
+    def _train(self, x: np.ndarray, y: np.ndarray, rng: np.random.Generator) -> List[np.ndarray]:
+        n, d = x.shape
+        params = [rng.normal(0.0, 1.0 / math.sqrt(d), (d, self.hidden)), np.zeros(self.hidden),
+                  rng.normal(0.0, 1.0 / math.sqrt(self.hidden), self.hidden), np.zeros(1)]
+        moments = [np.zeros_like(p) for p in params]
+        velocities = [np.zeros_like(p) for p in params]
+        beta1, beta2 = 0.9, 0.999
+
+        for step in range(1, self.epochs + 1):
+            w1, b1, w2, b2 = params
+            hidden = np.tanh(x @ w1 + b1)
+            error = 2.0 * (hidden @ w2 + b2 - y) / n
+            d_hidden = np.outer(error, w2) * (1.0 - hidden ** 2)
+            grads = [x.T @ d_hidden + 2.0 * self.weight_decay * w1, d_hidden.sum(axis=0),
+                     hidden.T @ error + 2.0 * self.weight_decay * w2, np.array([error.sum()])]
+
+            for p, g, m, v in zip(params, grads, moments, velocities):
+                m *= beta1
+                m += (1 - beta1) * g
+                v *= beta2
+                v += (1 - beta2) * g * g
+                p -= self.learning_rate * (m / (1 - beta1 ** step)) / (np.sqrt(v / (1 - beta2 ** step)) + 1e-8)
+        return params
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        x = (np.asarray(features, dtype=np.float64) - self._x_mean) / self._x_std
+        outputs = [np.tanh(x @ w1 + b1) @ w2 + b2 for w1, b1, w2, b2 in self._networks]
+        return np.mean(outputs, axis=0) * self._y_std + self._y_mean
+
+
+def load_hall_of_fame_records(experiments_dir: str, limit: int = 200) -> List[Tuple[str, float]]:
+    """
+    (code, fitness) of agents in every experiment's hall_of_fame.json
+
+    Args:
+        experiments_dir: Directory holding experiment directories
+        limit: Most records to return, spread evenly over the fitness range
+
+    Returns:
+        Records sorted by fitness, best first
+    """
+    records = {}
+    for path in sorted(glob.glob(os.path.join(experiments_dir, '*', 'hall_of_fame.json'))):
+        try:
+            with open(path, 'r') as f:
+                agents = json.load(f).get('agents', [])
+        except Exception as e:
+            print(f"⚠️  Could not read {path}: {e}")
+            continue
+        for agent in agents:
+            if agent.get('code'):
+                records[code_hash(agent['code'])] = (agent['code'], float(agent['fitness']))
+
+    ranked = sorted(records.values(), key=lambda record: record[1], reverse=True)
+    if len(ranked) > limit:
+        ranked = [ranked[i] for i in np.linspace(0, len(ranked) - 1, limit).round().astype(int)]
+    return ranked
+
+
+class FitnessSurrogate:
+    """
+    Fitness predictions from behavior features, for screening candidates before evaluation
+    """
+
+    def __init__(self, store, min_records: int = 30, seed: int = 0, **model_kwargs):
+        """
+        Initialize the surrogate
+
+        Args:
+            store: FingerprintStore that fingerprints agent code on the probe bank
+            min_records: Known fitness values needed before the model predicts
+            seed: Seed for the model and for picking audited agents
+            **model_kwargs: MLPRegressor parameters
+        """
+        self.store = store
+        self.min_records = min_records
+        self.seed = seed
+        self.model_kwargs = model_kwargs
+        self.fitness: Dict[str, float] = {}  # Code hash -> latest measured fitness
+        self.codes: Dict[str, str] = {}
+        self._features: Dict[str, np.ndarray] = {}
+        self._model: Optional[MLPRegressor] = None
+        self._fitted_records = 0
+        self._stale = True
+
+    @classmethod
+    def for_experiment(cls, experiment_dir: str, store, history_limit: int = 200, **kwargs) -> 'FitnessSurrogate':
+        """Surrogate seeded with the hall of fame of every experiment next to experiment_dir"""
+        surrogate = cls(store, **kwargs)
+        experiments_dir = os.path.dirname(os.path.abspath(experiment_dir))
+        records = load_hall_of_fame_records(experiments_dir, history_limit)
+        if records:
+            codes, fitness = zip(*records)
+            surrogate.add_results(codes, fitness)
+        return surrogate
+
+    def add_results(self, codes: Sequence[str], fitness: Sequence[float]):
+        """Record measured fitness for agent code (later results replace earlier ones)"""
+        for code, value in zip(codes, fitness):
+            key = code_hash(code)
+            self.fitness[key] = float(value)
+            self.codes[key] = code
+        self._stale = True
+
+    def knows(self, code: str) -> bool:
+        """Whether the fitness of this code has been measured"""
+        return code_hash(code) in self.fitness
+
+    @property
+    def ready(self) -> bool:
+        return len(self.fitness) >= self.min_records
+
+    def _feature_rows(self, codes: Sequence[str]) -> np.ndarray:
+        keys = [code_hash(code) for code in codes]
+        missing = [code for key, code in zip(keys, codes) if key not in self._features]
+        if missing:
+            rows = behavior_features(self.store.get_fingerprints(missing), self.store.bank)
+            for code, row in zip(missing, rows):
+                self._features[code_hash(code)] = row
+        return np.stack([self._features[key] for key in keys])
+
+    def fit(self) -> bool:
+        """Refit on all known results if any arrived since the last fit; True if a model is available"""
+        if not self.ready:
+            return False
+        if self._stale or self._model is None:
+            keys = list(self.fitness)
+            features = self._feature_rows([self.codes[key] for key in keys])
+            targets = np.array([self.fitness[key] for key in keys])
+            self._model = MLPRegressor(seed=self.seed, **self.model_kwargs).fit(features, targets)
+            self._fitted_records = len(keys)
+            self._stale = False
+        return True
+
+    def predict(self, codes: Sequence[str]) -> np.ndarray:
+        """Predicted fitness for agent code (call fit() first)"""
+        if not codes:
+            return np.zeros(0)
+        return self._model.predict(self._feature_rows(codes))
+
+    def select(self, predictions: np.ndarray, protected: Sequence[bool], keep: int,
+               audit: int = 0, rng: Optional[random.Random] = None) -> Tuple[List[int], List[int]]:
+        """
+        Choose the candidates to evaluate fully
+
+        Args:
+            predictions: Predicted fitness per candidate
+            protected: Candidates that are always evaluated
+            keep: Candidates to evaluate (protected ones count, but are kept even beyond it)
+            audit: Screened-out candidates to evaluate anyway
+            rng: Random source for picking audited candidates
+
+        Returns:
+            (indices to evaluate, the audited subset of them), in candidate order
+        """
+        chosen = [i for i, is_protected in enumerate(protected) if is_protected]
+        ranked = sorted((i for i in range(len(predictions)) if not protected[i]),
+                        key=lambda i: predictions[i], reverse=True)
+        slots = max(0, keep - len(chosen))
+        chosen += ranked[:slots]
+        screened = ranked[slots:]
+
+        rng = rng or random.Random(self.seed)
+        audited = sorted(rng.sample(screened, min(audit, len(screened))))
+        return sorted(chosen + audited), audited
+
+    def get_stats(self) -> Dict[str, int]:
+        return {'records': len(self.fitness), 'fitted_on': self._fitted_records}
+
+
+def screening_report(predicted: Sequence[float], actual: Sequence[float], audited: Sequence[bool],
+                     screened_out: int) -> Dict[str, Optional[float]]:
+    """
+    Accuracy of a generation's screening
+
+    Args:
+        predicted: Predicted fitness of the new (unprotected) agents that were evaluated
+        actual: Their measured fitness
+        audited: Which of them were evaluated only as an audit
+        screened_out: Candidates that were not evaluated
+
+    Returns:
+        rank_correlation and mae of predictions against measurements, the number of
+        audited agents, and missed: audited agents that beat the weakest agent the
+        surrogate chose
+    """
+    predicted = np.asarray(predicted, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    audited = np.asarray(audited, dtype=bool)
+    chosen = actual[~audited]
+    weakest_chosen = chosen.min() if len(chosen) else -math.inf
+    return {
+        'screened_out': screened_out,
+        'audited': int(audited.sum()),
+        'missed': int(np.sum(actual[audited] > weakest_chosen)),
+        'rank_correlation': rank_correlation(predicted, actual),
+        'mae': float(np.mean(np.abs(predicted - actual))) if len(actual) else None,
+    }
@@ -4,12 +4,23 @@ Swiss Tournament System for Evolutionary Training
 
 Implements efficient O(n log n) tournament evaluation where agents with
 similar performance are paired against each other.
+
+With a RatingStore (see ratings.py), carried-over ratings seed the
+tournament: round 1 pairs agents of similar rating instead of random
+opponents, and agents on equal wins are ordered by rating, so each match
+is as close (and as informative) as the evidence allows.
+
+Results are kept in a columnar ResultStore (see result_store.py) indexed
+by agent position; standings and strength of schedule are computed from
+it with vectorized queries after each round.
 """
 import math
 import random
+import numpy as np
 from typing import List, Dict, Tuple, Set, Optional
 from dataclasses import dataclass
-from collections import defaultdict
+
+from result_store import ResultStore, BYE_INDEX
 
 @dataclass
 class TournamentResult:
@@ -30,8 +41,7 @@ class AgentStanding:
     wins: float  # Can be fractional due to draws
     games_played: int
     total_fitness: float
-    opponents_faced: Set[str]
-    match_history: List[TournamentResult]
+    strength_of_schedule: float = 0.0  # Average win rate of opponents faced
     
     @property
     def win_rate(self) -> float:
@@ -40,14 +50,6 @@ class AgentStanding:
     @property
     def avg_fitness(self) -> float:
         return self.total_fitness / self.games_played if self.games_played > 0 else 0.0
-    
-    @property
-    def strength_of_schedule(self) -> float:
-        """Average win rate of opponents faced"""
-        if not self.opponents_faced:
-            return 0.0
-        # This will be calculated by the tournament manager
-        return getattr(self, '_strength_of_schedule', 0.0)
 
 class SwissTournament:
     """
@@ -58,18 +60,31 @@ class SwissTournament:
     rounds and providing better ranking information.
     """
     
-    def __init__(self, agents: List, rounds: Optional[int] = None):
+    def __init__(self, agents: List, rounds: Optional[int] = None, ratings=None):
         """
         Initialize Swiss tournament
         
         Args:
             agents: List of agent objects that have .agent_id attribute
             rounds: Number of rounds to play (default: ceil(log2(n_agents)))
+            ratings: Optional RatingStore used to seed pairings
         """
         self.agents = agents
+        self.ratings = ratings
         self.n_agents = len(agents)
         self.rounds = rounds or max(1, math.ceil(math.log2(self.n_agents)))
         
+        # All results, by compact integer agent index (positions in self.agents)
+        self.results = ResultStore([agent.agent_id for agent in agents])
+        self._index = self.results.index
+        self._faced: List[Set[int]] = [set() for _ in agents]
+        
+        # Per-agent totals from self.results, refreshed after each round
+        self._wins = np.zeros(self.n_agents)
+        self._matches = np.zeros(self.n_agents, dtype=np.int64)
+        self._fitness = np.zeros(self.n_agents)
+        self._sos = np.zeros(self.n_agents)
+        
         # Initialize standings
         self.standings: Dict[str, AgentStanding] = {}
         for agent in agents:
@@ -77,20 +92,20 @@ class SwissTournament:
                 agent_id=agent.agent_id,
                 wins=0.0,
                 games_played=0,
-                total_fitness=0.0,
-                opponents_faced=set(),
-                match_history=[]
+                total_fitness=0.0
             )
         
         self.current_round = 0
-        self.all_results: List[TournamentResult] = []
         
-    def run_tournament(self, match_runner_func) -> List[Tuple[str, AgentStanding]]:
+    def run_tournament(self, match_runner_func, batch_runner_func=None) -> List[Tuple[str, AgentStanding]]:
         """
         Run the complete Swiss tournament
         
         Args:
             match_runner_func: Function that takes (agent1, agent2) and returns TournamentResult
+            batch_runner_func: Optional function that takes a list of (agent1, agent2) pairs and
+                               returns their TournamentResults in order; when given, each round's
+                               matches are played as one batch (e.g. on a process pool)
             
         Returns:
             List of (agent_id, standing) tuples sorted by performance
@@ -106,7 +121,7 @@ class SwissTournament:
             print(f"   Created {len(pairings)} pairings")
             
             # Play all matches in this round
-            round_results = self._play_round(pairings, match_runner_func)
+            round_results = self._play_round(pairings, match_runner_func, batch_runner_func)
             
             # Update standings
             self._update_standings(round_results)
@@ -125,10 +140,34 @@ class SwissTournament:
     def _create_pairings(self) -> List[Tuple]:
         """Create pairings for the current round"""
         if self.current_round == 1:
+            if self.ratings is not None:
+                return self._create_rated_pairings()
             return self._create_random_pairings()
         else:
             return self._create_swiss_pairings()
     
+    def _rating(self, agent) -> float:
+        """Current rating of an agent (0 without a rating store)"""
+        if self.ratings is None:
+            return 0.0
+        return self.ratings.get_for_agent(agent).rating
+    
+    def _create_rated_pairings(self) -> List[Tuple]:
+        """Pair neighbours by rating for the first round (unrated agents in random order)"""
+        agents_copy = self.agents.copy()
+        random.shuffle(agents_copy)
+        agents_copy.sort(key=self._rating, reverse=True)
+        
+        pairings = []
+        for i in range(0, len(agents_copy) - 1, 2):
+            pairings.append((agents_copy[i], agents_copy[i + 1]))
+        
+        # Lowest-rated agent gets the bye
+        if len(agents_copy) % 2 == 1:
+            pairings.append((agents_copy[-1], None))
+        
+        return pairings
+    
     def _create_random_pairings(self) -> List[Tuple]:
         """Create random pairings for the first round"""
         agents_copy = self.agents.copy()
@@ -147,68 +186,81 @@ class SwissTournament:
     
     def _create_swiss_pairings(self) -> List[Tuple]:
         """Create Swiss pairings based on current standings"""
-        # Update strength of schedule for all agents
-        self._update_strength_of_schedule()
+        pairings = []
+        for i, j in self._pair_in_order(self._pairing_order()):
+            pairings.append((self.agents[i], self.agents[j] if j is not None else None))
         
-        # Sort agents by performance (wins, then strength of schedule, then fitness)
-        sorted_agents = sorted(
-            self.agents,
-            key=lambda a: (
-                self.standings[a.agent_id].wins,
-                self.standings[a.agent_id].strength_of_schedule,
-                self.standings[a.agent_id].avg_fitness
-            ),
-            reverse=True
-        )
+        return pairings
+    
+    def _pairing_order(self) -> List[int]:
+        """
+        Agent indices sorted by performance: wins (so score groups are contiguous),
+        then rating, strength of schedule and average fitness, all descending
+        """
+        ratings = np.array([self._rating(agent) for agent in self.agents], dtype=np.float64)
+        fitness = np.divide(self._fitness, self._matches, out=np.zeros(self.n_agents),
+                            where=self._matches > 0)
         
-        pairings = []
-        used_agents = set()
+        # lexsort is stable and sorts by its last key first; negating sorts descending
+        return np.lexsort((-fitness, -self._sos, -ratings, -self._wins)).tolist()
+    
+    def _pair_in_order(self, order: List[int]) -> List[Tuple[int, Optional[int]]]:
+        """
+        Pair agents walking down the performance order
+        
+        Each unpaired agent takes the next unpaired agent it has not faced yet, which is
+        in its own score group when one is left, and otherwise floats down to the next
+        group; if it has faced everyone left it takes the next unpaired agent, and the
+        last agent left over gets a bye. Unpaired agents are kept in a linked list, so
+        each agent skips at most the opponents it has already faced: O(n * rounds)
+        per round instead of rescanning the whole order for every agent.
+        
+        Returns:
+            (agent index, opponent index or None for a bye) tuples
+        """
+        if not order:
+            return []
+        
+        n = len(order)
+        head = n  # Sentinel node linking the last unpaired position back to the first
+        next_pos = list(range(1, n + 1)) + [0]
+        prev_pos = [head] + list(range(n - 1)) + [n - 1]
         
-        for agent in sorted_agents:
-            if agent.agent_id in used_agents:
-                continue
+        def unlink(pos):
+            next_pos[prev_pos[pos]] = next_pos[pos]
+            prev_pos[next_pos[pos]] = prev_pos[pos]
+        
+        pairs = []
+        while next_pos[head] != head:
+            pos = next_pos[head]
+            unlink(pos)
+            agent = order[pos]
+            faced = self._faced[agent]
             
-            # Find best available opponent
-            opponent = self._find_best_opponent(agent, sorted_agents, used_agents)
+            # First unpaired agent not faced yet, else the closest unpaired agent
+            candidate = next_pos[head]
+            while candidate != head and order[candidate] in faced:
+                candidate = next_pos[candidate]
+            if candidate == head:
+                candidate = next_pos[head]
             
-            if opponent:
-                pairings.append((agent, opponent))
-                used_agents.add(agent.agent_id)
-                used_agents.add(opponent.agent_id)
+            if candidate == head:
+                pairs.append((agent, None))  # Bye round
             else:
-                # Bye round
-                pairings.append((agent, None))
-                used_agents.add(agent.agent_id)
+                unlink(candidate)
+                pairs.append((agent, order[candidate]))
         
-        return pairings
+        return pairs
     
-    def _find_best_opponent(self, agent, sorted_agents: List, used_agents: Set) -> Optional:
-        """Find the best available opponent for an agent"""
-        agent_standing = self.standings[agent.agent_id]
-        
-        # Look for opponents with similar records who haven't been faced
-        for candidate in sorted_agents:
-            if (candidate.agent_id != agent.agent_id and 
-                candidate.agent_id not in used_agents and
-                candidate.agent_id not in agent_standing.opponents_faced):
-                return candidate
-        
-        # If no unfaced opponents, find closest available opponent
-        for candidate in sorted_agents:
-            if (candidate.agent_id != agent.agent_id and 
-                candidate.agent_id not in used_agents):
-                return candidate
-        
-        return None
-    
-    def _play_round(self, pairings: List[Tuple], match_runner_func) -> List[TournamentResult]:
+    def _play_round(self, pairings: List[Tuple], match_runner_func, batch_runner_func=None) -> List[TournamentResult]:
         """Play all matches in a round"""
-        round_results = []
+        round_results = [None] * len(pairings)
+        matches = []
         
         for i, (agent1, agent2) in enumerate(pairings):
             if agent2 is None:
                 # Bye round - agent gets automatic win
-                result = TournamentResult(
+                round_results[i] = TournamentResult(
                     agent1_id=agent1.agent_id,
                     agent2_id="BYE",
                     agent1_score=1.0,
@@ -222,54 +274,86 @@ class SwissTournament:
             else:
                 # Regular match
                 print(f"   Match {i+1}: {agent1.agent_id} vs {agent2.agent_id}")
-                result = match_runner_func(agent1, agent2)
-            
-            round_results.append(result)
-            self.all_results.append(result)
+                if batch_runner_func is None:
+                    round_results[i] = match_runner_func(agent1, agent2)
+                else:
+                    matches.append(i)
+        
+        # Matches within a round are independent, so they can all be played at once
+        if matches:
+            batch_results = batch_runner_func([pairings[i] for i in matches])
+            for i, result in zip(matches, batch_results):
+                round_results[i] = result
         
         return round_results
     
     def _update_standings(self, round_results: List[TournamentResult]):
-        """Update agent standings with round results"""
+        """Record round results and recompute standings"""
         for result in round_results:
-            # Update agent 1
-            standing1 = self.standings[result.agent1_id]
-            standing1.wins += result.agent1_score
-            standing1.games_played += 1 if result.agent2_id != "BYE" else 0
-            standing1.total_fitness += result.agent1_fitness
-            if result.agent2_id != "BYE":
-                standing1.opponents_faced.add(result.agent2_id)
-            standing1.match_history.append(result)
+            index1 = self._index[result.agent1_id]
+            index2 = BYE_INDEX if result.agent2_id == "BYE" else self._index[result.agent2_id]
+            if index2 != BYE_INDEX:
+                self._faced[index1].add(index2)
+                self._faced[index2].add(index1)
             
-            # Update agent 2 (if not bye)
-            if result.agent2_id != "BYE":
-                standing2 = self.standings[result.agent2_id]
-                standing2.wins += result.agent2_score
-                standing2.games_played += 1
-                standing2.total_fitness += result.agent2_fitness
-                standing2.opponents_faced.add(result.agent1_id)
-                standing2.match_history.append(result)
+            metadata = result.metadata or {}
+            self.results.append(self.current_round, index1, index2,
+                                result.agent1_score, result.agent2_score,
+                                result.agent1_fitness, result.agent2_fitness,
+                                result.games_played, metadata.get('match_duration', 0.0), metadata)
+        
+        self._update_strength_of_schedule()
     
     def _update_strength_of_schedule(self):
-        """Update strength of schedule for all agents"""
-        # Calculate win rates first
-        win_rates = {}
-        for agent_id, standing in self.standings.items():
-            win_rates[agent_id] = standing.win_rate
-        
-        # Calculate strength of schedule
-        for agent_id, standing in self.standings.items():
-            if standing.opponents_faced:
-                sos = sum(win_rates[opp_id] for opp_id in standing.opponents_faced)
-                sos /= len(standing.opponents_faced)
-                standing._strength_of_schedule = sos
-            else:
-                standing._strength_of_schedule = 0.0
+        """Recompute wins, matches, fitness and strength of schedule for all agents"""
+        self._wins, self._matches, self._fitness = self.results.standings()
+        win_rates = np.divide(self._wins, self._matches, out=np.zeros(self.n_agents),
+                              where=self._matches > 0)
+        self._sos = self.results.strength_of_schedule(win_rates)
+        
+        for i, agent in enumerate(self.agents):
+            standing = self.standings[agent.agent_id]
+            standing.wins = float(self._wins[i])
+            standing.games_played = int(self._matches[i])
+            standing.total_fitness = float(self._fitness[i])
+            standing.strength_of_schedule = float(self._sos[i])
+    
+    @property
+    def all_results(self) -> List[TournamentResult]:
+        """Every result so far (including byes), rebuilt from the result store"""
+        return [self._result_from_row(i) for i in range(len(self.results))]
+    
+    def _result_from_row(self, i: int) -> TournamentResult:
+        row = self.results.rows[i]
+        bye = row['agent2'] == BYE_INDEX
+        return TournamentResult(
+            agent1_id=self.agents[row['agent1']].agent_id,
+            agent2_id="BYE" if bye else self.agents[row['agent2']].agent_id,
+            agent1_score=float(row['agent1_score']),
+            agent2_score=float(row['agent2_score']),
+            agent1_fitness=float(row['agent1_fitness']),
+            agent2_fitness=float(row['agent2_fitness']),
+            games_played=int(row['games']),
+            metadata={'bye': True} if bye else dict(self.results.metadata(i), round=int(row['round']))
+        )
+    
+    def get_match_history(self, agent_id: str) -> List[TournamentResult]:
+        """Results of all matches an agent played (including byes)"""
+        index = self._index[agent_id]
+        rows = self.results.rows
+        mask = (rows['agent1'] == index) | (rows['agent2'] == index)
+        return [self._result_from_row(i) for i in np.flatnonzero(mask)]
+    
+    def get_opponents(self, agent_id: str) -> Set[str]:
+        """IDs of the distinct opponents an agent has faced"""
+        return {self.agents[i].agent_id for i in self._faced[self._index[agent_id]]}
+    
+    def get_head_to_head(self, agent_id: str, opponent_id: str) -> Dict[str, int]:
+        """Match wins, losses and draws of one agent against another"""
+        return self.results.head_to_head(self._index[agent_id], self._index[opponent_id])
     
     def _get_final_rankings(self) -> List[Tuple[str, AgentStanding]]:
         """Get final tournament rankings"""
-        self._update_strength_of_schedule()
-        
         # Sort by wins, then strength of schedule, then average fitness
         ranked_standings = sorted(
             self.standings.items(),
@@ -309,7 +393,7 @@ class SwissTournament:
         return {
             'total_agents': self.n_agents,
             'total_rounds': self.rounds,
-            'total_matches': len(self.all_results),
+            'total_matches': len(self.results),
             'matches_per_agent': sum(s.games_played for s in self.standings.values()) / self.n_agents,
             'final_rankings': self._get_final_rankings()
         }
@@ -8,6 +8,7 @@ import sys
 import numpy as np
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../core')))
 import config
+from observation import encode_observations, new_observation_buffer
 
 # Try to import PyTorch for RL policies
 try:
@@ -20,7 +21,9 @@ except ImportError:
     print("PyTorch not available - RL policies disabled")
 
 class DummyAI:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Random stream (random.Random); defaults to the global random module
+        self.rng = rng if rng is not None else random
         self.decision_timer = 0
         self.current_action = "idle"
         self.action_duration = 0
@@ -115,14 +118,14 @@ class DummyAI:
 
         # Calculate probabilities based on distance and situation
         if distance < 100:  # Close range
-            if random.random() < config.AI_ATTACK_CHANCE:
+            if self.rng.random() < config.AI_ATTACK_CHANCE:
                 # Choose random attack
-                if random.random() < 0.5:
+                if self.rng.random() < 0.5:
                     self.current_action = "punch"
                 else:
                     self.current_action = "kick"
                 self.action_duration = 20
-            elif random.random() < config.AI_BLOCK_CHANCE:
+            elif self.rng.random() < config.AI_BLOCK_CHANCE:
                 self.current_action = "block"
                 self.action_duration = 30
             else:
@@ -135,7 +138,7 @@ class DummyAI:
 
         elif distance > 300:  # Far range
             # Consider projectile charging (30% chance) or move closer
-            if random.random() < 0.3 and fighter.can_charge_projectile():
+            if self.rng.random() < 0.3 and fighter.can_charge_projectile():
                 self.current_action = "start_projectile"
                 self.action_duration = 5
                 self.is_charging_projectile = True
@@ -150,20 +153,20 @@ class DummyAI:
 
         else:  # Medium range (100-300 pixels)
             # Consider projectile charging (20% chance) or random behavior
-            if random.random() < 0.2 and fighter.can_charge_projectile():
+            if self.rng.random() < 0.2 and fighter.can_charge_projectile():
                 self.current_action = "start_projectile"
                 self.action_duration = 5
                 self.is_charging_projectile = True
                 self.charge_start_distance = distance
-            elif random.random() < config.AI_JUMP_CHANCE:
+            elif self.rng.random() < config.AI_JUMP_CHANCE:
                 self.current_action = "jump"
                 self.action_duration = 10
             else:
                 # Random behavior
                 actions = ["move_left", "move_right", "idle", "jump"]
                 weights = [0.25, 0.25, 0.3, 0.2]
-                self.current_action = random.choices(actions, weights=weights)[0]
-                self.action_duration = random.randint(20, 60)
+                self.current_action = self.rng.choices(actions, weights=weights)[0]
+                self.action_duration = self.rng.randint(20, 60)
 
     def _execute_action(self, fighter, opponent):
         """Execute the current AI action"""
@@ -215,7 +218,10 @@ class BalancedAI:
     - adaptation_factor: 0.0-1.0 (ignore to heavily adapt to opponent)
     """
 
-    def __init__(self, personality="aggressive", difficulty="easy"):
+    def __init__(self, personality="aggressive", difficulty="easy", rng=None):
+        # Random stream (random.Random); defaults to the global random module
+        self.rng = rng if rng is not None else random
+
         # AI Configuration
         self.personality = personality  # "aggressive", "defensive", "zoner", "balanced"
         self.difficulty = difficulty    # "easy", "medium", "hard"
@@ -477,8 +483,7 @@ class BalancedAI:
         total_weight = sum(weights)
         normalized_weights = [w / total_weight for w in weights]
 
-        import random
-        self.current_phase = random.choices(available_phases, weights=normalized_weights)[0]
+        self.current_phase = self.rng.choices(available_phases, weights=normalized_weights)[0]
         self.last_phase_switch = self.frame_count
 
         print(f"🤖 AI switched to {self.current_phase} phase")
@@ -556,8 +561,7 @@ class BalancedAI:
         total_weight = sum(intent_weights.values())
         normalized_weights = {k: v / total_weight for k, v in intent_weights.items()}
 
-        import random
-        new_intent = random.choices(
+        new_intent = self.rng.choices(
             list(normalized_weights.keys()),
             weights=list(normalized_weights.values())
         )[0]
@@ -848,7 +852,6 @@ class BalancedAI:
             pressure_weight *= 0.1
 
         # Select intent based on weighted preferences
-        import random
         intents = ["pressure", "zone", "counter"]
         weights = [pressure_weight, zone_weight, counter_weight]
 
@@ -860,7 +863,7 @@ class BalancedAI:
         total_weight = sum(weights)
         normalized_weights = [w / total_weight for w in weights]
 
-        self.current_intent = random.choices(intents, weights=normalized_weights)[0]
+        self.current_intent = self.rng.choices(intents, weights=normalized_weights)[0]
 
         print(f"🧠 AI intent: {self.current_intent.upper()} ({self.personality})")
 
@@ -1399,7 +1402,6 @@ class BalancedAI:
 
     def _weighted_random_choice(self, probs):
         """Select action based on weighted probabilities"""
-        import random
 
         # Normalize probabilities
         total = sum(probs.values())
@@ -1412,7 +1414,7 @@ class BalancedAI:
         actions = list(normalized_probs.keys())
         weights = list(normalized_probs.values())
 
-        return random.choices(actions, weights=weights)[0]
+        return self.rng.choices(actions, weights=weights)[0]
 
     def _get_action_duration(self, action):
         """Get duration for action in frames (shortened for faster sequences)"""
@@ -1527,9 +1529,11 @@ class FighterPolicy(nn.Module):
 class RLAIController:
     """RL-based AI controller that can load trained policies"""
 
-    def __init__(self, policy_path=None, personality_config=None):
+    def __init__(self, policy_path=None, personality_config=None, rng=None):
         self.policy = None
         self.personality = personality_config or {}
+        # Random stream (random.Random); defaults to the global random module
+        self.rng = rng if rng is not None else random
         self.action_mapping = {
             0: 'idle',
             1: 'move_left',
@@ -1543,8 +1547,11 @@ class RLAIController:
             9: 'projectile'
         }
 
+        # Reused observation buffer: row 0 is this fighter's view
+        self.observations = new_observation_buffer()
+
         # Fallback to dummy AI if RL not available
-        self.fallback_ai = DummyAI()
+        self.fallback_ai = DummyAI(rng=rng)
 
         if policy_path and TORCH_AVAILABLE:
             self.load_policy(policy_path)
@@ -1582,65 +1589,9 @@ class RLAIController:
             return False
 
     def get_state_vector(self, fighter, opponent):
-        """Convert game state to ML format with mirroring"""
-        # Determine if we need to mirror (player is on the right)
-        if fighter.x > opponent.x:
-            mirror = True
-        else:
-            mirror = False
-
-        # Build state with consistent perspective (player on left, opponent on right)
-        if mirror:
-            # Mirror positions and velocities
-            player_x = 1.0 - (fighter.x / config.STAGE_WIDTH)
-            opponent_x = 1.0 - (opponent.x / config.STAGE_WIDTH)
-            player_vel_x = -fighter.velocity_x / config.FIGHTER_SPEED
-            opponent_vel_x = -opponent.velocity_x / config.FIGHTER_SPEED
-            relative_x = (opponent_x - player_x)  # opponent relative to player
-        else:
-            # Normal positions
-            player_x = fighter.x / config.STAGE_WIDTH
-            opponent_x = opponent.x / config.STAGE_WIDTH
-            player_vel_x = fighter.velocity_x / config.FIGHTER_SPEED
-            opponent_vel_x = opponent.velocity_x / config.FIGHTER_SPEED
-            relative_x = (opponent_x - player_x)  # opponent relative to player
-
-        state = [
-            # Player state (always "on the left" in representation)
-            player_x,
-            fighter.y / config.STAGE_HEIGHT,
-            fighter.health / 100.0,
-            player_vel_x,
-            float(fighter.is_grounded),
-            float(fighter.is_attacking),
-            float(fighter.is_blocking),
-            fighter.attack_cooldown / config.ATTACK_COOLDOWN,
-            # Projectile state for player
-            fighter.projectile_cooldown / config.PROJECTILE_COOLDOWN,
-            float(fighter.is_charging_projectile),
-            fighter.charging_orb.get_charge_percent() if fighter.charging_orb else 0.0,
-
-            # Opponent state (always "on the right" in representation)
-            opponent_x,
-            opponent.y / config.STAGE_HEIGHT,
-            opponent.health / 100.0,
-            opponent_vel_x,
-            float(opponent.is_grounded),
-            float(opponent.is_attacking),
-            float(opponent.is_blocking),
-            opponent.attack_cooldown / config.ATTACK_COOLDOWN,
-            # Projectile state for opponent
-            opponent.projectile_cooldown / config.PROJECTILE_COOLDOWN,
-            float(opponent.is_charging_projectile),
-            opponent.charging_orb.get_charge_percent() if opponent.charging_orb else 0.0,
-
-            # Relative information (opponent relative to player)
-            abs(relative_x),  # Distance (always positive)
-            relative_x,       # Relative position (positive = opponent to right)
-            (opponent.y - fighter.y) / config.STAGE_HEIGHT,  # Height difference
-            (fighter.health - opponent.health) / 100.0,      # Health advantage
-        ]
-        return np.array(state, dtype=np.float32)
+        """Observation for fighter, encoded exactly as the training environment does"""
+        encode_observations(fighter, opponent, self.observations)
+        return self.observations[0].copy()
 
     def update_fighter(self, fighter, opponent, audio_manager=None):
         """Main update method - uses RL policy or falls back to rule-based"""
@@ -1649,8 +1600,8 @@ class RLAIController:
             self.fallback_ai.update_fighter(fighter, opponent, audio_manager)
             return
 
-        # Get current state
-        state = self.get_state_vector(fighter, opponent)
+        # Get current state (encoded in place; the policy copies it into a tensor)
+        state = encode_observations(fighter, opponent, self.observations)[0]
 
         # Get action from policy
         action_idx = self.policy.get_action(state, deterministic=False)
@@ -1683,7 +1634,7 @@ class RLAIController:
         if aggression > 0.7 and action == 'idle':
             distance = abs(fighter.x - opponent.x)
             if distance < 100:  # Close range
-                return random.choice(['punch', 'kick'])
+                return self.rng.choice(['punch', 'kick'])
 
         # Defensive personality: more likely to block
         if defensiveness > 0.7 and opponent.is_attacking and action in ['punch', 'kick']:
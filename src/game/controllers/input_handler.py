@@ -6,6 +6,7 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../core')))
 import config
+from observation import encode_observations, new_observation_buffer
 
 class InputHandler:
     def __init__(self):
@@ -52,6 +53,9 @@ class PlayerController:
         else:
             self.controls = config.PLAYER2_CONTROLS
 
+        # Reused buffer for demonstration observations (row 0 is this player's view)
+        self.observations = new_observation_buffer()
+
     def update_fighter(self, fighter, audio_manager=None, demo_recorder=None, opponent=None):
         """Update fighter based on input"""
         # Determine current action for recording
@@ -59,11 +63,9 @@ class PlayerController:
 
         # Record demonstration if recorder is provided
         if demo_recorder and opponent:
-            # Get state from RL AI controller format (with mirroring)
-            from .ai_controller import RLAIController
-            temp_controller = RLAIController()
-            state = temp_controller.get_state_vector(fighter, opponent)
-            demo_recorder.record_step(state, current_action)
+            # Record the same mirrored observation the training environment produces
+            encode_observations(fighter, opponent, self.observations)
+            demo_recorder.record_step(self.observations[0].copy(), current_action)
         # Movement
         left_pressed = self.input_handler.is_key_pressed(self.controls['left'])
         right_pressed = self.input_handler.is_key_pressed(self.controls['right'])
@@ -106,16 +106,25 @@ PLAYER2_CONTROLS = {
 
 # Fighter states
 class FighterState:
-    IDLE = "idle"
-    WALKING = "walking"
-    JUMPING = "jumping"
-    PUNCHING = "punching"
-    KICKING = "kicking"
-    BLOCKING = "blocking"
-    CHARGING = "charging"
-    HIT = "hit"
-    KNOCKBACK = "knockback"
-    KNOCKED_DOWN = "knocked_down"
+    # Integer codes so states can index lookup tables and bitmasks
+    IDLE = 0
+    WALKING = 1
+    JUMPING = 2
+    PUNCHING = 3
+    KICKING = 4
+    BLOCKING = 5
+    CHARGING = 6
+    HIT = 7
+    KNOCKBACK = 8
+    KNOCKED_DOWN = 9
+
+    NAMES = ("idle", "walking", "jumping", "punching", "kicking",
+             "blocking", "charging", "hit", "knockback", "knocked_down")
+
+    @staticmethod
+    def name(state):
+        """Readable name for a state code"""
+        return FighterState.NAMES[state]
 
 # Game states
 class GameState:
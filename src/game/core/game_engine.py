@@ -364,7 +364,7 @@ class Game:
         hitbox1, damage1, knockback1 = self.fighter1.get_attack_hitbox()
         if hitbox1 and hitbox1.colliderect(self.fighter2.rect) and not self.fighter1.has_hit_this_attack:
             print(f"\n=== P1 HIT DETECTED ===")
-            print(f"P1 State: {self.fighter1.state}")
+            print(f"P1 State: {config.FighterState.name(self.fighter1.state)}")
             print(f"P1 Position: ({self.fighter1.x:.1f}, {self.fighter1.y:.1f})")
             print(f"P2 Position: ({self.fighter2.x:.1f}, {self.fighter2.y:.1f})")
             print(f"P2 Is Blocking: {self.fighter2.is_blocking}")
@@ -423,7 +423,7 @@ class Game:
         hitbox2, damage2, knockback2 = self.fighter2.get_attack_hitbox()
         if hitbox2 and hitbox2.colliderect(self.fighter1.rect) and not self.fighter2.has_hit_this_attack:
             print(f"\n=== P2 HIT DETECTED ===")
-            print(f"P2 State: {self.fighter2.state}")
+            print(f"P2 State: {config.FighterState.name(self.fighter2.state)}")
             print(f"P2 Position: ({self.fighter2.x:.1f}, {self.fighter2.y:.1f})")
             print(f"P1 Position: ({self.fighter1.x:.1f}, {self.fighter1.y:.1f})")
             print(f"P1 Is Blocking: {self.fighter1.is_blocking}")
@@ -0,0 +1,122 @@
+"""
+Lightweight geometry for the headless simulation core
+
+AABB replaces pygame.Rect in Fighter and Projectile so that training and
+tournament processes never need to import pygame or initialize SDL. It keeps
+pygame.Rect's integer semantics so simulations are unchanged:
+  - the constructor truncates float coordinates toward zero
+  - assigning x/y rounds half away from zero
+AABB is also a 4-item sequence, so pygame.draw.rect accepts it directly.
+"""
+
+
+def _round_half_away(value):
+    """Round like pygame.Rect attribute assignment (10.5 -> 11, -10.5 -> -11)"""
+    if value >= 0:
+        return int(value + 0.5)
+    return -int(0.5 - value)
+
+
+class AABB:
+    """Axis-aligned bounding box with integer coordinates"""
+
+    __slots__ = ('_x', '_y', 'width', 'height')
+
+    def __init__(self, x, y, width, height):
+        self._x = int(x)
+        self._y = int(y)
+        self.width = int(width)
+        self.height = int(height)
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = _round_half_away(value)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = _round_half_away(value)
+
+    # pygame.Rect-style aliases
+    left = x
+    top = y
+
+    @property
+    def w(self):
+        return self.width
+
+    @property
+    def h(self):
+        return self.height
+
+    @property
+    def right(self):
+        return self._x + self.width
+
+    @property
+    def bottom(self):
+        return self._y + self.height
+
+    @property
+    def centerx(self):
+        return self._x + self.width // 2
+
+    @property
+    def centery(self):
+        return self._y + self.height // 2
+
+    @property
+    def center(self):
+        return (self.centerx, self.centery)
+
+    def move_to(self, x, y):
+        """Set position with the same rounding as assigning x and y (inlined for the per-frame path)"""
+        self._x = int(x + 0.5) if x >= 0 else -int(0.5 - x)
+        self._y = int(y + 0.5) if y >= 0 else -int(0.5 - y)
+
+    def place(self, x, y):
+        """Set position with constructor (truncating) semantics, keeping the size"""
+        self._x = int(x)
+        self._y = int(y)
+
+    def colliderect(self, other):
+        """Check overlap with another AABB or 4-item rect-style sequence"""
+        if type(other) is AABB:
+            ox, oy, ow, oh = other._x, other._y, other.width, other.height
+        else:
+            ox, oy, ow, oh = other
+        if not (self.width and self.height and ow and oh):
+            return False
+        return (self._x < ox + ow and self._y < oy + oh and
+                self._x + self.width > ox and self._y + self.height > oy)
+
+    def copy(self):
+        return AABB(self._x, self._y, self.width, self.height)
+
+    def __bool__(self):
+        return self.width != 0 and self.height != 0
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self._x, self._y, self.width, self.height)[index]
+
+    def __iter__(self):
+        return iter((self._x, self._y, self.width, self.height))
+
+    def __eq__(self, other):
+        try:
+            return tuple(self) == tuple(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return f"AABB({self._x}, {self._y}, {self.width}, {self.height})"
@@ -0,0 +1,161 @@
+"""
+Observation encoding shared by training, tournaments and in-game controllers
+
+Every policy sees the same 26-value vector, always from its own perspective:
+the observing fighter is represented on the left, and when it is actually on
+the right the x positions and x velocities are mirrored. Layout:
+
+  0-10   player:   x, y, health, velocity_x, grounded, attacking, blocking,
+                   attack cooldown, projectile cooldown, charging, orb charge
+  11-21  opponent: same fields
+  22-25  relative: distance, relative x, height difference, health advantage
+
+Relative x keeps its real-world sign (positive = opponent to the right) even
+in a mirrored view. That is what existing policies were trained on, so the
+in-game controllers use the same convention.
+
+The encoders write both fighters' observations into a caller-supplied buffer
+((2, 26) for one match, (N, 2, 26) for a batch) so the per-frame path
+allocates no arrays. Row 0 is the first fighter's view, row 1 the second's.
+"""
+import struct
+import numpy as np
+
+try:
+    from . import config
+except ImportError:
+    # Imported as a top-level module by the controllers (game/core on sys.path)
+    import config
+
+STATE_SIZE = 26
+FIGHTER_FEATURES = 11
+
+# Packs both views straight into a float32 buffer, far cheaper than
+# converting Python floats through numpy item assignment
+_PAIR_PACKER = struct.Struct(f'{2 * STATE_SIZE}f')
+
+
+def new_observation_buffer(num_envs=None):
+    """Allocate a zeroed (2, STATE_SIZE) buffer, or (num_envs, 2, STATE_SIZE) for a batch"""
+    shape = (2, STATE_SIZE) if num_envs is None else (num_envs, 2, STATE_SIZE)
+    return np.zeros(shape, dtype=np.float32)
+
+
+def _view(player, opponent):
+    """One fighter's view of the match as a STATE_SIZE tuple"""
+    if player.x > opponent.x:
+        # Mirror so the player is represented on the left
+        player_x = 1.0 - (player.x / config.STAGE_WIDTH)
+        opponent_x = 1.0 - (opponent.x / config.STAGE_WIDTH)
+        player_vel_x = -player.velocity_x / config.FIGHTER_SPEED
+        opponent_vel_x = -opponent.velocity_x / config.FIGHTER_SPEED
+        relative_x = -(opponent_x - player_x)  # Real-world sign, see module docstring
+    else:
+        player_x = player.x / config.STAGE_WIDTH
+        opponent_x = opponent.x / config.STAGE_WIDTH
+        player_vel_x = player.velocity_x / config.FIGHTER_SPEED
+        opponent_vel_x = opponent.velocity_x / config.FIGHTER_SPEED
+        relative_x = opponent_x - player_x
+
+    return (
+        player_x,
+        player.y / config.STAGE_HEIGHT,
+        player.health / 100.0,
+        player_vel_x,
+        player.is_grounded,
+        player.is_attacking,
+        player.is_blocking,
+        player.attack_cooldown / config.ATTACK_COOLDOWN,
+        player.projectile_cooldown / config.PROJECTILE_COOLDOWN,
+        player.is_charging_projectile,
+        player.charging_orb.get_charge_percent() if player.charging_orb else 0.0,
+
+        opponent_x,
+        opponent.y / config.STAGE_HEIGHT,
+        opponent.health / 100.0,
+        opponent_vel_x,
+        opponent.is_grounded,
+        opponent.is_attacking,
+        opponent.is_blocking,
+        opponent.attack_cooldown / config.ATTACK_COOLDOWN,
+        opponent.projectile_cooldown / config.PROJECTILE_COOLDOWN,
+        opponent.is_charging_projectile,
+        opponent.charging_orb.get_charge_percent() if opponent.charging_orb else 0.0,
+
+        abs(relative_x),
+        relative_x,
+        (opponent.y - player.y) / config.STAGE_HEIGHT,
+        (player.health - opponent.health) / 100.0,
+    )
+
+
+def encode_observations(fighter1, fighter2, out):
+    """
+    Write both fighters' observations into a preallocated buffer.
+
+    Args:
+        fighter1, fighter2: Fighter objects
+        out: C-contiguous (2, STATE_SIZE) float32 array (for example a row
+             of a batch buffer); out[0] receives fighter1's view and out[1]
+             fighter2's view
+
+    Returns:
+        out
+    """
+    _PAIR_PACKER.pack_into(out, 0, *_view(fighter1, fighter2), *_view(fighter2, fighter1))
+    return out
+
+
+def encode_batch(fighters, out):
+    """
+    Vectorized encode_observations for many matches at once.
+
+    Args:
+        fighters: object holding (N, 2) arrays named like the Fighter
+                  attributes (x, y, velocity_x, health, is_grounded,
+                  is_attacking, is_blocking, attack_cooldown,
+                  projectile_cooldown), e.g. a BatchFightingEnv. Fighters
+                  without is_charging_projectile/charge_percent arrays are
+                  encoded as never charging.
+        out: (N, 2, STATE_SIZE) float32 array; out[:, 0] receives fighter1's
+             view and out[:, 1] fighter2's view
+
+    Returns:
+        out
+    """
+    player = (slice(None), slice(None))
+    opp = (slice(None), slice(None, None, -1))
+
+    x_p, x_o = fighters.x[player], fighters.x[opp]
+    vx_p, vx_o = fighters.velocity_x[player], fighters.velocity_x[opp]
+
+    # Mirror so the player is always represented on the left
+    mirror = x_p > x_o
+    sign = np.where(mirror, -1.0, 1.0)
+    player_x = np.where(mirror, 1.0 - x_p / config.STAGE_WIDTH, x_p / config.STAGE_WIDTH)
+    opponent_x = np.where(mirror, 1.0 - x_o / config.STAGE_WIDTH, x_o / config.STAGE_WIDTH)
+    relative_x = sign * (opponent_x - player_x)
+
+    charging = getattr(fighters, 'is_charging_projectile', None)
+    charge = getattr(fighters, 'charge_percent', None)
+
+    for offset, idx, vel_x, pos_x in ((0, player, vx_p, player_x),
+                                      (FIGHTER_FEATURES, opp, vx_o, opponent_x)):
+        out[:, :, offset + 0] = pos_x
+        out[:, :, offset + 1] = fighters.y[idx] / config.STAGE_HEIGHT
+        out[:, :, offset + 2] = fighters.health[idx] / 100.0
+        out[:, :, offset + 3] = sign * vel_x / config.FIGHTER_SPEED
+        out[:, :, offset + 4] = fighters.is_grounded[idx]
+        out[:, :, offset + 5] = fighters.is_attacking[idx]
+        out[:, :, offset + 6] = fighters.is_blocking[idx]
+        out[:, :, offset + 7] = fighters.attack_cooldown[idx] / config.ATTACK_COOLDOWN
+        out[:, :, offset + 8] = fighters.projectile_cooldown[idx] / config.PROJECTILE_COOLDOWN
+        out[:, :, offset + 9] = 0.0 if charging is None else charging[idx]
+        out[:, :, offset + 10] = 0.0 if charge is None else charge[idx]
+
+    out[:, :, 22] = np.abs(relative_x)
+    out[:, :, 23] = relative_x
+    out[:, :, 24] = (fighters.y[opp] - fighters.y[player]) / config.STAGE_HEIGHT
+    out[:, :, 25] = (fighters.health[player] - fighters.health[opp]) / 100.0
+
+    return out
@@ -1,11 +1,62 @@
 """
 Fighter class for the 2D Fighting Game
 """
-import pygame
+import numpy as np
 from ..core import config
+from ..core.geometry import AABB
 from typing import Tuple
 
+# Capability bits, precomputed per state so checks are a table lookup and a mask
+CAN_MOVE = 1
+CAN_ATTACK = 2
+CAN_CHARGE = 4
+CAN_BE_PUSHED = 8
+
+
+def _build_state_capabilities():
+    S = config.FighterState
+    capabilities = []
+    for state in range(len(S.NAMES)):
+        flags = CAN_MOVE | CAN_ATTACK | CAN_CHARGE | CAN_BE_PUSHED
+        if state in (S.PUNCHING, S.KICKING, S.CHARGING, S.HIT, S.KNOCKBACK):
+            flags &= ~(CAN_MOVE | CAN_ATTACK | CAN_CHARGE)
+        if state == S.BLOCKING:
+            flags &= ~(CAN_MOVE | CAN_CHARGE)
+        if state in (S.HIT, S.KNOCKBACK):
+            flags &= ~CAN_BE_PUSHED
+        capabilities.append(flags)
+    return tuple(capabilities)
+
+
+STATE_CAPABILITIES = _build_state_capabilities()
+
+# Simulation fields captured by Fighter.get_snapshot(), grouped by type
+SNAPSHOT_FLOAT_FIELDS = ('x', 'y', 'velocity_x', 'velocity_y')
+SNAPSHOT_INT_FIELDS = (
+    'health', 'state', 'state_timer', 'attack_timer', 'attack_cooldown', 'hit_timer',
+    'knockback_timer', 'attack_to_block_delay', 'block_to_attack_delay', 'block_timer',
+    'projectile_cooldown',
+)
+SNAPSHOT_BOOL_FIELDS = (
+    'facing_right', 'is_grounded', 'is_attacking', 'is_blocking', 'has_hit_this_attack',
+    'has_played_block_sound', 'block_button_held', 'is_charging_projectile',
+)
+# Followed by: orb charge time (-1 if none), rect x/y, hitbox kind (0 none, 1 punch, 2 kick) and x/y
+SNAPSHOT_SIZE = len(SNAPSHOT_FLOAT_FIELDS) + len(SNAPSHOT_INT_FIELDS) + len(SNAPSHOT_BOOL_FIELDS) + 6
+
+
 class Fighter:
+    __slots__ = (
+        'x', 'y', 'velocity_x', 'velocity_y', 'facing_right',
+        'width', 'height', 'color', 'health', 'max_health',
+        'state', 'state_timer', 'is_grounded',
+        'attack_timer', 'attack_cooldown', 'is_attacking', 'is_blocking', 'hit_timer',
+        'has_hit_this_attack', 'has_played_block_sound', 'knockback_timer',
+        'attack_to_block_delay', 'block_to_attack_delay', 'block_timer', 'block_button_held',
+        'projectile_cooldown', 'charging_orb', 'is_charging_projectile',
+        'rect', 'punch_hitbox', 'kick_hitbox', '_punch_box', '_kick_box', 'audio_manager',
+    )
+
     def __init__(self, x: float, y: float, color: Tuple[int, int, int], facing_right: bool = True):
         # Position and movement
         self.x = x
@@ -48,11 +99,16 @@ class Fighter:
         self.is_charging_projectile = False
 
         # Create rect for collision detection
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect = AABB(self.x, self.y, self.width, self.height)
 
-        # Attack hitboxes
+        # Attack hitboxes (reused every frame; punch_hitbox/kick_hitbox point at them while active)
         self.punch_hitbox = None
         self.kick_hitbox = None
+        self._punch_box = AABB(0, 0, config.PUNCH_RANGE, 25)
+        self._kick_box = AABB(0, 0, config.KICK_RANGE, 30)
+
+        # Set by punch()/kick() so state transitions can play miss sounds
+        self.audio_manager = None
 
     def update(self):
         """Update fighter state and physics"""
@@ -103,7 +159,7 @@ class Fighter:
             # Check if just landed (was airborne, now grounded)
             if not self.is_grounded:
                 # Just landed - play land sound
-                if hasattr(self, 'audio_manager') and self.audio_manager:
+                if self.audio_manager:
                     self.audio_manager.play_sound('land')
             self.is_grounded = True
             if self.state == config.FighterState.JUMPING:
@@ -122,8 +178,7 @@ class Fighter:
             self.x = config.STAGE_RIGHT - self.width
 
         # Update rect position
-        self.rect.x = self.x
-        self.rect.y = self.y
+        self.rect.move_to(self.x, self.y)
 
         # Update attack hitboxes
         self._update_hitboxes()
@@ -139,16 +194,14 @@ class Fighter:
         if self.state == config.FighterState.PUNCHING and self.attack_timer > 0:
             # Punch hitbox in front of fighter - shorter range and height
             hitbox_x = self.x + self.width if self.facing_right else self.x - config.PUNCH_RANGE
-            self.punch_hitbox = pygame.Rect(
-                hitbox_x, self.y + 30, config.PUNCH_RANGE, 25
-            )
+            self._punch_box.place(hitbox_x, self.y + 30)
+            self.punch_hitbox = self._punch_box
 
         elif self.state == config.FighterState.KICKING and self.attack_timer > 0:
             # Kick hitbox in front of fighter - lower height, shorter vertical range
             hitbox_x = self.x + self.width if self.facing_right else self.x - config.KICK_RANGE
-            self.kick_hitbox = pygame.Rect(
-                hitbox_x, self.y + 60, config.KICK_RANGE, 30
-            )
+            self._kick_box.place(hitbox_x, self.y + 60)
+            self.kick_hitbox = self._kick_box
 
     def _handle_state_transitions(self):
         """Handle automatic state transitions"""
@@ -156,7 +209,7 @@ class Fighter:
         if self.state == config.FighterState.PUNCHING:
             if self.attack_timer <= 0:
                 # Play miss sound if attack didn't hit anything
-                if not self.has_hit_this_attack and hasattr(self, 'audio_manager') and self.audio_manager:
+                if not self.has_hit_this_attack and self.audio_manager:
                     self.audio_manager.play_sound('punch_miss')
                 self.state = config.FighterState.IDLE
                 self.is_attacking = False
@@ -164,7 +217,7 @@ class Fighter:
         elif self.state == config.FighterState.KICKING:
             if self.attack_timer <= 0:
                 # Play miss sound if attack didn't hit anything
-                if not self.has_hit_this_attack and hasattr(self, 'audio_manager') and self.audio_manager:
+                if not self.has_hit_this_attack and self.audio_manager:
                     self.audio_manager.play_sound('kick_miss')
                 self.state = config.FighterState.IDLE
                 self.is_attacking = False
@@ -198,7 +251,7 @@ class Fighter:
         # Safety check: if charging flag is set but not in charging state, clean up
         if self.is_charging_projectile and self.state != config.FighterState.CHARGING:
             if not config.TRAINING_MODE:
-                print(f"DEBUG: Cleaning up stuck charging state (state: {self.state})")
+                print(f"DEBUG: Cleaning up stuck charging state (state: {config.FighterState.name(self.state)})")
             self.cancel_charging_projectile()
 
     def move_left(self, audio_manager=None):
@@ -249,7 +302,7 @@ class Fighter:
             self.audio_manager = audio_manager  # Store for miss sound later
         else:
             if not config.TRAINING_MODE:
-                print(f"DEBUG: Punch blocked - can_attack: {self.can_attack()}, state: {self.state}, grounded: {self.is_grounded}, cooldown: {self.attack_cooldown}")
+                print(f"DEBUG: Punch blocked - can_attack: {self.can_attack()}, state: {config.FighterState.name(self.state)}, grounded: {self.is_grounded}, cooldown: {self.attack_cooldown}")
 
     def kick(self, audio_manager=None):
         """Execute kick attack"""
@@ -267,7 +320,7 @@ class Fighter:
             self.audio_manager = audio_manager  # Store for miss sound later
         else:
             if not config.TRAINING_MODE:
-                print(f"DEBUG: Kick blocked - can_attack: {self.can_attack()}, state: {self.state}, grounded: {self.is_grounded}, cooldown: {self.attack_cooldown}")
+                print(f"DEBUG: Kick blocked - can_attack: {self.can_attack()}, state: {config.FighterState.name(self.state)}, grounded: {self.is_grounded}, cooldown: {self.attack_cooldown}")
 
     def start_charging_projectile(self):
         """Start charging a projectile"""
@@ -316,15 +369,7 @@ class Fighter:
 
     def can_charge_projectile(self) -> bool:
         """Check if fighter can start charging a projectile"""
-        return (self.projectile_cooldown <= 0 and
-                self.state not in [
-                    config.FighterState.PUNCHING,
-                    config.FighterState.KICKING,
-                    config.FighterState.CHARGING,
-                    config.FighterState.HIT,
-                    config.FighterState.KNOCKBACK,
-                    config.FighterState.BLOCKING
-                ])
+        return self.projectile_cooldown <= 0 and (STATE_CAPABILITIES[self.state] & CAN_CHARGE) != 0
 
     def block(self):
         """Enter blocking state"""
@@ -380,7 +425,7 @@ class Fighter:
             # Apply horizontal knockback in the specified direction
             self.velocity_x = knockback_force * knockback_direction
             if not config.TRAINING_MODE:
-                print(f"DEBUG KNOCKBACK: force={knockback_force}, direction={knockback_direction}, velocity_x={self.velocity_x}, state={self.state}")
+                print(f"DEBUG KNOCKBACK: force={knockback_force}, direction={knockback_direction}, velocity_x={self.velocity_x}, state={config.FighterState.name(self.state)}")
 
             # Apply upward force (launch into air)
             self.velocity_y = -config.KICK_UPWARD_FORCE
@@ -407,26 +452,60 @@ class Fighter:
 
     def can_move(self) -> bool:
         """Check if fighter can move"""
-        return self.state not in [
-            config.FighterState.PUNCHING,
-            config.FighterState.KICKING,
-            config.FighterState.CHARGING,
-            config.FighterState.HIT,
-            config.FighterState.KNOCKBACK,
-            config.FighterState.BLOCKING
-        ]
+        return (STATE_CAPABILITIES[self.state] & CAN_MOVE) != 0
 
     def can_attack(self) -> bool:
         """Check if fighter can attack"""
         return (self.attack_cooldown <= 0 and
                 self.block_to_attack_delay <= 0 and
-                self.state not in [
-                    config.FighterState.PUNCHING,
-                    config.FighterState.KICKING,
-                    config.FighterState.CHARGING,  # Can't attack while charging
-                    config.FighterState.HIT,
-                    config.FighterState.KNOCKBACK
-                ])
+                (STATE_CAPABILITIES[self.state] & CAN_ATTACK) != 0)
+
+    def get_snapshot(self) -> np.ndarray:
+        """Copy all simulation state into a flat float64 array (see SNAPSHOT_SIZE)"""
+        values = [getattr(self, name) for name in SNAPSHOT_FLOAT_FIELDS]
+        values += [getattr(self, name) for name in SNAPSHOT_INT_FIELDS]
+        values += [getattr(self, name) for name in SNAPSHOT_BOOL_FIELDS]
+        values.append(self.charging_orb.charge_time if self.charging_orb else -1)
+        values += [self.rect.x, self.rect.y]
+        if self.punch_hitbox:
+            values += [1, self.punch_hitbox.x, self.punch_hitbox.y]
+        elif self.kick_hitbox:
+            values += [2, self.kick_hitbox.x, self.kick_hitbox.y]
+        else:
+            values += [0, 0, 0]
+        return np.array(values, dtype=np.float64)
+
+    def restore(self, snapshot):
+        """Restore simulation state from an array produced by get_snapshot()"""
+        values = snapshot.tolist() if isinstance(snapshot, np.ndarray) else list(snapshot)
+        index = 0
+        for name in SNAPSHOT_FLOAT_FIELDS:
+            setattr(self, name, values[index])
+            index += 1
+        for name in SNAPSHOT_INT_FIELDS:
+            setattr(self, name, int(values[index]))
+            index += 1
+        for name in SNAPSHOT_BOOL_FIELDS:
+            setattr(self, name, bool(values[index]))
+            index += 1
+
+        charge_time, rect_x, rect_y, hitbox_kind, hitbox_x, hitbox_y = values[index:index + 6]
+        if charge_time >= 0:
+            from .projectile import ChargingOrb
+            self.charging_orb = ChargingOrb(self)
+            self.charging_orb.charge_time = int(charge_time)
+        else:
+            self.charging_orb = None
+
+        self.rect.place(rect_x, rect_y)
+        self.punch_hitbox = None
+        self.kick_hitbox = None
+        if hitbox_kind == 1:
+            self._punch_box.place(hitbox_x, hitbox_y)
+            self.punch_hitbox = self._punch_box
+        elif hitbox_kind == 2:
+            self._kick_box.place(hitbox_x, hitbox_y)
+            self.kick_hitbox = self._kick_box
 
     def get_attack_hitbox(self):
         """Get current attack hitbox if any"""
@@ -442,13 +521,12 @@ class Fighter:
 
     def get_debug_info(self) -> str:
         """Get debug information about fighter state"""
-        return f"State: {self.state}, Attack Timer: {self.attack_timer}, Has Hit: {self.has_hit_this_attack}, Cooldown: {self.attack_cooldown}"
+        return f"State: {config.FighterState.name(self.state)}, Attack Timer: {self.attack_timer}, Has Hit: {self.has_hit_this_attack}, Cooldown: {self.attack_cooldown}"
 
     def can_be_pushed(self) -> bool:
         """Check if fighter can be pushed by collision"""
         # Can't be pushed if blocking, in knockback, or being hit
-        return not (self.is_blocking or
-                   self.state in [config.FighterState.KNOCKBACK, config.FighterState.HIT])
+        return not self.is_blocking and (STATE_CAPABILITIES[self.state] & CAN_BE_PUSHED) != 0
 
     def push(self, push_direction: int):
         """Push fighter in the given direction if possible"""
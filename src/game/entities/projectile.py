@@ -1,8 +1,8 @@
 """
 Projectile entity for the fighting game
 """
-import pygame
 from ..core import config
+from ..core.geometry import AABB
 
 class Projectile:
     """Projectile that can be fired by fighters"""
@@ -30,7 +30,7 @@ class Projectile:
         self.has_hit = False
 
         # Create rect for collision detection
-        self.rect = pygame.Rect(x - self.size, y - self.size, self.size * 2, self.size * 2)
+        self.rect = AABB(x - self.size, y - self.size, self.size * 2, self.size * 2)
 
     def update(self):
         """Update projectile position and state"""
@@ -53,6 +53,8 @@ class Projectile:
 
     def draw(self, screen):
         """Draw the projectile"""
+        import pygame
+
         if not self.active:
             return
 
@@ -101,6 +103,8 @@ class ChargingOrb:
 
     def draw(self, screen):
         """Draw charging orb with increasing intensity"""
+        import pygame
+
         if self.charge_time <= 0:
             return
 
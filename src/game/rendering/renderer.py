@@ -256,8 +256,8 @@ class Renderer:
         debug_y = config.SCREEN_HEIGHT - 150
 
         # Fighter states
-        p1_state_text = self.small_font.render(f"P1 State: {fighter1.state}", True, config.WHITE)
-        p2_state_text = self.small_font.render(f"P2 State: {fighter2.state}", True, config.WHITE)
+        p1_state_text = self.small_font.render(f"P1 State: {config.FighterState.name(fighter1.state)}", True, config.WHITE)
+        p2_state_text = self.small_font.render(f"P2 State: {config.FighterState.name(fighter2.state)}", True, config.WHITE)
 
         self.screen.blit(p1_state_text, (20, debug_y))
         self.screen.blit(p2_state_text, (20, debug_y + 20))
@@ -21,6 +21,8 @@ from game.controllers.input_handler import PlayerController
 from game.controllers.ai_controller import RLAIController
 from evolution.agent_serialization import AgentSerializer
 from evolution.safe_execution import SafeAgent
+from evolution.agent_cache import CompiledAgentCache
+from evolution.ratings import RatingStore
 
 class EvolvedAgentController(RLAIController):
     """
@@ -92,8 +94,8 @@ class EvolvedAgentController(RLAIController):
                         except:
                             win_rate = win_rate_text
 
-            # Create safe agent
-            self.agent = SafeAgent(agent_id, code)
+            # Create safe agent (reusing the experiment's compiled code when available)
+            self.agent = SafeAgent(agent_id, code, cache=CompiledAgentCache.for_agent_file(self.agent_path))
 
             if not self.agent.is_valid:
                 raise ValueError(f"Agent failed to compile: {agent_id}")
@@ -104,7 +106,8 @@ class EvolvedAgentController(RLAIController):
                 'fitness': fitness,
                 'fighting_style': fighting_style,
                 'generation': generation,
-                'win_rate': win_rate
+                'win_rate': win_rate,
+                'rating': RatingStore.for_agent_file(self.agent_path).get_for_code(code)
             }
 
             print(f"✅ Loaded evolved agent:")
@@ -114,6 +117,9 @@ class EvolvedAgentController(RLAIController):
             print(f"   Generation: {self.agent_info['generation']}")
             if isinstance(self.agent_info['win_rate'], (int, float)):
                 print(f"   Win Rate: {float(self.agent_info['win_rate'])*100:.1f}%")
+            if self.agent_info['rating'] is not None:
+                rating = self.agent_info['rating']
+                print(f"   Rating: {rating} ({rating.games} games)")
 
         except Exception as e:
             print(f"❌ Failed to load agent: {e}")
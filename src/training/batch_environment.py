@@ -0,0 +1,417 @@
+"""
+Batched Fighting Game Environment
+Steps N independent matches at once using NumPy struct-of-arrays state.
+
+Every field that Fighter keeps per object (position, velocity, timers, state,
+health, flags) is stored here as an (N, 2) array, where column 0 is fighter1
+and column 1 is fighter2. The step logic mirrors FightingGameEnv.step exactly:
+actions, Fighter.update(), _update_hitboxes(), _handle_state_transitions(),
+_check_combat(), rewards and termination.
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from game.core import config
+from game.core.observation import STATE_SIZE, encode_batch, new_observation_buffer
+from game.entities.fighter import STATE_CAPABILITIES, CAN_MOVE, CAN_ATTACK, CAN_CHARGE
+
+# FighterState codes
+IDLE = config.FighterState.IDLE
+WALKING = config.FighterState.WALKING
+JUMPING = config.FighterState.JUMPING
+PUNCHING = config.FighterState.PUNCHING
+KICKING = config.FighterState.KICKING
+BLOCKING = config.FighterState.BLOCKING
+HIT = config.FighterState.HIT
+KNOCKBACK = config.FighterState.KNOCKBACK
+
+# Per-state capability bitmasks shared with Fighter, as a lookup array
+CAPABILITY_TABLE = np.array(STATE_CAPABILITIES, dtype=np.int64)
+
+# Fighter starting positions used by FightingGameEnv.reset()
+START_X = (100, 600)
+START_Y = config.STAGE_FLOOR - 60
+
+# Attack geometry (see Fighter._update_hitboxes)
+PUNCH_OFFSET_Y = 30
+PUNCH_HEIGHT = 25
+KICK_OFFSET_Y = 60
+KICK_HEIGHT = 30
+
+
+def _round_half_away(values):
+    """Match AABB/pygame.Rect attribute assignment (rect.x = 10.5 -> 11)"""
+    return np.sign(values) * np.floor(np.abs(values) + 0.5)
+
+
+class BatchFightingEnv:
+    """N fighting game matches stepped together with vectorized physics"""
+
+    def __init__(self, num_envs=64, max_steps=3600, auto_reset=True, action_repeat=1):
+        self.num_envs = num_envs
+        self.max_steps = max_steps
+        self.auto_reset = auto_reset
+
+        # Frames each action is held for, as in FightingGameEnv
+        self.action_repeat = max(1, int(action_repeat))
+
+        # Same spaces as FightingGameEnv
+        self.state_size = STATE_SIZE
+        self.action_size = 10
+
+        n = num_envs
+        self.current_step = np.zeros(n, dtype=np.int64)
+        self.done = np.zeros(n, dtype=bool)
+
+        # Per-fighter state, shape (num_envs, 2)
+        self.x = np.zeros((n, 2), dtype=np.float64)
+        self.y = np.zeros((n, 2), dtype=np.float64)
+        self.velocity_x = np.zeros((n, 2), dtype=np.float64)
+        self.velocity_y = np.zeros((n, 2), dtype=np.float64)
+        self.facing_right = np.ones((n, 2), dtype=bool)
+        self.is_grounded = np.ones((n, 2), dtype=bool)
+        self.health = np.zeros((n, 2), dtype=np.int64)
+        self.state = np.zeros((n, 2), dtype=np.int8)
+        self.state_timer = np.zeros((n, 2), dtype=np.int64)
+
+        self.is_attacking = np.zeros((n, 2), dtype=bool)
+        self.is_blocking = np.zeros((n, 2), dtype=bool)
+        self.has_hit_this_attack = np.zeros((n, 2), dtype=bool)
+        self.block_button_held = np.zeros((n, 2), dtype=bool)
+
+        self.attack_timer = np.zeros((n, 2), dtype=np.int64)
+        self.attack_cooldown = np.zeros((n, 2), dtype=np.int64)
+        self.hit_timer = np.zeros((n, 2), dtype=np.int64)
+        self.knockback_timer = np.zeros((n, 2), dtype=np.int64)
+        self.attack_to_block_delay = np.zeros((n, 2), dtype=np.int64)
+        self.block_to_attack_delay = np.zeros((n, 2), dtype=np.int64)
+        self.block_timer = np.zeros((n, 2), dtype=np.int64)
+        self.projectile_cooldown = np.zeros((n, 2), dtype=np.int64)
+
+        self.last_health = np.zeros((n, 2), dtype=np.int64)
+
+        self._timers = (
+            self.attack_timer, self.attack_cooldown, self.hit_timer,
+            self.knockback_timer, self.attack_to_block_delay,
+            self.block_to_attack_delay, self.block_timer, self.projectile_cooldown,
+        )
+
+    def reset(self, mask=None):
+        """Reset all matches, or only those selected by a boolean mask"""
+        if mask is None:
+            mask = np.ones(self.num_envs, dtype=bool)
+        mask = np.asarray(mask, dtype=bool)
+
+        self.current_step[mask] = 0
+        self.done[mask] = False
+
+        self.x[mask] = START_X
+        self.y[mask] = START_Y
+        self.velocity_x[mask] = 0.0
+        self.velocity_y[mask] = 0.0
+        self.facing_right[mask] = True
+        self.is_grounded[mask] = True
+        self.health[mask] = config.MAX_HEALTH
+        self.state[mask] = IDLE
+        self.state_timer[mask] = 0
+
+        self.is_attacking[mask] = False
+        self.is_blocking[mask] = False
+        self.has_hit_this_attack[mask] = False
+        self.block_button_held[mask] = False
+        for timer in self._timers:
+            timer[mask] = 0
+
+        self.last_health[mask] = config.MAX_HEALTH
+
+        return self.get_states()
+
+    def step(self, actions):
+        """
+        Execute one decision in every running match.
+
+        Actions are held for action_repeat frames and rewards are summed over
+        them. A match that ends part-way through is frozen for the remaining frames.
+
+        Args:
+            actions: int array of shape (num_envs, 2) with actions for fighter1 and fighter2
+
+        Returns:
+            states: (num_envs, 2, state_size) observations from each fighter's perspective
+            rewards: (num_envs, 2) rewards for fighter1 and fighter2
+            dones: (num_envs,) episode termination flags
+            info: dict with health arrays and, when auto_reset is on, terminal states
+        """
+        actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+
+        rewards = np.zeros((self.num_envs, 2), dtype=np.float64)
+        for _ in range(self.action_repeat):
+            rewards += self._step_frame(actions)
+            if self.done.all():
+                break
+
+        done = self.done.copy()
+        states = self.get_states()
+        info = {
+            'fighter1_health': self.health[:, 0].copy(),
+            'fighter2_health': self.health[:, 1].copy(),
+            'step': self.current_step.copy(),
+        }
+
+        if self.auto_reset and done.any():
+            info['terminal_states'] = states.copy()
+            states[done] = self.reset(done)[done]
+
+        return states, rewards, done, info
+
+    def _step_frame(self, actions):
+        """Advance every running match by one frame and return the frame rewards"""
+        # Finished matches are frozen until they are reset
+        active = ~self.done
+        self.current_step[active] += 1
+
+        fighter_active = np.repeat(active[:, None], 2, axis=1)
+        self._execute_actions(actions, fighter_active)
+        self._update_fighters(fighter_active)
+        self._check_combat(fighter_active)
+
+        done = self._is_done()
+        rewards = self._calculate_rewards(done)
+        rewards[~active] = 0.0
+
+        self.done = done
+        self.last_health[:] = self.health
+
+        return rewards
+
+    def _can_move(self):
+        """Vectorized Fighter.can_move()"""
+        return (CAPABILITY_TABLE[self.state] & CAN_MOVE) != 0
+
+    def _can_attack(self):
+        """Vectorized Fighter.can_attack()"""
+        return ((self.attack_cooldown <= 0) & (self.block_to_attack_delay <= 0) &
+                ((CAPABILITY_TABLE[self.state] & CAN_ATTACK) != 0))
+
+    def _can_charge_projectile(self):
+        """Vectorized Fighter.can_charge_projectile()"""
+        return ((self.projectile_cooldown <= 0) &
+                ((CAPABILITY_TABLE[self.state] & CAN_CHARGE) != 0))
+
+    def _execute_actions(self, actions, active):
+        """Vectorized FightingGameEnv._execute_action for both fighters"""
+        can_move = self._can_move() & active
+        can_attack = self._can_attack() & active
+        can_charge = self._can_charge_projectile() & active
+
+        # Movement (move_left / move_right and their block variants)
+        left = ((actions == 1) | (actions == 7)) & can_move
+        right = ((actions == 2) | (actions == 8)) & can_move
+        self.velocity_x[left] = -config.FIGHTER_SPEED
+        self.velocity_x[right] = config.FIGHTER_SPEED
+        self.facing_right[left] = False
+        self.facing_right[right] = True
+        walk = (left | right) & self.is_grounded & (self.state == IDLE)
+        self.state[walk] = WALKING
+
+        # Jump
+        jump = (actions == 3) & can_move & self.is_grounded
+        self.velocity_y[jump] = -config.JUMP_STRENGTH
+        self.is_grounded[jump] = False
+        self.state[jump] = JUMPING
+
+        # Punch and kick
+        for action, attack_state in ((4, PUNCHING), (5, KICKING)):
+            attack = (actions == action) & can_attack
+            self.state[attack] = attack_state
+            self.attack_timer[attack] = config.ATTACK_DURATION
+            self.attack_cooldown[attack] = config.ATTACK_COOLDOWN
+            self.attack_to_block_delay[attack] = config.ATTACK_TO_BLOCK_DELAY
+            self.is_attacking[attack] = True
+            self.has_hit_this_attack[attack] = False
+            self.velocity_x[attack] = 0
+
+        # Block (moving into WALKING keeps can_move unchanged, so it is reused)
+        block_pressed = ((actions == 6) | (actions == 7) | (actions == 8)) & active
+        self.block_button_held[block_pressed] = True
+        block = block_pressed & can_move & (self.attack_to_block_delay <= 0)
+        self.state[block] = BLOCKING
+        self.is_blocking[block] = True
+        self.block_timer[block] = config.MINIMUM_BLOCK_DURATION
+        self.velocity_x[block] = 0
+
+        # Projectile: the env charges and fires instantly, leaving the fighter idle
+        fire = (actions == 9) & can_charge
+        self.velocity_x[fire] = 0
+        self.state[fire] = IDLE
+        self.projectile_cooldown[fire] = config.PROJECTILE_COOLDOWN
+
+    def _update_fighters(self, active):
+        """Vectorized Fighter.update() including state transitions"""
+        self.state_timer[active] += 1
+        for timer in self._timers:
+            timer[(timer > 0) & active] -= 1
+
+        # Gravity
+        falling = ~self.is_grounded & active
+        self.velocity_y[falling] += config.GRAVITY
+        self.velocity_y[falling & (self.velocity_y > config.MAX_FALL_SPEED)] = config.MAX_FALL_SPEED
+
+        # Integrate position
+        self.x[active] += self.velocity_x[active]
+        self.y[active] += self.velocity_y[active]
+
+        # Ground collision
+        floor_y = config.STAGE_FLOOR - config.FIGHTER_HEIGHT
+        landed = (self.y >= floor_y) & active
+        self.y[landed] = floor_y
+        self.velocity_y[landed] = 0
+        self.state[landed & (self.state == JUMPING)] = IDLE
+        self.is_grounded[active] = landed[active]
+
+        # Stage boundaries
+        np.clip(self.x, config.STAGE_LEFT, config.STAGE_RIGHT - config.FIGHTER_WIDTH, out=self.x)
+
+        # State transitions
+        attack_over = (((self.state == PUNCHING) | (self.state == KICKING)) &
+                       (self.attack_timer <= 0) & active)
+        self.state[attack_over] = IDLE
+        self.is_attacking[attack_over] = False
+        self.has_hit_this_attack[attack_over] = False
+
+        hit_over = (self.state == HIT) & (self.hit_timer <= 0) & active
+        self.state[hit_over] = IDLE
+        self.has_hit_this_attack[hit_over] = False
+
+        knockback_over = ((self.state == KNOCKBACK) & (self.knockback_timer <= 0) &
+                          self.is_grounded & active)
+        self.state[knockback_over] = IDLE
+        self.has_hit_this_attack[knockback_over] = False
+
+        block_over = ((self.state == BLOCKING) & (self.block_timer <= 0) &
+                      ~self.block_button_held & active)
+        self.state[block_over] = IDLE
+        self.is_blocking[block_over] = False
+        self.block_to_attack_delay[block_over] = config.BLOCK_TO_ATTACK_DELAY
+
+    def _attack_hitboxes(self):
+        """
+        Vectorized Fighter._update_hitboxes() + get_attack_hitbox().
+
+        Hitboxes are built with the AABB constructor, which truncates
+        float coordinates toward zero.
+        """
+        punching = (self.state == PUNCHING) & (self.attack_timer > 0)
+        kicking = (self.state == KICKING) & (self.attack_timer > 0)
+
+        width = np.where(punching, config.PUNCH_RANGE, config.KICK_RANGE)
+        height = np.where(punching, PUNCH_HEIGHT, KICK_HEIGHT)
+        offset_y = np.where(punching, PUNCH_OFFSET_Y, KICK_OFFSET_Y)
+        hit_x = np.where(self.facing_right, self.x + config.FIGHTER_WIDTH, self.x - width)
+
+        left = np.trunc(hit_x)
+        top = np.trunc(self.y + offset_y)
+        damage = np.where(punching, config.PUNCH_DAMAGE, config.KICK_DAMAGE)
+        knockback = np.where(punching, config.PUNCH_KNOCKBACK, config.KICK_KNOCKBACK)
+
+        return punching | kicking, left, top, width, height, damage, knockback
+
+    def _check_combat(self, active):
+        """Vectorized FightingGameEnv._check_combat for both fighters"""
+        has_hitbox, left, top, width, height, damage, knockback = self._attack_hitboxes()
+
+        # Fighter body rects are positioned through rect.x/rect.y assignment
+        body_left = _round_half_away(self.x)
+        body_top = _round_half_away(self.y)
+
+        # Column i of the target arrays is the fighter attacked by fighter i
+        target_left = body_left[:, ::-1]
+        target_top = body_top[:, ::-1]
+        overlaps = ((left < target_left + config.FIGHTER_WIDTH) &
+                    (top < target_top + config.FIGHTER_HEIGHT) &
+                    (left + width > target_left) &
+                    (top + height > target_top))
+
+        lands = (has_hitbox & overlaps & ~self.has_hit_this_attack &
+                 ~self.is_blocking[:, ::-1] & active)
+        if not lands.any():
+            return
+
+        direction = np.where(self.x < self.x[:, ::-1], 1, -1)
+
+        # Fighter.take_damage applied to the target of each landed attack
+        struck = lands[:, ::-1]
+        incoming_damage = damage[:, ::-1]
+        incoming_knockback = knockback[:, ::-1]
+        incoming_direction = direction[:, ::-1]
+
+        self.health[struck] -= incoming_damage[struck]
+        np.maximum(self.health, 0, out=self.health)
+
+        knocked = struck & (incoming_knockback > 0)
+        stunned = struck & ~knocked
+        self.state[knocked] = KNOCKBACK
+        self.knockback_timer[knocked] = config.KNOCKBACK_DURATION
+        self.velocity_x[knocked] = (incoming_knockback * incoming_direction)[knocked]
+        self.velocity_y[knocked] = -config.KICK_UPWARD_FORCE
+        self.is_grounded[knocked] = False
+        self.state[stunned] = HIT
+        self.hit_timer[stunned] = 20
+        self.is_blocking[struck] = False
+
+        self.has_hit_this_attack[lands] = True
+
+    def _is_done(self):
+        """Vectorized FightingGameEnv._is_done"""
+        return ((self.health <= 0).any(axis=1) |
+                (self.current_step >= self.max_steps) | self.done)
+
+    def _calculate_rewards(self, done):
+        """Vectorized FightingGameEnv._calculate_reward for both fighters"""
+        health_change = self.health - self.last_health
+        opp_health_change = health_change[:, ::-1]
+
+        # Accumulate in the same order as the scalar version so floats match bit for bit
+        rewards = np.zeros((self.num_envs, 2), dtype=np.float64)
+        rewards += health_change * 0.2
+        rewards -= opp_health_change * 0.2
+        rewards += np.where(self.has_hit_this_attack, 5.0, 0.0)
+
+        distance = np.abs(self.x[:, 0] - self.x[:, 1])
+        rewards += np.where((distance < 150)[:, None], 0.1, 0.0)
+
+        # Terminal rewards
+        alive = self.health > 0
+        opp_alive = alive[:, ::-1]
+        timeout = (self.current_step >= self.max_steps)[:, None]
+        ahead = self.health > self.health[:, ::-1]
+        behind = self.health < self.health[:, ::-1]
+
+        terminal = np.where(~alive, -50.0,
+                   np.where(~opp_alive, 50.0,
+                   np.where(timeout & ahead, 50.0,
+                   np.where(timeout & behind, -50.0, 0.0))))
+        rewards += np.where(done[:, None], terminal, 0.0)
+
+        return rewards
+
+    def close(self):
+        """Nothing to release; present for interface parity with the other envs"""
+        pass
+
+    def get_states(self, out=None):
+        """
+        Observation vectors for both fighters of every match.
+
+        Args:
+            out: Optional preallocated (num_envs, 2, state_size) float32 buffer
+
+        Returns:
+            (num_envs, 2, state_size) float32 array; [:, 0] is fighter1's view
+            and [:, 1] is fighter2's view, matching FightingGameEnv.get_state
+        """
+        if out is None:
+            out = new_observation_buffer(self.num_envs)
+        return encode_batch(self, out)
@@ -2,9 +2,12 @@
 """
 Performance benchmarking for fighting game AI components
 """
+import os
 import time
 import numpy as np
 from environment import FightingGameEnv
+from batch_environment import BatchFightingEnv
+from subproc_environment import SubprocVecEnv
 from models import SimplePolicy, FighterPolicy
 import torch
 
@@ -45,6 +48,30 @@ def benchmark_performance():
     env_step_time = np.mean(times) * 1000  # Convert to milliseconds
     print(f'  Average step time: {env_step_time:.3f} ms')
 
+    # Benchmark batched environment throughput
+    print('\n1b. Batched Environment Throughput:')
+    for num_envs in [64, 256, 1024]:
+        batch_env = BatchFightingEnv(num_envs=num_envs)
+        batch_env.reset()
+        actions = np.zeros((num_envs, 2), dtype=np.int64)
+        start = time.time()
+        for i in range(200):
+            batch_env.step(actions)
+        elapsed = time.time() - start
+        print(f'  {num_envs:5d} matches: {200 * num_envs / elapsed:,.0f} frames/second')
+
+    # Benchmark subprocess vector env scaling with worker count
+    print('\n1c. Subprocess Vector Environment Throughput (8 envs per worker):')
+    for num_workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+        with SubprocVecEnv(num_workers=num_workers, envs_per_worker=8) as vec_env:
+            vec_env.reset()
+            actions = np.zeros((vec_env.num_envs, 2), dtype=np.int64)
+            start = time.time()
+            for i in range(200):
+                vec_env.step(actions)
+            elapsed = time.time() - start
+        print(f'  {num_workers:3d} workers: {200 * vec_env.num_envs / elapsed:,.0f} frames/second')
+
     # Benchmark rule-based inference
     print('\n2. Rule-Based AI Inference:')
     state = env.reset()
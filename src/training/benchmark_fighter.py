@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for the Fighter hot paths
+
+Compares the slotted, integer-state Fighter against LegacyFighter, a frozen
+copy of the previous per-frame logic (dict-backed attributes, string states,
+list scans in the capability checks, and a new AABB allocated for each active
+hitbox every frame).
+"""
+import sys
+import os
+import time
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from game.core import config
+from game.core.geometry import AABB
+from game.entities.fighter import Fighter
+
+IDLE, WALKING, JUMPING = "idle", "walking", "jumping"
+PUNCHING, KICKING, BLOCKING, CHARGING = "punching", "kicking", "blocking", "charging"
+HIT, KNOCKBACK = "hit", "knockback"
+
+
+class LegacyFighter:
+    """Previous Fighter per-frame logic, kept only as a benchmark reference"""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.velocity_x = 0
+        self.velocity_y = 0
+        self.facing_right = True
+        self.width = config.FIGHTER_WIDTH
+        self.height = config.FIGHTER_HEIGHT
+        self.state = IDLE
+        self.state_timer = 0
+        self.is_grounded = True
+        self.attack_timer = 0
+        self.attack_cooldown = 0
+        self.is_attacking = False
+        self.is_blocking = False
+        self.hit_timer = 0
+        self.has_hit_this_attack = False
+        self.knockback_timer = 0
+        self.attack_to_block_delay = 0
+        self.block_to_attack_delay = 0
+        self.block_timer = 0
+        self.block_button_held = False
+        self.projectile_cooldown = 0
+        self.charging_orb = None
+        self.is_charging_projectile = False
+        self.rect = AABB(self.x, self.y, self.width, self.height)
+        self.punch_hitbox = None
+        self.kick_hitbox = None
+
+    def update(self):
+        self.state_timer += 1
+        if self.state == KNOCKBACK and not config.TRAINING_MODE:
+            print(f"DEBUG UPDATE: In knockback state - velocity_x: {self.velocity_x}")
+        if self.attack_timer > 0:
+            self.attack_timer -= 1
+        if self.attack_cooldown > 0:
+            self.attack_cooldown -= 1
+        if self.hit_timer > 0:
+            self.hit_timer -= 1
+        if self.knockback_timer > 0:
+            self.knockback_timer -= 1
+        if self.attack_to_block_delay > 0:
+            self.attack_to_block_delay -= 1
+        if self.block_to_attack_delay > 0:
+            self.block_to_attack_delay -= 1
+        if self.block_timer > 0:
+            self.block_timer -= 1
+        if self.projectile_cooldown > 0:
+            self.projectile_cooldown -= 1
+        if self.charging_orb:
+            self.charging_orb.update()
+
+        if not self.is_grounded:
+            self.velocity_y += config.GRAVITY
+            if self.velocity_y > config.MAX_FALL_SPEED:
+                self.velocity_y = config.MAX_FALL_SPEED
+        if self.state == KNOCKBACK and self.velocity_x != 0 and not config.TRAINING_MODE:
+            print(f"DEBUG UPDATE: Knockback fighter moving - velocity_x: {self.velocity_x}")
+        self.x += self.velocity_x
+        self.y += self.velocity_y
+
+        if self.y >= config.STAGE_FLOOR - self.height:
+            self.y = config.STAGE_FLOOR - self.height
+            self.velocity_y = 0
+            if not self.is_grounded:
+                if hasattr(self, 'audio_manager') and self.audio_manager:
+                    self.audio_manager.play_sound('land')
+            self.is_grounded = True
+            if self.state == JUMPING:
+                self.state = IDLE
+        else:
+            self.is_grounded = False
+
+        if self.x < config.STAGE_LEFT:
+            self.x = config.STAGE_LEFT
+        elif self.x > config.STAGE_RIGHT - self.width:
+            self.x = config.STAGE_RIGHT - self.width
+
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+        self.punch_hitbox = None
+        self.kick_hitbox = None
+        if self.state == PUNCHING and self.attack_timer > 0:
+            hitbox_x = self.x + self.width if self.facing_right else self.x - config.PUNCH_RANGE
+            self.punch_hitbox = AABB(hitbox_x, self.y + 30, config.PUNCH_RANGE, 25)
+        elif self.state == KICKING and self.attack_timer > 0:
+            hitbox_x = self.x + self.width if self.facing_right else self.x - config.KICK_RANGE
+            self.kick_hitbox = AABB(hitbox_x, self.y + 60, config.KICK_RANGE, 30)
+
+        if self.state == PUNCHING:
+            if self.attack_timer <= 0:
+                if not self.has_hit_this_attack and hasattr(self, 'audio_manager') and self.audio_manager:
+                    self.audio_manager.play_sound('punch_miss')
+                self.state = IDLE
+                self.is_attacking = False
+                self.has_hit_this_attack = False
+        elif self.state == KICKING:
+            if self.attack_timer <= 0:
+                if not self.has_hit_this_attack and hasattr(self, 'audio_manager') and self.audio_manager:
+                    self.audio_manager.play_sound('kick_miss')
+                self.state = IDLE
+                self.is_attacking = False
+                self.has_hit_this_attack = False
+        if self.state == HIT and self.hit_timer <= 0:
+            self.state = IDLE
+            self.has_hit_this_attack = False
+        if self.state == KNOCKBACK and self.knockback_timer <= 0 and self.is_grounded:
+            self.state = IDLE
+            self.has_hit_this_attack = False
+        if self.state == BLOCKING and self.block_timer <= 0 and not self.block_button_held:
+            self.state = IDLE
+            self.is_blocking = False
+            self.block_to_attack_delay = config.BLOCK_TO_ATTACK_DELAY
+        if self.state == CHARGING and not self.is_charging_projectile:
+            self.state = IDLE
+            self.charging_orb = None
+        if self.is_charging_projectile and self.state != CHARGING:
+            self.state = IDLE
+            self.is_charging_projectile = False
+            self.charging_orb = None
+
+    def can_move(self):
+        return self.state not in [PUNCHING, KICKING, CHARGING, HIT, KNOCKBACK, BLOCKING]
+
+    def can_attack(self):
+        return (self.attack_cooldown <= 0 and
+                self.block_to_attack_delay <= 0 and
+                self.state not in [PUNCHING, KICKING, CHARGING, HIT, KNOCKBACK])
+
+    def can_charge_projectile(self):
+        return (self.projectile_cooldown <= 0 and
+                self.state not in [PUNCHING, KICKING, CHARGING, HIT, KNOCKBACK, BLOCKING])
+
+    def move_right(self):
+        if self.can_move():
+            self.velocity_x = config.FIGHTER_SPEED
+            self.facing_right = True
+            if self.is_grounded and self.state == IDLE:
+                self.state = WALKING
+
+    def punch(self):
+        if self.can_attack():
+            self.state = PUNCHING
+            self.attack_timer = config.ATTACK_DURATION
+            self.attack_cooldown = config.ATTACK_COOLDOWN
+            self.attack_to_block_delay = config.ATTACK_TO_BLOCK_DELAY
+            self.is_attacking = True
+            self.has_hit_this_attack = False
+            self.velocity_x = 0
+
+
+def _make_fighters(cls, count):
+    floor_y = config.STAGE_FLOOR - config.FIGHTER_HEIGHT
+    if cls is LegacyFighter:
+        return [cls(100 + (i % 800), floor_y) for i in range(count)]
+    return [cls(100 + (i % 800), floor_y, config.BLUE) for i in range(count)]
+
+
+def _time_frames(fighters, frames):
+    """Scripted frames: walk, punch on a cycle, check capabilities, update"""
+    start = time.perf_counter()
+    for frame in range(frames):
+        punch_now = frame % 20 == 0
+        for fighter in fighters:
+            if punch_now:
+                fighter.punch()
+            else:
+                fighter.move_right()
+            fighter.can_charge_projectile()
+            fighter.update()
+    return time.perf_counter() - start
+
+
+def _time_capability_checks(fighters, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for fighter in fighters:
+            fighter.can_move()
+            fighter.can_attack()
+            fighter.can_charge_projectile()
+    return time.perf_counter() - start
+
+
+def _instance_bytes(fighter):
+    size = sys.getsizeof(fighter)
+    if hasattr(fighter, '__dict__'):
+        size += sys.getsizeof(fighter.__dict__)
+    return size
+
+
+def benchmark_fighter(count=200, frames=600):
+    config.TRAINING_MODE = True
+    print('🔍 Fighter Microbenchmark:')
+    print('=' * 50)
+    print(f'  {count} fighters x {frames} frames')
+
+    results = {}
+    for name, cls in [('legacy', LegacyFighter), ('current', Fighter)]:
+        fighters = _make_fighters(cls, count)
+        update_time = _time_frames(fighters, frames)
+        check_time = _time_capability_checks(fighters, frames)
+        results[name] = (update_time, check_time, _instance_bytes(fighters[0]))
+
+    updates = count * frames
+    print('\n1. Per-frame update (actions + capability check + update):')
+    for name, (update_time, _, _) in results.items():
+        print(f'  {name:8s} {update_time / updates * 1e6:.3f} us/fighter-frame '
+              f'({updates / update_time:,.0f} updates/second)')
+    print(f'  Speedup: {results["legacy"][0] / results["current"][0]:.2f}x')
+
+    print('\n2. Capability checks (can_move + can_attack + can_charge_projectile):')
+    for name, (_, check_time, _) in results.items():
+        print(f'  {name:8s} {check_time / updates * 1e9:.1f} ns/fighter')
+    print(f'  Speedup: {results["legacy"][1] / results["current"][1]:.2f}x')
+
+    print('\n3. Instance size (object + attribute dict):')
+    for name, (_, _, size) in results.items():
+        print(f'  {name:8s} {size} bytes')
+
+    return results
+
+
+if __name__ == "__main__":
+    benchmark_fighter()
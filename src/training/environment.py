@@ -7,27 +7,33 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 import numpy as np
-import pygame
 from game.core import config
-from game.entities.fighter import Fighter
+from game.core.observation import STATE_SIZE, encode_observations, new_observation_buffer
+from game.entities.fighter import Fighter, SNAPSHOT_SIZE
 
 class FightingGameEnv:
     """RL Environment wrapper for the fighting game"""
 
-    def __init__(self, headless=True, max_steps=3600):  # 60 seconds at 60 FPS
+    def __init__(self, headless=True, max_steps=3600, action_repeat=1, seed=None):  # 60 seconds at 60 FPS
         self.headless = headless
         self.max_steps = max_steps
         self.current_step = 0
 
+        # Per-env random stream; pass env.np_random to opponents for reproducible games
+        self.np_random = None
+        self.seed(seed)
+
+        # Number of frames each action is held for; step() returns after the last one
+        self.action_repeat = max(1, int(action_repeat))
+
         # Enable training mode to disable debug outputs
         config.TRAINING_MODE = True
 
-        # Initialize pygame (needed even in headless mode for game logic)
-        pygame.init()
-        if headless:
-            # Create a dummy surface for headless training
-            self.screen = pygame.Surface((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
-        else:
+        # Game logic is pygame-free; only import pygame when we need a window
+        self.screen = None
+        if not headless:
+            import pygame
+            pygame.init()
             self.screen = pygame.display.set_mode((config.SCREEN_WIDTH, config.SCREEN_HEIGHT))
 
         # Game components
@@ -36,7 +42,7 @@ class FightingGameEnv:
         self.fighter2 = None  # Opponent
 
         # State and action spaces
-        self.state_size = 26  # Increased to include projectile charge levels
+        self.state_size = STATE_SIZE  # Includes projectile charge levels
         self.action_size = 10
         self.action_mapping = {
             0: 'idle',
@@ -51,6 +57,9 @@ class FightingGameEnv:
             9: 'projectile'
         }
 
+        # Both fighters' latest observations, rewritten in place every step
+        self.observations = new_observation_buffer()
+
         # Training state
         self.last_health = [100, 100]  # [fighter1, fighter2]
         self.last_positions = [0, 0]
@@ -80,83 +89,100 @@ class FightingGameEnv:
 
         return self.get_state()
 
+    def seed(self, seed=None):
+        """Reseed the env's random stream (env.np_random) and return the seed used"""
+        if self.np_random is None:
+            self.np_random = np.random.RandomState(seed)
+        else:
+            # Reseed in place so opponents holding env.np_random follow along
+            self.np_random.seed(seed)
+        return [seed]
+
+    def get_snapshot(self):
+        """
+        Capture the full simulation state as a flat float64 array.
+
+        Restoring it with restore() continues the game exactly from this frame,
+        which lets lookahead agents and evaluations branch several rollouts
+        from one state. Random streams are not included; save them with
+        env.np_random.get_state() if opponents draw from it.
+        """
+        header = [self.current_step] + list(self.last_health) + list(self.last_positions)
+        return np.concatenate((
+            np.array(header, dtype=np.float64),
+            self.fighter1.get_snapshot(),
+            self.fighter2.get_snapshot(),
+        ))
+
+    def restore(self, snapshot):
+        """Restore a state captured by get_snapshot() and return the fighter1 observation"""
+        if self.fighter1 is None:
+            self.reset()
+
+        self.current_step = int(snapshot[0])
+        self.last_health = [int(snapshot[1]), int(snapshot[2])]
+        self.last_positions = [float(snapshot[3]), float(snapshot[4])]
+        offset = 5
+        self.fighter1.restore(snapshot[offset:offset + SNAPSHOT_SIZE])
+        self.fighter2.restore(snapshot[offset + SNAPSHOT_SIZE:offset + 2 * SNAPSHOT_SIZE])
+
+        return self.get_state()
+
     def get_state(self, player_fighter=None):
-        """Convert game state to RL state vector with mirroring"""
-        f1, f2 = self.fighter1, self.fighter2
+        """Observation vector for player_fighter (default fighter1), mirrored so it is on the left"""
+        encode_observations(self.fighter1, self.fighter2, self.observations)
+        row = 1 if player_fighter is self.fighter2 else 0
+        return self.observations[row].copy()
+
+    def get_observations(self, out=None):
+        """
+        Encode both fighters' observations into out (default self.observations).
+
+        Row 0 is fighter1's view and row 1 is fighter2's. self.observations is
+        also refreshed by reset() and step(), so callers that need both views
+        after a step can read it directly instead of re-encoding.
+        """
+        if out is None:
+            out = self.observations
+        return encode_observations(self.fighter1, self.fighter2, out)
 
-        # Default to fighter1 as the player perspective
-        if player_fighter is None:
-            player_fighter = f1
+    def step(self, action1, action2=None):
+        """
+        Execute one decision in the environment.
+
+        The actions are applied for action_repeat frames (physics still runs
+        frame by frame). Rewards are summed over those frames and only the
+        final observation is returned. The repeat stops early if the episode ends.
+        """
+        reward1 = 0.0
+        reward2 = 0.0
+        frames = 0
+        done = False
+
+        for _ in range(self.action_repeat):
+            frame_reward1, frame_reward2, done = self._step_frame(action1, action2)
+            reward1 += frame_reward1
+            reward2 += frame_reward2
+            frames += 1
+            if done:
+                break
 
-        # Determine if we need to mirror (player is on the right)
-        if player_fighter == f1:
-            player, opponent = f1, f2
-            mirror = False
-        else:
-            player, opponent = f2, f1
-            mirror = False  # We'll handle mirroring in the state construction
-
-        # If player is to the right of opponent, we need to mirror
-        if player.x > opponent.x:
-            mirror = True
-
-        # Build state with consistent perspective (player on left, opponent on right)
-        if mirror:
-            # Mirror positions and velocities
-            player_x = 1.0 - (player.x / config.STAGE_WIDTH)
-            opponent_x = 1.0 - (opponent.x / config.STAGE_WIDTH)
-            player_vel_x = -player.velocity_x / config.FIGHTER_SPEED
-            opponent_vel_x = -opponent.velocity_x / config.FIGHTER_SPEED
-            # When mirrored, relative position should be negative (opponent to left)
-            relative_x = -(opponent_x - player_x)  # Flip sign for mirrored perspective
+        # Return step results
+        next_state = self.get_state()
+        info = {
+            'fighter1_health': self.fighter1.health,
+            'fighter2_health': self.fighter2.health,
+            'step': self.current_step,
+            'frames': frames
+        }
+
+        if action2 is not None:
+            return next_state, (reward1, reward2), done, info
         else:
-            # Normal positions
-            player_x = player.x / config.STAGE_WIDTH
-            opponent_x = opponent.x / config.STAGE_WIDTH
-            player_vel_x = player.velocity_x / config.FIGHTER_SPEED
-            opponent_vel_x = opponent.velocity_x / config.FIGHTER_SPEED
-            relative_x = (opponent_x - player_x)  # opponent relative to player
-
-        state = [
-            # Player state (always "on the left" in representation)
-            player_x,
-            player.y / config.STAGE_HEIGHT,
-            player.health / 100.0,
-            player_vel_x,
-            float(player.is_grounded),
-            float(player.is_attacking),
-            float(player.is_blocking),
-            player.attack_cooldown / config.ATTACK_COOLDOWN,
-            # Projectile state for player
-            player.projectile_cooldown / config.PROJECTILE_COOLDOWN,
-            float(player.is_charging_projectile),
-            player.charging_orb.get_charge_percent() if player.charging_orb else 0.0,
-
-            # Opponent state (always "on the right" in representation)
-            opponent_x,
-            opponent.y / config.STAGE_HEIGHT,
-            opponent.health / 100.0,
-            opponent_vel_x,
-            float(opponent.is_grounded),
-            float(opponent.is_attacking),
-            float(opponent.is_blocking),
-            opponent.attack_cooldown / config.ATTACK_COOLDOWN,
-            # Projectile state for opponent
-            opponent.projectile_cooldown / config.PROJECTILE_COOLDOWN,
-            float(opponent.is_charging_projectile),
-            opponent.charging_orb.get_charge_percent() if opponent.charging_orb else 0.0,
-
-            # Relative information (opponent relative to player)
-            abs(relative_x),  # Distance (always positive)
-            relative_x,       # Relative position (positive = opponent to right)
-            (opponent.y - player.y) / config.STAGE_HEIGHT,  # Height difference
-            (player.health - opponent.health) / 100.0,      # Health advantage
-        ]
-
-        return np.array(state, dtype=np.float32)
+            return next_state, reward1, done, info
 
-    def step(self, action1, action2=None):
-        """Execute one step in the environment"""
+    def _step_frame(self, action1, action2=None):
+        """Advance the game by a single frame and return (reward1, reward2, done)"""
         self.current_step += 1
 
         # Execute actions
@@ -182,18 +208,7 @@ class FightingGameEnv:
         self.last_health = [self.fighter1.health, self.fighter2.health]
         self.last_positions = [self.fighter1.x, self.fighter2.x]
 
-        # Return step results
-        next_state = self.get_state()
-        info = {
-            'fighter1_health': self.fighter1.health,
-            'fighter2_health': self.fighter2.health,
-            'step': self.current_step
-        }
-
-        if action2 is not None:
-            return next_state, (reward1, reward2), done, info
-        else:
-            return next_state, reward1, done, info
+        return reward1, reward2, done
 
     def _execute_action(self, fighter, action):
         """Execute an action for a fighter"""
@@ -311,6 +326,7 @@ class FightingGameEnv:
     def render(self):
         """Render the environment (for debugging)"""
         if not self.headless:
+            import pygame
             self.screen.fill(config.BLACK)
             # Simple rendering - just rectangles for fighters
             pygame.draw.rect(self.screen, self.fighter1.color,
@@ -321,4 +337,6 @@ class FightingGameEnv:
 
     def close(self):
         """Clean up environment"""
-        pygame.quit()
+        if not self.headless:
+            import pygame
+            pygame.quit()
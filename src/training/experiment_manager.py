@@ -37,6 +37,8 @@ class ExperimentManager:
         # Evaluation settings (from config)
         self.eval_games = config.get('training', {}).get('eval_games', 50)
         self.eval_interval = config.get('training', {}).get('eval_interval', 5000)
+        self.action_repeat = config.get('environment', {}).get('action_repeat', 1)
+        self.eval_seed = config.get('training', {}).get('eval_seed')
 
         # Running metrics
         self.episode_count = 0
@@ -114,11 +116,11 @@ class ExperimentManager:
         """Evaluate policy against specified opponent"""
         print(f"🎯 Evaluating policy against {opponent_type}...")
 
-        env = FightingGameEnv(headless=True)
+        env = FightingGameEnv(headless=True, action_repeat=self.action_repeat, seed=self.eval_seed)
 
         # Create opponent policy once (not every step!)
         if opponent_type == "rule_based":
-            opponent_policy = SimplePolicy('medium')
+            opponent_policy = SimplePolicy('medium', rng=env.np_random)
         else:
             opponent_policy = None
 
@@ -146,8 +148,7 @@ class ExperimentManager:
 
                 # Get opponent action (from opponent's perspective)
                 if opponent_type == "rule_based":
-                    opponent_state = env.get_state(player_fighter=env.fighter2)
-                    opponent_action = opponent_policy.get_action(opponent_state)
+                    opponent_action = opponent_policy.get_action(env.observations[1])
                 else:
                     opponent_action = 0  # idle
 
@@ -160,11 +161,13 @@ class ExperimentManager:
                 distance = abs(fighter1_x - fighter2_x)
                 game_distances.append(distance)
 
+                # Metrics are counted in frames so they don't depend on action_repeat
+                frames = info.get('frames', 1)
                 if distance < 150:  # Combat range
-                    combat_time += 1
-                total_time += 1
+                    combat_time += frames
+                total_time += frames
 
-                game_length += 1
+                game_length += frames
                 state = next_state
 
                 if done:
@@ -58,6 +58,16 @@ class FighterPolicy(nn.Module):
 
             return action.item() if action.numel() == 1 else action.cpu().numpy()
 
+    def get_actions(self, states, deterministic=False):
+        """Actions for a (N, state_size) batch as an (N,) int array, in one forward pass"""
+        with torch.no_grad():
+            action_logits, _ = self.forward(torch.as_tensor(states, dtype=torch.float32))
+            if deterministic:
+                actions = torch.argmax(action_logits, dim=-1)
+            else:
+                actions = torch.distributions.Categorical(logits=action_logits).sample()
+        return actions.numpy()
+
     def get_action_and_value(self, state):
         """Get action, log probability, and value"""
         if isinstance(state, np.ndarray):
@@ -74,7 +84,8 @@ class FighterPolicy(nn.Module):
 class PPOTrainer:
     """PPO (Proximal Policy Optimization) trainer"""
 
-    def __init__(self, policy, lr=3e-4, eps_clip=0.2, value_coef=0.5, entropy_coef=0.01):
+    def __init__(self, policy, lr=3e-4, eps_clip=0.2, value_coef=0.5, entropy_coef=0.01,
+                 epochs=4, minibatch_size=None):
         self.policy = policy
         self.optimizer = torch.optim.Adam(policy.parameters(), lr=lr)
 
@@ -82,6 +93,10 @@ class PPOTrainer:
         self.value_coef = value_coef
         self.entropy_coef = entropy_coef
 
+        # Passes over each batch, in shuffled minibatches (None = whole batch at once)
+        self.epochs = epochs
+        self.minibatch_size = minibatch_size
+
         # Training statistics
         self.training_stats = {
             'policy_loss': [],
@@ -90,53 +105,52 @@ class PPOTrainer:
             'total_loss': []
         }
 
-    def update(self, states, actions, old_log_probs, returns, advantages):
-        """Update policy using PPO"""
-        # Convert to tensors
-        states = torch.FloatTensor(states)
-        actions = torch.LongTensor(actions)
-        old_log_probs = torch.FloatTensor(old_log_probs)
-        returns = torch.FloatTensor(returns)
-        advantages = torch.FloatTensor(advantages)
-
-        # Normalize advantages
-        advantages = (advantages - advantages.mean()) / (advantages.std() + 1e-8)
-
-        # Multiple epochs of updates
-        for _ in range(4):  # PPO typically does multiple epochs
-            # Get current policy outputs
-            action_logits, values = self.policy(states)
-            action_probs = F.softmax(action_logits, dim=-1)
-            action_dist = torch.distributions.Categorical(action_probs)
-
-            new_log_probs = action_dist.log_prob(actions)
-            entropy = action_dist.entropy().mean()
-
-            # Calculate ratio for PPO
-            ratio = torch.exp(new_log_probs - old_log_probs)
-
-            # Calculate surrogate losses
-            surr1 = ratio * advantages
-            surr2 = torch.clamp(ratio, 1 - self.eps_clip, 1 + self.eps_clip) * advantages
-            policy_loss = -torch.min(surr1, surr2).mean()
-
-            # Value loss
-            value_loss = F.mse_loss(values.squeeze(-1), returns)
-
-            # Total loss
-            total_loss = policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy
-
-            # Update
-            self.optimizer.zero_grad()
-            total_loss.backward()
-            torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 0.5)
-            self.optimizer.step()
-
-            # Store stats
-            self.training_stats['policy_loss'].append(policy_loss.item())
-            self.training_stats['value_loss'].append(value_loss.item())
-            self.training_stats['entropy_loss'].append(entropy.item())
-            self.training_stats['total_loss'].append(total_loss.item())
+    def update(self, buffer):
+        """
+        Update policy using PPO on a RolloutBuffer.
+
+        Expects buffer.compute_returns_and_advantages() to have been called.
+        Advantages are normalized over the whole batch (in place) before the
+        shuffled minibatch epochs.
+        """
+        advantages = buffer.advantages
+        advantages -= advantages.mean()
+        advantages /= advantages.std(ddof=1) + 1e-8
+
+        for _ in range(self.epochs):  # PPO typically does multiple epochs
+            for batch in buffer.minibatches(self.minibatch_size):
+                # Get current policy outputs
+                action_logits, values = self.policy(batch['states'])
+                action_dist = torch.distributions.Categorical(logits=action_logits)
+
+                new_log_probs = action_dist.log_prob(batch['actions'])
+                entropy = action_dist.entropy().mean()
+
+                # Calculate ratio for PPO
+                ratio = torch.exp(new_log_probs - batch['log_probs'])
+
+                # Calculate surrogate losses
+                surr1 = ratio * batch['advantages']
+                surr2 = torch.clamp(ratio, 1 - self.eps_clip, 1 + self.eps_clip) * batch['advantages']
+                policy_loss = -torch.min(surr1, surr2).mean()
+
+                # Value loss
+                value_loss = F.mse_loss(values.squeeze(-1), batch['returns'])
+
+                # Total loss
+                total_loss = policy_loss + self.value_coef * value_loss - self.entropy_coef * entropy
+
+                # Update
+                self.optimizer.zero_grad()
+                total_loss.backward()
+                torch.nn.utils.clip_grad_norm_(self.policy.parameters(), 0.5)
+                self.optimizer.step()
+
+                # Store stats
+                self.training_stats['policy_loss'].append(policy_loss.item())
+                self.training_stats['value_loss'].append(value_loss.item())
+                self.training_stats['entropy_loss'].append(entropy.item())
+                self.training_stats['total_loss'].append(total_loss.item())
 
     def get_stats(self):
         """Get recent training statistics"""
@@ -153,20 +167,32 @@ class PPOTrainer:
 class RandomPolicy:
     """Random policy for baseline/opponent"""
 
-    def __init__(self, action_size=10):
+    def __init__(self, action_size=10, rng=None):
         self.action_size = action_size
+        self.rng = rng if rng is not None else np.random
+
+    def seed(self, seed=None):
+        """Give this policy its own seeded random stream"""
+        self.rng = np.random.RandomState(seed)
 
     def get_action(self, state, deterministic=False):
         """Return random action"""
-        return np.random.randint(0, self.action_size)
+        return self.rng.randint(0, self.action_size)
+
+    def get_actions(self, states, deterministic=False):
+        """Random actions for a (N, state_size) batch"""
+        return self.rng.randint(0, self.action_size, size=len(states))
 
 class SimplePolicy:
     """Simple rule-based policy for training opponents"""
 
-    def __init__(self, difficulty='medium'):
+    def __init__(self, difficulty='medium', rng=None):
         self.difficulty = difficulty
         self.action_size = 9
 
+        # Random stream (np.random.RandomState); defaults to the global np.random
+        self.rng = rng if rng is not None else np.random
+
         # Difficulty parameters (balanced for training)
         if difficulty == 'easy':
             self.reaction_delay = 0.3
@@ -183,6 +209,10 @@ class SimplePolicy:
 
         self.last_action_time = 0
 
+    def seed(self, seed=None):
+        """Give this policy its own seeded random stream"""
+        self.rng = np.random.RandomState(seed)
+
     def get_action(self, state, deterministic=False):
         """Get action based on simple rules"""
         # Add reaction delay
@@ -191,8 +221,8 @@ class SimplePolicy:
             return 0  # idle
 
         # Random mistakes
-        if np.random.random() < self.mistake_rate:
-            return np.random.randint(0, self.action_size)
+        if self.rng.random() < self.mistake_rate:
+            return self.rng.randint(0, self.action_size)
 
         # Simple strategy based on state
         # state[22] is distance, state[25] is health advantage
@@ -201,16 +231,16 @@ class SimplePolicy:
 
         # Close range - attack or block
         if distance < 0.15:  # Close
-            if np.random.random() < self.aggression:
-                return np.random.choice([4, 5])  # punch or kick
+            if self.rng.random() < self.aggression:
+                return self.rng.choice([4, 5])  # punch or kick
             else:
                 return 6  # block
 
         # Medium range - move in, attack, or projectile
         elif distance < 0.3:
-            if np.random.random() < self.aggression * 0.8:  # Slightly less aggressive
-                return np.random.choice([4, 5])  # attack
-            elif np.random.random() < 0.2:  # 20% chance for projectile
+            if self.rng.random() < self.aggression * 0.8:  # Slightly less aggressive
+                return self.rng.choice([4, 5])  # attack
+            elif self.rng.random() < 0.2:  # 20% chance for projectile
                 return 9  # projectile
             else:
                 # Move towards opponent
@@ -221,7 +251,7 @@ class SimplePolicy:
 
         # Far range - move in or projectile
         else:
-            if np.random.random() < 0.3:  # 30% chance for projectile at far range
+            if self.rng.random() < 0.3:  # 30% chance for projectile at far range
                 return 9  # projectile
             elif state[23] > 0:  # opponent is to the right
                 return 2  # move right (towards opponent)
@@ -229,3 +259,33 @@ class SimplePolicy:
                 return 1  # move left (towards opponent)
 
         return 0  # idle as fallback
+
+    def get_actions(self, states, deterministic=False):
+        """
+        Vectorized get_action for a (N, state_size) batch of opponent views.
+
+        Applies the same rules with the same probabilities as get_action, drawing
+        every random number for the batch at once. The reaction delay counts
+        calls, so a batch call advances it by one frame for every env.
+        """
+        num_envs = len(states)
+        self.last_action_time += 1
+        if self.last_action_time < self.reaction_delay * 60:  # Convert to frames
+            return np.zeros(num_envs, dtype=np.int64)
+
+        distance = states[:, 22]
+        toward = np.where(states[:, 23] > 0, 2, 1)  # move towards opponent
+        rolls = self.rng.random_sample((num_envs, 3))
+        attacks = 4 + self.rng.randint(0, 2, size=num_envs)  # punch or kick
+        mistakes = self.rng.randint(0, self.action_size, size=num_envs)
+
+        # Close range - attack or block
+        close = np.where(rolls[:, 1] < self.aggression, attacks, 6)
+        # Medium range - attack, projectile or move in
+        medium = np.where(rolls[:, 1] < self.aggression * 0.8, attacks,
+                          np.where(rolls[:, 2] < 0.2, 9, toward))
+        # Far range - projectile or move in
+        far = np.where(rolls[:, 1] < 0.3, 9, toward)
+
+        actions = np.where(distance < 0.15, close, np.where(distance < 0.3, medium, far))
+        return np.where(rolls[:, 0] < self.mistake_rate, mistakes, actions).astype(np.int64)
@@ -0,0 +1,80 @@
+"""
+Rollout storage for vectorized PPO training
+"""
+import numpy as np
+import torch
+
+
+class RolloutBuffer:
+    """Preallocated (num_steps, num_envs, ...) storage for one batch of experience"""
+
+    def __init__(self, num_steps, num_envs, state_size=26):
+        self.num_steps = num_steps
+        self.num_envs = num_envs
+        self.state_size = state_size
+
+        self.states = np.zeros((num_steps, num_envs, state_size), dtype=np.float32)
+        self.actions = np.zeros((num_steps, num_envs), dtype=np.int64)
+        self.log_probs = np.zeros((num_steps, num_envs), dtype=np.float32)
+        self.values = np.zeros((num_steps, num_envs), dtype=np.float32)
+        self.rewards = np.zeros((num_steps, num_envs), dtype=np.float32)
+        self.dones = np.zeros((num_steps, num_envs), dtype=np.bool_)
+
+        # Filled by compute_returns_and_advantages()
+        self.advantages = np.zeros((num_steps, num_envs), dtype=np.float32)
+        self.returns = np.zeros((num_steps, num_envs), dtype=np.float32)
+
+        # Flat torch views over the same memory, used for minibatch updates
+        self._tensors = {
+            'states': torch.from_numpy(self.states.reshape(-1, state_size)),
+            'actions': torch.from_numpy(self.actions.reshape(-1)),
+            'log_probs': torch.from_numpy(self.log_probs.reshape(-1)),
+            'returns': torch.from_numpy(self.returns.reshape(-1)),
+            'advantages': torch.from_numpy(self.advantages.reshape(-1)),
+        }
+
+    def __len__(self):
+        return self.num_steps * self.num_envs
+
+    def compute_returns_and_advantages(self, last_values, gamma=0.99, gae_lambda=0.95):
+        """
+        Generalized Advantage Estimation over all envs at once.
+
+        dones[t] marks the last step of an episode in that env. The next step
+        belongs to a fresh episode, so neither its value nor its advantage is
+        carried back across the boundary.
+
+        Args:
+            last_values: (num_envs,) value estimates of the states after the
+                         final step, used to bootstrap unfinished episodes
+        """
+        not_done = 1.0 - self.dones.astype(np.float32)
+        next_values = np.empty_like(self.values)
+        next_values[:-1] = self.values[1:]
+        next_values[-1] = last_values
+
+        # TD errors for every step in one pass; only the accumulation runs over time
+        deltas = self.rewards + gamma * next_values * not_done - self.values
+        decay = (gamma * gae_lambda) * not_done
+
+        gae = np.zeros(self.num_envs, dtype=np.float32)
+        for t in range(self.num_steps - 1, -1, -1):
+            gae = deltas[t] + decay[t] * gae
+            self.advantages[t] = gae
+
+        np.add(self.advantages, self.values, out=self.returns)
+        return self.returns, self.advantages
+
+    def minibatches(self, minibatch_size, generator=None):
+        """
+        Yield shuffled minibatches covering the whole buffer once.
+
+        Each minibatch is a dict of tensors (states, actions, log_probs,
+        returns, advantages) indexed from flat views of the buffer storage.
+        """
+        size = len(self)
+        minibatch_size = min(size, minibatch_size or size)
+        order = torch.randperm(size, generator=generator)
+        for start in range(0, size, minibatch_size):
+            indices = order[start:start + minibatch_size]
+            yield {key: tensor[indices] for key, tensor in self._tensors.items()}
@@ -0,0 +1,258 @@
+"""
+Subprocess Vector Environment
+Spreads FightingGameEnv instances over worker processes so rollout collection
+uses every core.
+
+Each worker owns a contiguous slice of the envs and steps them serially,
+resetting any that finish. Actions, observations, rewards and dones live in
+multiprocessing.shared_memory arrays that both sides index directly; the
+pipes only carry one-word commands, so nothing is pickled per step. The
+interface matches BatchFightingEnv: step() takes (num_envs, 2) actions and
+returns (num_envs, 2, state_size) observations for both fighters.
+"""
+import sys
+import os
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import numpy as np
+from game.core.observation import STATE_SIZE
+from training.environment import FightingGameEnv
+
+# Shared buffers: name -> (per-env shape, dtype)
+BUFFER_SPECS = {
+    'observations': ((2, STATE_SIZE), np.float32),
+    'terminal_observations': ((2, STATE_SIZE), np.float32),
+    'actions': ((2,), np.int64),
+    'reset_mask': ((), np.bool_),
+    'rewards': ((2,), np.float64),
+    'dones': ((), np.bool_),
+    'health': ((2,), np.int64),
+    'steps': ((), np.int64),
+}
+
+
+def _shared_array(num_envs, shape, dtype, name=None):
+    """Create (name=None) or attach to a shared memory block and view it as an array"""
+    full_shape = (num_envs,) + shape
+    if name is None:
+        nbytes = max(1, int(np.prod(full_shape)) * np.dtype(dtype).itemsize)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    else:
+        shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(full_shape, dtype=dtype, buffer=shm.buf)
+
+
+def _serve(remote, envs, arrays, start):
+    """Answer step/reset commands until told to close"""
+    observations = arrays['observations']
+    terminal = arrays['terminal_observations']
+    actions, rewards, dones = arrays['actions'], arrays['rewards'], arrays['dones']
+    health, steps = arrays['health'], arrays['steps']
+    reset_mask = arrays['reset_mask']
+
+    while True:
+        command = remote.recv()
+        if command == 'step':
+            for i, env in enumerate(envs, start):
+                _, (reward1, reward2), done, _ = env.step(int(actions[i, 0]), int(actions[i, 1]))
+                rewards[i, 0] = reward1
+                rewards[i, 1] = reward2
+                dones[i] = done
+                health[i, 0] = env.fighter1.health
+                health[i, 1] = env.fighter2.health
+                steps[i] = env.current_step
+                if done:
+                    terminal[i] = observations[i]
+                    env.reset()
+        elif command == 'reset':
+            for i, env in enumerate(envs, start):
+                if reset_mask[i]:
+                    env.reset()
+        elif command == 'close':
+            return
+        remote.send('ok')
+
+
+def _worker(remote, parent_remote, buffer_names, num_envs, start, count, env_kwargs, seed):
+    """Worker process: owns envs [start, start + count) of the shared buffers"""
+    parent_remote.close()
+
+    blocks, arrays = [], {}
+    for key, (shape, dtype) in BUFFER_SPECS.items():
+        shm, arrays[key] = _shared_array(num_envs, shape, dtype, buffer_names[key])
+        blocks.append(shm)
+
+    envs = []
+    for i in range(start, start + count):
+        env = FightingGameEnv(headless=True, seed=None if seed is None else seed + i, **env_kwargs)
+        # The env encodes into env.observations in place, so point it at shared memory
+        env.observations = arrays['observations'][i]
+        envs.append(env)
+    del env
+
+    try:
+        _serve(remote, envs, arrays, start)
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        remote.send('error: ' + traceback.format_exc())
+    finally:
+        # Drop every view into the shared blocks before closing them
+        envs.clear()
+        arrays.clear()
+        for shm in blocks:
+            shm.close()
+        remote.close()
+
+
+class SubprocVecEnv:
+    """
+    num_workers processes, each stepping envs_per_worker FightingGameEnvs with auto-reset
+
+    Pass num_envs instead to build exactly that many envs, split as evenly as
+    possible over min(num_workers, num_envs) workers.
+    """
+
+    def __init__(self, num_workers=None, envs_per_worker=8, max_steps=3600, action_repeat=1,
+                 seed=None, start_method=None, num_envs=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        if num_envs is None:
+            counts = [envs_per_worker] * self.num_workers
+        else:
+            self.num_workers = max(1, min(self.num_workers, num_envs))
+            counts = [num_envs // self.num_workers + (worker < num_envs % self.num_workers)
+                      for worker in range(self.num_workers)]
+        self.envs_per_worker = max(counts)
+        self.num_envs = sum(counts)
+        self.max_steps = max_steps
+        self.action_repeat = max(1, int(action_repeat))
+
+        # Same spaces as FightingGameEnv
+        self.state_size = STATE_SIZE
+        self.action_size = 10
+
+        self._blocks = {}
+        self._arrays = {}
+        for key, (shape, dtype) in BUFFER_SPECS.items():
+            self._blocks[key], self._arrays[key] = _shared_array(self.num_envs, shape, dtype)
+        buffer_names = {key: shm.name for key, shm in self._blocks.items()}
+
+        # Shared views; observations always hold the latest view of every env
+        self.observations = self._arrays['observations']
+        self._actions = self._arrays['actions']
+
+        ctx = mp.get_context(start_method)
+        env_kwargs = {'max_steps': max_steps, 'action_repeat': self.action_repeat}
+        self._remotes = []
+        self._processes = []
+        start = 0
+        for count in counts:
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(work_remote, remote, buffer_names, self.num_envs,
+                      start, count, env_kwargs, seed),
+                daemon=True,
+            )
+            process.start()
+            start += count
+            work_remote.close()
+            self._remotes.append(remote)
+            self._processes.append(process)
+
+        self.closed = False
+
+    def _broadcast(self, command):
+        """Send a command to every worker and wait until all of them have finished it"""
+        for remote in self._remotes:
+            remote.send(command)
+        for remote in self._remotes:
+            reply = remote.recv()
+            if reply != 'ok':
+                raise RuntimeError(f"SubprocVecEnv worker failed:\n{reply}")
+
+    def reset(self, mask=None):
+        """
+        Reset envs and return (num_envs, 2, state_size) observations.
+
+        Args:
+            mask: Optional (num_envs,) bool array; only these envs are reset
+        """
+        self._arrays['reset_mask'][:] = True if mask is None else mask
+        self._broadcast('reset')
+        return self.observations.copy()
+
+    def step(self, actions):
+        """
+        Execute one decision in every env.
+
+        Finished envs are reset inside their worker; their final observation
+        is returned in info['terminal_states'].
+
+        Args:
+            actions: int array of shape (num_envs, 2) with actions for fighter1 and fighter2
+
+        Returns:
+            states: (num_envs, 2, state_size) observations from each fighter's perspective
+            rewards: (num_envs, 2) rewards for fighter1 and fighter2
+            dones: (num_envs,) episode termination flags
+            info: dict with health arrays, step counts and terminal states
+        """
+        self._actions[:] = np.asarray(actions, dtype=np.int64).reshape(self.num_envs, 2)
+        self._broadcast('step')
+
+        dones = self._arrays['dones'].copy()
+        info = {
+            'fighter1_health': self._arrays['health'][:, 0].copy(),
+            'fighter2_health': self._arrays['health'][:, 1].copy(),
+            'step': self._arrays['steps'].copy(),
+        }
+        if dones.any():
+            info['terminal_states'] = np.where(dones[:, None, None],
+                                               self._arrays['terminal_observations'],
+                                               self.observations)
+
+        return self.observations.copy(), self._arrays['rewards'].copy(), dones, info
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        if self.closed:
+            return
+        self.closed = True
+        for remote in self._remotes:
+            try:
+                remote.send('close')
+            except (BrokenPipeError, EOFError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for remote in self._remotes:
+            remote.close()
+
+        self.observations = None
+        self._actions = None
+        self._arrays = {}
+        for shm in self._blocks.values():
+            try:
+                shm.close()
+            except BufferError:
+                pass  # A caller still holds a view; the block is freed once it is dropped
+            shm.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
@@ -2,6 +2,7 @@
 Training script for Fighting Game RL agents with ExperimentManager
 """
 import os
+import copy
 import time
 import yaml
 import argparse
@@ -10,8 +11,10 @@ import torch
 import matplotlib.pyplot as plt
 from collections import deque
 
-from environment import FightingGameEnv
+from batch_environment import BatchFightingEnv
+from subproc_environment import SubprocVecEnv
 from models import FighterPolicy, PPOTrainer, RandomPolicy, SimplePolicy
+from rollout import RolloutBuffer
 from experiment_manager import ExperimentManager
 
 class ExperimentTrainer:
@@ -36,10 +39,13 @@ class ExperimentTrainer:
         self.gamma = float(training_config.get('gamma', 0.99))
         self.gae_lambda = float(training_config.get('gae_lambda', 0.95))
         self.total_steps = int(training_config.get('total_steps', 100000))
+        self.ppo_epochs = int(training_config.get('ppo_epochs', 4))
+        minibatch_size = training_config.get('minibatch_size')
+        self.minibatch_size = int(minibatch_size) if minibatch_size else None
 
         print(f"🚀 Initialized trainer for experiment: {experiment_name}")
         print(f"📋 Total steps: {self.total_steps}")
-        print(f"🎯 Batch size: {self.batch_size}")
+        print(f"🎯 Batch size: {self.batch_size} (minibatch: {self.minibatch_size or self.batch_size}, epochs: {self.ppo_epochs})")
 
     def _get_default_config(self):
         """Get default configuration if no config file provided"""
@@ -50,12 +56,18 @@ class ExperimentTrainer:
                 'learning_rate': 3e-4,
                 'gamma': 0.99,
                 'gae_lambda': 0.95,
+                'ppo_epochs': 4,
+                'minibatch_size': 512,
                 'eval_interval': 5000,
                 'init_from_bc': True
             },
             'environment': {
                 'max_episode_steps': 2048,
-                'headless': True
+                'max_steps': 3600,
+                'headless': True,
+                'action_repeat': 1,
+                'num_envs': 16,
+                'vec_env': 'batch'
             },
             'opponents': {
                 'types': ['rule_based'],
@@ -67,15 +79,20 @@ class ExperimentTrainer:
         """Main training method with experiment management"""
         print(f"\n=== Starting Training ===")
 
-        # Initialize environment and policy
+        # Initialize environments and policy
         env_config = self.config.get('environment', {})
-        env = FightingGameEnv(headless=env_config.get('headless', True))
+        env = self._make_vec_env(env_config)
         policy = FighterPolicy()
 
         # Initialize opponent policy once (not every step!)
+        # Rule-based opponents get their own seeded stream so a seeded run is reproducible
         opponent_config = self.config.get('opponents', {})
         difficulty = opponent_config.get('difficulty', 'medium')
-        self.opponent_policy = SimplePolicy(difficulty)
+        if 'self_play' in opponent_config.get('types', []):
+            # Frozen copy of the learner, synced before every rollout
+            self.opponent_policy = copy.deepcopy(policy)
+        else:
+            self.opponent_policy = SimplePolicy(difficulty, rng=np.random.RandomState(env_config.get('seed')))
 
         # Try to initialize from behavioral cloning policy
         training_config = self.config.get('training', {})
@@ -92,7 +109,8 @@ class ExperimentTrainer:
             else:
                 print(f"⚠️ BC policy not found: {bc_policy_path}, starting from scratch")
 
-        trainer = PPOTrainer(policy, lr=self.learning_rate)
+        trainer = PPOTrainer(policy, lr=self.learning_rate, epochs=self.ppo_epochs,
+                             minibatch_size=self.minibatch_size)
 
         # Initial evaluation at step 0 (baseline)
         print("🎯 Running initial evaluation (baseline)...")
@@ -109,31 +127,36 @@ class ExperimentTrainer:
         step = 0
         episode = 0
 
+        # One batch is num_steps decisions in each of the num_envs matches
+        buffer = RolloutBuffer(-(-self.batch_size // env.num_envs), env.num_envs, env.state_size)
+        self._observations = env.reset()
+        self._episode_steps = np.zeros(env.num_envs, dtype=np.int64)
+
         print(f"🔄 Starting training loop: target steps = {self.total_steps}")
+        print(f"🧩 Collecting with {env.num_envs} envs x {buffer.num_steps} steps per batch")
 
         while step < self.total_steps:
             print(f"📊 Episode {episode}, Step {step}/{self.total_steps}")
             # Collect batch of experience
-            batch_data = self._collect_batch(env, policy, self.batch_size)
-
-            if batch_data is None:
-                continue
+            if isinstance(self.opponent_policy, FighterPolicy):
+                self.opponent_policy.load_state_dict(policy.state_dict())
+            self._collect_batch(env, policy, buffer)
 
-            states, actions, rewards, log_probs, values, dones = batch_data
-
-            # Calculate returns and advantages
-            returns, advantages = self._calculate_gae(rewards, values, dones)
+            # Calculate returns and advantages, bootstrapping matches still in progress
+            with torch.no_grad():
+                _, last_values = policy(torch.from_numpy(np.ascontiguousarray(self._observations[:, 0])))
+            buffer.compute_returns_and_advantages(last_values.squeeze(-1).numpy(), self.gamma, self.gae_lambda)
 
             # Update policy
-            trainer.update(states, actions, log_probs, returns, advantages)
+            trainer.update(buffer)
 
-            step += len(states)
+            step += len(buffer)
             episode += 1
 
             # Track statistics
-            episode_reward = np.sum(rewards)
+            episode_reward = float(np.sum(buffer.rewards))
             episode_rewards.append(episode_reward)
-            episode_lengths.append(len(rewards))
+            episode_lengths.append(len(buffer))
 
             # Logging every 10 episodes
             if episode % 10 == 0 and episode > 0:
@@ -180,74 +203,62 @@ class ExperimentTrainer:
         print(f"✅ Completed training!")
         return policy
 
-    def _collect_batch(self, env, policy, batch_size):
-        """Collect a batch of experience"""
-        states, actions, rewards, log_probs, values, dones = [], [], [], [], [], []
-
-        state = env.reset()
-        episode_steps = 0
+    def _make_vec_env(self, env_config):
+        """Build the vectorized training env selected by environment.vec_env"""
+        num_envs = int(env_config.get('num_envs', 16))
+        env_kwargs = {
+            'max_steps': env_config.get('max_steps', 3600),
+            'action_repeat': env_config.get('action_repeat', 1),
+        }
+        # Env physics is deterministic; the seed only matters for the opponents (see train())
+        if env_config.get('vec_env', 'batch') == 'subproc':
+            # Exactly num_envs envs, over at most one worker per env
+            num_workers = env_config.get('num_workers') or os.cpu_count() or 1
+            return SubprocVecEnv(num_workers=min(num_workers, num_envs), num_envs=num_envs,
+                                 seed=env_config.get('seed'), **env_kwargs)
+        return BatchFightingEnv(num_envs=num_envs, **env_kwargs)
+
+    def _collect_batch(self, env, policy, buffer):
+        """
+        Fill buffer with one batch of experience from every env.
+
+        Each step runs one batched forward pass for the learner and one for the
+        opponent, and writes the results straight into the (T, N) buffer.
+        Observations carry over between batches, so matches continue across them.
+        """
         max_episode_steps = self.config.get('environment', {}).get('max_episode_steps', 2048)
-
-        while len(states) < batch_size:
-            # Get action from policy
-            action, log_prob, value = policy.get_action_and_value(state)
-
-            # Get opponent action (from opponent's perspective)
-            opponent_state = env.get_state(player_fighter=env.fighter2)
-            opponent_action = self._get_opponent_action(opponent_state)
-
-            # Step environment
-            next_state, reward, done, info = env.step(action.item(), opponent_action)
-
-            # Extract reward for player 1 (the RL agent) if it's a tuple
-            if isinstance(reward, tuple):
-                reward = reward[0]  # First player reward
-
-            # Store experience
-            states.append(state)
-            actions.append(action.item())
-            rewards.append(reward)
-            log_probs.append(log_prob.item())
-            values.append(value.item())
-            dones.append(done)
-
-            state = next_state
-            episode_steps += 1
-
-            if done or episode_steps > max_episode_steps:
-                state = env.reset()
-                episode_steps = 0
-
-        return states, actions, rewards, log_probs, values, dones
-
-    def _get_opponent_action(self, state):
-        """Get action for opponent based on configuration"""
-        # Use the persistent opponent policy (not a new instance every step!)
-        return self.opponent_policy.get_action(state)
-
-    def _calculate_gae(self, rewards, values, dones):
-        """Calculate Generalized Advantage Estimation"""
-        returns = []
-        advantages = []
-
-        gae = 0
-        next_value = 0
-
-        for i in reversed(range(len(rewards))):
-            if i == len(rewards) - 1:
-                next_non_terminal = 1.0 - dones[i]
-                next_value = 0
-            else:
-                next_non_terminal = 1.0 - dones[i]
-                next_value = values[i + 1]
-
-            delta = rewards[i] + self.gamma * next_value * next_non_terminal - values[i]
-            gae = delta + self.gamma * self.gae_lambda * next_non_terminal * gae
-
-            advantages.insert(0, gae)
-            returns.insert(0, gae + values[i])
-
-        return returns, advantages
+        observations = self._observations
+        actions = np.zeros((env.num_envs, 2), dtype=np.int64)
+
+        for t in range(buffer.num_steps):
+            # Get actions from policy for every env at once
+            buffer.states[t] = observations[:, 0]
+            with torch.no_grad():
+                action, log_prob, value = policy.get_action_and_value(torch.from_numpy(buffer.states[t]))
+            actions[:, 0] = buffer.actions[t] = action.numpy()
+            buffer.log_probs[t] = log_prob.numpy()
+            buffer.values[t] = value.numpy()
+
+            # Get opponent actions (from each opponent's perspective)
+            actions[:, 1] = self.opponent_policy.get_actions(observations[:, 1])
+
+            # Step environments (finished matches reset automatically)
+            observations, rewards, dones, info = env.step(actions)
+
+            # Cut overly long episodes; they count as episode ends for GAE
+            self._episode_steps += 1
+            truncated = (self._episode_steps > max_episode_steps) & ~dones
+            if truncated.any():
+                observations[truncated] = env.reset(truncated)[truncated]
+            ended = dones | truncated
+            self._episode_steps[ended] = 0
+
+            # Store experience (player 1 is the RL agent)
+            buffer.rewards[t] = rewards[:, 0]
+            buffer.dones[t] = ended
+
+        self._observations = observations
+        return buffer
 
 def main():
     """Main training function with experiment management"""
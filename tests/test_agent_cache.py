@@ -0,0 +1,87 @@
+"""
+Tests for the content-addressed compiled agent cache
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import numpy as np
+from agent_cache import CompiledAgentCache, CACHE_DIR_NAME
+from code_validator import CodeValidator
+from safe_execution import SafeAgent
+
+AGENT_CODE = """```python
+import numpy as np
+
+def get_action(state):
+    if state[22] < 0.3:
+        return 4
+    return 2 if state[23] > 0 else 1
+```"""
+
+
+def test_identical_code_is_validated_and_compiled_once(monkeypatch):
+    """Re-creating a known agent is a cache hit, not a re-parse"""
+    cache = CompiledAgentCache()
+    validator = CodeValidator()
+    calls = []
+    original = validator.validate_code
+    monkeypatch.setattr(validator, 'validate_code', lambda *args: calls.append(args) or original(*args))
+
+    first = cache.validate(validator, AGENT_CODE, "gen0_agent_000")
+    second = cache.validate(validator, AGENT_CODE, "gen1_elite_000")
+    assert first.is_valid and second is first
+    assert len(calls) == 1
+
+    # Different limits are a different validation
+    assert not cache.validate(CodeValidator(max_lines=2), AGENT_CODE).is_valid
+
+    agents = [SafeAgent(f"agent_{i}", first.cleaned_code, cache=cache) for i in range(3)]
+    assert cache.get_stats()['code_objects'] == 1
+    assert cache.misses == 3 and cache.hits == 3
+
+    state = np.zeros(26, dtype=np.float32)
+    state[22] = 0.1
+    assert [agent.get_action(state) for agent in agents] == [4, 4, 4]
+
+
+def test_disk_cache_survives_new_process_state(tmp_path):
+    """A fresh cache over the same directory serves marshalled entries without recomputing"""
+    experiment_dir = tmp_path / "evolutionary_run"
+    writer = CompiledAgentCache.for_experiment(str(experiment_dir))
+    result = writer.validate(CodeValidator(), AGENT_CODE)
+    SafeAgent("writer", result.cleaned_code, cache=writer)
+
+    agent_file = experiment_dir / "top_agents" / "rank_001.py"
+    agent_file.parent.mkdir()
+    reader = CompiledAgentCache.for_agent_file(str(agent_file))
+    assert reader.cache_dir == str(experiment_dir / CACHE_DIR_NAME)
+
+    assert reader.validate(CodeValidator(), AGENT_CODE) == result
+    agent = SafeAgent("reader", result.cleaned_code, cache=reader)
+    assert agent.is_valid
+    assert reader.misses == 0 and reader.hits == 2
+
+    # Without a cache directory the play tools fall back to memory only
+    assert CompiledAgentCache.for_agent_file(str(tmp_path / "loose_agent.py")).cache_dir is None
+
+
+def test_stale_or_malformed_validations_are_recomputed(tmp_path, monkeypatch):
+    """Stored validations from another validator version, or with old fields, are misses"""
+    import marshal
+    import agent_cache
+
+    cache = CompiledAgentCache(str(tmp_path))
+    result = cache.validate(CodeValidator(), AGENT_CODE)
+
+    monkeypatch.setattr(agent_cache, 'VALIDATOR_VERSION', agent_cache.VALIDATOR_VERSION + 1)
+    reader = CompiledAgentCache(str(tmp_path))
+    assert reader.validate(CodeValidator(), AGENT_CODE) == result
+    assert reader.misses == 1 and reader.hits == 0
+
+    # An entry whose fields no longer match ValidationResult
+    for path in tmp_path.glob("*.validation"):
+        path.write_bytes(marshal.dumps({'is_valid': True, 'removed_field': 1}))
+    reader = CompiledAgentCache(str(tmp_path))
+    assert reader.validate(CodeValidator(), AGENT_CODE) == result
+    assert reader.misses == 1
@@ -0,0 +1,87 @@
+"""
+Tests for agent host processes
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import numpy as np
+from agent_host import AgentHostPool
+from safe_execution import SafeAgent
+
+RANDOM_CODE = """
+import random
+def get_action(state):
+    return 4 if state[22] < 0.3 else random.randint(0, 9)
+"""
+
+# One long C call: the watchdog can only interrupt between bytecodes
+BLOCKING_CODE = """
+def get_action(state):
+    return sum(range(10 ** 11)) % 10
+"""
+
+IMPORT_CODE = """
+def get_action(state):
+    return len(__import__('os').sep)
+"""
+
+MEMORY_CODE = """
+def get_action(state):
+    hog = [0] * (10 ** 9)
+    return 1
+"""
+
+
+def test_hosted_agent_matches_in_process_agent():
+    """Same code and seed give the same actions in a host as in-process, singly or batched"""
+    states = np.random.RandomState(0).rand(50, 26).astype(np.float32)
+    local = SafeAgent("local", RANDOM_CODE, seed=5)
+
+    with AgentHostPool(num_workers=2) as pool:
+        hosted = pool.add_agent("hosted", RANDOM_CODE, seed=5)
+        other = pool.add_agent("other", RANDOM_CODE, seed=5)
+        assert hosted.is_valid and hosted.worker is not other.worker
+
+        expected = [local.get_action(state) for state in states]
+        assert [hosted.get_action(state) for state in states] == expected
+
+        batched = [pool.get_actions([other, hosted], np.stack([state, state]))[0] for state in states]
+        assert batched == expected
+        assert hosted.get_stats()['total_calls'] == 100
+
+
+def test_hung_host_is_respawned_and_limits_apply():
+    """A blocking agent gets its host killed and respawned; neighbours keep working"""
+    state = np.full(26, 0.1, dtype=np.float32)
+    with AgentHostPool(num_workers=1, hang_timeout=0.5, memory_limit_mb=128) as pool:
+        good = pool.add_agent("good", RANDOM_CODE)
+        blocker = pool.add_agent("blocker", BLOCKING_CODE, timeout_seconds=0.1)
+        hog = pool.add_agent("hog", MEMORY_CODE)
+        first_pid = good.worker.process.pid
+
+        assert blocker.get_action(state) == 0
+        assert pool.respawns == 1
+        assert good.worker.process.pid != first_pid
+        assert good.get_action(state) == 4
+
+        # The address space cap turns the allocation into an ordinary agent error
+        assert hog.get_action(state) == 0
+        assert hog.get_stats()['total_errors'] == 1
+        assert pool.respawns == 1
+
+
+def test_hosted_agent_cannot_import_other_modules():
+    """__import__ only resolves random, math and numpy inside a host"""
+    from code_validator import CodeValidator
+    assert not CodeValidator().validate_code(IMPORT_CODE).is_valid
+
+    state = np.full(26, 0.1, dtype=np.float32)
+    with AgentHostPool(num_workers=1) as pool:
+        importer = pool.add_agent("importer", IMPORT_CODE)
+        assert importer.get_action(state) == 0
+        assert importer.get_stats()['total_errors'] == 1
+
+    local = SafeAgent("local", IMPORT_CODE)
+    assert local.get_action(state) == 0
+    assert local.last_error.startswith("ImportError: import of 'os' is not allowed")
@@ -28,3 +28,17 @@ def test_get_behavior_name_default():
     name = ai._get_behavior_name(config.AIBehavior.DEFAULT)
     assert isinstance(name, str)
     assert "Default" in name or name == "Default AI"
+
+def test_rl_controller_personality_uses_injected_rng():
+    import random
+    from types import SimpleNamespace
+    from ai_controller import RLAIController
+
+    fighter = SimpleNamespace(x=100)
+    opponent = SimpleNamespace(x=150, is_attacking=False)
+    picks = []
+    for _ in range(2):
+        controller = RLAIController(personality_config={'aggression': 0.9}, rng=random.Random(7))
+        picks.append([controller._apply_personality('idle', None, fighter, opponent) for _ in range(20)])
+    assert picks[0] == picks[1]
+    assert set(picks[0]) == {'punch', 'kick'}
@@ -0,0 +1,122 @@
+"""
+Tests for offline AST mutation and crossover of agent code
+"""
+import sys
+import os
+import re
+import ast
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from ast_variation import ASTVariation
+from code_validator import CodeValidator
+from generation_pipeline import STUB_TEMPLATES
+from safe_execution import SafeAgent
+
+PARENT = '''
+def get_action(state):
+    distance = state[22]
+    relative_pos = state[23]
+    close_range = 0.12  # punch range
+    far_range = 0.4
+
+    if distance < close_range:
+        return 4  # punch
+    elif distance > far_range:
+        return 9  # projectile
+    if relative_pos > 0.5:
+        return 2
+    return 1
+'''.strip()
+
+
+def _constants(code):
+    return sorted(repr(n.value) for n in ast.walk(ast.parse(code)) if isinstance(n, ast.Constant))
+
+
+def test_mutation_only_changes_thresholds_and_actions():
+    engine = ASTVariation(seed=0)
+    children = [engine.mutate(PARENT) for _ in range(50)]
+    assert all(children) and engine.produced == 50
+    assert len(set(children)) > 40
+
+    shape = re.compile(r'\d+(\.\d+)?')
+    for child in children:
+        assert shape.sub('N', child) == shape.sub('N', PARENT)  # Same code apart from numbers
+        assert '# punch range' in child  # Comments survive
+        assert re.search(r'state\[22\]', child)  # Feature indices are never touched
+
+    # Same seed, same children
+    assert ASTVariation(seed=0).mutate(PARENT) == children[0]
+
+
+def test_crossover_splices_branches_with_defined_names():
+    donor = '''
+def get_action(state):
+    distance = state[22]
+    if distance < 0.3:
+        return 5
+    return 0
+'''.strip()
+    engine = ASTVariation(seed=1)
+    children = {engine.crossover(PARENT, donor) for _ in range(20)}
+    assert children and None not in children
+    assert all('return 5' in child and 'close_range = 0.12' in child for child in children)
+
+    # A branch reading a name the parent doesn't define, or `+=` on one, is never spliced in
+    for body in ('    if mystery > 0.3:\n        return 5', '    if state[1] > 0.3:\n        edge += 1'):
+        engine = ASTVariation(seed=1)
+        donor = f"def get_action(state):\n{body}\n    return 0"
+        assert engine.crossover(PARENT, donor) is None and engine.unchanged == 1
+
+
+def test_children_are_valid_and_run_without_errors():
+    validator = CodeValidator()
+    engine = ASTVariation(seed=2)
+    parents = [t.strip() for t in STUB_TEMPLATES] + [PARENT]
+    rng = np.random.default_rng(0)
+
+    children = []
+    for i in range(300):
+        parent1, parent2 = (parents[j] for j in rng.choice(len(parents), 2))
+        child = engine.crossover(parent1, parent2) if i % 2 else engine.mutate(parent1)
+        if child is not None:
+            children.append(child)
+    assert len(children) > 200 and engine.invalid == 0
+
+    for i, child in enumerate(children[:50]):
+        assert validator.validate_code(child).is_valid
+        agent = SafeAgent(f"child_{i}", child)
+        for _ in range(10):
+            assert 0 <= agent.get_action(rng.uniform(-1, 1, 26)) <= 9
+        assert agent.get_stats()['total_errors'] == 0
+
+
+def test_validator_security_check_is_case_insensitive():
+    validator = CodeValidator()
+    for code, dangerous in [("IMPORT OS", True), ("x = Eval (1)", True), ("import ſys", True),
+                            ("évaluation = 1", False), ("distance = 0.5", False)]:
+        expected = [p for p in validator.dangerous_patterns if re.findall(p, code, re.IGNORECASE)]
+        issues = validator._validate_security(code)
+        assert issues == [f"Dangerous pattern detected: {p}" for p in expected]
+        assert bool(issues) == dangerous
+
+
+def test_trainer_creates_children_locally(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=6, generations=1, elite_size=1, llm_backend='stub',
+                              ast_variation_rate=1.0, seed=1)
+    trainer = EvolutionaryTrainer(config, None, "ast_run")
+    trainer._create_initial_population()
+    for i, agent in enumerate(trainer.population):
+        agent.fitness = float(i)
+    requests = trainer.generation_pipeline.get_stats()['requests']
+
+    trainer._create_next_generation()
+    assert len(trainer.population) == 6
+    assert trainer.generation_pipeline.get_stats()['requests'] == requests  # No LLM calls
+    assert trainer.ast_variation.produced >= 5
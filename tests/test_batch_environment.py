@@ -0,0 +1,146 @@
+"""
+Lockstep equivalence tests for BatchFightingEnv against FightingGameEnv
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from game.core import config
+from training.environment import FightingGameEnv
+from training.batch_environment import BatchFightingEnv
+
+
+def _aggressive_actions(rng, envs):
+    """Random actions biased toward closing distance and attacking so matches see combat
+
+    Blocks are left out: the env never releases the block button, so a fighter
+    that blocks once stays untouchable for the rest of the match.
+    """
+    actions = np.zeros((len(envs), 2), dtype=np.int64)
+    for i, env in enumerate(envs):
+        for j, (me, opp) in enumerate(((env.fighter1, env.fighter2), (env.fighter2, env.fighter1))):
+            roll = rng.random()
+            if roll < 0.35:
+                actions[i, j] = 2 if opp.x > me.x else 1
+            elif roll < 0.7:
+                actions[i, j] = rng.choice([4, 5])
+            else:
+                actions[i, j] = rng.choice([0, 1, 2, 3, 9])
+    return actions
+
+
+def _assert_fighters_match(batch, envs):
+    for i, env in enumerate(envs):
+        for j, fighter in enumerate((env.fighter1, env.fighter2)):
+            assert batch.x[i, j] == fighter.x
+            assert batch.y[i, j] == fighter.y
+            assert batch.velocity_x[i, j] == fighter.velocity_x
+            assert batch.velocity_y[i, j] == fighter.velocity_y
+            assert batch.health[i, j] == fighter.health
+            assert batch.state[i, j] == fighter.state
+            assert batch.facing_right[i, j] == fighter.facing_right
+            assert batch.is_grounded[i, j] == fighter.is_grounded
+            assert batch.is_attacking[i, j] == fighter.is_attacking
+            assert batch.is_blocking[i, j] == fighter.is_blocking
+            assert batch.has_hit_this_attack[i, j] == fighter.has_hit_this_attack
+            assert batch.attack_timer[i, j] == fighter.attack_timer
+            assert batch.hit_timer[i, j] == fighter.hit_timer
+            assert batch.knockback_timer[i, j] == fighter.knockback_timer
+            assert batch.block_timer[i, j] == fighter.block_timer
+            assert batch.projectile_cooldown[i, j] == fighter.projectile_cooldown
+
+
+def _run_lockstep(num_envs, max_steps, seed, action_fn):
+    rng = np.random.default_rng(seed)
+    envs = [FightingGameEnv(headless=True, max_steps=max_steps) for _ in range(num_envs)]
+    batch = BatchFightingEnv(num_envs=num_envs, max_steps=max_steps, auto_reset=False)
+
+    for env in envs:
+        env.reset()
+    states = batch.reset()
+    for i, env in enumerate(envs):
+        np.testing.assert_array_equal(states[i, 0], env.get_state(env.fighter1))
+        np.testing.assert_array_equal(states[i, 1], env.get_state(env.fighter2))
+
+    finished = np.zeros(num_envs, dtype=bool)
+    hits = 0
+    while not finished.all():
+        actions = action_fn(rng, envs)
+        states, rewards, dones, _ = batch.step(actions)
+
+        for i, env in enumerate(envs):
+            if finished[i]:
+                continue
+            _, (reward1, reward2), done, _ = env.step(int(actions[i, 0]), int(actions[i, 1]))
+            assert rewards[i, 0] == reward1
+            assert rewards[i, 1] == reward2
+            assert dones[i] == done
+            np.testing.assert_array_equal(states[i, 0], env.get_state(env.fighter1))
+            np.testing.assert_array_equal(states[i, 1], env.get_state(env.fighter2))
+            hits += env.fighter1.has_hit_this_attack + env.fighter2.has_hit_this_attack
+            finished[i] = done
+
+        _assert_fighters_match(batch, envs)
+
+    return hits
+
+
+def test_batch_env_matches_single_env_random_actions():
+    """Uniformly random actions produce identical trajectories"""
+    _run_lockstep(num_envs=6, max_steps=400, seed=0,
+                  action_fn=lambda rng, envs: rng.integers(0, 10, size=(len(envs), 2)))
+
+
+def test_batch_env_matches_single_env_with_combat():
+    """Aggressive play exercises hits, knockback, KOs and terminal rewards"""
+    hits = _run_lockstep(num_envs=8, max_steps=config.ROUND_TIME_FRAMES, seed=1,
+                         action_fn=_aggressive_actions)
+    assert hits > 0
+
+
+def test_batch_env_auto_reset():
+    """Finished matches restart and report their terminal observation"""
+    batch = BatchFightingEnv(num_envs=3, max_steps=5, auto_reset=True)
+    batch.reset()
+    for _ in range(4):
+        _, _, dones, _ = batch.step(np.zeros((3, 2), dtype=np.int64))
+        assert not dones.any()
+
+    states, _, dones, info = batch.step(np.full((3, 2), 2, dtype=np.int64))
+    assert dones.all()
+    assert 'terminal_states' in info
+    assert (batch.current_step == 0).all()
+    np.testing.assert_array_equal(states, batch.get_states())
+
+
+def test_action_repeat_matches_repeated_single_frames():
+    """Holding an action for k frames sums the per-frame rewards of both envs"""
+    repeat = 4
+    rng = np.random.default_rng(2)
+    single = FightingGameEnv(headless=True, max_steps=300)
+    repeated = FightingGameEnv(headless=True, max_steps=300, action_repeat=repeat)
+    batch = BatchFightingEnv(num_envs=1, max_steps=300, auto_reset=False, action_repeat=repeat)
+    single.reset()
+    repeated.reset()
+    batch.reset()
+
+    done = False
+    while not done:
+        action1, action2 = (int(a) for a in rng.integers(0, 10, size=2))
+        expected = np.zeros(2)
+        for _ in range(repeat):
+            _, (reward1, reward2), single_done, _ = single.step(action1, action2)
+            expected += (reward1, reward2)
+            if single_done:
+                break
+
+        state, rewards, done, info = repeated.step(action1, action2)
+        batch_states, batch_rewards, batch_dones, _ = batch.step([[action1, action2]])
+
+        assert done == single_done == batch_dones[0]
+        assert info['step'] == single.current_step
+        np.testing.assert_allclose(rewards, expected)
+        np.testing.assert_allclose(batch_rewards[0], expected)
+        np.testing.assert_array_equal(state, single.get_state())
+        np.testing.assert_array_equal(batch_states[0, 0], state)
@@ -0,0 +1,184 @@
+"""
+Tests for static per-call cost analysis and the frame-budget cost gate
+"""
+import sys
+import os
+import json
+import math
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from cost_analysis import CostGate, analyze_cost, benchmark_call_cost
+
+FIGHTER = '''
+def get_action(state):
+    distance = state[22]
+    if distance < 0.15:
+        return 4 if state[25] >= 0 else 6
+    elif distance > 0.4:
+        return 9
+    return 2 if state[23] > 0 else 1
+'''
+
+SPINS = '''
+def get_action(state):
+    ticks = 0
+    while True:
+        ticks += 1
+    return ticks % 10
+'''
+
+SEARCHES = '''
+def get_action(state):
+    best = 0
+    while True:
+        best += 1
+        if best > 5:
+            return best % 10
+'''
+
+BIG_RANGE = '''
+def get_action(state):
+    total = 0
+    for i in range(300000):
+        total += i
+    return 2 if state[23] > 0 else 1
+'''
+
+DATA_RANGE = '''
+def get_action(state):
+    steps = int(state[0] * 50)
+    for i in range(steps):
+        pass
+    return 2
+'''
+
+NUMPY_HEAVY = '''
+import numpy as np
+
+def get_action(state):
+    grid = np.zeros((1000, 1000))
+    return int(grid.sum()) % 10
+'''
+
+RECURSIVE = '''
+def depth(n):
+    return 0 if n <= 0 else 1 + depth(n - 1)
+
+def get_action(state):
+    return depth(3) % 10
+'''
+
+MUTUAL = '''
+def ping(n):
+    return pong(n - 1)
+
+def pong(n):
+    return ping(n - 1) if n > 0 else 0
+
+def get_action(state):
+    return ping(4) % 10
+'''
+
+
+def _states(n=16):
+    return np.random.default_rng(0).uniform(-1, 1, (n, 26)).astype(np.float32)
+
+
+def test_straight_line_agent_is_cheap():
+    estimate = analyze_cost(FIGHTER.strip())
+    assert estimate.issues == [] and not estimate.unbounded
+    assert 0 < estimate.estimated_ms < 0.05
+
+
+def test_unbounded_loops_and_recursion_are_flagged():
+    spins = analyze_cost(SPINS.strip())
+    assert spins.unbounded and math.isinf(spins.estimated_ms)
+    assert any("while True" in issue for issue in spins.issues)
+
+    # A while True loop that returns is bounded by its exit, not infinite
+    assert not analyze_cost(SEARCHES.strip()).unbounded
+
+    for code in (RECURSIVE, MUTUAL):
+        estimate = analyze_cost(code.strip())
+        assert estimate.unbounded and any("recursion" in issue for issue in estimate.issues)
+
+
+def test_large_ranges_and_allocations_are_flagged():
+    big = analyze_cost(BIG_RANGE.strip())
+    assert any("range" in issue for issue in big.issues) and big.estimated_ms > 1.0
+
+    data = analyze_cost(DATA_RANGE.strip())
+    assert any("runtime data" in issue for issue in data.issues) and not data.unbounded
+
+    heavy = analyze_cost(NUMPY_HEAVY.strip())
+    assert heavy.numpy_elements == 1_000_000
+    assert any("NumPy" in issue for issue in heavy.issues)
+
+
+def test_validator_reports_estimated_cost():
+    from code_validator import CodeValidator
+    result = CodeValidator().validate_code(BIG_RANGE.strip())
+    assert result.is_valid
+    assert result.metrics['estimated_call_ms'] > 1.0
+    assert any(warning.startswith("Per-call cost") for warning in result.warnings)
+
+
+def test_benchmark_times_calls_and_stops_early():
+    timing = benchmark_call_cost(FIGHTER.strip(), _states())
+    assert timing['calls'] == 16 and 0 < timing['mean_ms'] <= timing['max_ms']
+
+    timing = benchmark_call_cost(BIG_RANGE.strip(), _states(), budget_ms=0.1)
+    assert timing['calls'] < 16 and timing['mean_ms'] > 0.4
+
+
+def test_gate_rejects_over_budget_agents_and_caches_by_code():
+    gate = CostGate(frame_budget_ms=1.0, states=_states())
+    check = gate.check("fighter", FIGHTER.strip())
+    assert not check.over_budget and check.weight == 1.0 and check.measured_ms is not None
+
+    check = gate.check("spins", SPINS.strip())
+    assert check.over_budget and check.weight == 0.0
+    assert check.measured_ms is None  # Never run
+    assert "per-call cost has no static bound" in check.issues
+
+    check = gate.check("big_range", BIG_RANGE.strip())
+    assert check.over_budget and 0 < check.weight < 1
+
+    again = gate.check("gen1_elite_000", FIGHTER.strip())
+    assert again.agent_id == "gen1_elite_000" and not again.over_budget
+
+    report = gate.take_report()
+    assert report['checked'] == 3 and report['reused'] == 1 and report['over_budget'] == 2
+    assert set(report['over_budget_agents']) == {"spins", "big_range"}
+    assert gate.take_report()['checked'] == 0
+
+
+def test_trainer_rejects_or_penalizes_slow_agents(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=3, generations=1, llm_backend='stub', cost_policy='reject',
+                              cost_sample_states=16)
+    trainer = EvolutionaryTrainer(config, None, "cost_run")
+    assert trainer._create_and_validate_agent("gen0_agent_000", FIGHTER, 'test', 0)
+    assert not trainer._create_and_validate_agent("gen0_agent_001", BIG_RANGE, 'test', 0)
+    assert [agent.agent_id for agent in trainer.population] == ["gen0_agent_000"]
+
+    trainer._save_generation_results()
+    with open(os.path.join(trainer.experiment_manager.experiment_dir, "evolution_summary.json")) as f:
+        report = json.load(f)['generations'][0]['cost_gate']
+    assert report['over_budget'] == 1 and list(report['over_budget_agents']) == ["gen0_agent_001"]
+
+    config = ExperimentConfig(population_size=3, generations=1, llm_backend='stub',
+                              cost_sample_states=16, cost_policy='penalize')
+    trainer = EvolutionaryTrainer(config, None, "penalize_run")
+    assert trainer._create_and_validate_agent("gen0_agent_000", BIG_RANGE, 'test', 0)
+    assert 0 < trainer.population[0].cost_weight < 1
+
+    # Off by default: no gate, nothing rejected
+    trainer = EvolutionaryTrainer(ExperimentConfig(llm_backend='stub'), None, "default_run")
+    assert trainer.cost_gate is None
+    assert trainer._create_and_validate_agent("gen0_agent_000", BIG_RANGE, 'test', 0)
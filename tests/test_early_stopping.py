@@ -0,0 +1,63 @@
+"""
+Tests for ending matches early once the winner is decided
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import pytest
+from safe_execution import SafeAgent
+from match_runner import MatchRunner, SequentialStopping
+
+ATTACKER_CODE = """
+def get_action(state):
+    if state[22] < 0.08:
+        return 4
+    return 2 if state[23] > 0 else 1
+"""
+
+IDLE_CODE = """
+def get_action(state):
+    return 0
+"""
+
+
+def test_clinch_stops_only_when_a_draw_is_impossible():
+    rule = SequentialStopping('clinch')
+    assert rule.check(3, 0, 2) == 'clinched'
+    assert rule.check(0, 3, 2) == 'clinched'
+    assert rule.check(2, 0, 2) is None  # 2-2 is still possible
+    assert rule.check(1, 1, 0) is None  # Match over, nothing to decide early
+
+
+def test_sprt_stops_on_a_clear_run_of_decisive_games():
+    rule = SequentialStopping('sprt', error_rate=0.05, margin=0.3)
+    assert rule.check(0, 0, 9) is None
+    assert rule.check(2, 0, 9) is None
+    assert rule.check(3, 0, 9) == 'sprt'
+    assert rule.check(0, 3, 9) == 'sprt'
+    assert rule.check(3, 1, 9) is None  # A loss pulls the test back toward undecided
+
+    # A looser error rate decides sooner
+    assert SequentialStopping('sprt', error_rate=0.2, margin=0.3).check(2, 0, 9) == 'sprt'
+
+    with pytest.raises(ValueError):
+        SequentialStopping('bayes')
+
+
+def test_clinched_match_has_same_outcome_in_fewer_games():
+    """Seeded games are independent of stopping, so clinch only drops games that cannot matter"""
+    attacker = SafeAgent("attacker", ATTACKER_CODE)
+    idle = SafeAgent("idle", IDLE_CODE)
+
+    full = MatchRunner(games_per_match=5, timeout_seconds=600, action_repeat=4, seed=3).run_match(attacker, idle)
+    early = MatchRunner(games_per_match=5, timeout_seconds=600, action_repeat=4, seed=3,
+                        early_stopping='clinch').run_match(attacker, idle)
+
+    assert full.metadata['stop_reason'] == 'completed' and full.games_played == 5
+    assert full.metadata['agent1_wins'] == 5
+
+    assert early.metadata['stop_reason'] == 'clinched'
+    assert early.games_played == 3 and early.metadata['max_games'] == 5
+    assert (early.agent1_score, early.agent2_score) == (full.agent1_score, full.agent2_score)
@@ -0,0 +1,114 @@
+"""
+Tests for probe-state bank behavior fingerprints and near-duplicate detection
+"""
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from fingerprints import (FingerprintStore, build_probe_bank, find_duplicates, disagreement,
+                          action_distribution)
+
+AGENT = '''
+def get_action(state):
+    distance = state[22]
+    if distance < 0.15:
+        return 4
+    return 2 if state[23] > 0 else 1
+'''
+
+# Same behavior, different code
+RENAMED = '''
+def get_action(obs):
+    # Attack when close, otherwise walk toward the opponent
+    gap = obs[22]
+    if gap < 0.15:
+        return 4  # punch
+    if obs[23] > 0:
+        return 2
+    return 1
+'''
+
+OTHER = '''
+def get_action(state):
+    return 9 if state[22] > 0.3 else 6
+'''
+
+RANDOM = '''
+import random
+def get_action(state):
+    return random.choice([1, 2, 4])
+'''
+
+
+def _bank(size=400):
+    return np.random.default_rng(0).uniform(-1, 1, (size, 26)).astype(np.float32)
+
+
+def test_probe_bank_is_sampled_from_games_and_fixed():
+    bank = build_probe_bank(300, seed=1)
+    assert bank.shape == (300, 26) and bank.dtype == np.float32
+    assert np.array_equal(bank, build_probe_bank(300, seed=1))
+    assert len(np.unique(bank, axis=0)) > 250  # Many distinct situations, not one game's opening
+
+
+def test_find_duplicates_keeps_first_of_each_group():
+    a = np.zeros(100, dtype=np.int8)
+    b = a.copy()
+    b[:3] = 4  # 3% different
+    c = np.full(100, 9, dtype=np.int8)
+    assert disagreement(a, b) == 0.03
+    assert find_duplicates(np.stack([a, b, c, a]), threshold=0.05).tolist() == [-1, 0, -1, 0]
+    assert find_duplicates(np.stack([a, b, c, a]), threshold=0.01).tolist() == [-1, -1, -1, 0]
+    assert action_distribution(b)[4] == 0.03
+
+
+def test_cosmetic_variants_share_a_fingerprint():
+    store = FingerprintStore(_bank(), isolate=False)
+    fingerprints = store.get_fingerprints([AGENT, RENAMED, OTHER, RANDOM, RANDOM + "\n# copy"])
+    assert find_duplicates(fingerprints).tolist() == [-1, 0, -1, -1, 3]
+    assert store.get_stats() == {'fingerprints': 5, 'probed': 5, 'reused': 0}
+
+    # Probed in sandbox host processes, the fingerprints are the same
+    isolated = FingerprintStore(_bank(), isolate=True, num_workers=2)
+    try:
+        assert np.array_equal(isolated.get_fingerprints([AGENT, OTHER, RANDOM]), fingerprints[[0, 2, 3]])
+    finally:
+        isolated.close()
+
+
+def test_fingerprints_are_reused_from_disk(tmp_path):
+    path = str(tmp_path / "fingerprints.npz")
+    store = FingerprintStore(_bank(), path, isolate=False)
+    first = store.get_fingerprints([AGENT, OTHER])
+    store.save()
+
+    reloaded = FingerprintStore(_bank(), path, isolate=False)
+    assert np.array_equal(reloaded.get_fingerprints([OTHER, AGENT]), first[::-1])
+    assert reloaded.probed == 0 and reloaded.reused == 2
+
+    # Fingerprints taken on another bank are not reused
+    other_bank = FingerprintStore(_bank(200), path, isolate=False)
+    assert other_bank.fingerprints == {}
+
+
+def test_trainer_collapses_duplicates_before_tournament(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=4, generations=1, llm_backend='stub', probe_bank_size=300,
+                              dedupe_agents=True)
+    trainer = EvolutionaryTrainer(config, None, "dedupe_run")
+    for i, code in enumerate([AGENT, OTHER, RENAMED, RANDOM]):
+        assert trainer._create_and_validate_agent(f"gen0_agent_{i:03d}", code, 'test', 0)
+
+    try:
+        kept = trainer._collapse_duplicates(list(trainer.population))
+    finally:
+        trainer.fingerprints.close()
+    assert [agent.agent_id for agent in kept] == ["gen0_agent_000", "gen0_agent_001", "gen0_agent_003"]
+    assert [agent.agent_id for agent in trainer.population] == [agent.agent_id for agent in kept]
+    assert os.path.exists(os.path.join(trainer.experiment_manager.experiment_dir, "fingerprints.npz"))
+    assert os.path.exists(os.path.join("experiments", "probe_states.npy"))
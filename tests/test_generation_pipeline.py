@@ -0,0 +1,79 @@
+"""
+Tests for the concurrent agent generation pipeline and its offline stub client
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from code_validator import CodeValidator
+from generation_pipeline import GenerationPipeline, GenerationRequest, StubLLMClient, extract_code
+
+
+def _request(i):
+    return GenerationRequest(prompt=f"agent prompt {i % 2}", fighting_style="balanced", generation=0)
+
+
+def _run(client, target, accept=None, max_attempts=None, **kwargs):
+    pipeline = GenerationPipeline(client, backoff_seconds=0.001, **kwargs)
+    codes = []
+
+    def keep(request, code):
+        if accept is not None and not accept(request, code):
+            return False
+        codes.append(code)
+        return True
+
+    pipeline.run(_request, keep, target, max_attempts or target * 3)
+    return pipeline, codes
+
+
+def test_concurrency_is_bounded_and_target_is_exact():
+    client = StubLLMClient(latency=0.01)
+    pipeline, codes = _run(client, target=7, max_concurrency=3)
+    assert len(codes) == 7
+    assert client.max_in_flight == 3
+    assert pipeline.get_stats()['requests'] == 7  # Nothing requested beyond what was needed
+
+
+def test_rejected_code_is_replaced_until_attempts_run_out():
+    verdicts = iter([False, True] * 10)
+    pipeline, codes = _run(StubLLMClient(), target=4, accept=lambda r, c: next(verdicts), max_concurrency=2)
+    assert len(codes) == 4 and pipeline.rejected == 4
+
+    pipeline, codes = _run(StubLLMClient(), target=4, accept=lambda r, c: False, max_attempts=6)
+    assert codes == [] and pipeline.requests == 6
+
+
+def test_transient_failures_are_retried():
+    pipeline, codes = _run(StubLLMClient(failures_per_request=2), target=5, max_retries=3)
+    assert len(codes) == 5 and pipeline.retries == 10 and pipeline.failed == 0
+
+    pipeline, codes = _run(StubLLMClient(failures_per_request=2), target=5, max_retries=1, max_attempts=5)
+    assert codes == [] and pipeline.failed == 5
+
+
+def test_stub_is_deterministic_and_produces_valid_agents():
+    _, first = _run(StubLLMClient(seed=3, latency=0.001), target=6, max_concurrency=4)
+    _, second = _run(StubLLMClient(seed=3), target=6, max_concurrency=1)
+    assert first == second
+
+    validator = CodeValidator()
+    parent = first[0]
+    child_request = GenerationRequest("mutate", "evolved", 1, parent_codes=[parent])
+    child = extract_code(StubLLMClient(seed=3).respond(child_request))
+    assert child != parent
+    assert all(validator.validate_code(code).is_valid for code in first + [child])
+
+
+def test_trainer_generates_population_offline(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=4, generations=1, llm_backend='stub', llm_concurrency=3, seed=1)
+    trainer = EvolutionaryTrainer(config, None, "stub_run")
+    trainer._create_initial_population()
+
+    assert [agent.agent_id for agent in trainer.population] == [f"gen0_agent_{i:03d}" for i in range(4)]
+    assert trainer.generation_pipeline.client.max_in_flight <= 3
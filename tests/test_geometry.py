@@ -0,0 +1,56 @@
+"""
+Unit tests for the pygame-free AABB type
+"""
+import sys
+import os
+import subprocess
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import pygame
+from game.core.geometry import AABB
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+
+def test_aabb_matches_pygame_rect_conversion():
+    """Constructor truncates and attribute assignment rounds like pygame.Rect"""
+    for values in [(10.7, 20.5, 50, 25), (-10.9, 2.5, 3.5, 4.5), (-0.5, 0.49, 60, 120)]:
+        assert tuple(AABB(*values)) == tuple(pygame.Rect(*values))
+
+    box = AABB(0, 0, 60, 120)
+    rect = pygame.Rect(0, 0, 60, 120)
+    for value in [10.5, 2.5, -0.5, -2.5, 10.4, 589.6, 530.0]:
+        box.x = value
+        box.y = value
+        rect.x = value
+        rect.y = value
+        assert tuple(box) == tuple(rect)
+
+def test_aabb_colliderect_matches_pygame():
+    """Overlap tests agree with pygame.Rect, including touching edges and empty boxes"""
+    target = (100, 530, 60, 120)
+    candidates = [
+        (160, 560, 50, 25),   # touching right edge
+        (159, 560, 50, 25),   # one pixel overlap
+        (50, 500, 50, 30),    # touching left edge
+        (120, 640, 90, 30),   # overlapping bottom
+        (120, 650, 90, 30),   # touching bottom
+        (120, 560, 0, 25),    # zero width
+    ]
+    for box in candidates:
+        assert AABB(*box).colliderect(AABB(*target)) == pygame.Rect(box).colliderect(pygame.Rect(target))
+    assert not AABB(0, 0, 0, 10)
+    assert AABB(0, 0, 1, 1)
+
+def test_headless_env_does_not_import_pygame():
+    """Headless training never touches pygame/SDL"""
+    code = (
+        "import sys\n"
+        "from training.environment import FightingGameEnv\n"
+        "env = FightingGameEnv(headless=True)\n"
+        "env.reset()\n"
+        "for _ in range(60):\n"
+        "    env.step(5, 4)\n"
+        "assert 'pygame' not in sys.modules\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
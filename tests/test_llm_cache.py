@@ -0,0 +1,96 @@
+"""
+Tests for the persistent LLM response cache and replay-only generation
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from generation_pipeline import GenerationPipeline, GenerationRequest, StubLLMClient
+from llm_cache import CachedLLMClient, LLMResponseCache, prompt_key
+
+PARAMS = {'max_tokens': 2000}
+
+
+def _request(i):
+    # Two distinct prompts, each issued several times
+    return GenerationRequest(prompt=f"agent prompt {i % 2}", fighting_style="balanced", generation=0)
+
+
+def _run(cache, client=None, replay_only=False, target=6, max_concurrency=3):
+    cached = CachedLLMClient(client, cache, "model-a", PARAMS, replay_only=replay_only)
+    pipeline = GenerationPipeline(cached, max_concurrency=max_concurrency, backoff_seconds=0.001)
+    codes = []
+
+    def keep(request, code):
+        codes.append(code)
+        return True
+
+    pipeline.run(_request, keep, target, target)
+    return pipeline, codes
+
+
+def test_prompt_key_covers_model_and_params():
+    key = prompt_key("p", "model-a", PARAMS)
+    assert key == prompt_key("p", "model-a", {'max_tokens': 2000})
+    assert key != prompt_key("q", "model-a", PARAMS)
+    assert key != prompt_key("p", "model-b", PARAMS)
+    assert key != prompt_key("p", "model-a", {'max_tokens': 1000})
+
+
+def test_rerun_replays_from_disk_without_client(tmp_path):
+    client = StubLLMClient(seed=1, latency=0.001)
+    cache = LLMResponseCache(str(tmp_path))
+    _, first = _run(cache, client)
+    assert cache.misses == 6 and cache.hits == 0 and client.calls == 6
+    assert all('```' not in code for code in first)  # Cleaned code is stored
+    assert len(set(first)) > 2  # Repeated prompts keep their distinct responses
+
+    replay = LLMResponseCache(str(tmp_path))
+    pipeline, second = _run(replay, replay_only=True, max_concurrency=1)
+    assert second == first
+    assert replay.hits == 6 and replay.misses == 0 and pipeline.failed == 0
+
+
+def test_replay_miss_fails_without_retries(tmp_path):
+    pipeline, codes = _run(LLMResponseCache(str(tmp_path)), replay_only=True, target=3)
+    assert codes == []
+    assert pipeline.failed == 3 and pipeline.retries == 0
+
+
+def test_requests_keep_their_slot_across_retries(tmp_path):
+    cached = CachedLLMClient(None, LLMResponseCache(str(tmp_path)), "model-a", PARAMS)
+    first, second = _request(0), _request(2)
+    key = prompt_key(first.prompt, "model-a", PARAMS)
+    assert cached._slot(first) == (key, 0) and cached._slot(second) == (key, 1)
+    assert cached._slot(first) == (key, 0) and first.cache_slot == (key, 0)  # A retry reuses its slot
+
+
+def test_partial_cache_only_requests_missing_responses():
+    cache = LLMResponseCache()
+    _run(cache, StubLLMClient(seed=1), target=2)
+
+    client = StubLLMClient(seed=1)
+    _, codes = _run(cache, client, target=6)
+    assert len(codes) == 6
+    assert cache.get_stats()['entries'] == 2
+    assert client.calls == 4
+
+
+def test_trainer_caches_only_seeded_runs_by_seed(tmp_path, monkeypatch):
+    import pytest
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    unseeded = EvolutionaryTrainer(ExperimentConfig(llm_replay_only=True), None, "unseeded_run")
+    with pytest.raises(ValueError):
+        unseeded._get_generation_pipeline()
+
+    trainer = EvolutionaryTrainer(ExperimentConfig(llm_replay_only=True, seed=3), None, "seeded_run")
+    trainer._get_generation_pipeline()
+    cached = trainer.generation_pipeline.client
+    assert trainer.llm_cache is not None and cached.params['seed'] == 3
+    # Runs with another seed do not share cached responses
+    assert (prompt_key("p", cached.model, cached.params)
+            != prompt_key("p", cached.model, dict(cached.params, seed=4)))
@@ -0,0 +1,64 @@
+"""
+Tests for the shared observation encoder
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from game.core.observation import STATE_SIZE, FIGHTER_FEATURES, encode_observations, new_observation_buffer
+from game.controllers.ai_controller import RLAIController
+from training.environment import FightingGameEnv
+
+
+def _play(env, frames, seed):
+    rng = np.random.default_rng(seed)
+    env.reset()
+    for _ in range(frames):
+        env.step(int(rng.integers(0, 10)), int(rng.integers(0, 10)))
+
+
+def test_encoder_writes_both_views_in_place():
+    """Both perspectives land in the caller's buffer, including rows of a batch buffer"""
+    env = FightingGameEnv(headless=True)
+    _play(env, 120, seed=0)
+
+    pair = new_observation_buffer()
+    batch = new_observation_buffer(3)
+    assert encode_observations(env.fighter1, env.fighter2, pair) is pair
+    encode_observations(env.fighter1, env.fighter2, batch[1])
+
+    np.testing.assert_array_equal(pair[0], env.get_state())
+    np.testing.assert_array_equal(pair[1], env.get_state(player_fighter=env.fighter2))
+    np.testing.assert_array_equal(batch[1], pair)
+    assert not batch[0].any() and not batch[2].any()
+
+
+def test_views_are_mirror_images():
+    """Each fighter sees itself on the left of a mirrored copy of the other's view"""
+    env = FightingGameEnv(headless=True)
+    unmirrored = [i for i in range(FIGHTER_FEATURES) if i not in (0, 3)]
+    for seed in range(5):
+        _play(env, 90, seed)
+        obs = env.get_observations()
+        assert obs.shape == (2, STATE_SIZE)
+        # Everything but x position and x velocity is shared between the two views
+        for me, other in ((0, 1), (1, 0)):
+            np.testing.assert_array_equal(obs[me, unmirrored],
+                                          obs[other, [FIGHTER_FEATURES + i for i in unmirrored]])
+        # Exactly one view is mirrored when the fighters are apart
+        np.testing.assert_allclose(obs[0, 0] + obs[1, FIGHTER_FEATURES], 1.0, atol=1e-6)
+        # Relative x keeps the real-world sign (positive = opponent to the right)
+        direction = np.sign(env.fighter2.x - env.fighter1.x)
+        assert np.sign(obs[0, 23]) == direction and np.sign(obs[1, 23]) == -direction
+        np.testing.assert_array_equal(obs[:, 22], np.abs(obs[:, 23]))
+
+
+def test_controller_matches_training_observation():
+    """The in-game RL controller sees exactly what the policy was trained on"""
+    env = FightingGameEnv(headless=True)
+    controller = RLAIController()
+    for seed in range(5):
+        _play(env, 90, seed)
+        np.testing.assert_array_equal(controller.get_state_vector(env.fighter2, env.fighter1),
+                                      env.get_state(player_fighter=env.fighter2))
@@ -0,0 +1,70 @@
+"""
+Tests for process-pool match execution against the sequential path
+"""
+import sys
+import os
+import random
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from safe_execution import SafeAgent
+from swiss_tournament import SwissTournament
+from match_runner import create_rule_based_opponents
+from parallel_matches import ParallelMatchExecutor
+
+AGENT_CODE = """
+import random
+import numpy as np
+def get_action(state):
+    if state[22] < {reach}:
+        return random.choice([4, 5])
+    if random.random() < 0.2:
+        return int(np.random.choice([3, 9]))
+    return 2 if state[23] > 0 else 1
+"""
+
+
+def _make_agents():
+    return [SafeAgent(f"agent_{i}", AGENT_CODE.format(reach=0.05 + 0.03 * i))
+            for i in range(5)]
+
+
+def _evaluate(num_workers, isolate_agents=False):
+    """Swiss tournament plus rule-based evaluation, as the evolution runner does it"""
+    agents = _make_agents()
+    random.seed(0)  # First-round pairings are shuffled with the global RNG
+    with ParallelMatchExecutor(num_workers, games_per_match=2, timeout_seconds=600,
+                               action_repeat=4, seed=11, isolate_agents=isolate_agents) as executor:
+        tournament = SwissTournament(agents, rounds=2)
+        rankings = tournament.run_tournament(executor.run_match, executor.run_matches)
+        rule_based = executor.evaluate_vs_rule_based(agents[:2], create_rule_based_opponents())
+
+    standings = [(agent_id, s.wins, s.games_played, s.total_fitness)
+                 for agent_id, s in rankings]
+    return standings, tournament.all_results, rule_based
+
+
+def test_parallel_results_match_sequential():
+    """Two workers produce exactly the standings and results of a single process"""
+    sequential = _evaluate(num_workers=1)
+    parallel = _evaluate(num_workers=2)
+
+    assert parallel[0] == sequential[0]
+    for par, seq in zip(parallel[1], sequential[1]):
+        assert (par.agent1_id, par.agent2_id, par.agent1_score, par.agent1_fitness, par.games_played) == \
+               (seq.agent1_id, seq.agent2_id, seq.agent1_score, seq.agent1_fitness, seq.games_played)
+    assert parallel[2] == sequential[2]
+
+    # 5 agents: two rounds of 2 matches plus a bye
+    assert len(sequential[1]) == 6
+    assert sum(result.metadata.get('bye', False) for result in sequential[1]) == 2
+    assert set(sequential[2][0]) == {'vs_easy', 'vs_medium', 'vs_hard', 'overall'}
+    assert sequential[2][0]['overall']['total_games'] == 6
+
+
+def test_isolated_agents_match_in_process_agents():
+    """Agents compiled in host processes play exactly like in-process SafeAgents"""
+    isolated = _evaluate(num_workers=2, isolate_agents=True)
+    in_process = _evaluate(num_workers=1)
+    assert isolated[0] == in_process[0]
+    assert isolated[2] == in_process[2]
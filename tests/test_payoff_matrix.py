@@ -0,0 +1,79 @@
+"""
+Tests for reusing match results across generations through the payoff matrix
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from safe_execution import SafeAgent
+from match_runner import create_rule_based_opponents
+from parallel_matches import ParallelMatchExecutor
+from payoff_matrix import PayoffMatrix
+
+AGENT_CODE = """
+import random
+def get_action(state):
+    if state[22] < {reach}:
+        return random.choice([4, 5])
+    return 2 if state[23] > 0 else 1
+"""
+
+
+def _agent(agent_id, variant):
+    return SafeAgent(agent_id, AGENT_CODE.format(reach=0.05 + 0.03 * variant))
+
+
+def _executor(payoff_matrix=None):
+    return ParallelMatchExecutor(1, games_per_match=2, timeout_seconds=600, action_repeat=4,
+                                 seed=5, payoff_matrix=payoff_matrix)
+
+
+def _summary(result):
+    return (result.agent1_id, result.agent2_id, result.agent1_score, result.agent2_score,
+            result.agent1_fitness, result.agent2_fitness, result.games_played)
+
+
+def test_unchanged_pairs_are_reused_with_new_ids(tmp_path):
+    """Elites renamed in the next generation replay nothing; new code pairs are played once"""
+    path = str(tmp_path / "payoff_matrix.json")
+    matrix = PayoffMatrix(path)
+    opponents = create_rule_based_opponents()
+
+    gen0 = [_agent(f"gen0_agent_{i}", i) for i in range(3)]
+    executor = _executor(matrix)
+    executor.run_matches([(gen0[0], gen0[1]), (gen0[1], gen0[2])])
+    executor.evaluate_vs_rule_based(gen0[:1], opponents)
+    assert executor.matches_played == 5 and executor.matches_reused == 0
+
+    # Next generation: two elites under new IDs, scheduled on either side, plus one new agent
+    gen1 = [_agent("gen1_elite_000", 1), _agent("gen1_elite_001", 0), _agent("gen1_agent_002", 7)]
+    pairings = [(gen1[0], gen1[1]), (gen1[2], gen1[0])]
+    reused = executor.run_matches(pairings)
+    rule_based = executor.evaluate_vs_rule_based(gen1[1:2], opponents)
+    assert executor.matches_played == 6 and executor.matches_reused == 4
+    assert reused[0].metadata['cached'] and 'cached' not in reused[1].metadata
+
+    # Reused results are exactly what replaying the matches gives
+    fresh = _executor()
+    assert [_summary(r) for r in reused] == [_summary(r) for r in fresh.run_matches(pairings)]
+    assert rule_based == fresh.evaluate_vs_rule_based(gen1[1:2], opponents)
+
+    # The matrix persists with the experiment
+    matrix.save()
+    reloaded = _executor(PayoffMatrix(path))
+    reloaded.run_matches(pairings)
+    assert reloaded.matches_played == 0 and reloaded.matches_reused == 2
+
+
+def test_settings_are_part_of_the_key():
+    """Changing the evaluation seed or games per match never reuses old results"""
+    matrix = PayoffMatrix()
+    agents = [_agent("a", 0), _agent("b", 1)]
+    _executor(matrix).run_match(*agents)
+
+    other_seed = ParallelMatchExecutor(1, games_per_match=2, timeout_seconds=600, action_repeat=4,
+                                       seed=6, payoff_matrix=matrix)
+    other_seed.run_match(*agents)
+    assert other_seed.matches_played == 1
+    assert len(matrix) == 2
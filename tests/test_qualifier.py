@@ -0,0 +1,108 @@
+"""
+Tests for the fast-fail qualifier stage run before agents join the population
+"""
+import sys
+import os
+import json
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from qualifier import Qualifier, action_entropy
+
+FIGHTER = '''
+def get_action(state):
+    distance = state[22]
+    if distance < 0.15:
+        return 4 if state[25] >= 0 else 6
+    elif distance > 0.4:
+        return 9
+    return 2 if state[23] > 0 else 1
+'''
+
+IDLE = '''
+def get_action(state):
+    return 0
+'''
+
+SPAM = '''
+def get_action(state):
+    return 9
+'''
+
+THROWS = '''
+def get_action(state):
+    return state[100]
+'''
+
+SLOW = '''
+def get_action(state):
+    total = 0
+    for i in range(300000):
+        total += i
+    return 2 if state[23] > 0 else 1
+'''
+
+
+def test_action_entropy():
+    assert action_entropy(np.array([10, 0, 0])) == 0.0
+    assert action_entropy(np.array([5, 5, 0, 0])) == 1.0
+    assert action_entropy(np.zeros(10)) == 0.0
+
+
+def test_qualifier_passes_a_working_agent():
+    qualifier = Qualifier(frames=200)
+    result = qualifier.qualify("fighter", FIGHTER.strip())
+    assert result.passed and result.reasons == []
+    assert result.calls == 600  # One 200-frame game per opponent
+    assert result.error_rate == 0.0 and result.entropy > 0.5
+
+
+def test_qualifier_rejects_degenerate_agents():
+    qualifier = Qualifier(frames=200, max_latency_ms=2.0)
+
+    for code in (IDLE, SPAM):
+        result = qualifier.qualify("degenerate", code.strip())
+        assert not result.passed and result.entropy == 0.0
+        assert result.reasons[0].startswith("action entropy")
+
+    result = qualifier.qualify("throws", THROWS.strip())
+    assert not result.passed
+    assert any(reason.startswith("error rate 100%") and "IndexError" in reason for reason in result.reasons)
+    assert result.calls < 600  # Disabled before the battery was over
+
+    result = qualifier.qualify("slow", SLOW.strip())
+    assert not result.passed and result.reasons[0].startswith("mean latency")
+    assert len(result.reasons) == 1 and result.calls < 600
+
+    report = qualifier.take_report()
+    assert report['tested'] == 4 and report['rejected'] == 4
+    assert set(report['rejections']) == {"degenerate", "throws", "slow"}
+    assert qualifier.take_report()['tested'] == 0
+
+
+def test_qualifier_results_are_cached_by_code():
+    qualifier = Qualifier(frames=100)
+    first = qualifier.qualify("gen0_agent_000", FIGHTER.strip())
+    again = qualifier.qualify("gen1_elite_000", FIGHTER.strip())
+    assert again.agent_id == "gen1_elite_000" and again.entropy == first.entropy
+    assert qualifier.get_stats()['tested'] == 1 and qualifier.get_stats()['reused'] == 1
+
+
+def test_trainer_rejects_agents_that_fail_qualifier(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=3, generations=1, llm_backend='stub', qualify_agents=True)
+    trainer = EvolutionaryTrainer(config, None, "qualifier_run")
+    assert trainer._create_and_validate_agent("gen0_agent_000", FIGHTER, 'test', 0)
+    assert not trainer._create_and_validate_agent("gen0_agent_001", IDLE, 'test', 0)
+    assert [agent.agent_id for agent in trainer.population] == ["gen0_agent_000"]
+    assert trainer.agent_pool.get_agent("gen0_agent_001") is None
+
+    trainer._save_generation_results()
+    with open(os.path.join(trainer.experiment_manager.experiment_dir, "evolution_summary.json")) as f:
+        report = json.load(f)['generations'][0]['qualifier']
+    assert report['tested'] == 2 and report['rejected'] == 1
+    assert list(report['rejections']) == ["gen0_agent_001"]
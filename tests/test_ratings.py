@@ -0,0 +1,126 @@
+"""
+Tests for persistent Glicko ratings and rating-seeded Swiss pairing
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import random
+import pytest
+from safe_execution import SafeAgent
+from parallel_matches import ParallelMatchExecutor
+from payoff_matrix import PayoffMatrix
+from swiss_tournament import SwissTournament, TournamentResult
+from hall_of_fame import HallOfFame
+from ratings import RatingStore, Rating, glicko_update, agent_key, RATINGS_FILE_NAME
+
+ATTACKER_CODE = """
+def get_action(state):
+    if state[22] < {reach}:
+        return 4
+    return 2 if state[23] > 0 else 1
+"""
+
+IDLE_CODE = """
+def get_action(state):
+    return 0
+"""
+
+
+def test_glicko_update_matches_reference_example():
+    """Worked example from Glickman's description of the Glicko system"""
+    rating, deviation = glicko_update(1500, 200, [(1400, 30, 1.0), (1550, 100, 0.0), (1700, 300, 0.0)])
+    assert rating == pytest.approx(1464.1, abs=0.1)
+    assert deviation == pytest.approx(151.4, abs=0.2)
+
+
+def test_ratings_update_from_matches_and_persist(tmp_path):
+    experiment_dir = tmp_path / "experiments" / "evolutionary_run"
+    ratings = RatingStore.for_experiment(str(experiment_dir))
+    assert ratings.path == str(tmp_path / "experiments" / RATINGS_FILE_NAME)
+
+    attacker = SafeAgent("attacker", ATTACKER_CODE.format(reach=0.08))
+    idle = SafeAgent("idle", IDLE_CODE)
+    matrix = PayoffMatrix()
+    executor = ParallelMatchExecutor(1, games_per_match=3, timeout_seconds=600, action_repeat=4,
+                                     seed=1, payoff_matrix=matrix, ratings=ratings)
+    executor.run_match(attacker, idle)
+
+    strong, weak = ratings.get_for_agent(attacker), ratings.get_for_agent(idle)
+    assert strong.rating > 1500 > weak.rating
+    assert strong.deviation < 350 and strong.games == 3 and strong.matches == 1
+
+    # A result reused from the payoff matrix is not counted twice
+    executor.run_match(SafeAgent("attacker_renamed", attacker.code), idle)
+    assert executor.matches_reused == 1
+    assert ratings.get_for_agent(attacker) == strong
+
+    # Sitting out a period makes a rating less certain
+    ratings.advance_period()
+    assert ratings.get_for_agent(attacker).deviation > strong.deviation
+    ratings.save()
+
+    reloaded = RatingStore(ratings.path)
+    assert reloaded.get(agent_key(attacker)) == ratings.get(agent_key(attacker))
+
+    # Play tools find the shared store from a saved agent file
+    agent_file = experiment_dir / "top_agents" / "rank_001.py"
+    assert RatingStore.for_agent_file(str(agent_file)).get_for_code(attacker.code).rating == strong.rating
+
+
+def test_rated_first_round_pairs_neighbours():
+    ratings = RatingStore()
+    agents = [SafeAgent(f"agent_{i}", ATTACKER_CODE.format(reach=0.05 + 0.01 * i)) for i in range(5)]
+    for i, agent in enumerate(agents):
+        ratings.ratings[agent_key(agent)] = Rating(rating=1500 + 100 * i, deviation=50)
+
+    random.seed(0)
+    tournament = SwissTournament(agents, rounds=1, ratings=ratings)
+    tournament.current_round = 1
+    pairings = [(a.agent_id, b.agent_id if b else None) for a, b in tournament._create_pairings()]
+    assert pairings == [("agent_4", "agent_3"), ("agent_2", "agent_1"), ("agent_0", None)]
+
+
+def test_hall_of_fame_reports_ratings(tmp_path):
+    ratings = RatingStore()
+    codes = [ATTACKER_CODE.format(reach=0.05), ATTACKER_CODE.format(reach=0.1)]
+    ratings.record(agent_key(SafeAgent("a", codes[0])), agent_key(SafeAgent("b", codes[1])),
+                   TournamentResult("a", "b", 0.0, 1.0, 0.0, 10.0, 2,
+                                    {'agent1_wins': 0, 'agent2_wins': 2}))
+
+    hof = HallOfFame(str(tmp_path), ratings=ratings)
+    hof.add_agents([{'agent_id': 'a', 'fitness': 5.0, 'code': codes[0]},
+                    {'agent_id': 'b', 'fitness': 1.0, 'code': codes[1]},
+                    {'agent_id': 'c', 'fitness': 3.0, 'code': IDLE_CODE}], generation=0)
+
+    assert hof.get_rating('b').rating > hof.get_rating('a').rating
+    assert hof.get_rating('c') is None
+    assert [record.agent_id for record, _ in hof.get_top_agents_by_rating()] == ['b', 'a']
+    agent_files = os.listdir(hof.hall_of_fame_dir)
+    with open(os.path.join(hof.hall_of_fame_dir, sorted(agent_files)[0])) as f:
+        assert "- Rating: " in f.read()
+
+
+def test_concurrent_stores_merge_their_updates(tmp_path):
+    """Two experiments saving to the shared file keep each other's updates"""
+    path = str(tmp_path / RATINGS_FILE_NAME)
+    win = TournamentResult("a", "b", 1.0, 0.0, 0.0, 0.0, 1, {'agent1_wins': 1, 'agent2_wins': 0})
+    first, second = RatingStore(path), RatingStore(path)
+
+    first.record("x", "y", win)
+    first.advance_period()
+    second.record("x", "z", win)
+    first.save()
+    second.save()
+
+    merged = RatingStore(path)
+    assert set(merged.ratings) == {"x", "y", "z"}
+    assert merged.ratings["y"] == first.ratings["y"] and merged.ratings["z"] == second.ratings["z"]
+    # x won in both experiments: both wins count
+    x = merged.ratings["x"]
+    assert x.matches == 2 and x.games == 2
+    assert x.rating > first.ratings["x"].rating and x.deviation < first.ratings["x"].deviation
+    assert merged.period == 1
+    # The second store continues from the merged state
+    assert second.ratings["x"] == x and second.period == 1
@@ -0,0 +1,87 @@
+"""
+Tests for the columnar tournament result store
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import pytest
+from collections import defaultdict
+from benchmark_swiss_pairing import simulated_tournament
+from result_store import ResultStore, BYE_INDEX
+
+
+def test_standings_and_schedule_match_per_result_totals():
+    """Vectorized standings equal totals accumulated result by result"""
+    tournament = simulated_tournament(51, rounds=5)
+    results = tournament.all_results
+    assert len(results) == len(tournament.results) == 5 * 26
+
+    wins, games, fitness, opponents = defaultdict(float), defaultdict(int), defaultdict(float), defaultdict(set)
+    for r in results:
+        wins[r.agent1_id] += r.agent1_score
+        fitness[r.agent1_id] += r.agent1_fitness
+        if r.agent2_id != "BYE":
+            wins[r.agent2_id] += r.agent2_score
+            fitness[r.agent2_id] += r.agent2_fitness
+            games[r.agent1_id] += 1
+            games[r.agent2_id] += 1
+            opponents[r.agent1_id].add(r.agent2_id)
+            opponents[r.agent2_id].add(r.agent1_id)
+
+    win_rate = {a: wins[a] / games[a] if games[a] else 0.0 for a in tournament.standings}
+    for agent_id, standing in tournament.standings.items():
+        assert standing.wins == pytest.approx(wins[agent_id])
+        assert standing.games_played == games[agent_id]
+        assert standing.total_fitness == pytest.approx(fitness[agent_id])
+        expected_sos = sum(win_rate[o] for o in opponents[agent_id]) / len(opponents[agent_id])
+        assert standing.strength_of_schedule == pytest.approx(expected_sos)
+        assert tournament.get_opponents(agent_id) == opponents[agent_id]
+        assert len(tournament.get_match_history(agent_id)) == 5
+
+
+def test_head_to_head_and_export(tmp_path):
+    store = ResultStore(["a", "b", "c"], capacity=1)
+    store.append(1, 0, 1, 1.0, 0.0, 10.0, 2.0, 3)
+    store.append(2, 1, 0, 0.5, 0.5, 4.0, 4.0, 3)
+    store.append(2, 2, BYE_INDEX, 1.0, 0.0, 0.0, 0.0, 0)
+    store.append(3, 1, 0, 1.0, 0.0, 8.0, 1.0, 3, duration=1.5)
+
+    assert store.head_to_head(0, 1) == {'matches': 3, 'wins': 1, 'losses': 1, 'draws': 1}
+    assert store.head_to_head(0, 2)['matches'] == 0
+    assert store.score_matrix().tolist() == [[0.0, 1.5, 0.0], [1.5, 0.0, 0.0], [0.0, 0.0, 0.0]]
+
+    wins, matches, _ = store.standings()
+    assert wins.tolist() == [1.5, 1.5, 1.0] and matches.tolist() == [3, 3, 0]
+
+    path = str(tmp_path / "results.npz")
+    store.save(path)
+    loaded = ResultStore.load(path)
+    assert loaded.agent_ids == ["a", "b", "c"]
+    assert (loaded.rows == store.rows).all()
+
+
+def test_error_and_cached_results_keep_their_metadata(tmp_path):
+    """Failed matches stay distinguishable from 0-0 results, in memory and in the .npz"""
+    from result_store import FLAG_ERROR, FLAG_CACHED, FLAG_GAME_COUNTS
+
+    store = ResultStore(["a", "b"])
+    played = {'agent1_wins': 2, 'agent2_wins': 1, 'draws': 0, 'max_games': 5, 'match_duration': 2.0}
+    store.append(1, 0, 1, 0.0, 0.0, 0.0, 0.0, 0, metadata={'error': "Match error: boom"})
+    store.append(2, 0, 1, 1.0, 0.0, 5.0, 1.0, 3, duration=2.0, metadata=dict(played, stop_reason='clinch'))
+    store.append(3, 0, 1, 1.0, 0.0, 5.0, 1.0, 3, duration=2.0,
+                 metadata=dict(played, stop_reason='completed', cached=True))
+
+    assert store.rows['flags'].tolist() == [FLAG_ERROR, FLAG_GAME_COUNTS, FLAG_GAME_COUNTS | FLAG_CACHED]
+    assert store.rows['agent1_wins'].tolist() == [0, 2, 2] and store.rows['max_games'].tolist() == [0, 5, 5]
+    assert store.metadata(0) == {'error': "Match error: boom"}
+    assert store.metadata(1) == dict(played, stop_reason='clinch')
+    assert store.metadata(2) == dict(played, stop_reason='completed', cached=True)
+    # Only the failed and early-stopped rows carry a note
+    assert sorted(store._notes) == [0, 1]
+
+    path = str(tmp_path / "results.npz")
+    store.save(path)
+    loaded = ResultStore.load(path)
+    assert (loaded.rows == store.rows).all()
+    assert [loaded.metadata(i) for i in range(3)] == [store.metadata(i) for i in range(3)]
@@ -0,0 +1,60 @@
+"""
+Tests for SubprocVecEnv against serially stepped FightingGameEnvs
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import numpy as np
+from training.environment import FightingGameEnv
+from training.subproc_environment import SubprocVecEnv
+
+
+def test_subproc_env_matches_serial_envs():
+    """Workers step, auto-reset and report exactly what serial envs would"""
+    max_steps = 150
+    rng = np.random.default_rng(0)
+    envs = [FightingGameEnv(headless=True, max_steps=max_steps, seed=3 + i) for i in range(6)]
+    for env in envs:
+        env.reset()
+
+    with SubprocVecEnv(num_workers=2, envs_per_worker=3, max_steps=max_steps, seed=3) as vec_env:
+        states = vec_env.reset()
+        for i, env in enumerate(envs):
+            np.testing.assert_array_equal(states[i], env.get_observations())
+
+        episodes = 0
+        for _ in range(400):
+            actions = rng.integers(0, 10, size=(6, 2))
+            states, rewards, dones, info = vec_env.step(actions)
+            for i, env in enumerate(envs):
+                _, (reward1, reward2), done, _ = env.step(int(actions[i, 0]), int(actions[i, 1]))
+                assert (rewards[i, 0], rewards[i, 1]) == (reward1, reward2)
+                assert dones[i] == done
+                assert info['fighter1_health'][i] == env.fighter1.health
+                if done:
+                    np.testing.assert_array_equal(info['terminal_states'][i], env.get_observations())
+                    env.reset()
+                    episodes += 1
+                np.testing.assert_array_equal(states[i], env.get_observations())
+
+        assert episodes >= 6
+
+
+def test_subproc_env_close_is_idempotent():
+    """Workers exit and shared memory is released on close"""
+    vec_env = SubprocVecEnv(num_workers=2, envs_per_worker=1)
+    vec_env.reset()
+    processes = list(vec_env._processes)
+    vec_env.close()
+    vec_env.close()
+    assert not any(process.is_alive() for process in processes)
+
+
+def test_subproc_env_builds_exactly_num_envs():
+    """num_envs is split over at most one worker per env, uneven splits included"""
+    with SubprocVecEnv(num_workers=4, num_envs=5, max_steps=20, seed=3) as vec_env:
+        assert vec_env.num_envs == 5 and vec_env.num_workers == 4
+        assert vec_env.reset().shape[0] == 5
+    with SubprocVecEnv(num_workers=8, num_envs=3) as vec_env:
+        assert vec_env.num_envs == 3 and vec_env.num_workers == 3
@@ -0,0 +1,144 @@
+"""
+Tests for the surrogate fitness model used to screen candidates before evaluation
+"""
+import sys
+import os
+import json
+import random
+import numpy as np
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+from fingerprints import FingerprintStore
+from surrogate import (FitnessSurrogate, MLPRegressor, behavior_features, load_hall_of_fame_records,
+                       rank_correlation, screening_report)
+
+CHASER = '''
+def get_action(state):
+    if state[22] < 0.15:
+        return 4
+    return 2 if state[23] > 0 else 1
+'''
+
+RUNNER = '''
+def get_action(state):
+    return 1 if state[23] > 0 else 2
+'''
+
+
+def _bank(size=400):
+    bank = np.random.default_rng(0).uniform(-1, 1, (size, 26)).astype(np.float32)
+    bank[:, 22] = np.abs(bank[:, 22])  # Distance is in [0, 1]
+    return bank
+
+
+def _agent(punch_range):
+    return f'''
+def get_action(state):
+    if state[22] < {punch_range}:
+        return 4
+    return 2 if state[23] > 0 else 1
+'''
+
+
+def test_behavior_features_describe_actions_in_context():
+    bank = _bank()
+    store = FingerprintStore(bank, isolate=False)
+    features = behavior_features(store.get_fingerprints([CHASER, RUNNER]), bank)
+    assert features.shape == (2, 62)
+
+    # Action shares per context sum to one
+    assert np.allclose(features[:, :60].reshape(2, 6, 10).sum(axis=2), 1.0)
+    # The chaser punches at close range and otherwise approaches; the runner only retreats
+    assert features[0, 4] == 1.0 and features[0, 60] > 0.5 and features[0, 61] == 0.0
+    assert features[1, 60] == 0.0 and features[1, 61] == 1.0
+
+
+def test_mlp_learns_a_nonlinear_fitness_function():
+    rng = np.random.default_rng(1)
+    x = rng.uniform(0, 1, (160, 5))
+    y = 100 * np.sin(3 * x[:, 0]) + 40 * x[:, 1] * x[:, 2] + rng.normal(0, 2, 160)
+
+    model = MLPRegressor(seed=0).fit(x[:120], y[:120])
+    assert rank_correlation(model.predict(x[120:]), y[120:]) > 0.9
+    # Same seed, same model
+    assert np.allclose(model.predict(x[120:]), MLPRegressor(seed=0).fit(x[:120], y[:120]).predict(x[120:]))
+
+
+def test_rank_correlation_and_screening_report():
+    assert rank_correlation([1, 2, 3], [10, 20, 30]) == 1.0
+    assert rank_correlation([1, 2, 2, 3], [4, 3, 3, 1]) == -1.0
+    assert rank_correlation([1], [1]) is None
+    assert rank_correlation([1, 1], [2, 3]) is None
+
+    report = screening_report(predicted=[5.0, 3.0, 1.0], actual=[6.0, 2.0, 4.0],
+                              audited=[False, False, True], screened_out=2)
+    assert report['missed'] == 1  # The audited agent beat the weakest chosen agent (2.0)
+    assert report['audited'] == 1 and report['screened_out'] == 2
+    assert np.isclose(report['mae'], 5 / 3) and report['rank_correlation'] == 0.5
+
+
+def test_select_keeps_protected_and_best_predicted():
+    surrogate = FitnessSurrogate(store=None)
+    predictions = np.array([1.0, 9.0, 5.0, 7.0, 3.0, 2.0])
+    protected = [True, False, False, False, False, False]
+
+    chosen, audited = surrogate.select(predictions, protected, keep=3)
+    assert chosen == [0, 1, 3] and audited == []
+
+    chosen, audited = surrogate.select(predictions, protected, keep=3, audit=1, rng=random.Random(0))
+    assert len(audited) == 1 and audited[0] in (2, 4, 5)
+    assert chosen == sorted([0, 1, 3] + audited)
+
+
+def test_surrogate_trains_on_past_halls_of_fame(tmp_path):
+    # A past experiment in which longer punch ranges scored better
+    ranges = np.linspace(0.05, 0.6, 24)
+    past = tmp_path / "experiments" / "past_run"
+    past.mkdir(parents=True)
+    with open(past / "hall_of_fame.json", 'w') as f:
+        json.dump({'agents': [{'code': _agent(r), 'fitness': 100 * r} for r in ranges]}, f)
+    assert len(load_hall_of_fame_records(str(tmp_path / "experiments"), limit=10)) == 10
+
+    store = FingerprintStore(_bank(), isolate=False)
+    surrogate = FitnessSurrogate.for_experiment(str(tmp_path / "experiments" / "new_run"), store, min_records=20)
+    assert surrogate.ready and surrogate.knows(_agent(ranges[0]))
+    assert surrogate.fit()
+    predictions = surrogate.predict([_agent(0.1), _agent(0.3), _agent(0.5)])
+    assert predictions[0] < predictions[1] < predictions[2]
+
+
+def test_trainer_screens_candidates_and_logs_accuracy(tmp_path, monkeypatch):
+    from evolution_runner import EvolutionaryTrainer
+    from experiment_manager import ExperimentConfig
+
+    monkeypatch.chdir(tmp_path)
+    config = ExperimentConfig(population_size=6, generations=1, games_per_match=1, llm_backend='stub',
+                              probe_bank_size=300, surrogate_screening=True, surrogate_min_records=4,
+                              surrogate_keep_fraction=0.5, surrogate_audit=1, dedupe_agents=False, seed=0)
+    trainer = EvolutionaryTrainer(config, None, "surrogate_run")
+    codes = [_agent(r) for r in (0.05, 0.1, 0.2, 0.3, 0.4, 0.5)]
+    for i, code in enumerate(codes):
+        assert trainer._create_and_validate_agent(f"gen0_agent_{i:03d}", code, 'test', 0)
+    # Fitness of the first four is already known, as for elites
+    known = [agent.code for agent in trainer.population[:4]]
+    trainer._get_surrogate().add_results(known, [10.0, 20.0, 30.0, 40.0])
+
+    try:
+        trainer._evaluate_generation()
+    finally:
+        trainer.match_executor.close()
+        trainer.fingerprints.close()
+
+    stats = trainer.surrogate_stats
+    # Known agents fill all three slots; one of the two new agents is evaluated as an audit
+    assert stats['evaluated'] == 5 and stats['screened_out'] == 1 and stats['audited'] == 1
+    screened = [agent for agent in trainer.population if getattr(agent, 'screened_out', False)]
+    assert len(screened) == 1
+    assert screened[0].fitness <= min(agent.fitness for agent in trainer.population)
+    new_agents = [agent for agent in trainer.population if agent.code not in known]
+    assert sum(trainer.surrogate.knows(agent.code) for agent in new_agents) == 1  # The audited one
+
+    trainer._save_generation_results()
+    with open(os.path.join(trainer.experiment_manager.experiment_dir, "evolution_summary.json")) as f:
+        assert json.load(f)['generations'][0]['surrogate']['screened_out'] == 1
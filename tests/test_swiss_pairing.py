@@ -0,0 +1,37 @@
+"""
+Tests for the score-group Swiss pairing engine
+"""
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import random
+from benchmark_swiss_pairing import legacy_swiss_pairings, simulated_tournament, _random_result
+
+
+def _ids(pairings):
+    return [(a.agent_id, b.agent_id if b is not None else None) for a, b in pairings]
+
+
+def test_pairings_match_previous_algorithm_round_by_round():
+    """Same pairings as the old full-scan code, including byes for odd populations"""
+    tournament = simulated_tournament(301, rounds=1)
+    rng = random.Random(1)
+    for round_num in range(2, 8):
+        tournament.current_round = round_num
+        pairings = tournament._create_swiss_pairings()
+        assert _ids(pairings) == _ids(legacy_swiss_pairings(tournament))
+        assert sum(1 for _, b in pairings if b is None) == 1
+        tournament._update_standings([_random_result(a, b, rng) for a, b in pairings])
+
+
+def test_rematches_only_when_everyone_left_was_faced():
+    tournament = simulated_tournament(4, rounds=3)
+    for a, b in tournament._create_swiss_pairings():
+        assert b is not None  # Everyone has faced everyone; pair anyway rather than bye
+
+    tournament = simulated_tournament(2000, rounds=5)
+    pairings = tournament._create_swiss_pairings()
+    assert len(pairings) == 1000
+    assert not any(b.agent_id in tournament.get_opponents(a.agent_id) for a, b in pairings)
+    assert len({agent.agent_id for pair in pairings for agent in pair}) == 2000
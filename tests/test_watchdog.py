@@ -0,0 +1,105 @@
+"""
+Tests for the CPU-budget watchdog behind SafeAgent timeouts
+"""
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src', 'evolution'))
+
+import numpy as np
+from safe_execution import SafeAgent
+
+SPIN_CODE = """
+def get_action(state):
+    total = 0
+    while True:
+        total += 1
+"""
+
+WORK_CODE = """
+def get_action(state):
+    total = 0
+    for i in range(20000):
+        total += i
+    return 4
+"""
+
+
+def test_runaway_call_is_interrupted_on_worker_thread():
+    """Timeouts no longer depend on SIGALRM, so they work off the main thread"""
+    agent = SafeAgent("spin", SPIN_CODE, timeout_seconds=0.05)
+    results = []
+
+    def play():
+        start = time.perf_counter()
+        results.append((agent.get_action(np.zeros(26)), time.perf_counter() - start))
+
+    thread = threading.Thread(target=play)
+    thread.start()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    action, duration = results[0]
+    assert action == 0 and duration < 1.0
+    assert agent.total_timeouts == 1
+    assert agent.budget._start is None
+
+
+def test_cumulative_budget_idles_agent_until_reset():
+    """Once a game's CPU budget is spent the agent idles; reset_budget starts the next game"""
+    agent = SafeAgent("work", WORK_CODE, cpu_budget_seconds=0.02)
+    state = np.zeros(26)
+
+    actions = [agent.get_action(state) for _ in range(500)]
+    assert 0 < actions.count(4) < 500
+    assert actions[-1] == 0
+    assert agent.budget_exhaustions == 1
+    assert agent.total_timeouts == 0
+
+    agent.reset_budget()
+    assert agent.get_action(state) == 4
+    assert agent.get_stats()['cpu_used'] > 0
+
+
+def test_agents_cannot_swallow_the_interrupt():
+    """except Exception does not catch it, a bare except is interrupted again, and returning anyway fails"""
+    catches_exception = """
+def get_action(state):
+    while True:
+        try:
+            while True:
+                pass
+        except Exception:
+            pass
+"""
+    swallows_then_spins = """
+def get_action(state):
+    try:
+        while True:
+            pass
+    except:
+        pass
+    while True:
+        pass
+"""
+    swallows_then_returns = """
+def get_action(state):
+    try:
+        while True:
+            pass
+    except:
+        return 4
+"""
+    for code in (catches_exception, swallows_then_spins, swallows_then_returns):
+        agent = SafeAgent("swallow", code, timeout_seconds=0.05)
+        start = time.perf_counter()
+        assert agent.get_action(np.zeros(26)) == 0
+        assert time.perf_counter() - start < 1.0
+        assert agent.total_timeouts == 1 and agent.total_errors == 0
+        assert agent.budget._start is None
+
+    # Nothing is left pending for the caller
+    total = 0
+    for i in range(200000):
+        total += i